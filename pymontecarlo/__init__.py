@@ -9,6 +9,7 @@ del get_versions
 # Standard library modules.
 import os
 import sys
+import threading
 
 # Third party modules.
 
@@ -16,19 +17,69 @@ import sys
 
 # Globals and constants variables.
 
+# The unit registry and the settings are only created when first used,
+# since both take a while to load (pint, HDF5 file).
+
 #--- Units
 
-import pint
+def _create_unit_registry():
+    import pint
+
+    unit_registry = pint.UnitRegistry()
+    unit_registry.define('electron = mol')
+    pint.set_application_registry(unit_registry)
 
-unit_registry = pint.UnitRegistry()
-unit_registry.define('electron = mol')
-pint.set_application_registry(unit_registry)
+    return unit_registry
 
 #--- Settings
 
-from pymontecarlo._settings import Settings
+def _import_settings_class():
+    from pymontecarlo._settings import Settings
+    return Settings
+
+def _create_settings():
+    Settings = _get_lazy_attribute('Settings')
+
+    try:
+        return Settings.read()
+    except:
+        return Settings()
+
+#--- Lazy attributes
+
+_LAZY_ATTRIBUTES = {'unit_registry': _create_unit_registry,
+                    'Settings': _import_settings_class,
+                    'settings': _create_settings}
+
+_lazy_lock = threading.RLock()
+_lazy_creating = set()
+
+def _get_lazy_attribute(name):
+    with _lazy_lock:
+        if name in globals():
+            return globals()[name]
+
+        # Attribute accessed while being created
+        if name in _lazy_creating:
+            raise AttributeError('module {!r} attribute {!r} is not yet created'
+                                 .format(__name__, name))
+
+        _lazy_creating.add(name)
+        try:
+            value = _LAZY_ATTRIBUTES[name]()
+        finally:
+            _lazy_creating.discard(name)
+
+        globals()[name] = value
+        return value
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    return _get_lazy_attribute(name)
 
-try:
-    settings = Settings.read()
-except:
-    settings = Settings()
+if sys.version_info < (3, 7): # pragma: no cover
+    # Module __getattr__ is not supported (PEP 562)
+    unit_registry = _get_lazy_attribute('unit_registry')
+    Settings = _get_lazy_attribute('Settings')
+    settings = _get_lazy_attribute('settings')
@@ -13,6 +13,8 @@ import tabulate
 # Local modules.
 import pymontecarlo
 from pymontecarlo.exceptions import ProgramNotFound
+from pymontecarlo.project import Project
+from pymontecarlo.formats.hdf5.reader import read
 
 # Globals and constants variables.
 
@@ -31,6 +33,8 @@ def _create_parser():
 def _create_commands(parser):
     subparsers = parser.add_subparsers(title='Commands', dest='command')
     _create_run_command(subparsers.add_parser('run'))
+    _create_plan_command(subparsers.add_parser('plan'))
+    _create_worker_command(subparsers.add_parser('worker'))
     _create_config_command(subparsers.add_parser('config'))
 
 def _create_run_command(parser):
@@ -45,6 +49,26 @@ def _create_run_command(parser):
     parser.add_argument('-n', type=int, default=nprocessors,
                         help='Number of processors to use')
 
+def _create_plan_command(parser):
+    parser.description = 'Report the simulation(s) that would be run, without running them.'
+
+    parser.add_argument('filepaths', nargs='+', metavar='FILE',
+                        help='Path to options or project')
+    parser.add_argument('-o', required=False, metavar='FILE',
+                        help='Path to project with existing simulations')
+
+def _create_worker_command(parser):
+    parser.description = 'Pull and run simulation(s) from a job queue.'
+
+    parser.add_argument('queue', metavar='FILE',
+                        help='Path to job queue database')
+    parser.add_argument('--max-jobs', type=int, default=None,
+                        help='Stop after running this number of simulations')
+    parser.add_argument('--idle-timeout', type=float, default=None, metavar='SECONDS',
+                        help='Stop if no simulation is queued for this duration')
+    parser.add_argument('--lease', type=float, default=60.0, metavar='SECONDS',
+                        help='Duration of the lease of a simulation without heartbeat')
+
 def _create_config_command(parser):
     parser.description = 'Configure pymontecarlo and Monte Carlo programs.'
 
@@ -107,6 +131,12 @@ def _parse_commands(parser, ns):
         _parse_run_command(parser, ns)
         parser.parse_args(['run', '--help'])
 
+    if ns.command == 'plan':
+        _parse_plan_command(parser, ns)
+
+    if ns.command == 'worker':
+        _parse_worker_command(parser, ns)
+
     if ns.command == 'config':
         _parse_config_command(parser, ns)
         parser.parse_args(['config', '--help'])
@@ -114,6 +144,53 @@ def _parse_commands(parser, ns):
 def _parse_run_command(parser, ns):
     pass
 
+def _parse_plan_command(parser, ns):
+    from pymontecarlo.runner.local import LocalSimulationRunner
+    from pymontecarlo.runner.history import RuntimeHistory
+
+    list_options = []
+    for filepath in ns.filepaths:
+        obj = read(filepath)
+        if isinstance(obj, Project):
+            list_options.extend(simulation.options for simulation in obj.simulations)
+        else:
+            list_options.append(obj)
+
+    if ns.o and os.path.exists(ns.o):
+        project = Project.read(ns.o)
+    else:
+        project = Project()
+
+    runner = LocalSimulationRunner(project, history=RuntimeHistory.read())
+    plan = runner.plan(*list_options)
+
+    rows = [['New simulations', plan.new_count],
+            ['Standards', plan.standard_count],
+            ['Already simulated', plan.cached_count],
+            ['Invalid', plan.invalid_count],
+            ['Estimated CPU-hours', '{:.2f}'.format(plan.estimated_cpu_hours)],
+            ['Without estimate', plan.unestimated_count]]
+    message = tabulate.tabulate(rows) + os.linesep
+
+    for _options, exc in plan.invalid:
+        message += str(exc) + os.linesep
+
+    parser.exit(message=message)
+
+def _parse_worker_command(parser, ns):
+    from pymontecarlo.runner.jobqueue import JobQueue, QueueWorker
+
+    queue = JobQueue(ns.queue, lease_duration_s=ns.lease)
+    worker = QueueWorker(queue)
+
+    try:
+        count = worker.run(ns.max_jobs, ns.idle_timeout)
+    except KeyboardInterrupt:
+        worker.stop()
+        parser.exit(message='Worker interrupted' + os.linesep)
+
+    parser.exit(message='{} simulation(s) run'.format(count) + os.linesep)
+
 def _parse_config_command(parser, ns):
     if ns.program:
         settings = pymontecarlo.settings
@@ -77,7 +77,7 @@ class Settings(HDF5ReaderMixin, HDF5WriterMixin):
 
     def reload(self):
         self._available_programs.clear()
-        entrypoint._ENTRYPOINTS.clear()
+        entrypoint.reset()
 
     def get_activated_program(self, identifier):
         """
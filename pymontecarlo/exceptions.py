@@ -42,6 +42,9 @@ class WorkerError(PymontecarloError):
 class WorkerCancelledError(PymontecarloError):
     pass
 
+class WorkerTimeoutError(WorkerError):
+    pass
+
 class ImportError_(AccumulatedError):
     pass
 
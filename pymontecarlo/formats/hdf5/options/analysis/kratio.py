@@ -1,6 +1,10 @@
 """"""
 
 # Standard library modules.
+import os
+import functools
+import logging
+logger = logging.getLogger(__name__)
 
 # Third party modules.
 import numpy as np
@@ -14,10 +18,19 @@ from pymontecarlo.options.analysis.kratio import KRatioAnalysis
 
 # Globals and constants variables.
 
+@functools.lru_cache(maxsize=4)
+def _read_standards_library(filepath, energy_tolerance_eV, mtime):
+    # NOTE: The modification time is part of the key of the cache,
+    # so that a library written again is read again
+    from pymontecarlo.standards import StandardsLibrary
+    return StandardsLibrary.read(filepath, energy_tolerance_eV)
+
 class KRatioAnalysisHDF5Handler(PhotonAnalysisHDF5Handler, MaterialHDF5HandlerMixin):
 
     DATASET_ATOMIC_NUMBER = 'atomic number'
     DATASET_STANDARDS = 'standards'
+    ATTR_STANDARDS_LIBRARY = 'standards library'
+    ATTR_STANDARDS_ENERGY_TOLERANCE = 'standards energy tolerance (eV)'
 
     def _parse_standard_materials(self, group):
         ds_z = group[self.DATASET_ATOMIC_NUMBER]
@@ -25,6 +38,20 @@ class KRatioAnalysisHDF5Handler(PhotonAnalysisHDF5Handler, MaterialHDF5HandlerMi
         return dict((z, self._parse_material_internal(group, ref_material))
                     for z, ref_material in zip(ds_z, ds_standard))
 
+    def _parse_standards_library(self, group):
+        if self.ATTR_STANDARDS_LIBRARY not in group.attrs:
+            return None
+
+        filepath = str(group.attrs[self.ATTR_STANDARDS_LIBRARY])
+        energy_tolerance_eV = float(group.attrs[self.ATTR_STANDARDS_ENERGY_TOLERANCE])
+
+        try:
+            mtime = os.path.getmtime(filepath)
+            return _read_standards_library(filepath, energy_tolerance_eV, mtime)
+        except (OSError, IOError):
+            logger.warning('Standards library not found: {}'.format(filepath))
+            return None
+
     def can_parse(self, group):
         return super().can_parse(group) and \
             self.DATASET_ATOMIC_NUMBER in group and \
@@ -33,7 +60,8 @@ class KRatioAnalysisHDF5Handler(PhotonAnalysisHDF5Handler, MaterialHDF5HandlerMi
     def parse(self, group):
         photon_detector = self._parse_photon_detector(group)
         standard_materials = self._parse_standard_materials(group)
-        return self.CLASS(photon_detector, standard_materials)
+        standards_library = self._parse_standards_library(group)
+        return self.CLASS(photon_detector, standard_materials, standards_library)
 
     def _convert_standard_materials(self, standard_materials, group):
         shape = (len(standard_materials),)
@@ -49,9 +77,24 @@ class KRatioAnalysisHDF5Handler(PhotonAnalysisHDF5Handler, MaterialHDF5HandlerMi
             ds_z[i] = z
             ds_standard[i] = group_material.ref
 
+    def _convert_standards_library(self, standards_library, group):
+        if standards_library is None:
+            return
+
+        if standards_library.filepath is None:
+            logger.warning('Standards library is not saved, since it was '
+                           'not read from or written to a file')
+            return
+
+        group.attrs[self.ATTR_STANDARDS_LIBRARY] = \
+            os.path.abspath(standards_library.filepath)
+        group.attrs[self.ATTR_STANDARDS_ENERGY_TOLERANCE] = \
+            standards_library.energy_tolerance_eV
+
     def convert(self, analysis, group):
         super().convert(analysis, group)
         self._convert_standard_materials(analysis.standard_materials, group)
+        self._convert_standards_library(analysis.standards_library, group)
 
     @property
     def CLASS(self):
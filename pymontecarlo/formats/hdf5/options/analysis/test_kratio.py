@@ -4,6 +4,7 @@
 # Standard library modules.
 import unittest
 import logging
+import os
 
 # Third party modules.
 
@@ -12,6 +13,9 @@ from pymontecarlo.testcase import TestCase
 from pymontecarlo.formats.hdf5.options.analysis.kratio import KRatioAnalysisHDF5Handler
 from pymontecarlo.options.analysis.kratio import KRatioAnalysis
 from pymontecarlo.options.material import Material
+from pymontecarlo.results.photonintensity import EmittedPhotonIntensityResultBuilder
+from pymontecarlo.simulation import Simulation
+from pymontecarlo.standards import StandardsLibrary
 
 # Globals and constants variables.
 
@@ -34,6 +38,50 @@ class TestKRatioAnalysisHDF5Handler(TestCase):
         analysis2 = self.convert_parse_hdf5handler(handler, analysis)
         self.assertEqual(analysis2, analysis)
 
+    def _create_standards_library(self, detector):
+        program = self.create_basic_options().program
+        list_options = StandardsLibrary.create_list_options(
+            program, [29], [10e3, 20e3], [detector])
+
+        simulations = []
+        for options in list_options:
+            builder = EmittedPhotonIntensityResultBuilder(options.analyses[0])
+            builder.add_intensity((29, 'Ka'), options.beam.energy_eV / 10.0, 1.0)
+            simulations.append(Simulation(options, [builder.build()]))
+
+        return StandardsLibrary(simulations, energy_tolerance_eV=5e3)
+
+    def testconvert_parse_standards_library(self):
+        handler = KRatioAnalysisHDF5Handler()
+        detector = self.create_basic_photondetector()
+
+        library = self._create_standards_library(detector)
+        filepath = os.path.join(self.create_temp_dir(), 'standards.h5')
+        library.write(filepath)
+
+        analysis = KRatioAnalysis(detector, standards_library=library)
+        analysis2 = self.convert_parse_hdf5handler(handler, analysis)
+        self.assertEqual(analysis2, analysis)
+
+        library2 = analysis2.standards_library
+        self.assertIsNotNone(library2)
+        self.assertEqual(len(library), len(library2))
+        self.assertAlmostEqual(5e3, library2.energy_tolerance_eV, 4)
+
+        # Missing library
+        os.remove(filepath)
+        analysis2 = self.convert_parse_hdf5handler(handler, analysis)
+        self.assertIsNone(analysis2.standards_library)
+
+    def testconvert_parse_standards_library_not_saved(self):
+        handler = KRatioAnalysisHDF5Handler()
+        detector = self.create_basic_photondetector()
+
+        library = self._create_standards_library(detector)
+        analysis = KRatioAnalysis(detector, standards_library=library)
+        analysis2 = self.convert_parse_hdf5handler(handler, analysis)
+        self.assertIsNone(analysis2.standards_library)
+
 #        import h5py
 #        with h5py.File('/tmp/analysis.h5', 'w') as f:
 #            handler.convert(analysis, f)
@@ -5,8 +5,6 @@
 # Third party modules.
 import numpy as np
 
-import matplotlib.colors
-
 # Local modules.
 from pymontecarlo.formats.hdf5.base import HDF5Handler
 from pymontecarlo.options.material import Material, VACUUM
@@ -90,6 +88,8 @@ class MaterialHDF5Handler(HDF5Handler):
         group.attrs[self.ATTR_DENSITY] = material.density_kg_per_m3
 
     def _convert_color(self, material, group):
+        import matplotlib.colors # Deferred, slow to import
+
         rgba = matplotlib.colors.to_rgba(material.color)
         group.attrs[self.ATTR_COLOR] = rgba
 
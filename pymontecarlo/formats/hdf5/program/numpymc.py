@@ -0,0 +1,37 @@
+""""""
+
+# Standard library modules.
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.formats.hdf5.program.base import ProgramHDF5Handler
+from pymontecarlo.program.numpymc.program import NumpyMonteCarloProgram
+
+# Globals and constants variables.
+
+class NumpyMonteCarloProgramHDF5Handler(ProgramHDF5Handler):
+
+    ATTR_BATCH_SIZE = 'batch size'
+
+    def _parse_batch_size(self, group):
+        return int(group.attrs[self.ATTR_BATCH_SIZE])
+
+    def can_parse(self, group):
+        return super().can_parse(group) and \
+            self.ATTR_BATCH_SIZE in group.attrs
+
+    def parse(self, group):
+        batch_size = self._parse_batch_size(group)
+        return self.CLASS(batch_size)
+
+    def _convert_batch_size(self, batch_size, group):
+        group.attrs[self.ATTR_BATCH_SIZE] = batch_size
+
+    def convert(self, program, group):
+        super().convert(program, group)
+        self._convert_batch_size(program.batch_size, group)
+
+    @property
+    def CLASS(self):
+        return NumpyMonteCarloProgram
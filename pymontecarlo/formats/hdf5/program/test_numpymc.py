@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+from pymontecarlo.formats.hdf5.program.numpymc import NumpyMonteCarloProgramHDF5Handler
+from pymontecarlo.program.numpymc.program import NumpyMonteCarloProgram
+
+# Globals and constants variables.
+
+class TestNumpyMonteCarloProgramHDF5Handler(TestCase):
+
+    def testconvert_parse(self):
+        handler = NumpyMonteCarloProgramHDF5Handler()
+        program = NumpyMonteCarloProgram(123)
+        program2 = self.convert_parse_hdf5handler(handler, program)
+        self.assertEqual(123, program2.batch_size)
+        self.assertEqual(program.getidentifier(), program2.getidentifier())
+
+if __name__ == '__main__': #pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,27 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+from pymontecarlo.formats.hdf5.program.xpp import XppProgramHDF5Handler
+from pymontecarlo.program.xpp.program import XppProgram
+
+# Globals and constants variables.
+
+class TestXppProgramHDF5Handler(TestCase):
+
+    def testconvert_parse(self):
+        handler = XppProgramHDF5Handler()
+        program = XppProgram()
+        program2 = self.convert_parse_hdf5handler(handler, program)
+        self.assertEqual(program.getidentifier(), program2.getidentifier())
+
+if __name__ == '__main__': #pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
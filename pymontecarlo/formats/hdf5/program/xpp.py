@@ -0,0 +1,23 @@
+""""""
+
+# Standard library modules.
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.formats.hdf5.program.base import ProgramHDF5Handler
+from pymontecarlo.program.xpp.program import XppProgram
+
+# Globals and constants variables.
+
+class XppProgramHDF5Handler(ProgramHDF5Handler):
+
+    def parse(self, group):
+        return super().parse(group)
+
+    def convert(self, program, group):
+        super().convert(program, group)
+
+    @property
+    def CLASS(self):
+        return XppProgram
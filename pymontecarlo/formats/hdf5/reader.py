@@ -3,7 +3,6 @@
 # Standard library modules.
 
 # Third party modules.
-import h5py
 
 # Local modules.
 from pymontecarlo.util.future import FutureExecutor
@@ -12,6 +11,8 @@ from pymontecarlo.formats.hdf5.base import find_parse_hdf5handler
 # Globals and constants variables.
 
 def read(filepath):
+    import h5py # Deferred, slow to import
+
     with h5py.File(filepath, 'r') as f:
         return find_parse_hdf5handler(f).parse(f)
 
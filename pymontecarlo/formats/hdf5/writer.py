@@ -3,7 +3,6 @@
 # Standard library modules.
 
 # Third party modules.
-import h5py
 
 # Local modules.
 from pymontecarlo.util.future import FutureExecutor
@@ -12,6 +11,8 @@ from pymontecarlo.formats.hdf5.base import find_convert_hdf5handler
 # Globals and constants variables.
 
 def write(obj, filepath):
+    import h5py # Deferred, slow to import
+
     with h5py.File(filepath, 'w') as f:
         return find_convert_hdf5handler(obj, f).convert(obj, f)
 
@@ -10,14 +10,14 @@ from dominate.util import raw
 # Local modules.
 import pymontecarlo
 from pymontecarlo.exceptions import ConvertError
-from pymontecarlo.util.entrypoint import resolve_entrypoints
+from pymontecarlo.util.entrypoint import iter_entrypoints
 from pymontecarlo.util.tolerance import tolerance_to_decimals
 
 # Globals and constants variables.
 ENTRYPOINT_HTMLHANDLER = 'pymontecarlo.formats.html'
 
 def find_convert_htmlhandler(obj):
-    for clasz in resolve_entrypoints(ENTRYPOINT_HTMLHANDLER):
+    for clasz in iter_entrypoints(ENTRYPOINT_HTMLHANDLER):
         handler = clasz()
         if handler.can_convert(obj):
             return handler
@@ -10,7 +10,7 @@ import pandas as pd
 # Local modules.
 import pymontecarlo
 from pymontecarlo.exceptions import ConvertError
-from pymontecarlo.util.entrypoint import resolve_entrypoints
+from pymontecarlo.util.entrypoint import iter_entrypoints
 from pymontecarlo.util.tolerance import tolerance_to_decimals
 from pymontecarlo.util.cbook import get_valid_filename
 
@@ -18,7 +18,7 @@ from pymontecarlo.util.cbook import get_valid_filename
 ENTRYPOINT_SERIESHANDLER = 'pymontecarlo.formats.series'
 
 def find_convert_serieshandler(obj):
-    for clasz in resolve_entrypoints(ENTRYPOINT_SERIESHANDLER):
+    for clasz in iter_entrypoints(ENTRYPOINT_SERIESHANDLER):
         handler = clasz()
         if handler.can_convert(obj):
             return handler
@@ -13,14 +13,15 @@ from pymontecarlo.program.configurator import Configurator
 from pymontecarlo.program.expander import Expander, expand_to_single, expand_analyses_to_single_detector
 from pymontecarlo.program.validator import Validator
 from pymontecarlo.program.exporter import Exporter
-from pymontecarlo.program.worker import Worker
+from pymontecarlo.program.worker import StagedWorker
 from pymontecarlo.program.importer import Importer
 from pymontecarlo.options.beam import GaussianBeam
 from pymontecarlo.options.sample.base import Sample
-from pymontecarlo.options.sample import SubstrateSample
+from pymontecarlo.options.sample import \
+    SubstrateSample, HorizontalLayerSample, InclusionSample, SphereSample
 from pymontecarlo.options.limit import ShowersLimit
 from pymontecarlo.options.model import ElasticCrossSectionModel
-from pymontecarlo.options.analysis import PhotonIntensityAnalysis
+from pymontecarlo.options.analysis import PhotonIntensityAnalysis, KRatioAnalysis
 from pymontecarlo.formats.hdf5.base import HDF5Handler
 
 # Globals and constants variables.
@@ -70,8 +71,12 @@ class ValidatorMock(Validator):
         self.beam_validate_methods[GaussianBeam] = self._validate_beam_gaussian
 
         self.sample_validate_methods[SubstrateSample] = self._validate_sample_substrate
+        self.sample_validate_methods[HorizontalLayerSample] = self._validate_sample_horizontallayers
+        self.sample_validate_methods[InclusionSample] = self._validate_sample_inclusion
+        self.sample_validate_methods[SphereSample] = self._validate_sample_sphere
 
         self.analysis_validate_methods[PhotonIntensityAnalysis] = self._validate_analysis_photonintensity
+        self.analysis_validate_methods[KRatioAnalysis] = self._validate_analysis_kratio
 
         self.limit_validate_methods[ShowersLimit] = self._validate_limit_showers
 
@@ -88,8 +93,12 @@ class ExporterMock(Exporter):
         self.beam_export_methods[GaussianBeam] = self._export_beam_gaussian
 
         self.sample_export_methods[SubstrateSample] = self._export_sample_substrate
+        self.sample_export_methods[HorizontalLayerSample] = self._export_sample_horizontallayers
+        self.sample_export_methods[InclusionSample] = self._export_sample_inclusion
+        self.sample_export_methods[SphereSample] = self._export_sample_sphere
 
         self.analysis_export_methods[PhotonIntensityAnalysis] = self._export_analysis_photonintensity
+        self.analysis_export_methods[KRatioAnalysis] = self._export_analysis_kratio
 
         self.limit_export_methods[ShowersLimit] = self._export_limit_showers
 
@@ -109,24 +118,30 @@ class ExporterMock(Exporter):
     def _export_sample_substrate(self, sample, errors, outdict):
         outdict['sample'] = 'substrate'
 
+    def _export_sample_horizontallayers(self, sample, errors, outdict):
+        outdict['sample'] = 'horizontal layers'
+
+    def _export_sample_inclusion(self, sample, errors, outdict):
+        outdict['sample'] = 'inclusion'
+
+    def _export_sample_sphere(self, sample, errors, outdict):
+        outdict['sample'] = 'sphere'
+
     def _export_analysis_photonintensity(self, analysis, errors, outdict):
         outdict.setdefault('analyses', []).append('photon intensity')
 
+    def _export_analysis_kratio(self, analysis, errors, outdict):
+        outdict.setdefault('analyses', []).append('kratio')
+
     def _export_limit_showers(self, limit, errors, outdict):
         outdict.setdefault('limits', []).append('showers')
 
     def _export_model_generic(self, model, errors, outdict):
         outdict.setdefault('models', []).append(model.name)
 
-class WorkerMock(Worker):
-
-    def run(self, token, simulation, outputdir):
-        options = simulation.options
-        program = options.program
-        exporter = program.create_exporter()
-
-        exporter.export(options, outputdir)
+class WorkerMock(StagedWorker):
 
+    def execute(self, token, simulation, outputdir):
         token.update(0.0, 'Started')
         for _ in range(10):
             if token.cancelled():
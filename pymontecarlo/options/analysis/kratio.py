@@ -15,31 +15,52 @@ from pymontecarlo.options.analysis.photon import PhotonAnalysis, PhotonAnalysisB
 from pymontecarlo.options.analysis.photonintensity import PhotonIntensityAnalysis
 from pymontecarlo.results.photonintensity import EmittedPhotonIntensityResult
 from pymontecarlo.results.kratio import KRatioResult, KRatioResultBuilder
-from pymontecarlo.util.cbook import are_mapping_equal
+from pymontecarlo.util.cbook import are_mapping_equal, LazyClassAttribute
 
 # Globals and constants variables.
 
 class KRatioAnalysis(PhotonAnalysis):
 
-    DEFAULT_NONPURE_STANDARD_MATERIALS = \
-        {7: Material.from_formula('BN', 2.1e3),
-         8: Material.from_formula('Al2O3', 3.95e3),
-         9: Material.from_formula('BaF2', 4.89e3),
-         17: Material.from_formula('KCl', 1.98e3),
-         36: Material.from_formula('KBr', 2.75e3),
-         80: Material.from_formula('HgTe', 8.1e3)}
-
-    def __init__(self, photon_detector, standard_materials=None):
+    @LazyClassAttribute
+    def DEFAULT_NONPURE_STANDARD_MATERIALS():
+        return {7: Material.from_formula('BN', 2.1e3),
+                8: Material.from_formula('Al2O3', 3.95e3),
+                9: Material.from_formula('BaF2', 4.89e3),
+                17: Material.from_formula('KCl', 1.98e3),
+                36: Material.from_formula('KBr', 2.75e3),
+                80: Material.from_formula('HgTe', 8.1e3)}
+
+    def __init__(self, photon_detector, standard_materials=None,
+                 standards_library=None):
+        """
+        :arg photon_detector: photon detector
+        :arg standard_materials: :class:`dict` where the keys are atomic 
+            numbers and the values, the material of their standard.
+            By default, pure elements or 
+            :attr:`DEFAULT_NONPURE_STANDARD_MATERIALS` are used.
+        :arg standards_library: :class:`StandardsLibrary` where the 
+            intensities of the standards are taken from, instead of being
+            simulated. The library is not part of the options (it is not
+            compared), but the path of a library read from or written to
+            a file is saved with the analysis.
+        """
         super().__init__(photon_detector)
 
         if standard_materials is None:
             standard_materials = {}
         self.standard_materials = standard_materials
 
+        self.standards_library = standards_library
+
     def __eq__(self, other):
         return super().__eq__(other) and \
             are_mapping_equal(self.standard_materials, other.standard_materials)
 
+    def fingerprint(self):
+        standard_materials = tuple((z, material.fingerprint())
+                                   for z, material in sorted(self.standard_materials.items()))
+        return super().fingerprint() + (standard_materials,)
+
     def add_standard_material(self, z, material):
         self.standard_materials[z] = material
 
@@ -88,8 +109,35 @@ class KRatioAnalysis(PhotonAnalysis):
         # Construct standard options
         standard_options = self._create_standard_options(options)
 
+        # Exclude standards found in library
+        if self.standards_library is not None:
+            standard_options = \
+                [stdoptions for stdoptions in standard_options
+                 if self.standards_library.find_result(stdoptions, self.photon_detector) is None]
+
         return super().apply(options) + standard_options
 
+    def _find_standard_result(self, stdmaterial, stdoptions, stdsimulations):
+        stdsimulation = \
+            next((s for s in stdsimulations
+                  if s.options.sample.material == stdmaterial), None)
+        if stdsimulation is not None:
+            stdresult = \
+                next((r for r in stdsimulation.find_result(EmittedPhotonIntensityResult)
+                     if r.analysis.photon_detector == self.photon_detector), None)
+            if stdresult is not None:
+                return stdresult
+
+        if self.standards_library is None:
+            return None
+
+        stdoptions = next((o for o in stdoptions
+                           if o.sample.material == stdmaterial), None)
+        if stdoptions is None:
+            return None
+
+        return self.standards_library.find_result(stdoptions, self.photon_detector)
+
     def calculate(self, simulation, simulations):
         stdoptions = self._create_standard_options(simulation.options)
         stdsimulations = [s for s in simulations if s.options in stdoptions]
@@ -119,21 +167,10 @@ class KRatioAnalysis(PhotonAnalysis):
                     continue
 
                 stdmaterial = self.get_standard_material(z)
-                stdsimulation = \
-                    next((s for s in stdsimulations
-                          if s.options.sample.material == stdmaterial), None)
-                if stdsimulation is None:
-                    logger.debug('No standard simulation found for Z={}'.format(z))
-                    stdresult_cache[z] = None
-                    continue
-
-                stdresult = \
-                    next((r for r in stdsimulation.find_result(EmittedPhotonIntensityResult)
-                         if r.analysis.photon_detector == self.photon_detector), None)
+                stdresult = self._find_standard_result(stdmaterial, stdoptions,
+                                                       stdsimulations)
                 if stdresult is None:
                     logger.debug('No standard result found for Z={}'.format(z))
-                    stdresult_cache[z] = None
-                    continue
 
                 stdresult_cache[z] = stdresult
 
@@ -29,6 +29,9 @@ class PhotonAnalysis(Analysis):
         return super().__eq__(other) and \
             self.photon_detector == other.photon_detector
 
+    def fingerprint(self):
+        return super().fingerprint() + (self.photon_detector.fingerprint(),)
+
     def __repr__(self):
         return '<{classname}(detector={photon_detector})>' \
             .format(classname=self.__class__.__name__, **self.__dict__)
@@ -20,6 +20,7 @@ from pymontecarlo.options.limit import ShowersLimit
 from pymontecarlo.simulation import Simulation
 from pymontecarlo.results.photonintensity import EmittedPhotonIntensityResultBuilder
 from pymontecarlo.results.kratio import KRatioResult
+from pymontecarlo.standards import StandardsLibrary
 
 # Globals and constants variables.
 
@@ -107,6 +108,44 @@ class TestKRatioAnalysis(TestCase):
         self.assertAlmostEqual(0.484232 / 0.470749, q.n, 4)
         self.assertAlmostEqual(0.066579, q.s, 4)
 
+    def testcalculate_standards_library(self):
+        beam = GaussianBeam(15e3, 10.e-9)
+        sample = SubstrateSample(Material.from_formula('CuZn'))
+        limit = ShowersLimit(100)
+        unkoptions = Options(self.program, beam, sample, [self.a], [limit])
+
+        # Library of Cu standard at 10 and 20 keV
+        list_options = StandardsLibrary.create_list_options(
+            self.program, [29], [10e3, 20e3], [self.a.photon_detector], [limit])
+
+        stdsims = []
+        for options in list_options:
+            builder = EmittedPhotonIntensityResultBuilder(options.analyses[0])
+            builder.add_intensity((29, 'Ka'), options.beam.energy_eV / 10.0, 1.0)
+            stdsims.append(Simulation(options, [builder.build()]))
+
+        self.a.standards_library = StandardsLibrary(stdsims, energy_tolerance_eV=5e3)
+
+        # Only Zn standard is simulated
+        list_standard_options = self.a.apply(unkoptions)
+        self.assertEqual(1, len(list_standard_options))
+        self.assertEqual(Material.pure(30), list_standard_options[0].sample.material)
+
+        builder = EmittedPhotonIntensityResultBuilder(self.a)
+        builder.add_intensity((29, 'Ka'), 750.0, 1.0)
+        builder.add_intensity((30, 'Ka'), 500.0, 1.0)
+        unksim = Simulation(unkoptions, [builder.build()])
+
+        builder = EmittedPhotonIntensityResultBuilder(self.a)
+        builder.add_intensity((30, 'Ka'), 1000.0, 1.0)
+        znsim = Simulation(list_standard_options[0], [builder.build()])
+
+        self.assertTrue(self.a.calculate(unksim, [unksim, znsim]))
+
+        result = unksim.find_result(KRatioResult)[0]
+        self.assertAlmostEqual(0.5, result[('Cu', 'Ka')].n, 4)
+        self.assertAlmostEqual(0.5, result[('Zn', 'Ka')].n, 4)
+
 if __name__ == '__main__': #pragma: no cover
     logging.basicConfig()
     logging.getLogger().setLevel(logging.DEBUG)
@@ -4,6 +4,7 @@ Base option class
 
 # Standard library modules.
 import abc
+import hashlib
 
 # Third party modules.
 
@@ -28,6 +29,24 @@ class Option(metaclass=abc.ABCMeta):
         """
         return type(other) == type(self)
 
+    def fingerprint(self):
+        """
+        Returns a hashable :class:`tuple` identifying this option.
+        Float values are rounded to the tolerance used in :meth:`__eq__`.
+        Options with the same fingerprint are therefore equal, while equal
+        options may, very rarely, differ by one rounding step.
+        Derived classes should append their attributes to the fingerprint
+        of their parent class.
+        """
+        return (self.__class__.__name__,)
+
+def calculate_digest(option):
+    """
+    Returns a hexadecimal digest of the fingerprint of an option,
+    stable between sessions.
+    """
+    return hashlib.sha1(repr(option.fingerprint()).encode('utf8')).hexdigest()
+
 class OptionBuilder(metaclass=abc.ABCMeta):
     """
     Base class of all option builders.
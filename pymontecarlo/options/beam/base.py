@@ -13,6 +13,7 @@ import math
 from pymontecarlo.util.cbook import MultiplierAttribute
 from pymontecarlo.options.particle import Particle
 from pymontecarlo.options.base import Option, OptionBuilder
+from pymontecarlo.util.tolerance import round_to_tolerance
 
 # Globals and constants variables.
 
@@ -41,6 +42,11 @@ class Beam(Option):
             math.isclose(self.energy_eV, other.energy_eV, abs_tol=self.ENERGY_TOLERANCE_eV) and \
             self.particle == other.particle
 
+    def fingerprint(self):
+        return super().fingerprint() + \
+            (round_to_tolerance(self.energy_eV, self.ENERGY_TOLERANCE_eV),
+             self.particle.name)
+
     energy_keV = MultiplierAttribute('energy_eV', 1e-3)
 
 class BeamBuilder(OptionBuilder):
@@ -12,6 +12,7 @@ import numpy as np
 # Local modules.
 from pymontecarlo.options.beam.base import Beam, BeamBuilder
 from pymontecarlo.options.particle import Particle
+from pymontecarlo.util.tolerance import round_to_tolerance
 
 # Globals and constants variables.
 
@@ -60,6 +61,12 @@ class CylindricalBeam(Beam):
             math.isclose(self.x0_m, other.x0_m, abs_tol=self.POSITION_TOLERANCE_m) and \
             math.isclose(self.y0_m, other.y0_m, abs_tol=self.POSITION_TOLERANCE_m)
 
+    def fingerprint(self):
+        return super().fingerprint() + \
+            (round_to_tolerance(self.diameter_m, self.DIAMETER_TOLERANCE_m),
+             round_to_tolerance(self.x0_m, self.POSITION_TOLERANCE_m),
+             round_to_tolerance(self.y0_m, self.POSITION_TOLERANCE_m))
+
 class CylindricalBeamBuilder(BeamBuilder):
 
     def __init__(self):
@@ -1,49 +1,150 @@
 """"""
 
 # Standard library modules.
-import string
+import re
+import functools
 from collections import defaultdict
-import itertools
-import math
 
 # Third party modules.
-from pyparsing import Word, Group, Optional, OneOrMore
+import numpy as np
 
 # Local modules.
-import pyxray
+from pymontecarlo.util.element_data import \
+    atomic_number, atomic_weight, mass_density_kg_per_m3, symbols, \
+    to_weight_fraction_matrix
 
 # Globals and constants variables.
 
-_symbol = Word(string.ascii_uppercase, string.ascii_lowercase)
-_digit = Word(string.digits + ".")
-_elementRef = Group(_symbol + Optional(_digit, default="1"))
-CHEMICAL_FORMULA_PARSER = OneOrMore(_elementRef)
+FORMULA_CACHE_SIZE = 8192
+
+_TOKEN_PATTERN = re.compile(r'\s*(?:(?P<symbol>[A-Z][a-z]*)|(?P<number>[0-9.]+)|'
+                            r'(?P<open>[(\[])|(?P<close>[)\]])|(?P<hydrate>[*\u00b7\u2022]))')
+
+def _tokenize(formula):
+    tokens = []
+    position = 0
+    length = len(formula.rstrip())
+
+    while position < length:
+        match = _TOKEN_PATTERN.match(formula, position)
+        if match is None:
+            raise ValueError('Invalid character in formula {!r} at position {}'
+                             .format(formula, position))
+
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'number':
+            value = float(value)
+
+        tokens.append((kind, value))
+        position = match.end()
+
+    return tokens
+
+@functools.lru_cache(maxsize=FORMULA_CACHE_SIZE)
+def _parse_formula(formula):
+    """
+    Returns the number of atoms of each element in a formula, as a
+    :class:`tuple` of atomic number and number of atoms, in order of
+    appearance.
+    """
+    tokens = _tokenize(formula)
+    tokens.append(('end', None))
+
+    def read_count(index):
+        kind, value = tokens[index]
+        if kind == 'number':
+            return value, index + 1
+        return 1.0, index
+
+    total = defaultdict(float)
+    stack = [defaultdict(float)] # One entry per parenthesis level
+    multiplier, index = read_count(0) # Leading coefficient (e.g. 5H2O)
+
+    while True:
+        kind, value = tokens[index]
+        index += 1
+
+        if kind == 'symbol':
+            count, index = read_count(index)
+            stack[-1][atomic_number(value)] += count
+
+        elif kind == 'open':
+            stack.append(defaultdict(float))
+
+        elif kind == 'close':
+            if len(stack) < 2:
+                raise ValueError('Unbalanced parenthesis in formula {!r}'.format(formula))
+            count, index = read_count(index)
+            for z, atoms in stack.pop().items():
+                stack[-1][z] += atoms * count
+
+        elif kind in ('hydrate', 'end'):
+            if len(stack) > 1:
+                raise ValueError('Unbalanced parenthesis in formula {!r}'.format(formula))
+            if not stack[0]:
+                raise ValueError('Empty part in formula {!r}'.format(formula))
+            for z, atoms in stack[0].items():
+                total[z] += atoms * multiplier
+
+            if kind == 'end':
+                break
+
+            stack = [defaultdict(float)]
+            multiplier, index = read_count(index)
+
+        else:
+            raise ValueError('Unexpected number in formula {!r}'.format(formula))
+
+    return tuple(total.items())
+
+@functools.lru_cache(maxsize=FORMULA_CACHE_SIZE)
+def _calculate_formula_composition(formula):
+    atoms = _parse_formula(formula)
+
+    atomicmasses = [(z, count * atomic_weight(z)) for z, count in atoms]
+    totalatomicmass = sum(atomicmass for _z, atomicmass in atomicmasses)
+
+    return tuple((z, atomicmass / totalatomicmass) for z, atomicmass in atomicmasses)
 
 def from_formula(formula):
-    # Parse chemical formula
-    formulaData = CHEMICAL_FORMULA_PARSER.parseString(formula)
+    """
+    Returns the composition (in weight fraction) of a chemical formula.
+    Besides elements and their number of atoms (e.g. ``Al2O3``,
+    ``Fe0.5Ni0.5``), the formula may contain groups between parentheses
+    or brackets (e.g. ``Ca(OH)2``) and hydrates separated by ``*`` or ``·``
+    (e.g. ``CuSO4*5H2O``).
+    The compositions of the last parsed formulas are cached.
+
+    :arg formula: chemical formula
+    :type formula: :class:`str`
+    """
+    return defaultdict(float, _calculate_formula_composition(formula))
 
-    zs = []
-    atomicfractions = []
-    for symbol, atomicfraction in formulaData:
-        zs.append(pyxray.element_atomic_number(symbol))
-        atomicfractions.append(float(atomicfraction))
+def from_formulas(formulas):
+    """
+    Returns the compositions (in weight fraction) of many chemical formulas,
+    as a :class:`list` of :class:`dict`.
+    The weight fractions of all formulas are calculated at once.
+    See :func:`from_formula` for the syntax.
 
-    # Calculate total atomic mass
-    totalatomicmass = 0.0
-    for z, atomicfraction in zip(zs, atomicfractions):
-        atomicmass = pyxray.element_atomic_weight(z)
-        totalatomicmass += atomicfraction * atomicmass
+    :arg formulas: iterable of chemical formulas
+    """
+    formulas = list(formulas)
+    unique_formulas = list(dict.fromkeys(formulas))
+    list_atoms = [dict(_parse_formula(formula)) for formula in unique_formulas]
 
-    # Create composition
-    composition = defaultdict(float)
+    # Matrix of the number of atoms of each element in each formula
+    zs, counts = to_weight_fraction_matrix(list_atoms)
+    atomicmasses = counts * atomic_weight(zs)
+    weightfractions = atomicmasses / atomicmasses.sum(axis=1, keepdims=True)
 
-    for z, atomicfraction in zip(zs, atomicfractions):
-        atomicmass = pyxray.element_atomic_weight(z)
-        weightfraction = atomicfraction * atomicmass / totalatomicmass
-        composition[z] += weightfraction
+    indexes = dict((z, i) for i, z in enumerate(zs.tolist()))
+    compositions = {}
+    for formula, atoms, row in zip(unique_formulas, list_atoms, weightfractions.tolist()):
+        compositions[formula] = [(z, row[indexes[z]]) for z in atoms]
 
-    return composition
+    return [defaultdict(float, compositions[formula]) for formula in formulas]
 
 def to_atomic(composition):
     """
@@ -55,20 +156,19 @@ def to_atomic(composition):
         No wildcard are accepted.
     :type composition: :class:`dict`
     """
-    composition2 = {}
-
-    for z, weightfraction in composition.items():
-        composition2[z] = weightfraction / pyxray.element_atomic_weight(z)
+    if not composition:
+        return defaultdict(float)
 
-    totalfraction = sum(composition2.values())
+    zs = np.array(list(composition.keys()))
+    fractions = np.array(list(composition.values()), dtype=float) / atomic_weight(zs)
 
-    for z, fraction in composition2.items():
-        try:
-            composition2[z] = fraction / totalfraction
-        except ZeroDivisionError:
-            composition2[z] = 0.0
+    totalfraction = fractions.sum()
+    if totalfraction == 0.0:
+        fractions[:] = 0.0
+    else:
+        fractions /= totalfraction
 
-    return defaultdict(float, composition2)
+    return defaultdict(float, zip(zs.tolist(), fractions.tolist()))
 
 def process_wildcard(composition):
     """
@@ -109,15 +209,13 @@ def calculate_density_kg_per_m3(composition):
         No wildcard are accepted.
     :type composition: :class:`dict`
     """
-    density = 0.0
-
     if not composition:
-        return density
+        return 0.0
 
-    for z, fraction in composition.items():
-        density += fraction / pyxray.element_mass_density_kg_per_m3(z)
+    zs = np.array(list(composition.keys()))
+    fractions = np.array(list(composition.values()), dtype=float)
 
-    return 1.0 / density
+    return float(1.0 / (fractions / mass_density_kg_per_m3(zs)).sum())
 
 def generate_name(composition):
     """
@@ -132,26 +230,22 @@ def generate_name(composition):
     """
     composition_atomic = to_atomic(composition)
 
-    symbols = []
-    fractions = []
-    for z in sorted(composition_atomic.keys(), reverse=True):
-        symbols.append(pyxray.element_symbol(z))
-        fractions.append(int(composition_atomic[z] * 100.0))
+    zs = sorted(composition_atomic.keys(), reverse=True)
+    fractions = np.array([composition_atomic[z] for z in zs]) * 100.0
+    fractions = fractions.astype(int)
 
     # Find gcd of the fractions
     smallest_gcd = 100
     if len(fractions) >= 2:
-        gcds = []
-        for a, b in itertools.combinations(fractions, 2):
-            gcds.append(math.gcd(a, b))
-        smallest_gcd = min(gcds)
+        gcds = np.gcd.outer(fractions, fractions)
+        smallest_gcd = gcds[np.triu_indices(len(fractions), 1)].min()
 
     if smallest_gcd == 0.0:
         smallest_gcd = 100.0
 
     # Write formula
     name = ''
-    for symbol, fraction in zip(symbols, fractions):
+    for symbol, fraction in zip([symbols()[z] for z in zs], fractions.tolist()):
         fraction /= smallest_gcd
         if fraction == 0:
             continue
@@ -169,5 +263,5 @@ def to_repr(composition):
     """
     Returns a repr string from a composition :class:`dict`.
     """
-    return ' '.join('{1:g}%{0}'.format(pyxray.element_symbol(z), wf * 100.0)
+    return ' '.join('{1:g}%{0}'.format(symbols()[z], wf * 100.0)
                     for z, wf in composition.items())
\ No newline at end of file
@@ -20,5 +20,8 @@ class Detector(Option):
     def __eq__(self, other):
         return super().__eq__(other) and self.name == other.name
 
+    def fingerprint(self):
+        return super().fingerprint() + (self.name,)
+
 class DetectorBuilder(OptionBuilder):
     pass
@@ -11,6 +11,7 @@ import itertools
 # Local modules.
 from pymontecarlo.options.detector.base import Detector, DetectorBuilder
 from pymontecarlo.util.cbook import DegreesAttribute
+from pymontecarlo.util.tolerance import round_to_tolerance
 
 # Globals and constants variables.
 
@@ -37,6 +38,11 @@ class PhotonDetector(Detector):
             math.isclose(self.elevation_rad, other.elevation_rad, abs_tol=self.ELEVATION_TOLERANCE_rad) and \
             math.isclose(self.azimuth_rad, other.azimuth_rad, abs_tol=self.AZIMUTH_TOLERANCE_rad)
 
+    def fingerprint(self):
+        return super().fingerprint() + \
+            (round_to_tolerance(self.elevation_rad, self.ELEVATION_TOLERANCE_rad),
+             round_to_tolerance(self.azimuth_rad, self.AZIMUTH_TOLERANCE_rad))
+
     elevation_deg = DegreesAttribute('elevation_rad')
     azimuth_deg = DegreesAttribute('azimuth_rad')
 
@@ -0,0 +1,95 @@
+"""
+Index of options based on their fingerprint.
+"""
+
+# Standard library modules.
+
+# Third party modules.
+
+# Local modules.
+
+# Globals and constants variables.
+
+class OptionIndex:
+    """
+    Mapping of options to values, where options are looked up by 
+    fingerprint (see :meth:`Option.fingerprint`) instead of comparing them
+    one by one.
+    Options with the same fingerprint are compared with :meth:`Option.__eq__`,
+    so that the index never returns a value for different options.
+    Equal options whose float values fall on either side of a rounding step
+    are, very rarely, considered different.
+    """
+
+    def __init__(self):
+        self._buckets = {} # key: fingerprint, value: list of (option, value)
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, option):
+        return self._find_item(option) is not None
+
+    def _find_item(self, option, fingerprint=None):
+        if fingerprint is None:
+            fingerprint = option.fingerprint()
+
+        for item in self._buckets.get(fingerprint, ()):
+            if item[0] == option:
+                return item
+
+        return None
+
+    def add(self, option, value=None):
+        """
+        Adds an option, unless an equal option is already in the index.
+        Returns ``True`` if the option was added.
+        """
+        fingerprint = option.fingerprint()
+        if self._find_item(option, fingerprint) is not None:
+            return False
+
+        self._buckets.setdefault(fingerprint, []).append((option, value))
+        self._count += 1
+        return True
+
+    def remove(self, option):
+        """
+        Removes an option equal to *option*.
+        Raises :exc:`KeyError` if no option is found.
+        """
+        fingerprint = option.fingerprint()
+        item = self._find_item(option, fingerprint)
+        if item is None:
+            raise KeyError(option)
+
+        bucket = self._buckets[fingerprint]
+        bucket.remove(item)
+        if not bucket:
+            del self._buckets[fingerprint]
+        self._count -= 1
+
+    def discard(self, option):
+        """
+        Removes an option equal to *option*, if present.
+        """
+        try:
+            self.remove(option)
+        except KeyError:
+            pass
+
+    def find(self, option, default=None, fingerprint=None):
+        """
+        Returns the value of the option equal to *option*, or *default*.
+        The *fingerprint* of the option can be specified if it was already
+        calculated.
+        """
+        item = self._find_item(option, fingerprint)
+        if item is None:
+            return default
+        return item[1]
+
+    def clear(self):
+        self._buckets.clear()
+        self._count = 0
@@ -25,6 +25,9 @@ class ShowersLimit(Limit):
         return super().__eq__(other) and \
             self.number_trajectories == other.number_trajectories
 
+    def fingerprint(self):
+        return super().fingerprint() + (self.number_trajectories,)
+
 class ShowersLimitBuilder(LimitBuilder):
 
     def __init__(self):
@@ -9,6 +9,7 @@ import math
 
 # Local modules.
 from pymontecarlo.options.limit.base import Limit
+from pymontecarlo.util.tolerance import round_to_tolerance
 
 # Globals and constants variables.
 
@@ -34,3 +35,8 @@ class UncertaintyLimit(Limit):
             self.detector == other.detector and \
             math.isclose(self.uncertainty, other.uncertainty, abs_tol=self.UNCERTAINTY_TOLERANCE)
 
+    def fingerprint(self):
+        return super().fingerprint() + \
+            (repr(self.xrayline), self.detector.fingerprint(),
+             round_to_tolerance(self.uncertainty, self.UNCERTAINTY_TOLERANCE))
+
@@ -4,12 +4,9 @@ Material definition
 
 # Standard library modules.
 import math
-from operator import itemgetter
 import itertools
 
 # Third party modules.
-import pyxray
-
 import numpy as np
 
 # Local modules.
@@ -18,6 +15,9 @@ from pymontecarlo.util.color import COLOR_SET_BROWN
 from pymontecarlo.options.composition import \
     calculate_density_kg_per_m3, generate_name, from_formula, to_repr
 from pymontecarlo.options.base import Option, OptionBuilder
+from pymontecarlo.options.sampling import latin_hypercube, sobol, to_simplex
+from pymontecarlo.util.tolerance import round_to_tolerance
+from pymontecarlo.util.element_data import names, mass_density_kg_per_m3
 
 # Globals and constants variables.
 
@@ -38,7 +38,9 @@ class Material(Option):
             between ]0.0, 1.0].
         :type composition: :class:`dict`
 
-        :arg name: name of the material
+        :arg name: name of the material. If ``None``, the name is generated
+            from the composition when it is first needed (see
+            :func:`generate_name`).
         :type name: :class:`str`
 
         :arg density_kg_per_m3: material's density in kg/m3.
@@ -67,6 +69,16 @@ class Material(Option):
         """
         cls.COLOR_CYCLER = itertools.cycle(color_set)
 
+    @property
+    def name(self):
+        if self._name is None:
+            self._name = generate_name(self.composition)
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        self._name = name
+
     @classmethod
     def pure(cls, z, color=None):
         """
@@ -75,9 +87,9 @@ class Material(Option):
         :arg z: atomic number
         :type z: :class:`int`
         """
-        name = pyxray.element_name(z)
+        name = names()[z]
+        density_kg_per_m3 = mass_density_kg_per_m3(z)
         composition = {z: 1.0}
-        density_kg_per_m3 = pyxray.element_mass_density_kg_per_m3(z)
 
         return cls(name, composition, density_kg_per_m3, color=color)
 
@@ -113,6 +125,13 @@ class Material(Option):
             cbook.are_mapping_value_close(self.composition, other.composition, abs_tol=self.WEIGHT_FRACTION_TOLERANCE) and \
             math.isclose(self.density_kg_per_m3, other.density_kg_per_m3, abs_tol=self.DENSITY_TOLERANCE_kg_per_m3)
 
+    def fingerprint(self):
+        composition = tuple((z, round_to_tolerance(wf, self.WEIGHT_FRACTION_TOLERANCE))
+                            for z, wf in sorted(self.composition.items()))
+        return super().fingerprint() + \
+            (self.name, composition,
+             round_to_tolerance(self.density_kg_per_m3, self.DENSITY_TOLERANCE_kg_per_m3))
+
     density_g_per_cm3 = cbook.MultiplierAttribute('density_kg_per_m3', 1e-3)
 
 class _Vacuum(Material):
@@ -149,17 +168,42 @@ class _Vacuum(Material):
 
 VACUUM = _Vacuum()
 
+def create_materials(zs, weight_fractions):
+    """
+    Returns a :class:`list` of materials from an array of weight fractions.
+    The densities of all materials are calculated at once (see
+    :func:`calculate_density_kg_per_m3`), while their names are only
+    generated when needed.
+
+    :arg zs: atomic numbers of the elements
+    :arg weight_fractions: array of shape (number of materials,
+        number of elements)
+    """
+    zs = np.asarray(zs, dtype=int)
+    weight_fractions = np.atleast_2d(weight_fractions)
+
+    densities_kg_per_m3 = \
+        1.0 / weight_fractions.dot(1.0 / mass_density_kg_per_m3(zs))
+
+    zs = zs.tolist()
+    return [Material(None, dict(zip(zs, wfs)), density_kg_per_m3)
+            for wfs, density_kg_per_m3
+            in zip(weight_fractions.tolist(), densities_kg_per_m3.tolist())]
+
 class MaterialBuilder(OptionBuilder):
+    """
+    Builds materials from the product of the weight fractions of each
+    element. The element *balance_z* makes up the remainder.
+    Combinations where the weight fractions of the other elements sum
+    to more than 1 are discarded.
+    """
 
     def __init__(self, balance_z):
         self.balance_z = balance_z
         self.elements = {}
 
     def __len__(self):
-        count = 1
-        for wfs in self.elements.values():
-            count *= len(wfs)
-        return count
+        return len(self.calculate_weight_fractions()[1])
 
     def add_element(self, z, *wf):
         self.elements[z] = np.ravel(wf)
@@ -173,27 +217,75 @@ class MaterialBuilder(OptionBuilder):
         self.elements[z] = np.linspace(wf0, wf1, nstep, endpoint=True)
         return self
 
+    def calculate_weight_fractions(self):
+        """
+        Returns the atomic numbers and an array of shape
+        (number of materials, number of elements) with the weight fractions
+        of the valid combinations. The balance element is the last column.
+        """
+        zs = list(self.elements.keys()) + [self.balance_z]
+        values = list(self.elements.values())
+        count = int(np.prod([len(wfs) for wfs in values]))
+
+        # Same order as itertools.product
+        weight_fractions = np.empty((count, len(zs)))
+        for column, grid in enumerate(np.meshgrid(*values, indexing='ij')):
+            weight_fractions[:, column] = grid.ravel()
+
+        balances = 1.0 - weight_fractions[:, :-1].sum(axis=1)
+        valid = balances >= -Material.WEIGHT_FRACTION_TOLERANCE
+        weight_fractions[:, -1] = np.maximum(balances, 0.0)
+
+        return zs, weight_fractions[valid]
+
     def build(self):
-        combinations = []
-        for z, wfs in self.elements.items():
-            combination = []
-            for wf in wfs:
-                combination.append((z, wf))
-            combinations.append(combination)
-
-        materials = []
-        for combination in itertools.product(*combinations):
-            composition = dict(combination)
-
-            total = sum(map(itemgetter(1), combination))
-            remainder = 1.0 - total
-            composition[self.balance_z] = remainder
-
-            name = generate_name(composition)
-            density_kg_per_m3 = calculate_density_kg_per_m3(composition)
+        zs, weight_fractions = self.calculate_weight_fractions()
+        return create_materials(zs, weight_fractions)
 
-            material = Material(name, composition, density_kg_per_m3)
-            materials.append(material)
+class SimplexMaterialBuilder(OptionBuilder):
+    """
+    Builds materials whose weight fractions are sampled uniformly on the
+    composition simplex, i.e. over all compositions of the elements *zs*.
+    """
 
-        return materials
+    METHODS = ('lhs', 'sobol')
 
+    def __init__(self, zs, count, method='lhs', seed=None):
+        """
+        :arg zs: atomic numbers of the elements
+        :arg count: number of materials
+        :arg method: ``lhs`` (Latin hypercube) or ``sobol`` (Sobol sequence)
+        :arg seed: seed of the random generator of the Latin hypercube
+        """
+        zs = tuple(zs)
+        if len(zs) < 2:
+            raise ValueError('A composition requires at least 2 elements')
+        if method not in self.METHODS:
+            raise ValueError('Unknown sampling method: {}'.format(method))
+
+        self.zs = zs
+        self.count = count
+        self.method = method
+        self.seed = seed
+
+    def __len__(self):
+        return self.count
+
+    def calculate_weight_fractions(self):
+        """
+        Returns the atomic numbers and an array of shape
+        (number of materials, number of elements) with the sampled
+        weight fractions.
+        """
+        dimension = len(self.zs) - 1
+        if self.method == 'sobol':
+            # Skip first point, at the corner of the cube
+            points = sobol(self.count, dimension, skip=1)
+        else:
+            points = latin_hypercube(self.count, dimension, self.seed)
+
+        return list(self.zs), to_simplex(points)
+
+    def build(self):
+        zs, weight_fractions = self.calculate_weight_fractions()
+        return create_materials(zs, weight_fractions)
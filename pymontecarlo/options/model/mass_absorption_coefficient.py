@@ -25,4 +25,5 @@ class MassAbsorptionCoefficientModel(Model):
     CHANTLER2005 = ('NIST-Chantler 2005', "See http://physics.nist.gov/ffast")
     DTSA_CITZAF = ('DTSA CitZAF', "DTSA at http://www.cstl.nist.gov/div837/Division/outputs/DTSA/DTSA.htm")
     THINH_LEROUS1979 = ('Thinh and Leroux' , 'Thinh and Leroux (1979)',)
+    BRAGG_PIERCE = ('Bragg-Pierce law', 'K.F.J. Heinrich (1966) X-ray absorption uncertainty, in T.D. McKinley, K.F.J. Heinrich and D.B. Wittry, The Electron Microprobe, Wiley, New York, p. 296-377')
     LLNL1989 = ('LLNL Evaluated Photon Data Library', 'Lawrence Livermore National Laboratory. (1989). Tables and graphs of photon-interaction cross sections from 10 eV to 100 GeV derived from the LLNL evaluated photon data library EPDL. Livermore, CA: Cullen, D., Chen, M., Hubbell, J., Perkins, S., Plechaty, E., Rathkopf, J., & Scofield, J..')
@@ -52,6 +52,23 @@ class Options(Option):
             are_sequence_similar(self.limits, other.limits) and \
             are_sequence_similar(self.models, other.models)
 
+    def fingerprint(self):
+        # NOTE: Analyses, limits and models are compared regardless of their order
+        def _sorted_fingerprints(options):
+            fingerprints = [option.fingerprint() for option in options]
+            try:
+                return tuple(sorted(fingerprints))
+            except TypeError: # Fingerprints with values of different types
+                return tuple(sorted(fingerprints, key=repr))
+
+        return super().fingerprint() + \
+            (self.program.getidentifier(),
+             self.beam.fingerprint(),
+             self.sample.fingerprint(),
+             _sorted_fingerprints(self.analyses),
+             _sorted_fingerprints(self.limits),
+             _sorted_fingerprints(self.models))
+
     def find_analyses(self, analysis_class):
         return find_by_type(self.analyses, analysis_class)
 
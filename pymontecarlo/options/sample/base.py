@@ -14,6 +14,7 @@ from pymontecarlo.options.material import VACUUM
 from pymontecarlo.util.cbook import \
     DegreesAttribute, are_sequence_equal, unique
 from pymontecarlo.options.base import Option, OptionBuilder
+from pymontecarlo.util.tolerance import round_to_tolerance
 
 # Globals and constants variables.
 
@@ -45,6 +46,11 @@ class Sample(Option):
             math.isclose(self.tilt_rad, other.tilt_rad, abs_tol=self.TILT_TOLERANCE_rad) and \
             math.isclose(self.azimuth_rad, other.azimuth_rad, abs_tol=self.AZIMUTH_TOLERANCE_rad)
 
+    def fingerprint(self):
+        return super().fingerprint() + \
+            (round_to_tolerance(self.tilt_rad, self.TILT_TOLERANCE_rad),
+             round_to_tolerance(self.azimuth_rad, self.AZIMUTH_TOLERANCE_rad))
+
     def _cleanup_materials(self, *materials):
         materials = list(materials)
 
@@ -129,6 +135,11 @@ class Layer(Option):
         return self.material == other.material and \
             math.isclose(self.thickness_m, other.thickness_m, abs_tol=self.THICKNESS_TOLERANCE_m)
 
+    def fingerprint(self):
+        return super().fingerprint() + \
+            (self.material.fingerprint(),
+             round_to_tolerance(self.thickness_m, self.THICKNESS_TOLERANCE_m))
+
 class LayerBuilder(OptionBuilder):
 
     def __init__(self):
@@ -168,6 +179,10 @@ class LayeredSample(Sample):
         return super().__eq__(other) and \
             are_sequence_equal(self.layers, other.layers)
 
+    def fingerprint(self):
+        return super().fingerprint() + \
+            (tuple(layer.fingerprint() for layer in self.layers),)
+
     def add_layer(self, material, thickness_m):
         """
         Adds a layer to the geometry.
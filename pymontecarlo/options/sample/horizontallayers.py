@@ -47,6 +47,9 @@ class HorizontalLayerSample(LayeredSample):
         return super().__eq__(other) and \
             self.substrate_material == other.substrate_material
 
+    def fingerprint(self):
+        return super().fingerprint() + (self.substrate_material.fingerprint(),)
+
     def has_substrate(self):
         """
         Returns ``True`` if a substrate material has been defined.
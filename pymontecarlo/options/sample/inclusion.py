@@ -12,6 +12,7 @@ import math
 
 # Local modules.
 from pymontecarlo.options.sample.base import Sample, SampleBuilder
+from pymontecarlo.util.tolerance import round_to_tolerance
 
 # Globals and constants variables.
 
@@ -43,6 +44,12 @@ class InclusionSample(Sample):
             self.inclusion_material == other.inclusion_material and \
             math.isclose(self.inclusion_diameter_m, other.inclusion_diameter_m, abs_tol=self.INCLUSION_DIAMETER_TOLERANCE_m)
 
+    def fingerprint(self):
+        return super().fingerprint() + \
+            (self.substrate_material.fingerprint(),
+             self.inclusion_material.fingerprint(),
+             round_to_tolerance(self.inclusion_diameter_m, self.INCLUSION_DIAMETER_TOLERANCE_m))
+
     @property
     def materials(self):
         return self._cleanup_materials(self.substrate_material,
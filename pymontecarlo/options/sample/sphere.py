@@ -12,6 +12,7 @@ import math
 
 # Local modules.
 from pymontecarlo.options.sample.base import Sample, SampleBuilder
+from pymontecarlo.util.tolerance import round_to_tolerance
 
 # Globals and constants variables.
 
@@ -41,6 +42,11 @@ class SphereSample(Sample):
             self.material == other.material and \
             math.isclose(self.diameter_m, other.diameter_m, abs_tol=self.DIAMETER_TOLERANCE_m)
 
+    def fingerprint(self):
+        return super().fingerprint() + \
+            (self.material.fingerprint(),
+             round_to_tolerance(self.diameter_m, self.DIAMETER_TOLERANCE_m))
+
     @property
     def materials(self):
         return self._cleanup_materials(self.material)
@@ -32,6 +32,9 @@ class SubstrateSample(Sample):
     def __eq__(self, other):
         return super().__eq__(other) and self.material == other.material
 
+    def fingerprint(self):
+        return super().fingerprint() + (self.material.fingerprint(),)
+
     @property
     def materials(self):
         return self._cleanup_materials(self.material)
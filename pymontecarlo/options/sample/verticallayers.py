@@ -12,6 +12,7 @@ import itertools
 
 # Local modules.
 from pymontecarlo.options.sample.base import LayeredSample, LayeredSampleBuilder
+from pymontecarlo.util.tolerance import round_to_tolerance
 
 # Globals and constants variables.
 
@@ -49,6 +50,12 @@ class VerticalLayerSample(LayeredSample):
             self.right_material == other.right_material and \
             math.isclose(self.depth_m, other.depth_m, abs_tol=self.DEPTH_TOLERANCE_m)
 
+    def fingerprint(self):
+        return super().fingerprint() + \
+            (self.left_material.fingerprint(),
+             self.right_material.fingerprint(),
+             round_to_tolerance(self.depth_m, self.DEPTH_TOLERANCE_m))
+
     @property
     def materials(self):
         return self._cleanup_materials(self.left_material,
@@ -0,0 +1,251 @@
+"""
+Sampling of options over a multi-parameter space.
+"""
+
+# Standard library modules.
+import collections
+import logging
+logger = logging.getLogger(__name__)
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+from pymontecarlo.options.base import OptionBuilder
+from pymontecarlo.exceptions import ValidationError
+
+# Globals and constants variables.
+
+SOBOL_BITS = 32
+
+# Primitive polynomials (degree, coefficients) and initial direction numbers
+# of dimensions 2 to 21 (Joe and Kuo, 2008)
+SOBOL_DIRECTIONS = [
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+    (6, 19, (1, 1, 1, 15, 7, 5)),
+    (6, 22, (1, 3, 1, 15, 13, 25)),
+    (6, 25, (1, 1, 5, 5, 19, 61)),
+    (7, 1, (1, 3, 7, 11, 23, 15, 103)),
+    (7, 4, (1, 3, 7, 13, 13, 15, 69)),
+]
+
+def latin_hypercube(count, dimension, seed=None):
+    """
+    Returns *count* points of a Latin hypercube sample of the unit cube,
+    as a :class:`numpy.ndarray` of shape (*count*, *dimension*).
+    Along each dimension, exactly one point falls in each of the *count*
+    intervals of equal width.
+    """
+    random = np.random.RandomState(seed)
+
+    points = np.empty((count, dimension))
+    for i in range(dimension):
+        strata = random.permutation(count)
+        points[:, i] = (strata + random.uniform(size=count)) / count
+
+    return points
+
+def _create_sobol_directions(dimension):
+    if dimension > len(SOBOL_DIRECTIONS) + 1:
+        raise ValueError('Sobol sequence is limited to {} dimensions'
+                         .format(len(SOBOL_DIRECTIONS) + 1))
+
+    directions = np.zeros((dimension, SOBOL_BITS), dtype=np.uint64)
+
+    # First dimension: van der Corput sequence
+    for i in range(SOBOL_BITS):
+        directions[0, i] = 1 << (SOBOL_BITS - 1 - i)
+
+    for j in range(1, dimension):
+        s, a, m = SOBOL_DIRECTIONS[j - 1]
+
+        v = [0] * SOBOL_BITS
+        for i in range(min(s, SOBOL_BITS)):
+            v[i] = m[i] << (SOBOL_BITS - 1 - i)
+
+        for i in range(s, SOBOL_BITS):
+            v[i] = v[i - s] ^ (v[i - s] >> s)
+            for k in range(1, s):
+                if (a >> (s - 1 - k)) & 1:
+                    v[i] ^= v[i - k]
+
+        directions[j] = v
+
+    return directions
+
+def sobol(count, dimension, skip=0):
+    """
+    Returns the first *count* points (after *skip* points) of the Sobol
+    low-discrepancy sequence in the unit cube, as a :class:`numpy.ndarray`
+    of shape (*count*, *dimension*).
+    The sequence is best balanced when *count* is a power of 2.
+    """
+    directions = _create_sobol_directions(dimension)
+
+    points = np.empty((count, dimension))
+    x = np.zeros(dimension, dtype=np.uint64)
+
+    for n in range(skip + count):
+        if n >= skip:
+            points[n - skip] = x
+
+        # Gray code: flip the direction of the rightmost zero bit of n
+        c = 0
+        while (n >> c) & 1:
+            c += 1
+        x ^= directions[:, c]
+
+    return points / 2.0 ** SOBOL_BITS
+
+def to_simplex(points):
+    """
+    Maps points of the unit cube of dimension *k - 1* to fractions of
+    *k* components summing to 1, uniformly distributed on the simplex.
+    """
+    points = np.sort(np.atleast_2d(points), axis=1)
+    count = points.shape[0]
+    bounds = np.hstack([np.zeros((count, 1)), points, np.ones((count, 1))])
+    return np.diff(bounds, axis=1)
+
+class SamplingOptionsBuilder(OptionBuilder):
+    """
+    Builds options from a sample of *count* points of a multi-parameter
+    space, instead of the full product of the values of each parameter.
+
+    Each point is converted to options by *create_options*, which receives
+    the value of each parameter as keyword argument.
+    Continuous parameters are added with :meth:`add_parameter`, and
+    compositions (mass fractions summing to 1) with :meth:`add_composition`.
+    Options which are not valid for their program are discarded.
+    As with :class:`OptionsBuilder`, the options required by the analyses
+    (e.g. standards) are also returned.
+    """
+
+    METHODS = ('lhs', 'sobol')
+
+    def __init__(self, create_options, count, method='lhs', seed=None):
+        """
+        :arg create_options: function returning options from parameter values
+        :arg count: number of sampled points
+        :arg method: ``lhs`` (Latin hypercube) or ``sobol`` (Sobol sequence)
+        :arg seed: seed of the random generator of the Latin hypercube
+        """
+        if method not in self.METHODS:
+            raise ValueError('Unknown sampling method: {}'.format(method))
+
+        self.create_options = create_options
+        self.count = count
+        self.method = method
+        self.seed = seed
+
+        self.parameters = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self.build())
+
+    def add_parameter(self, name, minimum, maximum, log=False):
+        """
+        Adds a continuous parameter sampled between *minimum* and *maximum*,
+        uniformly or, if *log*, uniformly in logarithmic scale.
+        """
+        if maximum < minimum:
+            raise ValueError('Maximum must be greater or equal to minimum')
+        if log and minimum <= 0.0:
+            raise ValueError('Logarithmic parameter must be positive')
+
+        self.parameters[name] = ('range', (minimum, maximum, log))
+
+    def add_composition(self, name, zs):
+        """
+        Adds a composition parameter, where the mass fractions of the
+        elements *zs* are sampled uniformly on the simplex.
+        The value passed to *create_options* is a :class:`dict` of atomic
+        number and mass fraction.
+        """
+        zs = tuple(zs)
+        if len(zs) < 2:
+            raise ValueError('A composition requires at least 2 elements')
+
+        self.parameters[name] = ('composition', zs)
+
+    @property
+    def dimension(self):
+        dimension = 0
+        for kind, args in self.parameters.values():
+            dimension += len(args) - 1 if kind == 'composition' else 1
+        return dimension
+
+    def sample(self):
+        """
+        Returns a :class:`list` of :class:`dict` with the parameter values
+        of each sampled point.
+        """
+        dimension = self.dimension
+        if self.method == 'sobol':
+            # Skip first point, at the corner of the cube
+            points = sobol(self.count, dimension, skip=1)
+        else:
+            points = latin_hypercube(self.count, dimension, self.seed)
+
+        list_values = [{} for _ in range(self.count)]
+        column = 0
+
+        for name, (kind, args) in self.parameters.items():
+            if kind == 'composition':
+                width = len(args) - 1
+                fractions = to_simplex(points[:, column:column + width])
+                for values, row in zip(list_values, fractions):
+                    values[name] = dict(zip(args, row))
+
+            else:
+                width = 1
+                minimum, maximum, log = args
+                u = points[:, column]
+                if log:
+                    samples = np.exp(np.log(minimum) + u * (np.log(maximum) - np.log(minimum)))
+                else:
+                    samples = minimum + u * (maximum - minimum)
+                for values, sample in zip(list_values, samples):
+                    values[name] = float(sample)
+
+            column += width
+
+        return list_values
+
+    def build(self):
+        list_options = []
+
+        for values in self.sample():
+            options = self.create_options(**values)
+
+            try:
+                validator = options.program.create_validator()
+                validator.validate_options(options)
+            except ValidationError as ex:
+                logger.debug('Invalid sample {}: {}'.format(values, ex))
+                continue
+
+            if options in list_options:
+                continue
+            list_options.append(options)
+
+            for analysis in options.analyses:
+                for extra_options in analysis.apply(options):
+                    if extra_options not in list_options:
+                        list_options.append(extra_options)
+
+        return list_options
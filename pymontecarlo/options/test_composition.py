@@ -8,7 +8,8 @@ import logging
 # Third party modules.
 
 # Local modules.
-from pymontecarlo.options.composition import from_formula
+from pymontecarlo.options.composition import \
+    from_formula, from_formulas, to_atomic, calculate_density_kg_per_m3, generate_name
 
 # Globals and constants variables.
 
@@ -45,6 +46,67 @@ class Testcomposition(unittest.TestCase):
         comp = from_formula('Al2')
         self.assertAlmostEqual(1.0, comp[13], 4)
 
+        comp = from_formula('Fe0.5Ni0.5')
+        self.assertAlmostEqual(0.4876, comp[26], 4)
+
+    def testfrom_formula_parentheses(self):
+        self.assertEqual(to_atomic(from_formula('CaO2H2')),
+                         to_atomic(from_formula('Ca(OH)2')))
+
+        comp = to_atomic(from_formula('K4[Fe(CN)6]'))
+        self.assertAlmostEqual(4.0 / 17.0, comp[19], 4)
+        self.assertAlmostEqual(1.0 / 17.0, comp[26], 4)
+        self.assertAlmostEqual(6.0 / 17.0, comp[6], 4)
+        self.assertAlmostEqual(6.0 / 17.0, comp[7], 4)
+
+    def testfrom_formula_hydrate(self):
+        expected = from_formula('CuSO9H10')
+
+        for formula in ['CuSO4*5H2O', 'CuSO4\u00b75H2O', 'CuSO4 * 5 H2O']:
+            comp = from_formula(formula)
+            for z, wf in expected.items():
+                self.assertAlmostEqual(wf, comp[z], 8)
+
+    def testfrom_formula_invalid(self):
+        for formula in ['', 'Ca(OH', 'CaOH)2', 'Cu$', 'CuSO4*', 'Cu(2O)']:
+            self.assertRaises(ValueError, from_formula, formula)
+
+    def testfrom_formula_cache(self):
+        comp = from_formula('Al2O3')
+        comp[13] = 0.0
+        self.assertNotEqual(0.0, from_formula('Al2O3')[13])
+
+    def testfrom_formulas(self):
+        formulas = ['Al2O3', 'Ca(OH)2', 'Al2O3', 'Fe']
+        compositions = from_formulas(formulas)
+        self.assertEqual(4, len(compositions))
+
+        for formula, comp in zip(formulas, compositions):
+            expected = from_formula(formula)
+            self.assertEqual(list(expected), list(comp))
+            for z, wf in expected.items():
+                self.assertAlmostEqual(wf, comp[z], 8)
+
+    def testto_atomic(self):
+        comp = to_atomic(from_formula('Al2O3'))
+        self.assertAlmostEqual(0.4, comp[13], 4)
+        self.assertAlmostEqual(0.6, comp[8], 4)
+
+        self.assertEqual({}, to_atomic({}))
+
+    def testcalculate_density_kg_per_m3(self):
+        self.assertAlmostEqual(8960.0, calculate_density_kg_per_m3({29: 1.0}), 4)
+        self.assertIs(float, type(calculate_density_kg_per_m3({29: 1.0})))
+        self.assertAlmostEqual(0.0, calculate_density_kg_per_m3({}), 4)
+
+        expected = 1.0 / (0.5 / 8960.0 + 0.5 / 19300.0)
+        self.assertAlmostEqual(expected, calculate_density_kg_per_m3({29: 0.5, 79: 0.5}), 4)
+
+    def testgenerate_name(self):
+        self.assertEqual('Cu', generate_name({29: 1.0}))
+        self.assertEqual('Al2O3', generate_name(from_formula('Al2O3')))
+        self.assertEqual('Untitled', generate_name({}))
+
 if __name__ == '__main__': #pragma: no cover
     logging.getLogger().setLevel(logging.DEBUG)
     unittest.main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+from pymontecarlo.options.index import OptionIndex
+
+# Globals and constants variables.
+
+class TestOptionIndex(TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.options = self.create_basic_options()
+
+        self.index = OptionIndex()
+        self.index.add(self.options, 'a')
+
+    def testadd(self):
+        self.assertEqual(1, len(self.index))
+
+        other = self.create_basic_options()
+        self.assertFalse(self.index.add(other, 'b'))
+        self.assertEqual(1, len(self.index))
+
+        other.beam.energy_eV = 20e3
+        self.assertTrue(self.index.add(other, 'b'))
+        self.assertEqual(2, len(self.index))
+
+    def testfind(self):
+        other = self.create_basic_options()
+        self.assertIn(other, self.index)
+        self.assertEqual('a', self.index.find(other))
+
+        other.beam.energy_eV = 20e3
+        self.assertNotIn(other, self.index)
+        self.assertEqual('z', self.index.find(other, 'z'))
+
+    def testremove(self):
+        other = self.create_basic_options()
+        self.index.remove(other)
+        self.assertEqual(0, len(self.index))
+        self.assertNotIn(self.options, self.index)
+
+        self.assertRaises(KeyError, self.index.remove, other)
+        self.index.discard(other)
+
+if __name__ == '__main__': # pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
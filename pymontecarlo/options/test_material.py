@@ -12,7 +12,10 @@ import pickle
 # Local modules.
 from pymontecarlo.testcase import TestCase
 
-from pymontecarlo.options.material import Material, VACUUM, MaterialBuilder
+from pymontecarlo.options.material import \
+    Material, VACUUM, MaterialBuilder, SimplexMaterialBuilder, create_materials
+from pymontecarlo.options.composition import \
+    calculate_density_kg_per_m3, from_formula
 
 # Globals and constants variables.
 
@@ -95,6 +98,13 @@ class TestMaterial(TestCase):
         m2 = Material('Pure Cu', {29: 0.5, 30: 0.5}, 8960.0)
         self.assertNotEqual(m2, self.m)
 
+    def testfingerprint(self):
+        m2 = Material('Pure Cu', {29: 1.0 + 1e-9}, 8960.0)
+        self.assertEqual(m2.fingerprint(), self.m.fingerprint())
+
+        m2 = Material('Pure Cu', {29: 1.0}, 8961.0)
+        self.assertNotEqual(m2.fingerprint(), self.m.fingerprint())
+
     def testset_color_set(self):
         Material.set_color_set(['#00FF00', '#0000FF'])
 
@@ -107,6 +117,28 @@ class TestMaterial(TestCase):
         m = Material.pure(15)
         self.assertEqual('#00FF00', m.color)
 
+    def testgenerated_name(self):
+        m = Material(None, from_formula('Al2O3'), 3950.0)
+        self.assertIsNone(m._name)
+        self.assertEqual('Al2O3', m.name)
+        self.assertEqual('Al2O3', str(m))
+
+    def testcopy_generated_name(self):
+        m = copy.deepcopy(Material(None, {29: 1.0}, 8960.0))
+        self.assertEqual('Cu', m.name)
+
+class TestModule(TestCase):
+
+    def testcreate_materials(self):
+        materials = create_materials([29, 30], [[1.0, 0.0], [0.4, 0.6]])
+        self.assertEqual(2, len(materials))
+
+        m = materials[1]
+        self.assertAlmostEqual(0.4, m.composition[29], 4)
+        self.assertAlmostEqual(0.6, m.composition[30], 4)
+        self.assertAlmostEqual(calculate_density_kg_per_m3(m.composition),
+                               m.density_kg_per_m3, 4)
+
 class TestMaterialBuilder(TestCase):
 
     def setUp(self):
@@ -122,17 +154,59 @@ class TestMaterialBuilder(TestCase):
         TestCase.tearDown(self)
 
     def test__len__(self):
-        self.assertEqual(5 * 3 * 5, len(self.b))
+        # Combinations with carbon of 0.75 and above exceed 1.0
+        self.assertEqual(5 * 3 * 3 + 10, len(self.b))
 
     def testbuild(self):
-        compositions = self.b.build()
-        self.assertEqual(5 * 3 * 5, len(compositions))
+        materials = self.b.build()
+        self.assertEqual(5 * 3 * 3 + 10, len(materials))
+
+        for material in materials:
+            self.assertAlmostEqual(1.0, sum(material.composition.values()), 4)
+            self.assertGreaterEqual(material.composition[26], 0.0)
+            self.assertAlmostEqual(calculate_density_kg_per_m3(material.composition),
+                                   material.density_kg_per_m3, 4)
+
+        material = materials[0]
+        self.assertAlmostEqual(0.05, material.composition[29], 4)
+        self.assertAlmostEqual(0.1, material.composition[28], 4)
+        self.assertAlmostEqual(0.01, material.composition[24], 4)
+        self.assertAlmostEqual(0.0, material.composition[6], 4)
+        self.assertAlmostEqual(0.84, material.composition[26], 4)
+
+    def testcalculate_weight_fractions(self):
+        zs, wfs = self.b.calculate_weight_fractions()
+        self.assertEqual([29, 28, 24, 6, 26], zs)
+        self.assertEqual((5 * 3 * 3 + 10, 5), wfs.shape)
 
     def testno_element(self):
         b = MaterialBuilder(26)
         self.assertEqual(1, len(b))
         self.assertEqual(1, len(b.build()))
 
+class TestSimplexMaterialBuilder(TestCase):
+
+    def testbuild(self):
+        b = SimplexMaterialBuilder([26, 28, 24], 20, seed=0)
+        self.assertEqual(20, len(b))
+
+        materials = b.build()
+        self.assertEqual(20, len(materials))
+
+        for material in materials:
+            self.assertEqual({24, 26, 28}, set(material.composition))
+            self.assertAlmostEqual(1.0, sum(material.composition.values()), 4)
+
+    def testbuild_sobol(self):
+        b = SimplexMaterialBuilder([29, 30], 8, method='sobol')
+        zs, wfs = b.calculate_weight_fractions()
+        self.assertEqual([29, 30], zs)
+        self.assertEqual((8, 2), wfs.shape)
+
+    def testinvalid(self):
+        self.assertRaises(ValueError, SimplexMaterialBuilder, [29], 10)
+        self.assertRaises(ValueError, SimplexMaterialBuilder, [29, 30], 10, method='grid')
+
 if __name__ == '__main__': # pragma: no cover
     logging.getLogger().setLevel(logging.DEBUG)
     unittest.main()
@@ -14,6 +14,7 @@ from pymontecarlo.options.detector.base import Detector
 from pymontecarlo.options.limit import ShowersLimit, UncertaintyLimit
 from pymontecarlo.options.model import ElasticCrossSectionModel, EnergyLossModel
 from pymontecarlo.options.options import OptionsBuilder
+from pymontecarlo.options.base import calculate_digest
 from pymontecarlo.options.analysis import PhotonIntensityAnalysis, KRatioAnalysis
 
 # Globals and constants variables.
@@ -49,6 +50,22 @@ class TestOptions(TestCase):
         models = self.options.find_models(EnergyLossModel)
         self.assertEqual(0, len(models))
 
+    def testfingerprint(self):
+        other = self.create_basic_options()
+        other.beam.energy_eV += 1e-4
+        other.limits.append(UncertaintyLimit((29, 'Ka1'), self.create_basic_photondetector(), 0.01))
+        other.limits.reverse()
+        self.options.limits.append(UncertaintyLimit((29, 'Ka1'), self.create_basic_photondetector(), 0.01))
+
+        self.assertEqual(other, self.options)
+        self.assertEqual(other.fingerprint(), self.options.fingerprint())
+        self.assertEqual(calculate_digest(other), calculate_digest(self.options))
+        hash(other.fingerprint())
+
+        other.beam.energy_eV = 20e3
+        self.assertNotEqual(other.fingerprint(), self.options.fingerprint())
+        self.assertNotEqual(calculate_digest(other), calculate_digest(self.options))
+
 class TestOptionsBuilder(TestCase):
 
     def testbuild(self):
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+from pymontecarlo.options.sampling import \
+    latin_hypercube, sobol, to_simplex, SamplingOptionsBuilder
+from pymontecarlo.options.beam import GaussianBeam
+from pymontecarlo.options.material import Material
+from pymontecarlo.options.sample import SubstrateSample
+
+# Globals and constants variables.
+
+class TestSampling(TestCase):
+
+    def _assert_stratified(self, points):
+        count = points.shape[0]
+        for column in points.T:
+            strata = np.floor(column * count).astype(int)
+            self.assertEqual(count, len(set(strata)))
+
+    def testlatin_hypercube(self):
+        points = latin_hypercube(50, 6, seed=1)
+        self.assertEqual((50, 6), points.shape)
+        self.assertTrue(np.all(points >= 0.0) and np.all(points < 1.0))
+        self._assert_stratified(points)
+
+        np.testing.assert_allclose(points, latin_hypercube(50, 6, seed=1))
+
+    def testsobol(self):
+        points = sobol(8, 3)
+        self.assertEqual((8, 3), points.shape)
+        np.testing.assert_allclose([0.0, 0.5, 0.75, 0.25, 0.375, 0.875, 0.625, 0.125],
+                                   points[:, 0])
+        np.testing.assert_allclose([0.0, 0.5, 0.25, 0.75, 0.625, 0.125, 0.875, 0.375],
+                                   points[:, 2])
+
+        self._assert_stratified(sobol(64, 21))
+
+        np.testing.assert_allclose(sobol(8, 3)[4:], sobol(4, 3, skip=4))
+
+    def testsobol_dimension(self):
+        self.assertRaises(ValueError, sobol, 8, 22)
+
+    def testto_simplex(self):
+        fractions = to_simplex(latin_hypercube(20, 2, seed=1))
+        self.assertEqual((20, 3), fractions.shape)
+        np.testing.assert_allclose(np.ones(20), fractions.sum(axis=1))
+        self.assertTrue(np.all(fractions >= 0.0))
+
+class TestSamplingOptionsBuilder(TestCase):
+
+    def _create_options(self, energy_eV, composition):
+        options = self.create_basic_options()
+        options.beam = GaussianBeam(energy_eV, 10e-9)
+        options.sample = SubstrateSample(Material('alloy', composition, 8e3))
+        return options
+
+    def testbuild(self):
+        for method in SamplingOptionsBuilder.METHODS:
+            b = SamplingOptionsBuilder(self._create_options, 16, method, seed=1)
+            b.add_parameter('energy_eV', 5e3, 20e3)
+            b.add_composition('composition', [26, 28])
+            self.assertEqual(2, b.dimension)
+
+            list_options = b.build()
+            self.assertEqual(16, len(list_options))
+            self.assertEqual(16, len(b))
+
+            for options in list_options:
+                self.assertTrue(5e3 <= options.beam.energy_eV <= 20e3)
+                composition = options.sample.material.composition
+                self.assertAlmostEqual(1.0, sum(composition.values()), 4)
+
+    def testsample_log(self):
+        b = SamplingOptionsBuilder(self._create_options, 100, seed=1)
+        b.add_parameter('energy_eV', 1e3, 100e3, log=True)
+
+        energies = np.array([values['energy_eV'] for values in b.sample()])
+        self.assertTrue(np.all(energies >= 1e3) and np.all(energies <= 100e3))
+        self.assertEqual(50, np.sum(energies < 10e3))
+
+    def testbuild_invalid(self):
+        b = SamplingOptionsBuilder(self._create_options, 16, seed=1)
+        b.add_parameter('energy_eV', -20e3, 20e3)
+        b.add_composition('composition', [26, 28])
+
+        list_options = b.build()
+        self.assertEqual(8, len(list_options))
+
+    def testadd_parameter_error(self):
+        b = SamplingOptionsBuilder(self._create_options, 16)
+        self.assertRaises(ValueError, b.add_parameter, 'energy_eV', 20e3, 5e3)
+        self.assertRaises(ValueError, b.add_parameter, 'energy_eV', 0.0, 5e3, True)
+        self.assertRaises(ValueError, b.add_composition, 'composition', [26])
+        self.assertRaises(ValueError, SamplingOptionsBuilder, self._create_options, 16, 'grid')
+
+if __name__ == '__main__': # pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
@@ -33,6 +33,16 @@ class Program(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError
 
+    def getversion(self):
+        """
+        Returns the version of the program.
+        The version is part of the key of the cached results
+        (see :class:`ResultCache`), so that results of another version of
+        the program are not reused.
+        Derived classes should override this method.
+        """
+        return ''
+
     @abc.abstractmethod
     def create_expander(self):
         raise NotImplementedError
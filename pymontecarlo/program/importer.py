@@ -4,11 +4,17 @@ Base importer.
 
 # Standard library modules.
 import abc
+import os
+import json
+import math
 
 # Third party modules.
 
 # Local modules.
 from pymontecarlo.exceptions import ImportError_
+from pymontecarlo.options.analysis import PhotonIntensityAnalysis, KRatioAnalysis
+from pymontecarlo.results.photonintensity import \
+    EmittedPhotonIntensityResultBuilder, GeneratedPhotonIntensityResultBuilder
 
 # Globals and constants variables.
 
@@ -65,3 +71,67 @@ class Importer(metaclass=abc.ABCMeta):
 
         method = self.import_analysis_methods[analysis_class]
         return method(analysis, dirpath, errors, *args, **kwargs)
+
+class PhotonIntensityImporter(Importer):
+    """
+    Imports the photon intensities saved by a program in a JSON results file,
+    containing the calculated x-ray lines, their generated intensities and
+    their emitted intensities for each detector.
+
+    :arg results_filename: name of the results file in the simulation folder
+    """
+
+    def __init__(self, results_filename):
+        super().__init__()
+
+        self.results_filename = results_filename
+
+        self.import_analysis_methods[PhotonIntensityAnalysis] = self._import_analysis_photonintensity
+        self.import_analysis_methods[KRatioAnalysis] = self._import_analysis_kratio
+
+    def create_results(self, options, indict):
+        """
+        Returns the results from the output of the calculation, given as a
+        :class:`dict`, without reading it from a file.
+        """
+        errors = set()
+        results = self._run_importers(options, None, errors, indict)
+
+        if errors:
+            raise ImportError_(*errors)
+
+        return results
+
+    def _import(self, options, dirpath, errors):
+        filepath = os.path.join(dirpath, self.results_filename)
+        if not os.path.exists(filepath):
+            errors.add(ValueError('Results file not found: {}'.format(filepath)))
+            return []
+
+        with open(filepath, 'r') as fp:
+            indict = json.load(fp)
+
+        return self._run_importers(options, dirpath, errors, indict)
+
+    def _import_analysis_photonintensity(self, analysis, dirpath, errors, indict):
+        name = analysis.photon_detector.name
+        if name not in indict['emitted']:
+            errors.add(ValueError('No intensities for detector: {}'.format(name)))
+            return []
+
+        # Photons are emitted isotropically
+        factor = 1.0 / (4 * math.pi)
+
+        emitted_builder = EmittedPhotonIntensityResultBuilder(analysis)
+        generated_builder = GeneratedPhotonIntensityResultBuilder(analysis)
+
+        for xrayline, (gvalue, gerror), (evalue, eerror) in \
+                zip(indict['xraylines'], indict['generated'], indict['emitted'][name]):
+            generated_builder.add_intensity(xrayline, gvalue * factor, gerror * factor)
+            emitted_builder.add_intensity(xrayline, evalue * factor, eerror * factor)
+
+        return [emitted_builder.build(), generated_builder.build()]
+
+    def _import_analysis_kratio(self, analysis, dirpath, errors, indict):
+        # K-ratios are calculated from the photon intensities of the standards
+        return []
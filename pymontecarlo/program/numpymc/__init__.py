@@ -0,0 +1,4 @@
+"""
+Built-in Monte Carlo program, simulating the electron transport with
+vectorized NumPy operations in the current process.
+"""
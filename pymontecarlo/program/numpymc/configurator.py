@@ -0,0 +1,32 @@
+""""""
+
+# Standard library modules.
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.program.configurator import Configurator
+
+# Globals and constants variables.
+
+class NumpyMonteCarloConfigurator(Configurator):
+
+    def prepare_parser(self, parser, program=None):
+        parser.description = 'Configure built-in NumPy Monte Carlo program.'
+
+        kwargs = {}
+        kwargs['type'] = int
+        kwargs['help'] = 'number of electrons simulated simultaneously'
+        if program is not None:
+            kwargs['default'] = program.batch_size
+            kwargs['help'] += ' (current: {})'.format(program.batch_size)
+        else:
+            kwargs['default'] = 1000
+        parser.add_argument('--batch-size', **kwargs)
+
+    def create_program(self, namespace, clasz):
+        return clasz(namespace.batch_size)
+
+    @property
+    def fullname(self):
+        return 'NumPy Monte Carlo'
@@ -0,0 +1,22 @@
+""""""
+
+# Standard library modules.
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.program.expander import Expander, expand_to_single
+
+# Globals and constants variables.
+
+class NumpyMonteCarloExpander(Expander):
+
+    def expand_analyses(self, analyses):
+        # All detectors are simulated at once
+        return [analyses]
+
+    def expand_limits(self, limits):
+        return expand_to_single(limits)
+
+    def expand_models(self, models):
+        return expand_to_single(models)
@@ -0,0 +1,164 @@
+""""""
+
+# Standard library modules.
+import os
+import json
+import math
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+from pymontecarlo.program.exporter import Exporter
+from pymontecarlo.options.base import calculate_digest
+from pymontecarlo.options.beam import GaussianBeam
+from pymontecarlo.options.material import VACUUM
+from pymontecarlo.options.sample import SubstrateSample, HorizontalLayerSample
+from pymontecarlo.options.analysis import PhotonIntensityAnalysis, KRatioAnalysis
+from pymontecarlo.options.limit import ShowersLimit
+from pymontecarlo.options.model import ElasticCrossSectionModel, EnergyLossModel
+from pymontecarlo.util.absorption import mass_absorption_coefficient
+from pymontecarlo.util.element_data import atomic_weight
+from pymontecarlo.util.xraydata import iter_xrayline_data
+
+# Globals and constants variables.
+
+INPUT_FILENAME = 'input.json'
+
+# Ratio between the full width at half maximum and the standard deviation
+FWHM_TO_SIGMA = 2.0 * math.sqrt(2.0 * math.log(2.0))
+
+def _to_sample_frame(vector, tilt_rad, azimuth_rad):
+    """
+    Returns the components of a vector of the laboratory frame in the frame
+    of a sample tilted around the x-axis and rotated around the z-axis.
+    """
+    cost, sint = math.cos(tilt_rad), math.sin(tilt_rad)
+    cosa, sina = math.cos(azimuth_rad), math.sin(azimuth_rad)
+    rotation_x = np.array([[1.0, 0.0, 0.0], [0.0, cost, -sint], [0.0, sint, cost]])
+    rotation_z = np.array([[cosa, -sina, 0.0], [sina, cosa, 0.0], [0.0, 0.0, 1.0]])
+    rotation = rotation_z.dot(rotation_x)
+    return rotation.T.dot(vector).tolist()
+
+class NumpyMonteCarloExporter(Exporter):
+
+    def __init__(self):
+        super().__init__()
+
+        self.beam_export_methods[GaussianBeam] = self._export_beam_gaussian
+
+        self.sample_export_methods[SubstrateSample] = self._export_sample_substrate
+        self.sample_export_methods[HorizontalLayerSample] = self._export_sample_horizontallayers
+
+        self.analysis_export_methods[PhotonIntensityAnalysis] = self._export_analysis_photonintensity
+        self.analysis_export_methods[KRatioAnalysis] = self._export_analysis_kratio
+
+        self.limit_export_methods[ShowersLimit] = self._export_limit_showers
+
+        self.model_export_methods[ElasticCrossSectionModel] = self._export_model_elastic
+        self.model_export_methods[EnergyLossModel] = self._export_model_energyloss
+
+    def _export(self, options, dirpath, errors):
+        outdict = {'detectors': [], 'seed': int(calculate_digest(options)[:8], 16)}
+        self._run_exporters(options, errors, outdict)
+
+        if errors:
+            return
+
+        sample = options.sample
+        self._export_geometry(sample.tilt_rad, sample.azimuth_rad, outdict)
+        self._export_xraylines(options.beam.energy_eV / 1e3, outdict)
+
+        filepath = os.path.join(dirpath, INPUT_FILENAME)
+        with open(filepath, 'w') as fp:
+            json.dump(outdict, fp)
+
+    def _export_geometry(self, tilt_rad, azimuth_rad, outdict):
+        outdict['direction'] = _to_sample_frame([0.0, 0.0, -1.0], tilt_rad, azimuth_rad)
+
+        for detector in outdict['detectors']:
+            elevation_rad = detector['elevation_rad']
+            detector_azimuth_rad = detector['azimuth_rad']
+            direction = [math.cos(elevation_rad) * math.cos(detector_azimuth_rad),
+                         math.cos(elevation_rad) * math.sin(detector_azimuth_rad),
+                         math.sin(elevation_rad)]
+            direction = _to_sample_frame(direction, tilt_rad, azimuth_rad)
+            detector['sin_elevation'] = direction[2]
+
+    def _export_xraylines(self, energy_keV, outdict):
+        zs = sorted(set(z for region in outdict['regions'] for z in region['zs']))
+
+        xraylines = list(iter_xrayline_data(zs, energy_keV))
+        outdict['xraylines'] = xraylines
+
+        # Linear attenuation coefficients (1/cm) of each line in each region
+        attenuations = []
+        for xrayline in xraylines:
+            values = []
+            for region in outdict['regions']:
+                composition = dict(zip(region['zs'], region['wfs']))
+                mac = mass_absorption_coefficient(composition, xrayline['energy_keV'] * 1e3)
+                values.append(mac * region['density_g_per_cm3'])
+            attenuations.append(values)
+
+        outdict['attenuations'] = attenuations
+
+    def _export_beam_gaussian(self, beam, errors, outdict):
+        outdict['energy_keV'] = beam.energy_eV / 1e3
+        outdict['beam_sigma_cm'] = beam.diameter_m * 1e2 / FWHM_TO_SIGMA
+
+    def _create_region(self, material, zmin_m, zmax_m):
+        if material is VACUUM:
+            zs = []
+            wfs = []
+            density_g_per_cm3 = 0.0
+        else:
+            zs = sorted(material.composition)
+            wfs = [material.composition[z] for z in zs]
+            density_g_per_cm3 = material.density_kg_per_m3 / 1e3
+
+        return {'zmin_cm': zmin_m * 1e2,
+                'zmax_cm': zmax_m * 1e2,
+                'zs': zs,
+                'wfs': wfs,
+                'atomic_weights': [atomic_weight(z) for z in zs],
+                'density_g_per_cm3': density_g_per_cm3}
+
+    def _export_sample_substrate(self, sample, errors, outdict):
+        outdict['regions'] = \
+            [self._create_region(sample.material, -math.inf, 0.0)]
+
+    def _export_sample_horizontallayers(self, sample, errors, outdict):
+        regions = []
+
+        zmin_m = 0.0
+        for layer, (zmin_m, zmax_m) in zip(sample.layers, sample.layers_zpositions_m):
+            regions.append(self._create_region(layer.material, zmin_m, zmax_m))
+
+        regions.append(self._create_region(sample.substrate_material, -math.inf, zmin_m))
+
+        outdict['regions'] = regions
+
+    def _export_detector(self, detector, outdict):
+        names = [d['name'] for d in outdict['detectors']]
+        if detector.name in names:
+            return
+
+        outdict['detectors'].append({'name': detector.name,
+                                     'elevation_rad': detector.elevation_rad,
+                                     'azimuth_rad': detector.azimuth_rad})
+
+    def _export_analysis_photonintensity(self, analysis, errors, outdict):
+        self._export_detector(analysis.photon_detector, outdict)
+
+    def _export_analysis_kratio(self, analysis, errors, outdict):
+        self._export_detector(analysis.photon_detector, outdict)
+
+    def _export_limit_showers(self, limit, errors, outdict):
+        outdict['showers'] = limit.number_trajectories
+
+    def _export_model_elastic(self, model, errors, outdict):
+        outdict['elastic'] = model.name
+
+    def _export_model_energyloss(self, model, errors, outdict):
+        outdict['energy_loss'] = model.name
@@ -0,0 +1,57 @@
+""""""
+
+# Standard library modules.
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.program.base import Program
+from pymontecarlo.program.numpymc.configurator import NumpyMonteCarloConfigurator
+from pymontecarlo.program.numpymc.expander import NumpyMonteCarloExpander
+from pymontecarlo.program.numpymc.validator import NumpyMonteCarloValidator
+from pymontecarlo.program.numpymc.exporter import NumpyMonteCarloExporter
+from pymontecarlo.program.numpymc.worker import NumpyMonteCarloWorker
+from pymontecarlo.program.numpymc.importer import NumpyMonteCarloImporter
+from pymontecarlo.options.limit import ShowersLimit
+
+# Globals and constants variables.
+
+# Version of the physics models, to increment when the results change
+VERSION = '1'
+
+class NumpyMonteCarloProgram(Program):
+
+    def __init__(self, batch_size=1000):
+        """
+        :arg batch_size: number of electrons simulated simultaneously
+        """
+        self.batch_size = batch_size
+
+    @classmethod
+    def getidentifier(cls):
+        return 'numpymc'
+
+    @classmethod
+    def create_configurator(cls):
+        return NumpyMonteCarloConfigurator()
+
+    def getversion(self):
+        return VERSION
+
+    def create_expander(self):
+        return NumpyMonteCarloExpander()
+
+    def create_validator(self):
+        return NumpyMonteCarloValidator()
+
+    def create_exporter(self):
+        return NumpyMonteCarloExporter()
+
+    def create_importer(self):
+        return NumpyMonteCarloImporter()
+
+    def create_worker(self):
+        return NumpyMonteCarloWorker(self.batch_size)
+
+    def create_default_limits(self, options):
+        return [ShowersLimit(1000)]
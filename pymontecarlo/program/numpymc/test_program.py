@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+import os
+import math
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+from pymontecarlo.program.numpymc.program import NumpyMonteCarloProgram
+from pymontecarlo.runner.local import LocalSimulationRunner
+from pymontecarlo.options.options import Options
+from pymontecarlo.options.beam import GaussianBeam
+from pymontecarlo.options.beam.cylindrical import CylindricalBeam
+from pymontecarlo.options.material import Material
+from pymontecarlo.options.sample import \
+    SubstrateSample, HorizontalLayerSample, InclusionSample
+from pymontecarlo.options.analysis import PhotonIntensityAnalysis, KRatioAnalysis
+from pymontecarlo.options.detector import PhotonDetector
+from pymontecarlo.options.limit import ShowersLimit
+from pymontecarlo.options.model import ElasticCrossSectionModel, EnergyLossModel
+from pymontecarlo.options.particle import Particle
+from pymontecarlo.results.photonintensity import \
+    EmittedPhotonIntensityResult, GeneratedPhotonIntensityResult
+from pymontecarlo.results.kratio import KRatioResult
+from pymontecarlo.exceptions import ValidationError
+
+# Globals and constants variables.
+
+class TestNumpyMonteCarloProgram(TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.program = NumpyMonteCarloProgram(batch_size=100)
+
+    def _create_options(self, sample, analyses=None):
+        beam = GaussianBeam(10e3, 10e-9)
+        if analyses is None:
+            analyses = [PhotonIntensityAnalysis(self.create_basic_photondetector())]
+        limits = [ShowersLimit(200)]
+        return Options(self.program, beam, sample, analyses, limits, [])
+
+    def testvalidate(self):
+        validator = self.program.create_validator()
+
+        options = self._create_options(self.create_basic_sample())
+        options = validator.validate_options(options)
+        self.assertIn(ElasticCrossSectionModel.RUTHERFORD_RELATIVISTIC, options.models)
+        self.assertIn(EnergyLossModel.JOY_LUO1989, options.models)
+
+        options = self._create_options(InclusionSample(Material.pure(29),
+                                                       Material.pure(79), 1e-6))
+        self.assertRaises(ValidationError, validator.validate_options, options)
+
+        options = self._create_options(self.create_basic_sample())
+        options.beam = GaussianBeam(10e3, 10e-9, Particle.POSITRON)
+        self.assertRaises(ValidationError, validator.validate_options, options)
+
+        options = self._create_options(self.create_basic_sample())
+        options.beam = CylindricalBeam(10e3, 10e-9)
+        self.assertRaises(ValidationError, validator.validate_options, options)
+
+    def testexport(self):
+        options = self._create_options(self.create_basic_sample())
+        options = self.program.create_validator().validate_options(options)
+
+        outputdir = self.create_temp_dir()
+        self.program.create_exporter().export(options, outputdir)
+        self.assertTrue(os.path.exists(os.path.join(outputdir, 'input.json')))
+
+    def _run(self, *options):
+        with LocalSimulationRunner(max_workers=2) as runner:
+            runner.submit(*options)
+        return runner.project.simulations
+
+    def testrun_substrate(self):
+        options = self._create_options(self.create_basic_sample())
+        simulation, = self._run(options)
+
+        emitted = simulation.find_result(EmittedPhotonIntensityResult)[0]
+        generated = simulation.find_result(GeneratedPhotonIntensityResult)[0]
+
+        q_emitted = emitted[(29, 'Ka1')]
+        q_generated = generated[(29, 'Ka1')]
+        self.assertGreater(q_emitted.nominal_value, 0.0)
+        self.assertGreater(q_emitted.std_dev, 0.0)
+        self.assertLessEqual(q_emitted.nominal_value, q_generated.nominal_value)
+
+        # Transition set added by the analysis
+        self.assertIn((29, 'Ka'), emitted)
+
+    def testrun_layers(self):
+        sample = HorizontalLayerSample(Material.pure(79))
+        sample.add_layer(Material.pure(29), 50e-9)
+        options = self._create_options(sample)
+        simulation, = self._run(options)
+
+        emitted = simulation.find_result(EmittedPhotonIntensityResult)[0]
+        self.assertGreater(emitted[(29, 'Ka1')].nominal_value, 0.0)
+        self.assertGreater(emitted[(79, 'Ma1')].nominal_value, 0.0)
+
+    def testrun_detector_below_surface(self):
+        detector = PhotonDetector('below', math.radians(-10.0))
+        options = self._create_options(self.create_basic_sample(),
+                                       [PhotonIntensityAnalysis(detector)])
+        simulation, = self._run(options)
+
+        emitted = simulation.find_result(EmittedPhotonIntensityResult)[0]
+        generated = simulation.find_result(GeneratedPhotonIntensityResult)[0]
+        self.assertAlmostEqual(0.0, emitted[(29, 'Ka1')].nominal_value, 30)
+        self.assertGreater(generated[(29, 'Ka1')].nominal_value, 0.0)
+
+    def testrun_kratio(self):
+        material = Material.from_formula('CuAu')
+        analysis = KRatioAnalysis(self.create_basic_photondetector())
+        options = self._create_options(SubstrateSample(material), [analysis])
+        simulations = self._run(options)
+
+        # Unknown and two standards
+        self.assertEqual(3, len(simulations))
+
+        simulation = next(s for s in simulations
+                          if s.options.sample.material == material)
+        result = simulation.find_result(KRatioResult)[0]
+
+        kratio_cu = result[(29, 'Ka1')].nominal_value
+        kratio_au = result[(79, 'Ma1')].nominal_value
+        self.assertGreater(kratio_cu, 0.0)
+        self.assertLess(kratio_cu, 1.0)
+        self.assertGreater(kratio_au, 0.0)
+        self.assertLess(kratio_au, 1.0)
+
+if __name__ == '__main__': # pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
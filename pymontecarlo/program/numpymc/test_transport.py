@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+import math
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+from pymontecarlo.program.numpymc.transport import \
+    (Region, XrayLineData, simulate, calculate_absorption_path,
+     ENERGY_LOSS_BETHE1930, ENERGY_LOSS_JOY_LUO1989)
+
+# Globals and constants variables.
+
+def _create_copper(zmin_cm=-math.inf, zmax_cm=0.0):
+    return Region(zmin_cm, zmax_cm, [29], [1.0], [63.546], 8.96)
+
+def _create_copper_ka():
+    return XrayLineData(29, 'K', 8.979, 2, 0.2557)
+
+class TestRegion(TestCase):
+
+    def testvacuum(self):
+        region = Region(-1e-5, 0.0, [], [], [], 0.0)
+        self.assertTrue(region.is_vacuum())
+        self.assertFalse(_create_copper().is_vacuum())
+
+    def teststopping_power(self):
+        region = _create_copper()
+        energies_keV = np.array([1.0, 5.0, 15.0])
+
+        for energy_loss in [ENERGY_LOSS_BETHE1930, ENERGY_LOSS_JOY_LUO1989]:
+            stopping_powers = region.stopping_power(energies_keV, energy_loss)
+            self.assertTrue(np.all(stopping_powers > 0.0))
+            self.assertTrue(np.all(np.diff(stopping_powers) < 0.0))
+
+        # About 10.7 MeV cm2/g at 15 keV (ESTAR), i.e. 9.6e4 keV/cm
+        stopping_power = region.stopping_power(np.array([15.0]), ENERGY_LOSS_JOY_LUO1989)[0]
+        self.assertAlmostEqual(9.6e4, stopping_power, delta=1.5e4)
+
+class TestXrayLineData(TestCase):
+
+    def testionization_cross_sections(self):
+        xrayline = _create_copper_ka()
+        sigmas = xrayline.ionization_cross_sections(np.array([5.0, 15.0, 30.0]))
+        self.assertAlmostEqual(0.0, sigmas[0], 30)
+        self.assertGreater(sigmas[1], 0.0)
+        self.assertGreater(sigmas[2], sigmas[1])
+
+class TestTransport(TestCase):
+
+    def testcalculate_absorption_path(self):
+        regions = [_create_copper(-1e-5, 0.0), _create_copper(-math.inf, -1e-5)]
+        zs_cm = np.array([0.0, -0.5e-5, -2e-5])
+        exponents = calculate_absorption_path(regions, zs_cm, [1.0, 2.0])
+        np.testing.assert_allclose([0.0, 0.5e-5, 1e-5 + 2e-5], exponents)
+
+    def testsimulate(self):
+        regions = [_create_copper()]
+        xraylines = [_create_copper_ka()]
+        attenuations = [[[500.0]]]
+
+        generated, emitted = simulate(regions, 15.0, 200, xraylines, attenuations,
+                                      seed=1, batch_size=50)
+
+        self.assertEqual((1, 2), generated.shape)
+        self.assertEqual((1, 1, 2), emitted.shape)
+        self.assertGreater(generated[0, 0], 0.0)
+        self.assertGreater(generated[0, 1], 0.0)
+        self.assertLess(emitted[0, 0, 0], generated[0, 0])
+
+        # Reproducible
+        generated2, _emitted2 = simulate(regions, 15.0, 200, xraylines, attenuations,
+                                         seed=1, batch_size=200)
+        self.assertAlmostEqual(generated[0, 0], generated2[0, 0], delta=3 * generated[0, 1])
+
+        generated3, _emitted3 = simulate(regions, 15.0, 200, xraylines, attenuations,
+                                         seed=1, batch_size=50)
+        np.testing.assert_allclose(generated, generated3)
+
+    def testsimulate_thin_film(self):
+        xraylines = [_create_copper_ka()]
+
+        regions = [_create_copper(-10e-7, 0.0), Region(-math.inf, -10e-7, [], [], [], 0.0)]
+        generated_film, _emitted = simulate(regions, 15.0, 200, xraylines,
+                                            [[[0.0, 0.0]]], seed=1)
+
+        regions = [_create_copper()]
+        generated_bulk, _emitted = simulate(regions, 15.0, 200, xraylines,
+                                            [[[0.0]]], seed=1)
+
+        self.assertGreater(generated_film[0, 0], 0.0)
+        self.assertLess(generated_film[0, 0], generated_bulk[0, 0])
+
+    def testsimulate_below_edge(self):
+        regions = [_create_copper()]
+        xraylines = [_create_copper_ka()]
+        generated, emitted = simulate(regions, 5.0, 10, xraylines, [[[0.0]]], seed=1)
+        self.assertAlmostEqual(0.0, generated[0, 0], 30)
+        self.assertAlmostEqual(0.0, emitted[0, 0, 0], 30)
+
+    def testsimulate_higher_edge(self):
+        regions = [Region(-math.inf, 0.0, [29, 79], [0.5, 0.5], [63.546, 196.967], 13.0)]
+        copper_ka = _create_copper_ka()
+        gold_la = XrayLineData(79, 'L3', 11.919, 4, 0.7)
+
+        generated, _emitted = simulate(regions, 15.0, 100, [copper_ka],
+                                       [[[0.0]]], seed=1)
+        generated2, _emitted2 = simulate(regions, 15.0, 100, [copper_ka, gold_la],
+                                         [[[0.0], [0.0]]], seed=1)
+
+        # The line with a higher edge does not stop the electrons earlier
+        np.testing.assert_allclose(generated[0], generated2[0])
+        self.assertGreater(generated2[1, 0], 0.0)
+
+    def testsimulate_cancel(self):
+        regions = [_create_copper()]
+        xraylines = [_create_copper_ka()]
+        fractions = []
+
+        def callback(fraction):
+            fractions.append(fraction)
+            return False
+
+        results = simulate(regions, 15.0, 100, xraylines, [[[0.0]]],
+                           batch_size=10, callback=callback)
+        self.assertIsNone(results)
+        self.assertEqual([0.1], fractions)
+
+if __name__ == '__main__': # pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
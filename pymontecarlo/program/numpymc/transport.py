@@ -0,0 +1,352 @@
+"""
+Vectorized electron transport.
+
+The electrons of a batch are tracked simultaneously as arrays (position,
+direction, energy), following the single scattering scheme of Joy (1995):
+the step length is sampled from the elastic mean free path, the energy
+lost along the step is given by a continuous slowing down approximation
+and the direction is changed by a screened Rutherford elastic scattering.
+The sample is a stack of horizontal regions (layers and substrate).
+
+All quantities are in keV, cm and g/cm3.
+"""
+
+# Standard library modules.
+import math
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Globals and constants variables.
+
+AVOGADRO = 6.02214076e23
+ELECTRON_REST_ENERGY_keV = 511.0
+
+ELASTIC_RUTHERFORD = 'RUTHERFORD'
+ELASTIC_RUTHERFORD_RELATIVISTIC = 'RUTHERFORD_RELATIVISTIC'
+
+ENERGY_LOSS_BETHE1930 = 'BETHE1930'
+ENERGY_LOSS_JOY_LUO1989 = 'JOY_LUO1989'
+
+MINIMUM_ENERGY_keV = 0.05
+
+# Distance to move an electron past a boundary
+BOUNDARY_EPSILON_cm = 1e-10
+
+# Constant of the ionization cross section of each shell (Powell, 1976)
+IONIZATION_CONSTANTS = {'K': 0.35, 'L': 0.25, 'M': 0.25}
+
+class Region:
+    """
+    Horizontal region of the sample between *zmin_cm* and *zmax_cm*.
+    A region without element is vacuum.
+    """
+
+    def __init__(self, zmin_cm, zmax_cm, zs, wfs, atomic_weights, density_g_per_cm3):
+        self.zmin_cm = zmin_cm
+        self.zmax_cm = zmax_cm
+        self.zs = np.asarray(zs, dtype=float)
+        self.wfs = np.asarray(wfs, dtype=float)
+        self.atomic_weights = np.asarray(atomic_weights, dtype=float)
+        self.density_g_per_cm3 = density_g_per_cm3
+
+        # Number of atoms per cm3 of each element
+        self.densities_atoms = \
+            AVOGADRO * density_g_per_cm3 * self.wfs / self.atomic_weights
+
+        # Mean ionization potential (Berger and Seltzer, 1964)
+        if self.is_vacuum():
+            self.j_keV = 1.0
+            self.k = 0.0
+            self.zoa = 0.0
+        else:
+            zoas = self.wfs * self.zs / self.atomic_weights
+            js_keV = (9.76 * self.zs + 58.5 * self.zs ** -0.19) * 1e-3
+            self.zoa = zoas.sum()
+            self.j_keV = math.exp((zoas * np.log(js_keV)).sum() / self.zoa)
+
+            # Joy and Luo (1989)
+            zmean = (self.wfs * self.zs).sum()
+            self.k = 0.731 + 0.0688 * math.log10(zmean)
+
+    def is_vacuum(self):
+        return len(self.zs) == 0 or self.density_g_per_cm3 <= 0.0
+
+    def screening(self, energies_keV):
+        """
+        Returns the screening parameter of each element (columns) for each
+        energy (rows).
+        """
+        return 3.4e-3 * self.zs[np.newaxis, :] ** 0.67 / energies_keV[:, np.newaxis]
+
+    def elastic_cross_sections(self, energies_keV, alphas, elastic):
+        """
+        Returns the screened Rutherford cross section (cm2) of each element.
+        """
+        energies = energies_keV[:, np.newaxis]
+        sigmas = 5.21e-21 * self.zs[np.newaxis, :] ** 2 / energies ** 2 * \
+            4.0 * math.pi / (alphas * (1.0 + alphas))
+
+        if elastic == ELASTIC_RUTHERFORD_RELATIVISTIC:
+            sigmas *= ((energies + ELECTRON_REST_ENERGY_keV) /
+                       (energies + 2 * ELECTRON_REST_ENERGY_keV)) ** 2
+
+        return sigmas
+
+    def stopping_power(self, energies_keV, energy_loss):
+        """
+        Returns the stopping power (keV/cm).
+        """
+        if energy_loss == ENERGY_LOSS_JOY_LUO1989:
+            argument = 1.166 * (energies_keV + self.k * self.j_keV) / self.j_keV
+        else:
+            argument = np.maximum(1.166 * energies_keV / self.j_keV, math.e)
+
+        return 7.85e4 * self.density_g_per_cm3 * self.zoa / energies_keV * np.log(argument)
+
+class XrayLineData:
+    """
+    Atomic data of an X-ray line of an element.
+    """
+
+    def __init__(self, z, shell, edge_keV, occupancy, probability):
+        self.z = z
+        self.shell = shell
+        self.edge_keV = edge_keV
+        self.occupancy = occupancy
+        self.probability = probability
+
+    def ionization_cross_sections(self, energies_keV):
+        """
+        Returns the ionization cross section (cm2) of the shell of the line,
+        using the Bethe formula.
+        """
+        u = energies_keV / self.edge_keV
+        b = IONIZATION_CONSTANTS.get(self.shell, 0.25)
+        sigmas = 6.51e-20 * self.occupancy * b * np.log(np.maximum(u, 1.0)) / \
+            (np.maximum(u, 1.0) * self.edge_keV ** 2)
+        return np.where(u > 1.0, sigmas, 0.0)
+
+def _find_regions(regions, zs_cm):
+    """
+    Returns the index of the region of each position, or -1 if outside
+    the sample.
+    """
+    indexes = np.full(len(zs_cm), -1, dtype=int)
+    for i, region in enumerate(regions):
+        indexes[(zs_cm > region.zmin_cm) & (zs_cm <= region.zmax_cm)] = i
+    return indexes
+
+def _rotate(us, vs, ws, costhetas, phis):
+    sinthetas = np.sqrt(np.maximum(1.0 - costhetas ** 2, 0.0))
+    cosphis = np.cos(phis)
+    sinphis = np.sin(phis)
+
+    normal = np.abs(ws) < 0.99999
+    sq = np.sqrt(np.where(normal, 1.0 - ws ** 2, 1.0))
+
+    newus = np.where(normal,
+                     us * costhetas + sinthetas * (us * ws * cosphis - vs * sinphis) / sq,
+                     sinthetas * cosphis)
+    newvs = np.where(normal,
+                     vs * costhetas + sinthetas * (vs * ws * cosphis + us * sinphis) / sq,
+                     sinthetas * sinphis)
+    newws = np.where(normal,
+                     ws * costhetas - sq * sinthetas * cosphis,
+                     np.sign(ws) * costhetas)
+
+    return newus, newvs, newws
+
+def calculate_absorption_path(regions, zs_cm, attenuations):
+    """
+    Returns the exponent of the absorption of the photons emitted at
+    depths *zs_cm* along their path to the surface.
+
+    :arg attenuations: attenuation per unit depth (1/cm) in each region,
+        i.e. mass absorption coefficient times density divided by the
+        sine of the elevation of the detector
+    """
+    exponents = np.zeros(len(zs_cm))
+    for region, attenuation in zip(regions, attenuations):
+        if attenuation == 0.0:
+            continue
+        lengths = np.minimum(region.zmax_cm, 0.0) - np.maximum(region.zmin_cm, zs_cm)
+        exponents += attenuation * np.maximum(lengths, 0.0)
+    return exponents
+
+def simulate(regions, energy_keV, showers, xraylines, attenuations,
+             beam_sigma_cm=0.0, direction=(0.0, 0.0, -1.0),
+             elastic=ELASTIC_RUTHERFORD_RELATIVISTIC,
+             energy_loss=ENERGY_LOSS_JOY_LUO1989,
+             seed=None, batch_size=1000, callback=None):
+    """
+    Simulates *showers* electrons and returns the generated and emitted
+    intensities (photons per electron) of each X-ray line, as
+    :class:`numpy.ndarray` of the mean and standard error.
+
+    :arg regions: :class:`list` of :class:`Region`, from the surface
+    :arg xraylines: :class:`list` of :class:`XrayLineData`
+    :arg attenuations: :class:`numpy.ndarray` of shape (number of
+        detectors, number of X-ray lines, number of regions), see
+        :func:`calculate_absorption_path`
+    :arg callback: function called after each batch with the fraction of
+        simulated electrons. If it returns ``False``, the simulation stops
+        and ``None`` is returned.
+
+    :return: generated intensities, of shape (number of X-ray lines, 2),
+        and emitted intensities, of shape (number of detectors, number of
+        X-ray lines, 2)
+    """
+    random = np.random.RandomState(seed)
+    attenuations = np.asarray(attenuations, dtype=float)
+    ndetectors = attenuations.shape[0]
+    nlines = len(xraylines)
+
+    # Electrons below all edges do not generate X-rays.
+    # Below the edge of a line, its ionization cross section is zero.
+    edges_keV = [xrayline.edge_keV for xrayline in xraylines]
+    minimum_energy_keV = max(MINIMUM_ENERGY_keV, min(edges_keV, default=0.0))
+
+    # Index of the element of each X-ray line in each region
+    line_elements = []
+    for region in regions:
+        indexes = []
+        for xrayline in xraylines:
+            matches = np.nonzero(region.zs == xrayline.z)[0]
+            indexes.append(matches[0] if len(matches) else -1)
+        line_elements.append(indexes)
+
+    generated_sums = np.zeros((nlines, 2))
+    emitted_sums = np.zeros((ndetectors, nlines, 2))
+
+    simulated = 0
+    while simulated < showers:
+        count = min(batch_size, showers - simulated)
+
+        generated = np.zeros((count, nlines))
+        emitted = np.zeros((ndetectors, count, nlines))
+
+        xs = random.normal(0.0, beam_sigma_cm, count) if beam_sigma_cm > 0 else np.zeros(count)
+        ys = random.normal(0.0, beam_sigma_cm, count) if beam_sigma_cm > 0 else np.zeros(count)
+        zs = np.zeros(count)
+        us = np.full(count, direction[0])
+        vs = np.full(count, direction[1])
+        ws = np.full(count, direction[2])
+        energies = np.full(count, float(energy_keV))
+        indexes = np.arange(count) # index of each electron in the tallies
+
+        if energy_keV <= minimum_energy_keV:
+            zs[:] = 1.0 # nothing to simulate
+
+        while True:
+            region_indexes = _find_regions(regions, zs)
+            alive = (region_indexes >= 0) & (energies > minimum_energy_keV)
+            if not alive.any():
+                break
+
+            xs, ys, zs = xs[alive], ys[alive], zs[alive]
+            us, vs, ws = us[alive], vs[alive], ws[alive]
+            energies = energies[alive]
+            indexes = indexes[alive]
+            region_indexes = region_indexes[alive]
+
+            for i, region in enumerate(regions):
+                mask = region_indexes == i
+                if not mask.any():
+                    continue
+
+                n = mask.sum()
+                rz = zs[mask]
+                rw = ws[mask]
+                renergies = energies[mask]
+
+                # Distance to the boundaries of the region
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    distances = np.where(rw < 0.0, (rz - region.zmin_cm) / -rw,
+                                         np.where(rw > 0.0, (region.zmax_cm - rz) / rw, np.inf))
+
+                if region.is_vacuum():
+                    steps = distances
+                    crossing = np.ones(n, dtype=bool)
+                    alphas = sigmas = None
+                else:
+                    alphas = region.screening(renergies)
+                    sigmas = region.elastic_cross_sections(renergies, alphas, elastic)
+                    inverse_mfps = (sigmas * region.densities_atoms[np.newaxis, :]).sum(axis=1)
+                    steps = -np.log(1.0 - random.uniform(size=n)) / inverse_mfps
+                    crossing = steps > distances
+                    steps = np.where(crossing, distances, steps)
+
+                # Electrons leaving the sample through an infinite vacuum
+                steps = np.where(np.isfinite(steps), steps, 0.0)
+                steps_boundary = steps + np.where(crossing, BOUNDARY_EPSILON_cm, 0.0)
+
+                # X-ray generation along the step, at its midpoint
+                if not region.is_vacuum():
+                    zmids = rz + rw * steps / 2
+                    rindexes = indexes[mask]
+
+                    for l, xrayline in enumerate(xraylines):
+                        element = line_elements[i][l]
+                        if element < 0:
+                            continue
+
+                        photons = region.densities_atoms[element] * \
+                            xrayline.ionization_cross_sections(renergies) * \
+                            xrayline.probability * steps
+                        generated[rindexes, l] += photons
+
+                        for d in range(ndetectors):
+                            exponents = calculate_absorption_path(regions, zmids, attenuations[d, l])
+                            emitted[d, rindexes, l] += photons * np.exp(-exponents)
+
+                    losses = region.stopping_power(renergies, energy_loss) * steps
+                    energies[mask] = renergies - np.maximum(losses, 0.0)
+
+                xs[mask] += us[mask] * steps_boundary
+                ys[mask] += vs[mask] * steps_boundary
+                zs[mask] = rz + rw * steps_boundary
+
+                # Electrons in infinite vacuum leave the sample
+                zs[mask] = np.where(np.isinf(distances) & crossing, np.inf, zs[mask])
+
+                # Elastic scattering of the electrons which did not cross a boundary
+                scatter = ~crossing
+                if sigmas is None or not scatter.any():
+                    continue
+
+                ssigmas = sigmas[scatter] * region.densities_atoms[np.newaxis, :]
+                cumulative = np.cumsum(ssigmas, axis=1)
+                r = random.uniform(size=len(ssigmas)) * cumulative[:, -1]
+                elements = np.minimum((cumulative < r[:, np.newaxis]).sum(axis=1),
+                                      len(region.zs) - 1)
+                salphas = alphas[scatter, elements]
+
+                r = random.uniform(size=len(ssigmas))
+                costhetas = 1.0 - 2.0 * salphas * r / (1.0 + salphas - r)
+                phis = random.uniform(0.0, 2 * math.pi, size=len(ssigmas))
+
+                positions = np.nonzero(mask)[0][scatter]
+                us[positions], vs[positions], ws[positions] = \
+                    _rotate(us[positions], vs[positions], ws[positions], costhetas, phis)
+
+        generated_sums[:, 0] += generated.sum(axis=0)
+        generated_sums[:, 1] += (generated ** 2).sum(axis=0)
+        emitted_sums[:, :, 0] += emitted.sum(axis=1)
+        emitted_sums[:, :, 1] += (emitted ** 2).sum(axis=1)
+
+        simulated += count
+
+        if callback is not None and callback(simulated / showers) is False:
+            return None
+
+    return _calculate_statistics(generated_sums, showers), \
+        _calculate_statistics(emitted_sums, showers)
+
+def _calculate_statistics(sums, count):
+    means = sums[..., 0] / count
+    variances = np.maximum(sums[..., 1] / count - means ** 2, 0.0)
+    errors = np.sqrt(variances / count)
+    return np.stack([means, errors], axis=-1)
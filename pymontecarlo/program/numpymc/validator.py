@@ -0,0 +1,53 @@
+""""""
+
+# Standard library modules.
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.program.validator import Validator
+from pymontecarlo.options.beam import GaussianBeam
+from pymontecarlo.options.sample import SubstrateSample, HorizontalLayerSample
+from pymontecarlo.options.analysis import PhotonIntensityAnalysis, KRatioAnalysis
+from pymontecarlo.options.limit import ShowersLimit
+from pymontecarlo.options.model import ElasticCrossSectionModel, EnergyLossModel
+from pymontecarlo.options.particle import Particle
+
+# Globals and constants variables.
+
+class NumpyMonteCarloValidator(Validator):
+
+    def __init__(self):
+        super().__init__()
+
+        self.beam_validate_methods[GaussianBeam] = self._validate_beam_gaussian
+
+        self.sample_validate_methods[SubstrateSample] = self._validate_sample_substrate
+        self.sample_validate_methods[HorizontalLayerSample] = self._validate_sample_horizontallayers
+
+        self.analysis_validate_methods[PhotonIntensityAnalysis] = self._validate_analysis_photonintensity
+        self.analysis_validate_methods[KRatioAnalysis] = self._validate_analysis_kratio
+
+        self.limit_validate_methods[ShowersLimit] = self._validate_limit_showers
+
+        self.model_validate_methods[ElasticCrossSectionModel] = self._validate_model_valid_models
+        self.model_validate_methods[EnergyLossModel] = self._validate_model_valid_models
+
+        self.valid_models[ElasticCrossSectionModel] = \
+            [ElasticCrossSectionModel.RUTHERFORD,
+             ElasticCrossSectionModel.RUTHERFORD_RELATIVISTIC]
+        self.default_models[ElasticCrossSectionModel] = \
+            ElasticCrossSectionModel.RUTHERFORD_RELATIVISTIC
+
+        self.valid_models[EnergyLossModel] = \
+            [EnergyLossModel.JOY_LUO1989, EnergyLossModel.BETHE1930]
+        self.default_models[EnergyLossModel] = EnergyLossModel.JOY_LUO1989
+
+    def _validate_beam_base_particle(self, particle, options, errors):
+        particle = super()._validate_beam_base_particle(particle, options, errors)
+
+        if particle is not Particle.ELECTRON:
+            exc = ValueError('Only electron beams are supported.')
+            errors.add(exc)
+
+        return particle
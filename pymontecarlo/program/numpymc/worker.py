@@ -0,0 +1,78 @@
+""""""
+
+# Standard library modules.
+import os
+import json
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+from pymontecarlo.program.worker import StagedWorker
+from pymontecarlo.program.numpymc.exporter import INPUT_FILENAME
+from pymontecarlo.program.numpymc.transport import Region, XrayLineData, simulate
+
+# Globals and constants variables.
+
+RESULTS_FILENAME = 'results.json'
+
+class NumpyMonteCarloWorker(StagedWorker):
+
+    def __init__(self, batch_size=1000):
+        self.batch_size = batch_size
+
+    def execute(self, token, simulation, outputdir):
+        token.update(0.0, 'Started')
+
+        filepath = os.path.join(outputdir, INPUT_FILENAME)
+        with open(filepath, 'r') as fp:
+            indict = json.load(fp)
+
+        regions = [Region(r['zmin_cm'], r['zmax_cm'], r['zs'], r['wfs'],
+                          r['atomic_weights'], r['density_g_per_cm3'])
+                   for r in indict['regions']]
+        xraylines = [XrayLineData(x['z'], x['shell'], x['edge_keV'],
+                                  x['occupancy'], x['probability'])
+                     for x in indict['xraylines']]
+
+        # Attenuation per unit depth along the path to each detector.
+        # Detectors below the surface of the sample are not simulated.
+        detectors = indict['detectors']
+        visibles = [detector for detector in detectors if detector['sin_elevation'] > 0.0]
+        coefficients = np.reshape(indict['attenuations'], (len(xraylines), len(regions)))
+        attenuations = np.array([coefficients / detector['sin_elevation']
+                                 for detector in visibles])
+        attenuations = attenuations.reshape(len(visibles), len(xraylines), len(regions))
+
+        def callback(fraction):
+            token.update(fraction, 'Running')
+            return not token.cancelled()
+
+        results = simulate(regions, indict['energy_keV'], indict['showers'],
+                           xraylines, attenuations,
+                           beam_sigma_cm=indict['beam_sigma_cm'],
+                           direction=indict['direction'],
+                           elastic=indict['elastic'],
+                           energy_loss=indict['energy_loss'],
+                           seed=indict['seed'],
+                           batch_size=self.batch_size,
+                           callback=callback)
+        if results is None: # Cancelled
+            return
+
+        generated, emitted = results
+
+        outdict = {'xraylines': [[x['z'], x['transition']] for x in indict['xraylines']],
+                   'generated': generated.tolist(),
+                   'emitted': {}}
+
+        for detector in detectors:
+            outdict['emitted'][detector['name']] = np.zeros_like(generated).tolist()
+        for detector, values in zip(visibles, emitted):
+            outdict['emitted'][detector['name']] = values.tolist()
+
+        filepath = os.path.join(outputdir, RESULTS_FILENAME)
+        with open(filepath, 'w') as fp:
+            json.dump(outdict, fp)
+
+        token.update(1.0, 'Done')
@@ -4,14 +4,19 @@
 # Standard library modules.
 import unittest
 import logging
+import sys
+import threading
 
 # Third party modules.
+import psutil
 
 # Local modules.
 from pymontecarlo.testcase import TestCase
 from pymontecarlo.mock import WorkerMock
 from pymontecarlo.simulation import Simulation
 from pymontecarlo.util.future import Token
+from pymontecarlo.program.worker import SubprocessWorkerMixin
+from pymontecarlo.exceptions import WorkerTimeoutError
 
 # Globals and constants variables.
 
@@ -34,6 +39,43 @@ class TestWorker(TestCase):
         self.assertEqual('Done', token.status)
         self.assertFalse(token.cancelled())
 
+class TestSubprocessWorkerMixin(TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.w = SubprocessWorkerMixin()
+
+    def testwait_process(self):
+        token = Token()
+        args = [sys.executable, '-c', 'import time; time.sleep(0.3)']
+        process = self.w._create_process(args)
+        self.w._wait_process(process, token, interval=0.1)
+
+        self.assertGreater(token.peak_rss_bytes, 0)
+
+    def testwait_process_timeout(self):
+        token = Token()
+        args = [sys.executable, '-c', 'import time; time.sleep(30)']
+        process = self.w._create_process(args)
+
+        timer = threading.Timer(0.2, token.timeout, args=('Too long',))
+        timer.start()
+
+        self.assertRaises(WorkerTimeoutError,
+                          self.w._wait_process, process, token, 0.1)
+        self.assertIsNotNone(process.wait(5))
+
+    @unittest.skipUnless(hasattr(psutil.Process, 'cpu_affinity'),
+                         'CPU affinity not supported')
+    def testcpu_affinity(self):
+        self.w.cpu_affinity = [0]
+
+        args = [sys.executable, '-c', 'import time; time.sleep(0.3)']
+        process = self.w._create_process(args)
+        self.assertEqual([0], psutil.Process(process.pid).cpu_affinity())
+        self.w._wait_process(process, Token(), interval=0.1)
+
 if __name__ == '__main__': #pragma: no cover
     logging.getLogger().setLevel(logging.DEBUG)
     unittest.main()
@@ -8,10 +8,9 @@ import math
 # Third party modules.
 import pyxray.descriptor
 
-import matplotlib.colors
-
 # Local modules.
 from pymontecarlo.exceptions import ValidationError
+from pymontecarlo.util.color import is_color_like
 from pymontecarlo.options.options import Options
 from pymontecarlo.options.beam.gaussian import GaussianBeam
 from pymontecarlo.options.beam.cylindrical import CylindricalBeam
@@ -258,7 +257,7 @@ class Validator(object):
         return density_kg_per_m3
 
     def _validate_material_base_color(self, color, options, errors):
-        if not matplotlib.colors.is_color_like(color):
+        if not is_color_like(color):
             exc = ValueError('Color ({}) is not a valid color.'
                              .format(color))
             errors.add(exc)
@@ -13,7 +13,8 @@ import abc
 import psutil
 
 # Local modules.
-from pymontecarlo.exceptions import WorkerError, WorkerCancelledError
+from pymontecarlo.exceptions import \
+    WorkerError, WorkerCancelledError, WorkerTimeoutError
 
 # Globals and constants variables.
 
@@ -27,8 +28,13 @@ class Worker:
 
     A worker should not be directly used to start a simulation.
     One should rather use a runner.
+    
+    The runner may restrict the CPUs on which the worker runs by setting
+    :attr:`cpu_affinity` to a :class:`list` of CPU indexes.
     """
 
+    cpu_affinity = None
+
     @abc.abstractmethod
     def run(self, token, simulation, outputdir):
         """
@@ -39,6 +45,49 @@ class Worker:
         """
         raise NotImplementedError
 
+class StagedWorker(Worker):
+    """
+    Worker running a simulation in three stages: export of the options,
+    execution of the program and import of the results.
+    A runner may run the stages of different simulations concurrently,
+    so that the file I/O of one simulation overlaps with the computation
+    of another.
+    """
+
+    def export(self, token, simulation, outputdir):
+        """
+        Exports the options of the simulation in *outputdir*.
+        """
+        options = simulation.options
+        exporter = options.program.create_exporter()
+        exporter.export(options, outputdir)
+
+    @abc.abstractmethod
+    def execute(self, token, simulation, outputdir):
+        """
+        Runs the program on the exported simulation files.
+        """
+        raise NotImplementedError
+
+    def import_(self, token, simulation, outputdir):
+        """
+        Imports the results from *outputdir* in the simulation.
+        """
+        options = simulation.options
+        importer = options.program.create_importer()
+        simulation.results.extend(importer.import_(options, outputdir))
+
+    def run(self, token, simulation, outputdir):
+        self.export(token, simulation, outputdir)
+        if token.cancelled():
+            return
+
+        self.execute(token, simulation, outputdir)
+        if token.cancelled():
+            return
+
+        self.import_(token, simulation, outputdir)
+
 class SubprocessWorkerMixin:
 
     def _create_process(self, *args, **kwargs):
@@ -48,15 +97,53 @@ class SubprocessWorkerMixin:
         else:
             startupinfo = None
         logging.debug('Args: %s' % subprocess.list2cmdline(args[0]))
-        return subprocess.Popen(*args, startupinfo=startupinfo, **kwargs)
+        process = subprocess.Popen(*args, startupinfo=startupinfo, **kwargs)
+
+        cpu_affinity = getattr(self, 'cpu_affinity', None)
+        if cpu_affinity:
+            self._set_cpu_affinity(process, cpu_affinity)
+
+        return process
+
+    def _set_cpu_affinity(self, process, cpu_affinity):
+        psprocess = psutil.Process(process.pid)
+        if not hasattr(psprocess, 'cpu_affinity'): # Not supported on macOS
+            logging.debug('CPU affinity not supported')
+            return
+
+        try:
+            psprocess.cpu_affinity(list(cpu_affinity))
+        except psutil.Error:
+            logging.exception('Could not set CPU affinity')
+
+    def _update_usage(self, process, token):
+        try:
+            psprocess = psutil.Process(process.pid)
+            psprocesses = [psprocess] + psprocess.children(recursive=True)
+
+            cpu_time_s = 0.0
+            rss_bytes = 0
+            for psprocess in psprocesses:
+                cpu_times = psprocess.cpu_times()
+                cpu_time_s += cpu_times.user + cpu_times.system
+                rss_bytes += psprocess.memory_info().rss
+        except psutil.Error:
+            return
+
+        token.update_usage(cpu_time_s, rss_bytes)
 
     def _wait_process(self, process, token, interval=1):
         while True:
+            self._update_usage(process, token)
+
             if token.cancelled():
                 psprocess = psutil.Process(process.pid)
                 for subpsprocess in psprocess.children(recursive=True):
                     subpsprocess.kill()
                 psprocess.kill()
+
+                if token.timed_out():
+                    raise WorkerTimeoutError(token.timeout_reason)
                 raise WorkerCancelledError('Worker cancelled')
 
             try:
@@ -0,0 +1,4 @@
+"""
+Built-in analytical program, calculating the X-ray intensities of bulk
+samples with the XPP phi-rho-z model.
+"""
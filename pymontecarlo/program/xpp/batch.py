@@ -0,0 +1,85 @@
+"""
+Calculation of many options at once, without files nor runner.
+"""
+
+# Standard library modules.
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.program.xpp.program import XppProgram
+from pymontecarlo.program.xpp.phirhoz import calculate_intensities
+from pymontecarlo.options.options import Options
+from pymontecarlo.project import Project
+from pymontecarlo.simulation import Simulation
+from pymontecarlo.formats.series.base import create_identifier
+from pymontecarlo.formats.series.options.base import create_options_dataframe
+
+# Globals and constants variables.
+
+def convert_options(options, program=None):
+    """
+    Returns a copy of the options calculated with the XPP program.
+    The limits and models of the options are not copied, since they are
+    specific to the original program; the default ones of XPP are used.
+    """
+    if program is None:
+        program = XppProgram()
+    return Options(program, options.beam, options.sample, list(options.analyses))
+
+def simulate(list_options, project=None):
+    """
+    Calculates the results of all options, and of the options required by
+    their analyses (e.g. standards of k-ratios), in a single vectorized
+    calculation.
+    Options of other programs are converted with :func:`convert_options`,
+    so that a sweep can be pre-screened before being simulated with a
+    Monte Carlo program.
+
+    :arg list_options: :class:`list` of :class:`Options`
+    :arg project: project where the simulations are added
+        (default: a new project)
+
+    :return: project
+    """
+    if project is None:
+        project = Project()
+
+    program = XppProgram()
+    validator = program.create_validator()
+    exporter = program.create_exporter()
+    importer = program.create_importer()
+
+    # Expand and validate the distinct options
+    validated = {} # key: fingerprint, value: options
+    for options in list_options:
+        if options.program.getidentifier() != program.getidentifier():
+            options = convert_options(options, program)
+
+        required_list_options = []
+        for analysis in options.analyses:
+            required_list_options.extend(analysis.apply(options))
+
+        for other in [options] + required_list_options:
+            valid_options = validator.validate_options(other)
+            validated.setdefault(valid_options.fingerprint(), valid_options)
+
+    valid_list_options = [options for options in validated.values()
+                          if project.find_simulation(options) is None]
+    if not valid_list_options:
+        return project
+
+    # Calculate
+    inputs = [exporter.create_input(options) for options in valid_list_options]
+    outputs = calculate_intensities(inputs)
+
+    df = create_options_dataframe(valid_list_options, only_different_columns=True)
+    identifiers = [create_identifier(series) for _index, series in df.iterrows()]
+
+    for options, outdict, identifier in zip(valid_list_options, outputs, identifiers):
+        results = importer.create_results(options, outdict)
+        project.add_simulation(Simulation(options, results, identifier))
+
+    project.recalculate()
+
+    return project
@@ -0,0 +1,22 @@
+""""""
+
+# Standard library modules.
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.program.configurator import Configurator
+
+# Globals and constants variables.
+
+class XppConfigurator(Configurator):
+
+    def prepare_parser(self, parser, program=None):
+        parser.description = 'Configure built-in XPP analytical program.'
+
+    def create_program(self, namespace, clasz):
+        return clasz()
+
+    @property
+    def fullname(self):
+        return 'XPP'
@@ -0,0 +1,136 @@
+""""""
+
+# Standard library modules.
+import os
+import json
+import math
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.program.exporter import Exporter
+from pymontecarlo.exceptions import ExportError
+from pymontecarlo.options.beam import GaussianBeam
+from pymontecarlo.options.sample import SubstrateSample
+from pymontecarlo.options.analysis import PhotonIntensityAnalysis, KRatioAnalysis
+from pymontecarlo.options.limit import ShowersLimit
+from pymontecarlo.options.model import \
+    MassAbsorptionCoefficientModel, IonizationCrossSectionModel
+from pymontecarlo.program.xpp.phirhoz import IONIZATION_CONSTANTS
+from pymontecarlo.util.absorption import mass_absorption_coefficient
+from pymontecarlo.util.element_data import atomic_weight
+from pymontecarlo.util.xraydata import iter_xrayline_data
+
+# Globals and constants variables.
+
+INPUT_FILENAME = 'input.json'
+
+class XppExporter(Exporter):
+
+    def __init__(self):
+        super().__init__()
+
+        self.beam_export_methods[GaussianBeam] = self._export_beam_gaussian
+
+        self.sample_export_methods[SubstrateSample] = self._export_sample_substrate
+
+        self.analysis_export_methods[PhotonIntensityAnalysis] = self._export_analysis_photonintensity
+        self.analysis_export_methods[KRatioAnalysis] = self._export_analysis_kratio
+
+        self.limit_export_methods[ShowersLimit] = self._export_limit_showers
+
+        self.model_export_methods[MassAbsorptionCoefficientModel] = self._export_model_mac
+        self.model_export_methods[IonizationCrossSectionModel] = self._export_model_ionization
+
+    def create_input(self, options):
+        """
+        Returns the input of the calculation as a :class:`dict`,
+        without writing it to a file.
+        It is assumed that the options object is valid for this program.
+        """
+        errors = set()
+        outdict = self._create_input(options, errors)
+
+        if errors:
+            raise ExportError(*errors)
+
+        return outdict
+
+    def _create_input(self, options, errors):
+        outdict = {'detectors': []}
+        self._run_exporters(options, errors, outdict)
+
+        if errors:
+            return outdict
+
+        self._export_xraylines(outdict)
+
+        return outdict
+
+    def _export(self, options, dirpath, errors):
+        outdict = self._create_input(options, errors)
+
+        if errors:
+            return
+
+        filepath = os.path.join(dirpath, INPUT_FILENAME)
+        with open(filepath, 'w') as fp:
+            json.dump(outdict, fp)
+
+    def _export_xraylines(self, outdict):
+        energy_keV = outdict['energy_keV']
+        composition = dict(zip(outdict['zs'], outdict['wfs']))
+
+        xraylines = []
+        for data in iter_xrayline_data(composition, energy_keV):
+            # Ionization cross sections are only calculated for these shells
+            if data['shell'] not in IONIZATION_CONSTANTS:
+                continue
+
+            data = data.copy()
+            data['wf'] = composition[data['z']]
+
+            if outdict['mac'] == MassAbsorptionCoefficientModel.NONE.name:
+                data['mac_cm2_per_g'] = 0.0
+            else:
+                data['mac_cm2_per_g'] = \
+                    mass_absorption_coefficient(composition, data['energy_keV'] * 1e3)
+
+            xraylines.append(data)
+
+        outdict['xraylines'] = xraylines
+
+    def _export_beam_gaussian(self, beam, errors, outdict):
+        outdict['energy_keV'] = beam.energy_eV / 1e3
+
+    def _export_sample_substrate(self, sample, errors, outdict):
+        composition = sample.material.composition
+        zs = sorted(composition)
+
+        outdict['zs'] = zs
+        outdict['wfs'] = [composition[z] for z in zs]
+        outdict['atomic_weights'] = [atomic_weight(z) for z in zs]
+
+    def _export_detector(self, detector, outdict):
+        names = [d['name'] for d in outdict['detectors']]
+        if detector.name in names:
+            return
+
+        # Normal incidence, the take-off angle is the elevation
+        outdict['detectors'].append({'name': detector.name,
+                                     'sin_elevation': math.sin(detector.elevation_rad)})
+
+    def _export_analysis_photonintensity(self, analysis, errors, outdict):
+        self._export_detector(analysis.photon_detector, outdict)
+
+    def _export_analysis_kratio(self, analysis, errors, outdict):
+        self._export_detector(analysis.photon_detector, outdict)
+
+    def _export_limit_showers(self, limit, errors, outdict):
+        pass
+
+    def _export_model_mac(self, model, errors, outdict):
+        outdict['mac'] = model.name
+
+    def _export_model_ionization(self, model, errors, outdict):
+        outdict['ionization'] = model.name
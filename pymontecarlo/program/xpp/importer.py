@@ -0,0 +1,16 @@
+""""""
+
+# Standard library modules.
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.program.importer import PhotonIntensityImporter
+from pymontecarlo.program.xpp.worker import RESULTS_FILENAME
+
+# Globals and constants variables.
+
+class XppImporter(PhotonIntensityImporter):
+
+    def __init__(self):
+        super().__init__(RESULTS_FILENAME)
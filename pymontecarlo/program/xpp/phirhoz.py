@@ -0,0 +1,278 @@
+"""
+Vectorized XPP phi-rho-z model.
+
+The depth distribution of the ionizations, phi(rho z), is described by
+the XPP model of Pouchou and Pichoir (1991): a sum of two exponentials
+whose parameters are derived from the area F under the distribution,
+the surface ionization phi(0), the mean depth and the initial slope.
+All functions take arrays where each item is one X-ray line in one
+sample, so that many options can be calculated at once.
+
+All quantities are in keV, cm and g/cm2.
+
+Reference:
+Pouchou, J.L. and Pichoir, F. (1991). Quantitative analysis of
+homogeneous or stratified microvolumes applying the model "PAP".
+In Electron Probe Quantitation, pp. 31-75. Plenum Press, New York.
+"""
+
+# Standard library modules.
+import collections
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+
+# Globals and constants variables.
+
+AVOGADRO = 6.02214076e23
+
+# Deceleration law of Pouchou and Pichoir
+DECELERATION_DS = (6.6e-6, 1.12e-5, 2.2e-6)
+
+# Constant of the ionization cross section of each shell (Powell, 1976)
+IONIZATION_CONSTANTS = {'K': 0.35, 'L': 0.25, 'M': 0.25}
+
+# Minimum relative difference between the two exponential slopes
+MINIMUM_EPSILON = 1e-6
+
+PhiRhoZ = collections.namedtuple('PhiRhoZ',
+                                 ['area', 'phi0', 'A', 'a', 'B', 'b', 'epsilon'])
+
+def calculate_matrix_parameters(zs, wfs, atomic_weights):
+    """
+    Returns the parameters of the matrix of each sample:
+    the sum of the Z/A ratios weighted by weight fraction (mol/g),
+    the mean ionization potential (keV) and the mean atomic number
+    for the backscattering.
+
+    :arg zs: array of shape (number of samples, number of elements).
+        Missing elements have an atomic number of 1 and a weight
+        fraction of 0.
+    :arg wfs: weight fractions, same shape as *zs*
+    :arg atomic_weights: atomic weights, same shape as *zs*
+    """
+    zs = np.asarray(zs, dtype=float)
+    wfs = np.asarray(wfs, dtype=float)
+    atomic_weights = np.asarray(atomic_weights, dtype=float)
+
+    zoas = wfs * zs / atomic_weights
+    m_zas = zoas.sum(axis=1)
+
+    js_keV = 1e-3 * zs * (10.04 + 8.25 * np.exp(-zs / 11.22))
+    j_keV = np.exp((zoas * np.log(js_keV)).sum(axis=1) / m_zas)
+
+    zbs = (wfs * np.sqrt(zs)).sum(axis=1) ** 2
+
+    return m_zas, j_keV, zbs
+
+def calculate_ionization_exponents(zs, shells):
+    """
+    Returns the exponent *m* of the ionization cross section
+    ``ln(U) / (U^m Ec^2)`` of each X-ray line (Pouchou, 1986).
+    """
+    zs = np.asarray(zs, dtype=float)
+    shells = np.asarray(shells)
+    return np.where(shells == 'K', 0.86 + 0.12 * np.exp(-(zs / 5.0) ** 2),
+                    np.where(shells == 'L', 0.82, 0.78))
+
+def calculate_ionization_cross_sections(energies_keV, edges_keV, exponents,
+                                        shells, occupancies):
+    """
+    Returns the ionization cross section (cm2) of the shell of each X-ray
+    line at the incident energy.
+    """
+    overvoltages = energies_keV / edges_keV
+    constants = np.array([IONIZATION_CONSTANTS.get(shell, 0.25) for shell in shells])
+    return 6.51e-20 * occupancies * constants * np.log(overvoltages) / \
+        (overvoltages ** exponents * edges_keV ** 2)
+
+def _calculate_inverse_stopping_factor(overvoltages, v0s, m_zas, j_keV, exponents):
+    ps = (0.78, 0.1, -(0.5 - 0.25 * j_keV))
+    ds = (DECELERATION_DS[0],
+          DECELERATION_DS[1] * (1.35 - 0.45 * j_keV ** 2),
+          DECELERATION_DS[2] / j_keV)
+
+    total = 0.0
+    for d, p in zip(ds, ps):
+        t = 1.0 + p - exponents
+        total += d * (v0s / overvoltages) ** p * \
+            (t * overvoltages ** t * np.log(overvoltages) - overvoltages ** t + 1.0) / t ** 2
+
+    return overvoltages / (v0s * m_zas) * total
+
+def _calculate_backscatter_factor(overvoltages, zbs):
+    etas = 1.75e-3 * zbs + 0.37 * (1.0 - np.exp(-0.015 * zbs ** 1.3))
+    ws = 0.595 + etas / 3.7 + etas ** 4.55
+    qs = (2.0 * ws - 1.0) / (1.0 - ws)
+    js = 1.0 + overvoltages * (np.log(overvoltages) - 1.0)
+    gs = (overvoltages - 1.0 - (1.0 - overvoltages ** -(1.0 + qs)) / (1.0 + qs)) / \
+        ((2.0 + qs) * js)
+    return 1.0 - etas * ws * (1.0 - gs), etas
+
+def calculate_phirhoz(energies_keV, edges_keV, exponents, m_zas, j_keV, zbs):
+    """
+    Returns the parameters of the phi-rho-z distribution of each X-ray
+    line as a :class:`PhiRhoZ` of arrays.
+    The distribution is
+    ``A exp(-a rho z) + (B rho z + phi0 - A) exp(-b rho z)``.
+
+    :arg energies_keV: incident energies
+    :arg edges_keV: ionization energies of the shell of the lines
+    :arg exponents: see :func:`calculate_ionization_exponents`
+    :arg m_zas, j_keV, zbs: see :func:`calculate_matrix_parameters`
+    """
+    energies_keV = np.asarray(energies_keV, dtype=float)
+    edges_keV = np.asarray(edges_keV, dtype=float)
+    exponents = np.asarray(exponents, dtype=float)
+    m_zas = np.asarray(m_zas, dtype=float)
+    j_keV = np.asarray(j_keV, dtype=float)
+    zbs = np.asarray(zbs, dtype=float)
+
+    overvoltages = energies_keV / edges_keV
+    v0s = energies_keV / j_keV
+
+    # Area
+    inverse_stopping = \
+        _calculate_inverse_stopping_factor(overvoltages, v0s, m_zas, j_keV, exponents)
+    backscatter, etas = _calculate_backscatter_factor(overvoltages, zbs)
+    qs = np.log(overvoltages) / (overvoltages ** exponents * edges_keV ** 2)
+    areas = backscatter * inverse_stopping / qs
+
+    # Surface ionization
+    rs = 2.0 - 2.3 * etas
+    phi0s = 1.0 + 3.3 * (1.0 - overvoltages ** -rs) * etas ** 1.2
+
+    # Mean depth
+    xs = 1.0 + 1.3 * np.log(zbs)
+    ys = 0.2 + zbs / 200.0
+    depths = areas / (1.0 + xs * np.log(1.0 + ys * (1.0 - overvoltages ** -0.42)) /
+                      np.log(1.0 + ys))
+    depths = np.where(areas / depths < phi0s, areas / phi0s, depths)
+
+    bs = np.sqrt(2.0) * (1.0 + np.sqrt(np.maximum(1.0 - depths * phi0s / areas, 0.0))) / depths
+
+    # Initial slope
+    gs = 0.22 * np.log(4.0 * zbs) * (1.0 - 2.0 * np.exp(-zbs * (overvoltages - 1.0) / 15.0))
+    hs = 1.0 - 10.0 * (1.0 - 1.0 / (1.0 + overvoltages / 10.0)) / zbs ** 2
+    ghs = gs * hs ** 4
+    limits = 0.9 * bs * depths ** 2 * (bs - 2.0 * phi0s / areas)
+    ghs = np.minimum(ghs, limits)
+    slopes = ghs * areas / depths ** 2
+
+    # Exponential slopes
+    as_ = (slopes + bs * (2.0 * phi0s - bs * areas)) / \
+        (bs * areas * (2.0 - bs * depths) - phi0s)
+    epsilons = (as_ - bs) / bs
+    small = np.abs(epsilons) < MINIMUM_EPSILON
+    epsilons = np.where(small, MINIMUM_EPSILON, epsilons)
+    as_ = np.where(small, bs * (1.0 + epsilons), as_)
+
+    bigbs = (bs ** 2 * areas * (1.0 + epsilons) - slopes -
+             phi0s * bs * (2.0 + epsilons)) / epsilons
+    bigas = (bigbs / bs + phi0s - bs * areas) * (1.0 + epsilons) / epsilons
+
+    return PhiRhoZ(areas, phi0s, bigas, as_, bigbs, bs, epsilons)
+
+def calculate_phirhoz_values(phirhoz, rhozs):
+    """
+    Returns the value of the phi-rho-z distributions at mass depths
+    *rhozs* (g/cm2).
+    """
+    return phirhoz.A * np.exp(-phirhoz.a * rhozs) + \
+        (phirhoz.B * rhozs + phirhoz.phi0 - phirhoz.A) * np.exp(-phirhoz.b * rhozs)
+
+def calculate_emitted_areas(phirhoz, chis):
+    """
+    Returns the integral of the phi-rho-z distributions attenuated by
+    ``exp(-chi rho z)``, where *chis* is the mass absorption coefficient
+    divided by the sine of the take-off angle (cm2/g).
+    With *chis* equal to zero, the area of the distribution is returned.
+    """
+    b, epsilon = phirhoz.b, phirhoz.epsilon
+    return (phirhoz.phi0 + phirhoz.B / (b + chis) -
+            phirhoz.A * b * epsilon / (b * (1.0 + epsilon) + chis)) / (b + chis)
+
+def select(phirhoz, indexes):
+    """
+    Returns the parameters of the distributions at *indexes*.
+    """
+    return PhiRhoZ(*(values[indexes] for values in phirhoz))
+
+def calculate_intensities(inputs):
+    """
+    Calculates the generated and emitted intensities (photons per electron)
+    of the X-ray lines of many samples at once.
+
+    :arg inputs: :class:`list` of :class:`dict` created by the exporter
+    :return: :class:`list` of :class:`dict` with the intensities of each
+        X-ray line and of each detector
+    """
+    # Matrix parameters of each sample
+    maxcount = max([len(indict['zs']) for indict in inputs] + [1])
+    zs = np.ones((len(inputs), maxcount))
+    wfs = np.zeros((len(inputs), maxcount))
+    atomic_weights = np.ones((len(inputs), maxcount))
+    for i, indict in enumerate(inputs):
+        count = len(indict['zs'])
+        zs[i, :count] = indict['zs']
+        wfs[i, :count] = indict['wfs']
+        atomic_weights[i, :count] = indict['atomic_weights']
+
+    m_zas, j_keV, zbs = calculate_matrix_parameters(zs, wfs, atomic_weights)
+
+    # One row per X-ray line in each sample
+    rows = [(i, xrayline) for i, indict in enumerate(inputs)
+            for xrayline in indict['xraylines']]
+    samples = np.array([i for i, _xrayline in rows], dtype=int)
+    lines = [xrayline for _i, xrayline in rows]
+
+    energies_keV = np.array([inputs[i]['energy_keV'] for i, _xrayline in rows])
+    line_zs = np.array([xrayline['z'] for xrayline in lines], dtype=float)
+    shells = [xrayline['shell'] for xrayline in lines]
+    edges_keV = np.array([xrayline['edge_keV'] for xrayline in lines])
+    occupancies = np.array([xrayline['occupancy'] for xrayline in lines], dtype=float)
+    probabilities = np.array([xrayline['probability'] for xrayline in lines])
+    concentrations = np.array([xrayline['wf'] / xrayline['atomic_weight']
+                               for xrayline in lines])
+
+    exponents = calculate_ionization_exponents(line_zs, shells)
+    sigmas = calculate_ionization_cross_sections(energies_keV, edges_keV,
+                                                 exponents, shells, occupancies)
+    phirhoz = calculate_phirhoz(energies_keV, edges_keV, exponents,
+                                m_zas[samples], j_keV[samples], zbs[samples])
+
+    factors = AVOGADRO * concentrations * sigmas * probabilities
+    generated = factors * phirhoz.area
+
+    # One row per X-ray line, sample and detector
+    rows_detectors = [(row, detector) for row, (i, _xrayline) in enumerate(rows)
+                      for detector in inputs[i]['detectors']]
+    indexes = np.array([row for row, _detector in rows_detectors], dtype=int)
+    chis = np.array([lines[row]['mac_cm2_per_g'] / detector['sin_elevation']
+                     if detector['sin_elevation'] > 0.0 else np.inf
+                     for row, detector in rows_detectors])
+
+    with np.errstate(invalid='ignore'):
+        emitted = factors[indexes] * \
+            calculate_emitted_areas(select(phirhoz, indexes), chis)
+    emitted = np.where(np.isfinite(chis), emitted, 0.0)
+
+    # Results of each sample
+    outputs = []
+    for i, indict in enumerate(inputs):
+        outputs.append({'xraylines': [[xrayline['z'], xrayline['transition']]
+                                      for xrayline in indict['xraylines']],
+                        'generated': [],
+                        'emitted': dict((detector['name'], [])
+                                        for detector in indict['detectors'])})
+
+    for row, (i, _xrayline) in enumerate(rows):
+        outputs[i]['generated'].append([float(generated[row]), 0.0])
+
+    for (row, detector), value in zip(rows_detectors, emitted):
+        i = rows[row][0]
+        outputs[i]['emitted'][detector['name']].append([float(value), 0.0])
+
+    return outputs
@@ -0,0 +1,50 @@
+""""""
+
+# Standard library modules.
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.program.base import Program
+from pymontecarlo.program.xpp.configurator import XppConfigurator
+from pymontecarlo.program.xpp.expander import XppExpander
+from pymontecarlo.program.xpp.validator import XppValidator
+from pymontecarlo.program.xpp.exporter import XppExporter
+from pymontecarlo.program.xpp.worker import XppWorker
+from pymontecarlo.program.xpp.importer import XppImporter
+
+# Globals and constants variables.
+
+# Version of the model, to increment when the results change
+VERSION = '1'
+
+class XppProgram(Program):
+
+    @classmethod
+    def getidentifier(cls):
+        return 'xpp'
+
+    @classmethod
+    def create_configurator(cls):
+        return XppConfigurator()
+
+    def getversion(self):
+        return VERSION
+
+    def create_expander(self):
+        return XppExpander()
+
+    def create_validator(self):
+        return XppValidator()
+
+    def create_exporter(self):
+        return XppExporter()
+
+    def create_importer(self):
+        return XppImporter()
+
+    def create_worker(self):
+        return XppWorker()
+
+    def create_default_limits(self, options):
+        return []
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+from pymontecarlo.program.xpp.batch import simulate, convert_options
+from pymontecarlo.program.xpp.program import XppProgram
+from pymontecarlo.runner.local import LocalSimulationRunner
+from pymontecarlo.options.options import Options
+from pymontecarlo.options.beam import GaussianBeam
+from pymontecarlo.options.material import Material
+from pymontecarlo.options.sample import SubstrateSample
+from pymontecarlo.options.analysis import KRatioAnalysis
+from pymontecarlo.results.photonintensity import EmittedPhotonIntensityResult
+from pymontecarlo.results.kratio import KRatioResult
+
+# Globals and constants variables.
+
+class TestModule(TestCase):
+
+    def _create_list_options(self, program):
+        list_options = []
+
+        for energy_eV in [10e3, 15e3, 20e3]:
+            for wf in [0.2, 0.5, 0.8]:
+                material = Material.from_formula('CuAu')
+                material.composition = {29: wf, 79: 1.0 - wf}
+                sample = SubstrateSample(material)
+                analysis = KRatioAnalysis(self.create_basic_photondetector())
+                options = Options(program, GaussianBeam(energy_eV, 10e-9), sample, [analysis])
+                list_options.append(options)
+
+        return list_options
+
+    def testconvert_options(self):
+        options = self.create_basic_options()
+        newoptions = convert_options(options)
+        self.assertEqual('xpp', newoptions.program.getidentifier())
+        self.assertEqual(options.sample, newoptions.sample)
+        self.assertEqual(0, len(newoptions.models))
+        self.assertEqual('mock', options.program.getidentifier())
+
+    def testsimulate(self):
+        list_options = self._create_list_options(self.program)
+        project = simulate(list_options)
+
+        # 9 unknowns and 2 standards for each of the 3 energies
+        self.assertEqual(9 + 2 * 3, len(project.simulations))
+
+        for simulation in project.simulations:
+            self.assertEqual('xpp', simulation.options.program.getidentifier())
+            self.assertEqual(1, len(simulation.find_result(EmittedPhotonIntensityResult)))
+
+        kratios = [s.find_result(KRatioResult) for s in project.simulations]
+        self.assertEqual(9, sum(1 for results in kratios if results))
+
+        # Already calculated
+        simulate(list_options, project)
+        self.assertEqual(9 + 2 * 3, len(project.simulations))
+
+    def testsimulate_same_as_runner(self):
+        list_options = self._create_list_options(XppProgram())[:2]
+        project = simulate(list_options)
+
+        with LocalSimulationRunner(max_workers=2) as runner:
+            runner.submit(*self._create_list_options(XppProgram())[:2])
+
+        for simulation in runner.project.simulations:
+            other = project.find_simulation(simulation.options)
+            self.assertIsNotNone(other)
+
+            result = simulation.find_result(EmittedPhotonIntensityResult)[0]
+            other_result = other.find_result(EmittedPhotonIntensityResult)[0]
+            for xrayline, q in result.items():
+                self.assertAlmostEqual(q.nominal_value, other_result[xrayline].nominal_value, 12)
+
+if __name__ == '__main__': # pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+from pymontecarlo.program.xpp.phirhoz import \
+    (calculate_matrix_parameters, calculate_ionization_exponents,
+     calculate_phirhoz, calculate_phirhoz_values, calculate_emitted_areas)
+
+# Globals and constants variables.
+
+# numpy.trapz is deprecated since NumPy 2.0 in favour of numpy.trapezoid
+trapezoid = getattr(np, 'trapezoid', None) or np.trapz
+
+class TestModule(TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        # Cu Ka in pure copper at 10, 15 and 25 keV
+        m_zas, j_keV, zbs = calculate_matrix_parameters([[29]], [[1.0]], [[63.546]])
+        exponents = calculate_ionization_exponents([29], ['K'])
+        self.phirhoz = calculate_phirhoz([10.0, 15.0, 25.0], [8.979] * 3,
+                                         exponents, m_zas, j_keV, zbs)
+
+    def testcalculate_matrix_parameters(self):
+        m_zas, j_keV, zbs = \
+            calculate_matrix_parameters([[29, 79], [29, 1]], [[0.5, 0.5], [1.0, 0.0]],
+                                        [[63.546, 196.97], [63.546, 1.0]])
+        self.assertAlmostEqual(29 / 63.546, m_zas[1], 6)
+        self.assertAlmostEqual(29.0, zbs[1], 6)
+        self.assertAlmostEqual(0.3092, j_keV[1], 3)
+        self.assertGreater(j_keV[0], j_keV[1])
+        self.assertGreater(zbs[0], zbs[1])
+
+    def testcalculate_phirhoz(self):
+        areas = self.phirhoz.area
+        self.assertTrue(np.all(np.diff(areas) > 0.0))
+
+        # Mass range of Cu Ka at 15 keV, about 0.5 um
+        self.assertAlmostEqual(3.3e-4, areas[1], delta=1e-4)
+
+        # Surface ionization, larger than 1
+        self.assertTrue(np.all(self.phirhoz.phi0 > 1.0))
+        np.testing.assert_allclose(self.phirhoz.phi0,
+                                   calculate_phirhoz_values(self.phirhoz, 0.0))
+
+    def testcalculate_emitted_areas(self):
+        np.testing.assert_allclose(self.phirhoz.area,
+                                   calculate_emitted_areas(self.phirhoz, 0.0))
+
+        # Numerical integration of the distribution
+        rhozs = np.linspace(0.0, 1e-2, 100001)
+        for chi in [0.0, 100.0, 1000.0]:
+            values = calculate_phirhoz_values(self.phirhoz, rhozs[:, np.newaxis]) * \
+                np.exp(-chi * rhozs[:, np.newaxis])
+            np.testing.assert_allclose(trapezoid(values, rhozs, axis=0),
+                                       calculate_emitted_areas(self.phirhoz, chi),
+                                       rtol=1e-4)
+
+        emitted = calculate_emitted_areas(self.phirhoz, 100.0)
+        self.assertTrue(np.all(emitted < self.phirhoz.area))
+
+if __name__ == '__main__': # pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+import math
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+from pymontecarlo.program.xpp.program import XppProgram
+from pymontecarlo.runner.local import LocalSimulationRunner
+from pymontecarlo.options.options import Options
+from pymontecarlo.options.beam import GaussianBeam
+from pymontecarlo.options.material import Material
+from pymontecarlo.options.sample import SubstrateSample, HorizontalLayerSample
+from pymontecarlo.options.analysis import PhotonIntensityAnalysis, KRatioAnalysis
+from pymontecarlo.options.limit import ShowersLimit
+from pymontecarlo.options.model import \
+    MassAbsorptionCoefficientModel, IonizationCrossSectionModel
+from pymontecarlo.results.photonintensity import \
+    EmittedPhotonIntensityResult, GeneratedPhotonIntensityResult
+from pymontecarlo.results.kratio import KRatioResult
+from pymontecarlo.exceptions import ValidationError
+
+# Globals and constants variables.
+
+class TestXppProgram(TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.program = XppProgram()
+
+    def _create_options(self, sample=None, analyses=None, models=None):
+        beam = GaussianBeam(15e3, 10e-9)
+        if sample is None:
+            sample = self.create_basic_sample()
+        if analyses is None:
+            analyses = [PhotonIntensityAnalysis(self.create_basic_photondetector())]
+        return Options(self.program, beam, sample, analyses, [], models)
+
+    def testvalidate(self):
+        validator = self.program.create_validator()
+
+        options = validator.validate_options(self._create_options())
+        self.assertIn(MassAbsorptionCoefficientModel.BRAGG_PIERCE, options.models)
+        self.assertIn(IonizationCrossSectionModel.POUCHOU1996, options.models)
+        self.assertEqual(0, len(options.limits))
+
+        options = self._create_options()
+        options.limits.append(ShowersLimit(100))
+        validator.validate_options(options)
+
+        options = self._create_options(SubstrateSample(Material.pure(29), tilt_rad=0.1))
+        self.assertRaises(ValidationError, validator.validate_options, options)
+
+        sample = HorizontalLayerSample(Material.pure(29))
+        sample.add_layer(Material.pure(79), 10e-9)
+        options = self._create_options(sample)
+        self.assertRaises(ValidationError, validator.validate_options, options)
+
+    def _run(self, *options):
+        with LocalSimulationRunner(max_workers=2) as runner:
+            runner.submit(*options)
+        return runner.project.simulations
+
+    def testrun(self):
+        simulation, = self._run(self._create_options())
+
+        emitted = simulation.find_result(EmittedPhotonIntensityResult)[0]
+        generated = simulation.find_result(GeneratedPhotonIntensityResult)[0]
+
+        q_emitted = emitted[(29, 'Ka1')]
+        q_generated = generated[(29, 'Ka1')]
+        self.assertGreater(q_emitted.nominal_value, 0.0)
+        self.assertLess(q_emitted.nominal_value, q_generated.nominal_value)
+
+        # About 1e-4 photons per electron in 4 pi
+        self.assertAlmostEqual(1e-4, q_generated.nominal_value * 4 * math.pi, delta=0.7e-4)
+
+    def testrun_no_absorption(self):
+        options = self._create_options(models=[MassAbsorptionCoefficientModel.NONE])
+        simulation, = self._run(options)
+
+        emitted = simulation.find_result(EmittedPhotonIntensityResult)[0]
+        generated = simulation.find_result(GeneratedPhotonIntensityResult)[0]
+        self.assertAlmostEqual(generated[(29, 'La1')].nominal_value,
+                               emitted[(29, 'La1')].nominal_value, 12)
+
+    def testrun_kratio(self):
+        material = Material.from_formula('CuAu')
+        analysis = KRatioAnalysis(self.create_basic_photondetector())
+        options = self._create_options(SubstrateSample(material), [analysis])
+        simulations = self._run(options)
+        self.assertEqual(3, len(simulations))
+
+        simulation = next(s for s in simulations
+                          if s.options.sample.material == material)
+        result = simulation.find_result(KRatioResult)[0]
+
+        # Within 30% of the weight fractions, the k-ratio of the lighter
+        # element being enhanced by the atomic number effect
+        wf_cu = material.composition[29]
+        wf_au = material.composition[79]
+        kratio_cu = result[(29, 'Ka1')].nominal_value
+        kratio_au = result[(79, 'La1')].nominal_value
+        self.assertAlmostEqual(wf_cu, kratio_cu, delta=0.3 * wf_cu)
+        self.assertAlmostEqual(wf_au, kratio_au, delta=0.3 * wf_au)
+        self.assertGreater(kratio_cu, wf_cu)
+
+        # Standards have k-ratios of 1
+        standard = next(s for s in simulations
+                        if s.options.sample.material == Material.pure(29))
+        self.assertEqual(0, len(standard.find_result(KRatioResult)))
+
+if __name__ == '__main__': # pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,65 @@
+""""""
+
+# Standard library modules.
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.program.validator import Validator
+from pymontecarlo.options.beam import GaussianBeam
+from pymontecarlo.options.sample import SubstrateSample
+from pymontecarlo.options.analysis import PhotonIntensityAnalysis, KRatioAnalysis
+from pymontecarlo.options.limit import ShowersLimit
+from pymontecarlo.options.model import \
+    MassAbsorptionCoefficientModel, IonizationCrossSectionModel
+from pymontecarlo.options.particle import Particle
+
+# Globals and constants variables.
+
+class XppValidator(Validator):
+
+    def __init__(self):
+        super().__init__()
+
+        self.beam_validate_methods[GaussianBeam] = self._validate_beam_gaussian
+
+        self.sample_validate_methods[SubstrateSample] = self._validate_sample_substrate
+
+        self.analysis_validate_methods[PhotonIntensityAnalysis] = self._validate_analysis_photonintensity
+        self.analysis_validate_methods[KRatioAnalysis] = self._validate_analysis_kratio
+
+        # Accepted so that the same options can be used with Monte Carlo
+        # programs, but not used in the calculation
+        self.limit_validate_methods[ShowersLimit] = self._validate_limit_showers
+
+        self.model_validate_methods[MassAbsorptionCoefficientModel] = self._validate_model_valid_models
+        self.model_validate_methods[IonizationCrossSectionModel] = self._validate_model_valid_models
+
+        self.valid_models[MassAbsorptionCoefficientModel] = \
+            [MassAbsorptionCoefficientModel.BRAGG_PIERCE,
+             MassAbsorptionCoefficientModel.NONE]
+        self.default_models[MassAbsorptionCoefficientModel] = \
+            MassAbsorptionCoefficientModel.BRAGG_PIERCE
+
+        self.valid_models[IonizationCrossSectionModel] = \
+            [IonizationCrossSectionModel.POUCHOU1996]
+        self.default_models[IonizationCrossSectionModel] = \
+            IonizationCrossSectionModel.POUCHOU1996
+
+    def _validate_beam_base_particle(self, particle, options, errors):
+        particle = super()._validate_beam_base_particle(particle, options, errors)
+
+        if particle is not Particle.ELECTRON:
+            exc = ValueError('Only electron beams are supported.')
+            errors.add(exc)
+
+        return particle
+
+    def _validate_sample_base_tilt_rad(self, tilt_rad, options, errors):
+        tilt_rad = super()._validate_sample_base_tilt_rad(tilt_rad, options, errors)
+
+        if tilt_rad != 0.0:
+            exc = ValueError('Only normal incidence (no tilt) is supported.')
+            errors.add(exc)
+
+        return tilt_rad
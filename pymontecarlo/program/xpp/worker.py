@@ -0,0 +1,33 @@
+""""""
+
+# Standard library modules.
+import os
+import json
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.program.worker import StagedWorker
+from pymontecarlo.program.xpp.exporter import INPUT_FILENAME
+from pymontecarlo.program.xpp.phirhoz import calculate_intensities
+
+# Globals and constants variables.
+
+RESULTS_FILENAME = 'results.json'
+
+class XppWorker(StagedWorker):
+
+    def execute(self, token, simulation, outputdir):
+        token.update(0.0, 'Started')
+
+        filepath = os.path.join(outputdir, INPUT_FILENAME)
+        with open(filepath, 'r') as fp:
+            indict = json.load(fp)
+
+        outdict, = calculate_intensities([indict])
+
+        filepath = os.path.join(outputdir, RESULTS_FILENAME)
+        with open(filepath, 'w') as fp:
+            json.dump(outdict, fp)
+
+        token.update(1.0, 'Done')
@@ -11,8 +11,7 @@ import threading
 # Local modules.
 from pymontecarlo.formats.hdf5.reader import HDF5ReaderMixin
 from pymontecarlo.formats.hdf5.writer import HDF5WriterMixin
-from pymontecarlo.formats.series.options.base import create_options_dataframe
-from pymontecarlo.formats.series.results.base import create_results_dataframe
+from pymontecarlo.options.index import OptionIndex
 from pymontecarlo.util.signal import Signal
 
 # Globals and constants variables.
@@ -20,6 +19,7 @@ from pymontecarlo.util.signal import Signal
 class Project(HDF5ReaderMixin, HDF5WriterMixin):
 
     simulation_added = Signal()
+    simulation_recalculated = Signal()
     recalculated = Signal()
 
     def __init__(self, filepath=None):
@@ -28,9 +28,37 @@ class Project(HDF5ReaderMixin, HDF5WriterMixin):
         self.lock = threading.Lock()
         self.recalculate_required = False
 
+        # Index of the simulations by options
+        self._index = OptionIndex()
+        self._indexed_simulations = None
+        self._indexed_count = 0
+
+    def _find_simulation(self, options, fingerprint=None):
+        # NOTE: Simulations may be appended directly to the list
+        if self._indexed_simulations is not self.simulations or \
+                len(self.simulations) < self._indexed_count:
+            self._index.clear()
+            self._indexed_simulations = self.simulations
+            self._indexed_count = 0
+
+        for simulation in self.simulations[self._indexed_count:]:
+            self._index.add(simulation.options, simulation)
+        self._indexed_count = len(self.simulations)
+
+        return self._index.find(options, fingerprint=fingerprint)
+
+    def find_simulation(self, options, fingerprint=None):
+        """
+        Returns the simulation with the same options, or ``None``.
+        The *fingerprint* of the options can be specified if it was already
+        calculated.
+        """
+        with self.lock:
+            return self._find_simulation(options, fingerprint)
+
     def add_simulation(self, simulation):
         with self.lock:
-            if simulation in self.simulations:
+            if self._find_simulation(simulation.options) is not None:
                 return
 
             identifiers = [s.identifier for s in self.simulations
@@ -60,14 +88,28 @@ class Project(HDF5ReaderMixin, HDF5WriterMixin):
                 status = 'Calculating simulation {}'.format(simulation.identifier)
                 if token: token.update(progress, status)
 
-                for analysis in simulation.options.analyses:
-                    analysis.calculate(simulation, tuple(self.simulations))
+                self._recalculate_simulation(simulation)
 
             if token: token.update(1.0, 'Done')
 
             self.recalculate_required = False
             self.recalculated.send()
 
+    def _recalculate_simulation(self, simulation):
+        for analysis in simulation.options.analyses:
+            analysis.calculate(simulation, tuple(self.simulations))
+
+    def recalculate_simulation(self, simulation):
+        """
+        Calculates the additional results of the analyses of a single 
+        simulation, using the other simulations of the project 
+        (e.g. standards).
+        """
+        with self.lock:
+            self._recalculate_simulation(simulation)
+
+        self.simulation_recalculated.send(simulation)
+
     def create_options_dataframe(self, only_different_columns=False):
         """
         Returns a :class:`pandas.DataFrame`.
@@ -75,6 +117,9 @@ class Project(HDF5ReaderMixin, HDF5WriterMixin):
         If *only_different_columns*, the data rows will only contain the columns
         that are different between the options.
         """
+        # Deferred, pandas is slow to import
+        from pymontecarlo.formats.series.options.base import create_options_dataframe
+
         list_options = [simulation.options for simulation in self.simulations]
         return create_options_dataframe(list_options, only_different_columns)
 
@@ -86,6 +131,9 @@ class Project(HDF5ReaderMixin, HDF5WriterMixin):
         this result classes will be returned. If ``None``, the columns from 
         all results will be returned.
         """
+        # Deferred, pandas is slow to import
+        from pymontecarlo.formats.series.results.base import create_results_dataframe
+
         list_results = [simulation.results for simulation in self.simulations]
         return create_results_dataframe(list_results, result_classes)
 
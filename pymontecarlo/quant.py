@@ -0,0 +1,422 @@
+"""
+Quantification of the composition of an unknown from measured k-ratios.
+"""
+
+# Standard library modules.
+import abc
+import logging
+logger = logging.getLogger(__name__)
+
+# Third party modules.
+import numpy as np
+
+import uncertainties
+
+# Local modules.
+from pymontecarlo.results.kratio import KRatioResult
+from pymontecarlo.util.xrayline import XrayLine
+from pymontecarlo.util.tolerance import tolerance_to_decimals
+
+# Globals and constants variables.
+
+class CompositionRule(metaclass=abc.ABCMeta):
+    """
+    Rule setting the weight fraction of an element, instead of
+    quantifying it from its k-ratio.
+    """
+
+    def __init__(self, z):
+        self.z = z
+
+    def __repr__(self):
+        return '<{}({})>'.format(self.__class__.__name__, self.z)
+
+    @abc.abstractmethod
+    def update(self, composition):
+        """
+        Updates the specified composition for the element of the rule.
+        """
+        raise NotImplementedError
+
+class ElementByDifferenceRule(CompositionRule):
+    """
+    Weight fraction of an element calculated as the difference between 1.0
+    and the total of the other elements.
+    """
+
+    def update(self, composition):
+        composition.pop(self.z, None)
+
+        total = min(sum(composition.values()), 1.0)
+        if total < 1.0:
+            composition[self.z] = 1.0 - total
+
+class FixedElementRule(CompositionRule):
+    """
+    Fixed weight fraction of an element.
+    """
+
+    def __init__(self, z, wf):
+        super().__init__(z)
+
+        if wf <= 0.0 or wf > 1.0:
+            raise ValueError('Weight fraction must be between ]0.0, 1.0]')
+        self.wf = wf
+
+    def __repr__(self):
+        return '<{}({}, {:g})>'.format(self.__class__.__name__, self.z, self.wf)
+
+    def update(self, composition):
+        composition[self.z] = self.wf
+
+def extract_kratios(simulation, photon_detector=None):
+    """
+    Returns a :class:`dict` of the k-ratios of a simulation, where the keys
+    are :class:`XrayLine` and the values, :class:`ufloat`.
+
+    :arg photon_detector: photon detector of the k-ratios (default: any)
+    """
+    kratios = {}
+
+    for result in simulation.find_result(KRatioResult):
+        if photon_detector is not None and \
+                result.analysis.photon_detector != photon_detector:
+            continue
+        kratios.update(result.data)
+
+    return kratios
+
+def _to_ufloat(value):
+    if isinstance(value, uncertainties.core.AffineScalarFunc):
+        return value
+    if isinstance(value, (tuple, list)):
+        return uncertainties.ufloat(*value)
+    return uncertainties.ufloat(value, 0.0)
+
+class Quantifier:
+    """
+    Iterative quantification of the composition of an unknown from its
+    measured k-ratios, using simulations to calculate the k-ratios of
+    trial compositions.
+
+    The weight fractions of the elements are found by weighted
+    Gauss-Newton iterations on the difference between the calculated and
+    measured k-ratios.
+    In each iteration, the trial composition and its variants, required
+    for the derivatives of the k-ratios, are submitted to the runner as
+    one batch, so that they are simulated in parallel.
+    With the ``newton`` method, the derivatives are calculated by finite
+    differences in every iteration. With the ``broyden`` method, they are
+    only calculated in the first iteration and then updated from the
+    secant of each iteration, so only one composition is simulated per
+    iteration.
+
+    Compositions are rounded to *composition_tolerance* and the k-ratios
+    of each composition are cached, so near-identical compositions are
+    only simulated once. The standards are only simulated once by the
+    runner, or not at all if a :class:`StandardsLibrary` is attached to
+    the :class:`KRatioAnalysis`.
+
+    Since simulated compositions must total 1.0, one element is always
+    calculated by difference: the element of the
+    :class:`ElementByDifferenceRule` or, if there is none, the last
+    measured element, whose k-ratio is then still fitted.
+    """
+
+    METHODS = ('newton', 'broyden')
+
+    def __init__(self, runner, create_options, kratios, rules=(),
+                 initial_composition=None, method='newton', tolerance=1e-3,
+                 max_iterations=10, step=0.01, composition_tolerance=1e-4,
+                 photon_detector=None, extract_kratios=extract_kratios):
+        """
+        :arg runner: :class:`SimulationRunner` running the simulations
+        :arg create_options: function returning the options of the unknown
+            for a composition (:class:`dict` of atomic number and weight
+            fraction). The options must contain a :class:`KRatioAnalysis`.
+        :arg kratios: :class:`dict` of the measured k-ratios, where the keys
+            are X-ray lines and the values, :class:`ufloat`, tuples of the
+            value and its uncertainty, or values. Only one X-ray line per
+            element can be measured.
+        :arg rules: :class:`CompositionRule` of the elements without k-ratio
+        :arg initial_composition: initial composition (default: the
+            measured k-ratios)
+        :arg method: ``newton`` or ``broyden``
+        :arg tolerance: maximum change of weight fraction to converge
+        :arg max_iterations: maximum number of iterations
+        :arg step: weight fraction step of the finite differences
+        :arg composition_tolerance: tolerance on the weight fractions of
+            the simulated compositions
+        :arg photon_detector: photon detector of the k-ratios (default: any)
+        :arg extract_kratios: function returning the k-ratios of a
+            simulation (default: :func:`extract_kratios`)
+        """
+        if method not in self.METHODS:
+            raise ValueError('Unknown method: {}'.format(method))
+        if step <= composition_tolerance:
+            raise ValueError('Step must be greater than the composition tolerance')
+
+        self.runner = runner
+        self.create_options = create_options
+        self.method = method
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.step = step
+        self.composition_tolerance = composition_tolerance
+        self.photon_detector = photon_detector
+        self.extract_kratios = extract_kratios
+
+        self.kratios = {}
+        for xrayline, kratio in kratios.items():
+            xrayline = XrayLine(*xrayline)
+            z = xrayline.element.atomic_number
+            if any(other.element.atomic_number == z for other in self.kratios):
+                raise ValueError('More than one k-ratio for element {}'.format(z))
+            self.kratios[xrayline] = _to_ufloat(kratio)
+
+        # Rules
+        self.rules = list(rules)
+        self._fixed_rules = [rule for rule in self.rules
+                             if not isinstance(rule, ElementByDifferenceRule)]
+
+        by_difference_rules = [rule for rule in self.rules
+                               if isinstance(rule, ElementByDifferenceRule)]
+        if len(by_difference_rules) > 1:
+            raise ValueError('Only one element can be calculated by difference')
+
+        rule_zs = set(rule.z for rule in self.rules)
+        if len(rule_zs) != len(self.rules):
+            raise ValueError('More than one rule for the same element')
+
+        # Fitted X-ray lines and variables
+        self._xraylines = sorted((xrayline for xrayline in self.kratios
+                                  if xrayline.element.atomic_number not in rule_zs),
+                                 key=lambda xrayline: xrayline.element.atomic_number)
+        zs = [xrayline.element.atomic_number for xrayline in self._xraylines]
+
+        if by_difference_rules:
+            self._by_difference_rule, = by_difference_rules
+        elif zs:
+            self._by_difference_rule = ElementByDifferenceRule(zs.pop())
+        else:
+            self._by_difference_rule = None
+
+        if not zs:
+            raise ValueError('Composition is fully determined by the rules')
+        self._zs = zs
+
+        fixed_composition = {}
+        for rule in self._fixed_rules:
+            rule.update(fixed_composition)
+        self._fixed_total = sum(fixed_composition.values())
+        if self._fixed_total >= 1.0:
+            raise ValueError('Total of fixed weight fractions must be lower than 1.0')
+
+        if initial_composition is None:
+            initial_composition = \
+                dict((xrayline.element.atomic_number, kratio.nominal_value)
+                     for xrayline, kratio in self.kratios.items())
+        self.initial_composition = initial_composition
+
+        self.iterations = [] # list of compositions
+        self.converged = False
+        self._cache = {} # key: composition, value: k-ratio array
+
+    def _constrain(self, x):
+        x = np.clip(x, self.composition_tolerance, 1.0)
+
+        # Keep a positive weight fraction for the element by difference
+        maximum = 1.0 - self._fixed_total - self.composition_tolerance
+        total = x.sum()
+        if total > maximum:
+            x = x * maximum / total
+
+        return x
+
+    def _round(self, x):
+        """
+        Returns the weight fractions rounded to the composition tolerance,
+        which still satisfy the constraints of :meth:`_constrain`.
+        """
+        decimals = tolerance_to_decimals(self.composition_tolerance)
+        unit = 10.0 ** -decimals
+
+        x = np.round(self._constrain(x), decimals)
+
+        # Rounding up may exceed the maximum total, remove the excess from
+        # the largest weight fractions
+        maximum = 1.0 - self._fixed_total - self.composition_tolerance
+        while x.sum() > maximum + unit * 1e-3:
+            index = np.argmax(x)
+            x[index] = round(x[index] - unit, decimals)
+
+        return x
+
+    def _create_composition(self, x):
+        composition = dict(zip(self._zs, self._round(x).tolist()))
+
+        for rule in self._fixed_rules:
+            rule.update(composition)
+
+        self._by_difference_rule.update(composition)
+
+        return composition
+
+    def _create_key(self, composition):
+        return tuple(sorted(composition.items()))
+
+    def _create_variants(self, x):
+        """
+        Returns the compositions for the finite differences of each variable.
+        """
+        variants = []
+
+        for j in range(len(x)):
+            xj = x.copy()
+            xj[j] += self.step
+
+            constrained = self._constrain(xj)
+            if not np.allclose(constrained, xj):
+                # Backward step, without going below the tolerance
+                # (e.g. for a trace element)
+                step = min(self.step, x[j] - self.composition_tolerance)
+
+                if step > self.composition_tolerance:
+                    xj = x.copy()
+                    xj[j] -= step
+                else: # No room in either direction
+                    xj = constrained
+
+            variants.append(self._round(xj))
+
+        return variants
+
+    def _simulate(self, list_x):
+        """
+        Simulates the compositions not in the cache as one batch and returns
+        the calculated k-ratios of each composition, as
+        :class:`numpy.ndarray` of the values and of the uncertainties.
+        """
+        compositions = [self._create_composition(x) for x in list_x]
+
+        list_options = []
+        missing_keys = []
+        for composition in compositions:
+            key = self._create_key(composition)
+            if key in self._cache or key in missing_keys:
+                continue
+
+            options = self.create_options(composition)
+            options = options.program.create_validator().validate_options(options)
+            list_options.append(options)
+            missing_keys.append(key)
+
+        if list_options:
+            logger.debug('Simulating {} composition(s)'.format(len(list_options)))
+
+            self.runner.start()
+            self.runner.submit(*list_options)
+            self.runner.wait()
+
+        for key, options in zip(missing_keys, list_options):
+            simulation = self.runner.project.find_simulation(options)
+            if simulation is None:
+                raise ValueError('No simulation for composition {}'.format(dict(key)))
+
+            kratios = self.extract_kratios(simulation, self.photon_detector)
+
+            values = []
+            for xrayline in self._xraylines:
+                if xrayline not in kratios:
+                    raise ValueError('No k-ratio of {} for composition {}'
+                                     .format(xrayline, dict(key)))
+                values.append(kratios[xrayline])
+
+            self._cache[key] = \
+                (np.array([value.nominal_value for value in values]),
+                 np.array([value.std_dev for value in values]))
+
+        return [self._cache[self._create_key(composition)]
+                for composition in compositions]
+
+    def _calculate_jacobian(self, x, kratios, list_x, list_kratios):
+        jacobian = np.empty((len(self._xraylines), len(x)))
+        for j, (xj, kratiosj) in enumerate(zip(list_x, list_kratios)):
+            jacobian[:, j] = (kratiosj - kratios) / (xj[j] - x[j])
+        return jacobian
+
+    def run(self):
+        """
+        Runs the quantification and returns the composition as a
+        :class:`dict` where the keys are atomic numbers and the values,
+        :class:`ufloat` of the weight fractions.
+        The uncertainties of the measured and calculated k-ratios are
+        propagated to the weight fractions.
+        """
+        measured = np.array([self.kratios[xrayline].nominal_value
+                             for xrayline in self._xraylines])
+        measured_std = np.array([self.kratios[xrayline].std_dev
+                                 for xrayline in self._xraylines])
+
+        # Rounded as the simulated compositions, so that the finite
+        # differences are calculated from the simulated weight fractions
+        x = np.array([self.initial_composition.get(z, 0.0) for z in self._zs])
+        x = self._round(x)
+
+        self.iterations = []
+        self.converged = False
+        jacobian = None
+        previous = None
+
+        for iteration in range(self.max_iterations):
+            list_x = [x]
+            if jacobian is None or self.method == 'newton':
+                list_x += self._create_variants(x)
+
+            (kratios, kratios_std), *list_kratios = self._simulate(list_x)
+            self.iterations.append(self._create_composition(x))
+
+            if len(list_x) > 1:
+                jacobian = self._calculate_jacobian(x, kratios, list_x[1:],
+                                                    [k for k, _std in list_kratios])
+            else:
+                # Broyden update from the secant of the previous iteration
+                dx = x - previous[0]
+                dk = kratios - previous[1]
+                jacobian = jacobian + np.outer(dk - jacobian.dot(dx), dx) / dx.dot(dx)
+            previous = (x, kratios)
+
+            sigma = np.sqrt(measured_std ** 2 + kratios_std ** 2)
+            weights = 1.0 / np.where(sigma > 0.0, sigma, 1.0)
+
+            residuals = measured - kratios
+            dx, *_ = np.linalg.lstsq(jacobian * weights[:, np.newaxis],
+                                     residuals * weights, rcond=None)
+
+            newx = self._round(x + dx)
+            logger.debug('Iteration {}: {}'.format(iteration, self._create_composition(newx)))
+
+            if np.max(np.abs(newx - x)) < self.tolerance:
+                self.converged = True
+                break
+
+            x = newx
+
+        if not self.converged:
+            logger.warning('Quantification did not converge in {} iterations'
+                           .format(self.max_iterations))
+
+        # Propagate uncertainties
+        weighted_jacobian = jacobian * weights[:, np.newaxis]
+        covariance = np.linalg.pinv(weighted_jacobian.T.dot(weighted_jacobian))
+
+        composition = self._create_composition(x)
+        values = uncertainties.correlated_values([composition[z] for z in self._zs],
+                                                 covariance)
+        composition = dict(zip(self._zs, values))
+
+        for rule in self._fixed_rules:
+            rule.update(composition)
+        self._by_difference_rule.update(composition)
+
+        return dict((z, _to_ufloat(wf)) for z, wf in composition.items())
@@ -0,0 +1,443 @@
+"""
+Reconstruction of the geometry of a sample from measured k-ratios.
+"""
+
+# Standard library modules.
+import copy
+import math
+import itertools
+import logging
+logger = logging.getLogger(__name__)
+
+# Third party modules.
+import numpy as np
+
+import uncertainties
+
+# Local modules.
+from pymontecarlo.quant import extract_kratios
+from pymontecarlo.options.options import Options
+from pymontecarlo.util.xrayline import XrayLine
+
+# Globals and constants variables.
+
+class Parameter:
+    """
+    Geometry parameter of a sample to reconstruct.
+    """
+
+    def __init__(self, name, getter, setter, minimum=-math.inf,
+                 maximum=math.inf, tolerance=0.0):
+        """
+        :arg name: name of the parameter
+        :arg getter: function returning the value of the parameter from
+            a sample
+        :arg setter: function setting the value of the parameter in a
+            sample, taking the sample and the value as arguments
+        :arg minimum: lower limit of the value
+        :arg maximum: upper limit of the value
+        :arg tolerance: values are rounded to this tolerance, so that
+            near-identical values are only simulated once (0: no rounding)
+        """
+        if maximum <= minimum:
+            raise ValueError('Maximum must be greater than minimum')
+
+        self.name = name
+        self.getter = getter
+        self.setter = setter
+        self.minimum = minimum
+        self.maximum = maximum
+        self.tolerance = tolerance
+
+    def __repr__(self):
+        return '<{}({}, {:g} to {:g})>'.format(self.__class__.__name__, self.name,
+                                               self.minimum, self.maximum)
+
+    def get(self, sample):
+        return self.getter(sample)
+
+    def set(self, sample, value):
+        if value < self.minimum or value > self.maximum:
+            raise ValueError('Value of {} ({:g}) outside limits'
+                             .format(self.name, value))
+        self.setter(sample, value)
+
+    def round(self, value):
+        if self.tolerance <= 0.0:
+            return value
+        return round(value / self.tolerance) * self.tolerance
+
+class LayerThicknessParameter(Parameter):
+    """
+    Thickness of a layer of a :class:`HorizontalLayerSample` or
+    :class:`VerticalLayerSample`.
+    """
+
+    def __init__(self, index, minimum=0.0, maximum=math.inf, tolerance=1e-10):
+        """
+        :arg index: index of the layer
+        """
+        def getter(sample):
+            return sample.layers[index].thickness_m
+
+        def setter(sample, value):
+            sample.layers[index].thickness_m = value
+
+        name = 'layer{}_thickness_m'.format(index)
+        super().__init__(name, getter, setter, minimum, maximum, tolerance)
+
+class InclusionDiameterParameter(Parameter):
+    """
+    Diameter of the inclusion of an :class:`InclusionSample`.
+    """
+
+    def __init__(self, minimum=0.0, maximum=math.inf, tolerance=1e-10):
+        def getter(sample):
+            return sample.inclusion_diameter_m
+
+        def setter(sample, value):
+            sample.inclusion_diameter_m = value
+
+        super().__init__('inclusion_diameter_m', getter, setter,
+                         minimum, maximum, tolerance)
+
+class SphereDiameterParameter(Parameter):
+    """
+    Diameter of a :class:`SphereSample`.
+    """
+
+    def __init__(self, minimum=0.0, maximum=math.inf, tolerance=1e-10):
+        def getter(sample):
+            return sample.diameter_m
+
+        def setter(sample, value):
+            sample.diameter_m = value
+
+        super().__init__('diameter_m', getter, setter,
+                         minimum, maximum, tolerance)
+
+class Measurement:
+    """
+    Measured k-ratios of a sample with the conditions defined by options
+    (e.g. beam energy).
+    """
+
+    def __init__(self, options, kratios, surrogate_values=None):
+        """
+        :arg options: options of the measurement, with a
+            :class:`KRatioAnalysis`. The sample contains the initial values
+            of the parameters.
+        :arg kratios: :class:`dict` of the measured k-ratios, where the keys
+            are X-ray lines and the values, :class:`ufloat`, tuples of the
+            value and its uncertainty, or values
+        :arg surrogate_values: :class:`dict` of the values of the surrogate
+            parameters other than the reconstructed ones (e.g. beam energy),
+            used to warm-start the reconstruction
+        """
+        self.options = options
+
+        self.kratios = {}
+        for xrayline, kratio in kratios.items():
+            if isinstance(kratio, (tuple, list)):
+                kratio = uncertainties.ufloat(*kratio)
+            elif not isinstance(kratio, uncertainties.core.AffineScalarFunc):
+                kratio = uncertainties.ufloat(kratio, 0.0)
+            self.kratios[XrayLine(*xrayline)] = kratio
+
+        if surrogate_values is None:
+            surrogate_values = {}
+        self.surrogate_values = surrogate_values
+
+class Reconstructor:
+    """
+    Reconstruction of geometry parameters of a sample (e.g. thickness of
+    a thin film, diameter of an inclusion) from the k-ratios measured
+    in one or more conditions.
+
+    The parameters are found by weighted Gauss-Newton iterations on the
+    difference between the simulated and measured k-ratios, within the
+    limits of the parameters.
+    The Jacobian is calculated by forward finite differences: the
+    simulations of all its columns and of all measurements are submitted to
+    the runner as one batch, so that they run in parallel.
+    Simulations already in the project of the runner are not simulated
+    again, and the k-ratios of each set of parameter values are cached.
+    """
+
+    def __init__(self, runner, measurements, parameters, tolerance=1e-3,
+                 max_iterations=20, step=0.01, max_change=0.5,
+                 photon_detector=None, extract_kratios=extract_kratios):
+        """
+        :arg runner: :class:`SimulationRunner` running the simulations
+        :arg measurements: :class:`Measurement` of the sample
+        :arg parameters: :class:`Parameter` to reconstruct
+        :arg tolerance: maximum relative change of the parameters to converge
+        :arg max_iterations: maximum number of iterations
+        :arg step: relative step of the finite differences
+        :arg max_change: maximum relative change of a parameter in one
+            iteration
+        :arg photon_detector: photon detector of the k-ratios (default: any)
+        :arg extract_kratios: function returning the k-ratios of a
+            simulation (default: :func:`extract_kratios`)
+        """
+        if not measurements:
+            raise ValueError('At least one measurement is required')
+        if not parameters:
+            raise ValueError('At least one parameter is required')
+
+        self.runner = runner
+        self.measurements = list(measurements)
+        self.parameters = list(parameters)
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.step = step
+        self.max_change = max_change
+        self.photon_detector = photon_detector
+        self.extract_kratios = extract_kratios
+
+        self.iterations = [] # list of parameter values
+        self.converged = False
+        self._cache = {} # key: parameter values, value: k-ratio arrays
+
+        self._minimums = np.array([parameter.minimum for parameter in self.parameters])
+        self._maximums = np.array([parameter.maximum for parameter in self.parameters])
+
+    def _create_key(self, x):
+        return tuple(parameter.round(float(value))
+                     for parameter, value in zip(self.parameters, x))
+
+    def create_list_options(self, values):
+        """
+        Returns the options of each measurement for the parameter values,
+        given as a :class:`dict` or a sequence in the order of the
+        parameters.
+        """
+        if isinstance(values, dict):
+            values = [values[parameter.name] for parameter in self.parameters]
+
+        list_options = []
+        for measurement in self.measurements:
+            base = measurement.options
+
+            sample = copy.deepcopy(base.sample)
+
+            for parameter, value in zip(self.parameters, values):
+                parameter.set(sample, value)
+
+            list_options.append(Options(base.program, base.beam, sample,
+                                        list(base.analyses), list(base.limits),
+                                        list(base.models)))
+
+        return list_options
+
+    def _simulate(self, list_x):
+        """
+        Simulates the parameter values not in the cache as one batch and
+        returns the simulated k-ratios of each parameter values, as
+        :class:`numpy.ndarray` of the values and of the uncertainties.
+        """
+        keys = [self._create_key(x) for x in list_x]
+
+        missing = {} # key: key, value: list of validated options
+        for key in keys:
+            if key in self._cache or key in missing:
+                continue
+
+            list_options = []
+            for options in self.create_list_options(key):
+                validator = options.program.create_validator()
+                list_options.append(validator.validate_options(options))
+            missing[key] = list_options
+
+        if missing:
+            logger.debug('Simulating {} set(s) of parameters'.format(len(missing)))
+
+            self.runner.start()
+            self.runner.submit(*itertools.chain.from_iterable(missing.values()))
+            self.runner.wait()
+
+        for key, list_options in missing.items():
+            values = []
+            for measurement, options in zip(self.measurements, list_options):
+                simulation = self.runner.project.find_simulation(options)
+                if simulation is None:
+                    raise ValueError('No simulation for parameters {}'.format(key))
+
+                kratios = self.extract_kratios(simulation, self.photon_detector)
+
+                for xrayline in measurement.kratios:
+                    if xrayline not in kratios:
+                        raise ValueError('No k-ratio of {} for parameters {}'
+                                         .format(xrayline, key))
+                    values.append(kratios[xrayline])
+
+            self._cache[key] = \
+                (np.array([value.nominal_value for value in values]),
+                 np.array([value.std_dev for value in values]))
+
+        return [self._cache[key] for key in keys]
+
+    def _constrain(self, x):
+        return np.clip(x, self._minimums, self._maximums)
+
+    def _create_variants(self, x):
+        variants = []
+
+        for j, parameter in enumerate(self.parameters):
+            if x[j] != 0.0:
+                h = self.step * abs(x[j])
+            elif math.isfinite(parameter.maximum - parameter.minimum):
+                h = self.step * (parameter.maximum - parameter.minimum)
+            else:
+                h = self.step
+            h = max(h, 2 * parameter.tolerance)
+
+            # NOTE: The variants are rounded as the simulated values,
+            # so that the finite differences use the simulated steps
+            for sign in (1.0, -1.0):
+                xj = x.copy()
+                xj[j] += sign * h
+                xj = np.array(self._create_key(xj))
+                if xj[j] != x[j] and \
+                        parameter.minimum <= xj[j] <= parameter.maximum:
+                    break
+            else:
+                raise ValueError('No valid finite difference step for {}'
+                                 .format(parameter.name))
+
+            variants.append(xj)
+
+        return variants
+
+    def _limit_change(self, x, dx):
+        factor = 1.0
+        for xj, dxj in zip(x, dx):
+            if xj != 0.0 and abs(dxj) > self.max_change * abs(xj):
+                factor = min(factor, self.max_change * abs(xj) / abs(dxj))
+        return dx * factor
+
+    def _get_measured(self):
+        kratios = [kratio for measurement in self.measurements
+                   for kratio in measurement.kratios.values()]
+        return (np.array([kratio.nominal_value for kratio in kratios]),
+                np.array([kratio.std_dev for kratio in kratios]))
+
+    def estimate_from_surrogate(self, surrogate, count=21):
+        """
+        Returns the parameter values, as a :class:`dict`, best matching the
+        measured k-ratios according to the k-ratios interpolated by a
+        :class:`KRatioSurrogate`, evaluated on a grid of *count* values per
+        parameter.
+        The surrogate must be a function of the reconstructed parameters
+        (same names) and of the *surrogate_values* of the measurements.
+        """
+        bounds = surrogate.bounds
+
+        axes = []
+        for parameter in self.parameters:
+            if parameter.name not in bounds:
+                raise ValueError('Surrogate has no parameter {}'.format(parameter.name))
+            minimum, maximum = bounds[parameter.name]
+            minimum = max(minimum, parameter.minimum)
+            maximum = min(maximum, parameter.maximum)
+            axes.append(np.linspace(minimum, maximum, count))
+
+        grid = np.array(list(itertools.product(*axes)))
+        chi2 = np.zeros(len(grid))
+
+        for measurement in self.measurements:
+            columns = []
+            for name in surrogate.parameters:
+                if name in measurement.surrogate_values:
+                    columns.append(np.full(len(grid), measurement.surrogate_values[name]))
+                    continue
+
+                index = next((i for i, parameter in enumerate(self.parameters)
+                              if parameter.name == name), None)
+                if index is None:
+                    raise ValueError('No value for surrogate parameter {}'.format(name))
+                columns.append(grid[:, index])
+
+            predictions = surrogate.predict_array(np.column_stack(columns))
+
+            for xrayline, kratio in measurement.kratios.items():
+                if xrayline not in surrogate.xraylines:
+                    continue
+                column = surrogate.xraylines.index(xrayline)
+                sigma = kratio.std_dev if kratio.std_dev > 0.0 else 1.0
+                chi2 += ((predictions[:, column] - kratio.nominal_value) / sigma) ** 2
+
+        best = grid[np.argmin(chi2)]
+        return dict((parameter.name, float(value))
+                    for parameter, value in zip(self.parameters, best))
+
+    def run(self, initial_values=None, surrogate=None):
+        """
+        Runs the reconstruction and returns the parameter values as a
+        :class:`dict` where the keys are the names of the parameters and
+        the values, :class:`ufloat`.
+        The uncertainties of the measured and simulated k-ratios are
+        propagated to the parameters.
+
+        :arg initial_values: :class:`dict` of the initial values of the
+            parameters (default: values in the sample of the first
+            measurement)
+        :arg surrogate: :class:`KRatioSurrogate` used to estimate the
+            initial values (see :meth:`estimate_from_surrogate`)
+        """
+        if surrogate is not None:
+            initial_values = self.estimate_from_surrogate(surrogate)
+            logger.debug('Initial values from surrogate: {}'.format(initial_values))
+
+        if initial_values is None:
+            sample = self.measurements[0].options.sample
+            initial_values = dict((parameter.name, parameter.get(sample))
+                                  for parameter in self.parameters)
+
+        x = np.array([initial_values[parameter.name] for parameter in self.parameters],
+                     dtype=float)
+        x = self._constrain(x)
+
+        measured, measured_std = self._get_measured()
+
+        self.iterations = []
+        self.converged = False
+
+        for iteration in range(self.max_iterations):
+            x = np.array(self._create_key(x))
+            self.iterations.append(x)
+
+            list_x = [x] + self._create_variants(x)
+            (kratios, kratios_std), *list_kratios = self._simulate(list_x)
+
+            jacobian = np.empty((len(measured), len(x)))
+            for j, (xj, (kratiosj, _std)) in enumerate(zip(list_x[1:], list_kratios)):
+                jacobian[:, j] = (kratiosj - kratios) / (xj[j] - x[j])
+
+            sigma = np.sqrt(measured_std ** 2 + kratios_std ** 2)
+            weights = 1.0 / np.where(sigma > 0.0, sigma, 1.0)
+
+            dx, *_ = np.linalg.lstsq(jacobian * weights[:, np.newaxis],
+                                     (measured - kratios) * weights, rcond=None)
+            newx = self._constrain(x + self._limit_change(x, dx))
+            logger.debug('Iteration {}: {}'.format(iteration, newx))
+
+            scales = np.array([max(abs(value), parameter.tolerance)
+                               for parameter, value in zip(self.parameters, x)])
+            if np.all(np.abs(newx - x) <= self.tolerance * scales):
+                self.converged = True
+                break
+
+            x = newx
+
+        if not self.converged:
+            logger.warning('Reconstruction did not converge in {} iterations'
+                           .format(self.max_iterations))
+
+        # Propagate uncertainties
+        weighted_jacobian = jacobian * weights[:, np.newaxis]
+        covariance = np.linalg.pinv(weighted_jacobian.T.dot(weighted_jacobian))
+        values = uncertainties.correlated_values(x, covariance)
+
+        return dict((parameter.name, value)
+                    for parameter, value in zip(self.parameters, values))
@@ -4,6 +4,11 @@ Base runner.
 
 # Standard library modules.
 import abc
+import time
+import threading
+import itertools
+import logging
+logger = logging.getLogger(__name__)
 
 # Third party modules.
 
@@ -11,55 +16,202 @@ import abc
 from pymontecarlo.project import Project
 from pymontecarlo.simulation import Simulation
 from pymontecarlo.util.future import FutureExecutor, Token, FutureAdapter
-from pymontecarlo.util.cbook import unique
-from pymontecarlo.formats.series.base import create_identifier
-from pymontecarlo.formats.series.options.base import create_options_dataframe
+from pymontecarlo.runner.scheduler import StandardsFirstScheduler
+from pymontecarlo.runner.history import RuntimeRecord, RuntimePredictor
+from pymontecarlo.runner.plan import SimulationPlan
+from pymontecarlo.options.index import OptionIndex
+from pymontecarlo.exceptions import ValidationError, WorkerTimeoutError
 
 # Globals and constants variables.
 
 class SimulationRunner(FutureExecutor, metaclass=abc.ABCMeta):
 
-    def __init__(self, project=None, max_workers=1):
+    def __init__(self, project=None, max_workers=1, scheduler=None, history=None,
+                 pools=None, watchdog=None, retry_policy=None, cache=None):
+        """
+        :arg project: project where the simulations are added
+        :arg max_workers: number of simulations running in parallel
+        :arg scheduler: scheduler ordering the simulations
+            (default: :class:`StandardsFirstScheduler`)
+        :arg history: :class:`RuntimeHistory` where the resources used by
+            each completed simulation are recorded. The history is used to
+            predict the runtime of the simulations.
+        :arg pools: :class:`dict` where the keys are program identifiers and
+            the values, :class:`ProgramPool` limiting the concurrency, memory
+            and CPUs of the simulations of this program. The simulations of
+            other programs are only limited by *max_workers*.
+        :arg watchdog: :class:`Watchdog` timing out simulations exceeding 
+            their wall time limit or without progress. A timed out 
+            simulation fails with a :exc:`WorkerTimeoutError`.
+        :arg retry_policy: :class:`RetryPolicy` defining which failed 
+            simulations are retried (default: no retry)
+        :arg cache: :class:`ResultCache` checked before running a 
+            simulation. On a hit, the cached results are used instead.
+            The results of the completed simulations are added to the cache.
+        """
         super().__init__(max_workers)
         self.submitted_options = []
+        self._submitted_index = OptionIndex()
 
         if project is None:
             project = Project()
         self.project = project
 
+        if scheduler is None:
+            scheduler = StandardsFirstScheduler()
+        self.scheduler = scheduler
+
+        self.history = history
+        cost_estimator = self.scheduler.cost_estimator
+        if history is not None and cost_estimator.predictor is None:
+            cost_estimator.predictor = RuntimePredictor(history)
+
+        # Dependencies between simulations, using options fingerprints
+        self._requirements = {} # key: simulation, value: set of required simulations
+        self._dependents = {} # key: required simulation, value: set of simulations
+        self._finished_fingerprints = set()
+        self._waiting_simulations = {} # finished simulations waiting for their requirements
+        self._dependency_lock = threading.Lock()
+
+        # Whether the project only requires a recalculation because of the
+        # simulations added by the runner, which are recalculated as soon
+        # as they are finished
+        self._streamed_recalculation = False
+        self._recalculation_lock = threading.Lock()
+
+        self._submitting_iter = False
+
+        if pools is None:
+            pools = {}
+        self.pools = pools
+
+        self.watchdog = watchdog
+        self.retry_policy = retry_policy
+        self.cache = cache
+
     def _on_done(self, future):
         simulation = super()._on_done(future)
 
         if simulation:
-            self.project.add_simulation(simulation)
+            with self._recalculation_lock:
+                if not self.project.recalculate_required:
+                    self._streamed_recalculation = True
+                self.project.add_simulation(simulation)
+
+            self._on_simulation_finished(simulation)
 
         else:
             try:
                 options = future.args[0].options
+                self._submitted_index.remove(options)
                 self.submitted_options.remove(options)
             except:
                 pass
 
         # Recalculate if all other futures are done and recalculation is required
-        if not self.executor._shutdown and self.done() and self.project.recalculate_required:
-            target = self.project.recalculate
-            token = Token()
-            future = self.executor.submit(target, token)
+        if not self._submitting_iter:
+            self._submit_recalculation()
+
+    def _submit_recalculation(self):
+        if not self.done() or not self.project.recalculate_required:
+            return
+
+        # Skipped if all added simulations were already recalculated
+        # (see _on_simulation_finished)
+        with self._recalculation_lock, self._dependency_lock:
+            streamed = self._streamed_recalculation and not self._waiting_simulations
+            self._streamed_recalculation = False
+
+            if streamed:
+                self.project.recalculate_required = False
+                return
+
+        if self.executor._shutdown:
+            return
+
+        target = self.project.recalculate
+        token = Token()
+        future = self.executor.submit(target, token)
+
+        future2 = FutureAdapter(future, token, (), {})
+        self.futures.add(future2)
+        self.submitted.send(future2)
+
+    def _on_simulation_finished(self, simulation):
+        """
+        Calculates the results of the analyses of the finished simulation
+        and of the finished simulations depending on it, as soon as all 
+        their required simulations (e.g. standards) are finished.
+        """
+        fingerprint = simulation.options.fingerprint()
+        ready_simulations = []
+
+        with self._dependency_lock:
+            self._finished_fingerprints.add(fingerprint)
+            self._waiting_simulations[fingerprint] = simulation
+
+            candidates = [fingerprint]
+            candidates.extend(self._dependents.pop(fingerprint, ()))
+
+            for candidate in candidates:
+                if candidate not in self._waiting_simulations:
+                    continue
+
+                requirements = self._requirements.get(candidate, set())
+                if not requirements <= self._finished_fingerprints:
+                    continue
+
+                self._requirements.pop(candidate, None)
+                ready_simulations.append(self._waiting_simulations.pop(candidate))
+
+        for ready_simulation in ready_simulations:
+            self.project.recalculate_simulation(ready_simulation)
 
-            future2 = FutureAdapter(future, token, (), {})
-            self.futures.add(future2)
-            self.submitted.send(future2)
+    def _find_pool(self, options):
+        return self.pools.get(options.program.getidentifier())
+
+    def _acquire(self, args, kwargs):
+        if not args: # e.g. recalculation of the project
+            return True
+
+        simulation = args[0]
+        pool = self._find_pool(simulation.options)
+        if pool is None:
+            return True
+
+        memory_bytes = None
+        predictor = self.scheduler.cost_estimator.predictor
+        if predictor is not None:
+            memory_bytes = predictor.predict_peak_rss_bytes(simulation.options)
+
+        return pool.try_acquire(id(simulation), memory_bytes)
+
+    def _release(self, args, kwargs):
+        if not args:
+            return
+
+        simulation = args[0]
+        pool = self._find_pool(simulation.options)
+        if pool is not None:
+            pool.release(id(simulation))
 
     def _expand_options(self, list_options):
-        final_list_options = []
+        """
+        Returns a :class:`list` of :class:`tuple`, where the first item is
+        the options and the second, a :class:`list` of options required by 
+        its analyses (e.g. standards).
+        """
+        expanded = []
 
         for options in list_options:
-            final_list_options.append(options)
+            required_list_options = []
 
             for analysis in options.analyses:
-                final_list_options.extend(analysis.apply(options))
+                required_list_options.extend(analysis.apply(options))
+
+            expanded.append((options, required_list_options))
 
-        return unique(final_list_options)
+        return expanded
 
     def _validate_options(self, list_options):
         valid_list_options = []
@@ -76,24 +228,27 @@ class SimulationRunner(FutureExecutor, metaclass=abc.ABCMeta):
         final_list_options = []
 
         for options in list_options:
+            fingerprint = options.fingerprint()
+
             # Exclude already submitted options
-            if options in self.submitted_options:
+            if self._submitted_index.find(options, fingerprint=fingerprint):
                 continue
 
             # Exclude if simulation with same options already exists in project
             # and has results
-            dummy_simulation = Simulation(options, identifier='dummy')
-            if dummy_simulation in self.project.simulations:
-                index = self.project.simulations.index(dummy_simulation)
-                real_simulation = self.project.simulations[index]
-                if real_simulation.results:
-                    continue
+            simulation = self.project.find_simulation(options, fingerprint)
+            if simulation is not None and simulation.results:
+                continue
 
             final_list_options.append(options)
 
         return final_list_options
 
     def _create_identifiers(self, list_options):
+        # Deferred, pandas is slow to import
+        from pymontecarlo.formats.series.base import create_identifier
+        from pymontecarlo.formats.series.options.base import create_options_dataframe
+
         df = create_options_dataframe(list_options, only_different_columns=True)
 
         identifiers = []
@@ -111,21 +266,206 @@ class SimulationRunner(FutureExecutor, metaclass=abc.ABCMeta):
 
         return simulations
 
+    def _resolve_options(self, list_options, invalid=None):
+        """
+        Expands and validates the options.
+        
+        Returns a :class:`dict` of the distinct validated options and 
+        a :class:`dict` of the options required by each options, 
+        both keyed by fingerprint.
+        
+        If *invalid* is a :class:`list`, the invalid options are appended
+        to it with their :exc:`ValidationError`, instead of raising the 
+        exception.
+        """
+        expanded = self._expand_options(list_options)
+
+        # Validate each distinct options once
+        validated = {} # key: fingerprint before validation, value: (fingerprint, options)
+        resolved = {}
+        requirements = {}
+
+        for options, required_list_options in expanded:
+            items = []
+
+            try:
+                for other in [options] + required_list_options:
+                    key = other.fingerprint()
+                    if key not in validated:
+                        try:
+                            valid_options, = self._validate_options([other])
+                            validated[key] = (valid_options.fingerprint(), valid_options)
+                        except ValidationError as ex:
+                            validated[key] = ex
+
+                    item = validated[key]
+                    if isinstance(item, ValidationError):
+                        raise item
+                    items.append(item)
+
+            except ValidationError as ex:
+                if invalid is None:
+                    raise
+                invalid.append((options, ex))
+                continue
+
+            for fingerprint, valid_options in items:
+                resolved.setdefault(fingerprint, valid_options)
+
+            fingerprints = [fingerprint for fingerprint, _valid_options in items]
+            requirements.setdefault(fingerprints[0], set()).update(fingerprints[1:])
+
+        return resolved, requirements
+
     def _prepare_simulations(self, list_options):
-        list_options = self._expand_options(list_options)
-        list_options = self._validate_options(list_options)
-        list_options = self._exclude_simulated_options(list_options)
+        """
+        Returns the simulations to submit and a :class:`dict` of the 
+        fingerprints of the simulations required by each simulation.
+        """
+        resolved, requirements = self._resolve_options(list_options)
 
-        identifiers = self._create_identifiers(list_options)
+        submitted_list_options = \
+            self._exclude_simulated_options(list(resolved.values()))
 
-        simulations = self._create_simulations(list_options, identifiers)
+        # Simulations excluded because they were already simulated are finished
+        submitted_ids = set(id(options) for options in submitted_list_options)
+        for fingerprint, options in resolved.items():
+            if id(options) not in submitted_ids and \
+                    options not in self._submitted_index:
+                with self._dependency_lock:
+                    self._finished_fingerprints.add(fingerprint)
 
-        return simulations
+        identifiers = self._create_identifiers(submitted_list_options)
+
+        simulations = self._create_simulations(submitted_list_options, identifiers)
+
+        return simulations, requirements
 
     @abc.abstractmethod
     def _prepare_target(self):
         raise NotImplementedError
 
+    def _watch(self, token, simulation):
+        """
+        Starts watching the token of a running simulation with the
+        watchdog, with the wall time limit estimated for the simulation.
+        """
+        if self.watchdog is None:
+            return
+
+        estimated_duration_s = \
+            self.scheduler.cost_estimator.estimate_duration_s(simulation.options)
+        self.watchdog.watch(token, estimated_duration_s)
+
+    def _on_target_started(self, token, simulation):
+        """
+        Called before the target of a simulation is run, if the runner has
+        a watchdog. By default, the simulation is watched from now on.
+        Derived classes running the simulation elsewhere (e.g. in a queue)
+        can override this method and call :meth:`_watch` once the
+        simulation actually starts.
+        """
+        self._watch(token, simulation)
+
+    def _wrap_target(self, target):
+        """
+        Wraps the target to record the runtime of each completed simulation
+        in the cost estimator of the scheduler and in the history, and to
+        add it to the cache.
+        """
+        cost_estimator = self.scheduler.cost_estimator
+        history = self.history
+        watchdog = self.watchdog
+        retry_policy = self.retry_policy
+        cache = self.cache
+
+        def watched_target(token, simulation):
+            if watchdog is None:
+                return target(token, simulation)
+
+            self._on_target_started(token, simulation)
+
+            try:
+                try:
+                    simulation = target(token, simulation)
+                except Exception:
+                    if token.timed_out():
+                        raise WorkerTimeoutError(token.timeout_reason)
+                    raise
+
+                if token.timed_out():
+                    raise WorkerTimeoutError(token.timeout_reason)
+
+                return simulation
+
+            finally:
+                watchdog.unwatch(token)
+
+        def wrapped_target(token, simulation):
+            retries = 0
+
+            while True:
+                start = time.perf_counter()
+                start_cpu = time.thread_time()
+
+                try:
+                    result = watched_target(token, simulation)
+                except Exception as exc:
+                    if token.cancelled() and not token.timed_out():
+                        raise
+                    if retry_policy is None or \
+                            not retry_policy.should_retry(exc, retries):
+                        raise
+
+                    retries += 1
+                    logger.info('Retrying simulation {} ({}): {}'
+                                .format(simulation.identifier, retries, exc))
+                    token.reset_timeout()
+                    continue
+
+                break
+
+            # Nothing was simulated (e.g. the simulation was only exported)
+            if result is None:
+                return None
+            simulation = result
+
+            if not token.cancelled():
+                # NOTE: The runtime measured where the simulation ran
+                # excludes the time spent waiting (e.g. in a job queue)
+                if token.elapsed_s is not None:
+                    elapsed_s = token.elapsed_s
+                    cpu_time_s = token.cpu_time_s
+                else:
+                    elapsed_s = time.perf_counter() - start
+                    cpu_time_s = time.thread_time() - start_cpu + token.cpu_time_s
+
+                cost_estimator.record(simulation.options, elapsed_s)
+
+                if history is not None:
+                    record = RuntimeRecord.from_options(simulation.options,
+                                                        elapsed_s, cpu_time_s,
+                                                        token.peak_rss_bytes)
+                    history.add(record)
+
+                if cache is not None:
+                    try:
+                        cache.put(simulation)
+                    except Exception:
+                        logger.exception('Could not cache simulation {}'
+                                         .format(simulation.identifier))
+
+            return simulation
+
+        return wrapped_target
+
+    def _estimate_duration_s(self, future):
+        if not future.args: # e.g. recalculation of the project
+            return 0.0
+
+        options = future.args[0].options
+        return self.scheduler.cost_estimator.estimate_duration_s(options)
+
     def submit(self, *list_options):
         """
         Submits the options in the queue.
@@ -134,24 +474,219 @@ class SimulationRunner(FutureExecutor, metaclass=abc.ABCMeta):
         
         If additional simulations are required based on the analyses of the
         submitted options, they will also be submitted.
+        As soon as a simulation and all the simulations it requires 
+        (e.g. standards) are finished, the results of its analyses are 
+        calculated and :attr:`Project.simulation_recalculated` is sent.
         
         If a simulation with the same options already exists in the project,
         the simulation is skipped.
         
+        The order in which the simulations are started is defined by the 
+        scheduler of the runner.
+        
         :return: a list of :class:`Future` object, one for each launched 
             simulation
         """
-        simulations = self._prepare_simulations(list_options)
-        target = self._prepare_target()
+        simulations, requirements = self._prepare_simulations(list_options)
+        target = self._wrap_target(self._prepare_target())
+
+        required_fingerprints = set()
+        for fingerprints in requirements.values():
+            required_fingerprints.update(fingerprints)
+
+        with self._dependency_lock:
+            for fingerprint, fingerprints in requirements.items():
+                fingerprints = fingerprints - self._finished_fingerprints
+                if not fingerprints:
+                    continue
+
+                self._requirements.setdefault(fingerprint, set()).update(fingerprints)
+                for required_fingerprint in fingerprints:
+                    self._dependents.setdefault(required_fingerprint, set()).add(fingerprint)
+
+        # Cached simulations are completed without being queued
+        cached_simulations = self._find_cached_simulations(simulations)
+
+        futures = {}
+
+        # NOTE: The queue is locked until all simulations are submitted,
+        # so that the first simulations started are the ones with the
+        # lowest priority.
+        with self._queue_lock:
+            for simulation in simulations:
+                self.submitted_options.append(simulation.options)
+                self._submitted_index.add(simulation.options, True)
+
+                if id(simulation) in cached_simulations:
+                    continue
+
+                standard = simulation.options.fingerprint() in required_fingerprints
+                priority = self.scheduler.priority(simulation, standard)
+
+                future = self._submit_with_priority(priority, target, simulation)
+                futures[id(simulation)] = future
+
+        for simulation in simulations:
+            if id(simulation) in cached_simulations:
+                future = self._submit_result(simulation, simulation)
+                futures[id(simulation)] = future
+
+        return [futures[id(simulation)] for simulation in simulations]
+
+    def _find_cached_simulations(self, simulations):
+        """
+        Adds the results of the cache to the simulations found in the cache.
+        Returns a :class:`set` with the :func:`id` of these simulations.
+        """
+        if self.cache is None:
+            return set()
+
+        cached_simulations = set()
 
-        futures = []
         for simulation in simulations:
-            self.submitted_options.append(simulation.options)
-            future = self._submit(target, simulation)
-            futures.append(future)
+            try:
+                cached_simulation = self.cache.get(simulation.options)
+            except Exception:
+                logger.exception('Could not read simulation {} from cache'
+                                 .format(simulation.identifier))
+                continue
+
+            if cached_simulation is None:
+                continue
 
-        return futures
+            simulation.results.extend(cached_simulation.results)
+            cached_simulations.add(id(simulation))
+
+        return cached_simulations
+
+    def plan(self, *list_options):
+        """
+        Returns what :meth:`submit` would do with the options, without 
+        submitting anything.
+        Contrary to :meth:`submit`, invalid options do not raise an exception,
+        but are reported in the plan.
+        
+        :return: a :class:`SimulationPlan`
+        """
+        invalid = []
+        resolved, requirements = self._resolve_options(list_options, invalid)
+
+        new_list_options = self._exclude_simulated_options(list(resolved.values()))
+
+        required_fingerprints = set()
+        for fingerprints in requirements.values():
+            required_fingerprints.update(fingerprints)
+
+        new_ids = set(id(options) for options in new_list_options)
+
+        standard_count = 0
+        durations_s = []
+        for fingerprint, options in resolved.items():
+            if id(options) not in new_ids:
+                continue
+            if fingerprint in required_fingerprints:
+                standard_count += 1
+            duration_s = self.scheduler.cost_estimator.estimate_duration_s(options)
+            durations_s.append(duration_s)
+
+        cached_count = len(resolved) - len(new_list_options)
+
+        return SimulationPlan(new_list_options, standard_count, cached_count,
+                              invalid, durations_s)
+
+    def submit_iter(self, iterable, max_in_flight=None, batch_size=None):
+        """
+        Submits the options of an iterable (e.g. a generator), consuming it
+        lazily.
+        
+        The options are prepared and submitted in batches of *batch_size*.
+        Before each batch, this method blocks until there is capacity, i.e. 
+        at most *max_in_flight* simulations are queued or running.
+        Completed futures and the options of completed simulations are not
+        kept, so that the memory used by the runner does not grow with the
+        length of the iterable.
+        Duplicate options are still skipped, since the completed simulations
+        are found in the project.
+        Failed futures are still available in :attr:`failed_futures`.
+        
+        Otherwise, options are submitted as with :meth:`submit`.
+        Since identifiers are created per batch, they are less descriptive
+        than with :meth:`submit`.
+        
+        :arg max_in_flight: maximum number of queued or running simulations
+            (default: twice the number of workers)
+        :arg batch_size: number of options prepared at once
+            (default: half of *max_in_flight*)
+        
+        :return: number of submitted simulations
+        """
+        if max_in_flight is None:
+            max_in_flight = 2 * self.max_workers
+        if batch_size is None:
+            batch_size = max(1, max_in_flight // 2)
+        batch_size = min(batch_size, max_in_flight)
+
+        count = 0
+        iterator = iter(iterable)
+
+        self._submitting_iter = True
+        try:
+            while True:
+                list_options = list(itertools.islice(iterator, batch_size))
+                if not list_options:
+                    break
+
+                self._wait_in_flight(max_in_flight - len(list_options))
+                self._prune_futures()
+                self._prune_submitted()
+
+                count += len(self.submit(*list_options))
+
+        finally:
+            self._submitting_iter = False
+
+        self._submit_recalculation()
+
+        return count
+
+    def _prune_submitted(self):
+        """
+        Forgets the options of the completed simulations and the fingerprints
+        of the finished simulations which are no longer required by a 
+        queued or running simulation.
+        """
+        in_flight_options = [future.args[0].options
+                             for future in list(self.futures)
+                             if future.args and not future.done()]
+
+        with self._queue_lock:
+            index = OptionIndex()
+            for options in in_flight_options:
+                index.add(options, True)
+
+            self.submitted_options = in_flight_options
+            self._submitted_index = index
+
+        with self._dependency_lock:
+            required_fingerprints = set()
+            for fingerprints in self._requirements.values():
+                required_fingerprints.update(fingerprints)
+
+            self._finished_fingerprints &= required_fingerprints
 
     def shutdown(self):
         super().shutdown()
         self.submitted_options.clear()
+
+        if self.watchdog is not None:
+            self.watchdog.stop()
+        self._submitted_index.clear()
+
+        with self._dependency_lock:
+            self._requirements.clear()
+            self._dependents.clear()
+            self._finished_fingerprints.clear()
+            self._waiting_simulations.clear()
+
+        with self._recalculation_lock:
+            self._streamed_recalculation = False
@@ -0,0 +1,235 @@
+"""
+Runner exporting simulations as a job array for a batch scheduler.
+"""
+
+# Standard library modules.
+import os
+import re
+import json
+import shutil
+import threading
+import concurrent.futures
+import logging
+logger = logging.getLogger(__name__)
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.runner.base import SimulationRunner
+from pymontecarlo.options.base import calculate_digest
+from pymontecarlo.formats.hdf5.reader import read
+from pymontecarlo.formats.hdf5.writer import write
+
+# Globals and constants variables.
+
+SLURM_SCRIPT_TEMPLATE = """#!/bin/bash
+#SBATCH --job-name={name}
+#SBATCH --array=0-{last_index}
+#SBATCH --output={dirpath}/%a.log
+
+JOBDIR="{dirpath}/$(sed -n "$((SLURM_ARRAY_TASK_ID + 1))p" "{jobs_filepath}")"
+cd "$JOBDIR" && {command} && touch "$JOBDIR/{done_filename}"
+"""
+
+class BatchSimulationRunner(SimulationRunner):
+    """
+    Runner exporting each simulation in its own job directory with the
+    exporter of its program, instead of running it.
+    The job directories are listed in a manifest, with a job array script
+    to run them on a batch scheduler (e.g. SLURM).
+    Once the jobs are finished, their results are imported in the project
+    with :meth:`import_results`.
+
+    The runner can be reopened on the same directory to export more
+    simulations or to import the results. Simulations already in the
+    manifest are not exported again.
+    """
+
+    MANIFEST_FILENAME = 'manifest.json'
+    JOBS_FILENAME = 'jobs.txt'
+    SCRIPT_FILENAME = 'submit.sh'
+    SIMULATION_FILENAME = 'simulation.h5'
+    DONE_FILENAME = '.done'
+    IMPORTED_FILENAME = '.imported'
+
+    def __init__(self, dirpath, command, project=None, max_workers=1,
+                 script_template=SLURM_SCRIPT_TEMPLATE, **kwargs):
+        """
+        :arg dirpath: directory where the job directories are created
+        :arg command: shell command running the program in the current
+            job directory. The command should exit with a non-zero code
+            if the simulation failed.
+        :arg max_workers: number of simulations exported or imported
+            in parallel
+        :arg script_template: template of the job array script, formatted
+            with *name*, *dirpath*, *last_index*, *jobs_filepath*,
+            *command* and *done_filename*
+
+        See :class:`SimulationRunner` for the other arguments.
+        """
+        super().__init__(project, max_workers, **kwargs)
+        self.dirpath = dirpath
+        self.command = command
+        self.script_template = script_template
+
+        os.makedirs(dirpath, exist_ok=True)
+
+        self._jobs = self._read_manifest() # key: digest, value: job directory name
+        self._exporting_jobs = {} # key: digest, value: job directory name
+        self._next_index = self._find_next_index()
+        self._jobs_lock = threading.Lock()
+
+    @property
+    def manifest_filepath(self):
+        return os.path.join(self.dirpath, self.MANIFEST_FILENAME)
+
+    @property
+    def script_filepath(self):
+        return os.path.join(self.dirpath, self.SCRIPT_FILENAME)
+
+    def _read_manifest(self):
+        if not os.path.exists(self.manifest_filepath):
+            return {}
+
+        with open(self.manifest_filepath, 'r') as fp:
+            data = json.load(fp)
+
+        return dict((job['digest'], job['dirname']) for job in data['jobs'])
+
+    def _find_next_index(self):
+        """
+        Returns the index of the next job directory, after the ones in the
+        manifest and the ones left in the directory (e.g. after a crash).
+        """
+        dirnames = list(self._jobs.values())
+        if os.path.isdir(self.dirpath):
+            dirnames.extend(os.listdir(self.dirpath))
+
+        indexes = [int(m.group(1)) for m in map(re.compile(r'^(\d+)-').match, dirnames)
+                   if m is not None]
+        return max(indexes, default=-1) + 1
+
+    @staticmethod
+    def _write_atomically(filepath, content):
+        tmpfilepath = filepath + '.tmp'
+        with open(tmpfilepath, 'w') as fp:
+            fp.write(content)
+        os.replace(tmpfilepath, filepath)
+
+    def _write_manifest(self):
+        # NOTE: Must be called with the jobs lock
+        jobs = sorted(self._jobs.items(), key=lambda item: item[1])
+
+        data = {'jobs': [{'digest': digest, 'dirname': dirname}
+                         for digest, dirname in jobs]}
+        self._write_atomically(self.manifest_filepath, json.dumps(data, indent=2))
+
+        jobs_filepath = os.path.join(self.dirpath, self.JOBS_FILENAME)
+        self._write_atomically(jobs_filepath,
+                               ''.join(dirname + '\n' for _digest, dirname in jobs))
+
+        script = self.script_template.format(
+            name=os.path.basename(os.path.abspath(self.dirpath)),
+            dirpath=os.path.abspath(self.dirpath),
+            last_index=max(len(jobs) - 1, 0),
+            jobs_filepath=os.path.abspath(jobs_filepath),
+            command=self.command,
+            done_filename=self.DONE_FILENAME)
+        self._write_atomically(self.script_filepath, script)
+
+    def write_manifest(self):
+        """
+        Writes the manifest, the list of job directories and the job array
+        script. This method is called after each exported simulation and
+        when the runner is shut down.
+        """
+        with self._jobs_lock:
+            self._write_manifest()
+
+    def _prepare_target(self):
+        def target(token, simulation):
+            digest = calculate_digest(simulation.options)
+
+            with self._jobs_lock:
+                if digest in self._jobs or digest in self._exporting_jobs:
+                    return None
+                dirname = '{:05d}-{}'.format(self._next_index, simulation.identifier)
+                self._next_index += 1
+                self._exporting_jobs[digest] = dirname
+
+            jobdir = os.path.join(self.dirpath, dirname)
+
+            try:
+                os.makedirs(jobdir, exist_ok=True)
+
+                token.update(0.0, 'Exporting')
+                exporter = simulation.options.program.create_exporter()
+                exporter.export(simulation.options, jobdir)
+
+                write(simulation, os.path.join(jobdir, self.SIMULATION_FILENAME))
+
+            except:
+                # The simulation can be exported again
+                shutil.rmtree(jobdir, ignore_errors=True)
+                with self._jobs_lock:
+                    self._exporting_jobs.pop(digest, None)
+                raise
+
+            # Only exported jobs are listed, so that nothing is lost after a crash
+            with self._jobs_lock:
+                self._exporting_jobs.pop(digest, None)
+                self._jobs[digest] = dirname
+                self._write_manifest()
+
+            # The simulation is only added to the project once imported
+            return None
+
+        return target
+
+    def _import_job(self, jobdir):
+        simulation = read(os.path.join(jobdir, self.SIMULATION_FILENAME))
+        options = simulation.options
+
+        existing = self.project.find_simulation(options)
+        if existing is None or not existing.results:
+            importer = options.program.create_importer()
+            simulation.results.extend(importer.import_(options, jobdir))
+            self.project.add_simulation(simulation)
+
+        open(os.path.join(jobdir, self.IMPORTED_FILENAME), 'w').close()
+        return simulation
+
+    def import_results(self):
+        """
+        Imports the results of the finished jobs in the project,
+        in parallel with the importer of their program.
+        Jobs already imported or not finished are skipped.
+
+        :return: :class:`list` of the imported simulations
+        """
+        dirnames = []
+        for dirname in sorted(self._read_manifest().values()):
+            jobdir = os.path.join(self.dirpath, dirname)
+            if not os.path.exists(os.path.join(jobdir, self.DONE_FILENAME)):
+                continue
+            if os.path.exists(os.path.join(jobdir, self.IMPORTED_FILENAME)):
+                continue
+            dirnames.append(jobdir)
+
+        simulations = []
+        with concurrent.futures.ThreadPoolExecutor(self.max_workers) as executor:
+            for jobdir, future in [(jobdir, executor.submit(self._import_job, jobdir))
+                                   for jobdir in dirnames]:
+                try:
+                    simulations.append(future.result())
+                except Exception:
+                    logger.exception('Import of {} failed'.format(jobdir))
+
+        if self.project.recalculate_required:
+            self.project.recalculate()
+
+        return simulations
+
+    def shutdown(self):
+        super().shutdown()
+        self.write_manifest()
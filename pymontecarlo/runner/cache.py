@@ -0,0 +1,186 @@
+"""
+Cache of simulation results shared between projects.
+"""
+
+# Standard library modules.
+import os
+import hashlib
+import tempfile
+import threading
+import logging
+logger = logging.getLogger(__name__)
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.options.base import calculate_digest
+from pymontecarlo.formats.hdf5.reader import read
+from pymontecarlo.formats.hdf5.writer import write
+from pymontecarlo.util.path import get_config_dir
+
+# Globals and constants variables.
+
+class ResultCache:
+    """
+    Content-addressed cache of simulations with their results, stored
+    as HDF5 files on disk.
+    A simulation is identified by the digest of its options and the
+    version of its program (see :meth:`Program.getversion`).
+
+    The least recently used simulations are evicted when the size of the
+    cache exceeds *max_size_bytes*.
+    The size is only read from the disk once and then updated as
+    simulations are added, so the files added by other processes are only
+    accounted for at the next eviction.
+    The cache can be shared by several processes: files are written
+    atomically and an evicted file is a cache miss.
+    """
+
+    DEFAULT_DIRNAME = 'cache'
+    EXTENSION = '.h5'
+
+    def __init__(self, dirpath=None, max_size_bytes=None):
+        """
+        :arg dirpath: directory of the cache
+            (default: ``cache`` in the configuration directory)
+        :arg max_size_bytes: maximum size of the cache (``None``: unlimited)
+        """
+        if dirpath is None:
+            dirpath = os.path.join(get_config_dir(), self.DEFAULT_DIRNAME)
+        os.makedirs(dirpath, exist_ok=True)
+
+        self.dirpath = dirpath
+        self.max_size_bytes = max_size_bytes
+
+        self._size_bytes = None # Estimated size, None if not yet read
+        self._size_lock = threading.Lock()
+
+    def __repr__(self):
+        return '<{classname}({dirpath})>' \
+            .format(classname=self.__class__.__name__, dirpath=self.dirpath)
+
+    def __len__(self):
+        return len(self._list_filepaths())
+
+    def __contains__(self, options):
+        return os.path.exists(self._get_filepath(options))
+
+    def _get_key(self, options):
+        version = options.program.getversion()
+        data = repr((calculate_digest(options), version)).encode('utf8')
+        return hashlib.sha1(data).hexdigest()
+
+    def _get_filepath(self, options):
+        key = self._get_key(options)
+        return os.path.join(self.dirpath, key[:2], key + self.EXTENSION)
+
+    def _list_filepaths(self):
+        filepaths = []
+        for dirpath, _dirnames, filenames in os.walk(self.dirpath):
+            for filename in filenames:
+                if filename.endswith(self.EXTENSION):
+                    filepaths.append(os.path.join(dirpath, filename))
+        return filepaths
+
+    def get(self, options):
+        """
+        Returns the cached simulation with the same options,
+        or ``None``.
+        """
+        filepath = self._get_filepath(options)
+
+        try:
+            simulation = read(filepath)
+            os.utime(filepath)
+        except (OSError, IOError): # Not cached or evicted
+            return None
+
+        # Verify the options in case of hash collision
+        if simulation.options != options:
+            return None
+
+        return simulation
+
+    def put(self, simulation):
+        """
+        Adds a simulation with its results in the cache.
+        Simulations without result are not cached.
+        """
+        if not simulation.results:
+            return
+
+        filepath = self._get_filepath(simulation.options)
+        dirpath = os.path.dirname(filepath)
+        os.makedirs(dirpath, exist_ok=True)
+
+        try:
+            previous_size_bytes = os.path.getsize(filepath)
+        except OSError:
+            previous_size_bytes = 0
+
+        fd, tmpfilepath = tempfile.mkstemp(suffix='.tmp', dir=dirpath)
+        os.close(fd)
+
+        try:
+            write(simulation, tmpfilepath)
+            size_bytes = os.path.getsize(tmpfilepath)
+            os.replace(tmpfilepath, filepath)
+        except:
+            os.remove(tmpfilepath)
+            raise
+
+        if self.max_size_bytes is None:
+            return
+
+        with self._size_lock:
+            if self._size_bytes is None:
+                self._size_bytes = self.size_bytes
+            else:
+                self._size_bytes += size_bytes - previous_size_bytes
+            exceeded = self._size_bytes > self.max_size_bytes
+
+        if exceeded:
+            self.evict(self.max_size_bytes)
+
+    def evict(self, max_size_bytes):
+        """
+        Removes the least recently used simulations until the size of
+        the cache is at most *max_size_bytes*.
+        """
+        entries = []
+        for filepath in self._list_filepaths():
+            try:
+                stat = os.stat(filepath)
+            except OSError: # Evicted by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, filepath))
+
+        size_bytes = sum(size for _mtime, size, _filepath in entries)
+
+        for _mtime, size, filepath in sorted(entries):
+            if size_bytes <= max_size_bytes:
+                break
+
+            try:
+                os.remove(filepath)
+            except OSError: # Evicted by another process
+                pass
+
+            logger.debug('Evicted {} from cache'.format(filepath))
+            size_bytes -= size
+
+        with self._size_lock:
+            self._size_bytes = size_bytes
+
+    def clear(self):
+        self.evict(0)
+
+    @property
+    def size_bytes(self):
+        size_bytes = 0
+        for filepath in self._list_filepaths():
+            try:
+                size_bytes += os.path.getsize(filepath)
+            except OSError:
+                pass
+        return size_bytes
@@ -0,0 +1,267 @@
+"""
+History of simulation runtimes and prediction model.
+"""
+
+# Standard library modules.
+import os
+import math
+import json
+import time
+import threading
+import collections
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+from pymontecarlo.options.base import calculate_digest
+from pymontecarlo.runner.scheduler import CostEstimator
+from pymontecarlo.util.path import get_config_dir
+
+# Globals and constants variables.
+
+def extract_features(options):
+    """
+    Returns a :class:`dict` of the features of the options affecting the
+    runtime of a simulation.
+    """
+    sample = options.sample
+
+    mean_zs = [sum(z * wf for z, wf in material.composition.items())
+               for material in sample.materials]
+    mean_z = sum(mean_zs) / len(mean_zs) if mean_zs else 0.0
+
+    return {'number_trajectories': CostEstimator.estimate_number_trajectories(options),
+            'energy_eV': options.beam.energy_eV,
+            'mean_z': mean_z,
+            'sample': sample.__class__.__name__,
+            'number_layers': len(getattr(sample, 'layers', ()))}
+
+class RuntimeRecord:
+
+    def __init__(self, program_identifier, fingerprint, features,
+                 wall_time_s, cpu_time_s, peak_rss_bytes, timestamp=None):
+        """
+        Resources used by a completed simulation.
+
+        :arg program_identifier: identifier of the program
+        :arg fingerprint: digest of the options (see :func:`calculate_digest`)
+        :arg features: features of the options (see :func:`extract_features`)
+        :arg wall_time_s: elapsed time
+        :arg cpu_time_s: CPU time used by the runner thread and the
+            subprocesses of the worker
+        :arg peak_rss_bytes: peak resident memory of the subprocesses of the
+            worker, 0 if unknown
+        :arg timestamp: time when the simulation was completed
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        self.program_identifier = program_identifier
+        self.fingerprint = fingerprint
+        self.features = features
+        self.wall_time_s = wall_time_s
+        self.cpu_time_s = cpu_time_s
+        self.peak_rss_bytes = peak_rss_bytes
+        self.timestamp = timestamp
+
+    def __repr__(self):
+        return '<{classname}({program_identifier}, {wall_time_s:g} s)>' \
+            .format(classname=self.__class__.__name__, **self.__dict__)
+
+    @classmethod
+    def from_options(cls, options, wall_time_s, cpu_time_s, peak_rss_bytes):
+        return cls(options.program.getidentifier(),
+                   calculate_digest(options),
+                   extract_features(options),
+                   wall_time_s, cpu_time_s, peak_rss_bytes)
+
+class RuntimeHistory:
+    """
+    Thread-safe collection of :class:`RuntimeRecord`.
+    The history can be saved in the configuration directory to be reused
+    in later sessions.
+    Only the most recent *max_records_per_program* records of each program
+    are kept.
+    """
+
+    DEFAULT_FILENAME = 'runtimes.json'
+    DEFAULT_MAX_RECORDS_PER_PROGRAM = 1000
+
+    def __init__(self, records=None,
+                 max_records_per_program=DEFAULT_MAX_RECORDS_PER_PROGRAM):
+        self.max_records_per_program = max_records_per_program
+
+        self._records = []
+        self._program_records = {} # key: program identifier, value: deque of records
+        self._versions = collections.Counter() # key: program identifier
+        self._lock = threading.Lock()
+
+        for record in records or ():
+            self.add(record)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    @classmethod
+    def read(cls, filepath=None):
+        """
+        Reads a history.
+        An empty history is returned if the file does not exist.
+        """
+        if filepath is None:
+            filepath = os.path.join(get_config_dir(), cls.DEFAULT_FILENAME)
+
+        if not os.path.exists(filepath):
+            return cls()
+
+        with open(filepath, 'r') as fp:
+            data = json.load(fp)
+
+        return cls(RuntimeRecord(**kwargs) for kwargs in data['records'])
+
+    def write(self, filepath=None):
+        if filepath is None:
+            filepath = os.path.join(get_config_dir(), self.DEFAULT_FILENAME)
+
+        data = {'records': [record.__dict__ for record in self.records]}
+
+        with open(filepath, 'w') as fp:
+            json.dump(data, fp)
+
+    def add(self, record):
+        program_identifier = record.program_identifier
+
+        with self._lock:
+            self._records.append(record)
+
+            records = self._program_records.setdefault(program_identifier,
+                                                       collections.deque())
+            records.append(record)
+
+            # Forget the oldest record of the program
+            if len(records) > self.max_records_per_program:
+                oldest = records.popleft()
+                index = next(i for i, other in enumerate(self._records)
+                             if other is oldest)
+                del self._records[index]
+
+            self._versions[program_identifier] += 1
+
+    def find_records(self, program_identifier):
+        with self._lock:
+            return list(self._program_records.get(program_identifier, ()))
+
+    def get_version(self, program_identifier):
+        """
+        Returns a number which changes each time the records of a program
+        change, e.g. to know whether a model fitted on them is outdated.
+        """
+        with self._lock:
+            return self._versions[program_identifier]
+
+    @property
+    def records(self):
+        with self._lock:
+            return tuple(self._records)
+
+class _RegressionModel:
+
+    def __init__(self, samples, coefficients):
+        self.samples = samples
+        self.coefficients = coefficients
+
+    @classmethod
+    def _create_row(cls, features, samples):
+        row = [1.0,
+               math.log(max(features['number_trajectories'], 1.0)),
+               math.log(max(features['energy_eV'], 1.0)),
+               features['mean_z'],
+               features['number_layers']]
+        row.extend(float(features['sample'] == sample) for sample in samples)
+        return row
+
+    @classmethod
+    def fit(cls, list_features, values):
+        samples = sorted(set(features['sample'] for features in list_features))
+
+        a = np.array([cls._create_row(features, samples) for features in list_features])
+        b = np.log(np.array(values))
+        coefficients, _residuals, _rank, _s = np.linalg.lstsq(a, b, rcond=None)
+
+        return cls(samples, coefficients)
+
+    def predict(self, features):
+        row = self._create_row(features, self.samples)
+        return math.exp(np.dot(row, self.coefficients))
+
+class RuntimePredictor:
+    """
+    Predicts the runtime and peak memory of a simulation from the history
+    of simulations of the same program.
+
+    For each program, the logarithm of the runtime is fitted by least squares
+    on the logarithm of the number of trajectories and beam energy,
+    the mean atomic number of the sample, its number of layers and its type.
+    The models are refitted when new records are added to the history.
+    """
+
+    MINIMUM_RECORDS = 5
+
+    def __init__(self, history):
+        self.history = history
+        self._models = {} # key: (program identifier, attribute), value: (version, model)
+        self._lock = threading.Lock()
+
+    def _get_model(self, program_identifier, attribute):
+        key = (program_identifier, attribute)
+        version = self.history.get_version(program_identifier)
+
+        with self._lock:
+            cached_version, model = self._models.get(key, (None, None))
+            if cached_version == version:
+                return model
+
+        records = [record for record in self.history.find_records(program_identifier)
+                   if getattr(record, attribute) > 0]
+        if len(records) < self.MINIMUM_RECORDS:
+            model = None
+        else:
+            list_features = [record.features for record in records]
+            values = [getattr(record, attribute) for record in records]
+            model = _RegressionModel.fit(list_features, values)
+
+        with self._lock:
+            self._models[key] = (version, model)
+
+        return model
+
+    def _predict(self, options, attribute):
+        model = self._get_model(options.program.getidentifier(), attribute)
+        if model is None:
+            return None
+        return model.predict(extract_features(options))
+
+    def can_predict(self, program):
+        """
+        Returns whether enough simulations of the program were recorded
+        to predict their runtime.
+        """
+        return self._get_model(program.getidentifier(), 'wall_time_s') is not None
+
+    def predict_wall_time_s(self, options):
+        """
+        Returns the predicted runtime of the options in seconds, or ``None``
+        if not enough simulations of the program were recorded.
+        """
+        return self._predict(options, 'wall_time_s')
+
+    def predict_peak_rss_bytes(self, options):
+        """
+        Returns the predicted peak memory of the options in bytes, or ``None``
+        if not enough simulations of the program were recorded.
+        """
+        return self._predict(options, 'peak_rss_bytes')
@@ -0,0 +1,516 @@
+"""
+Durable job queue, where simulations are pulled by workers running in
+any number of processes and hosts.
+"""
+
+# Standard library modules.
+import os
+import time
+import socket
+import sqlite3
+import tempfile
+import threading
+import contextlib
+import shutil
+import logging
+logger = logging.getLogger(__name__)
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.runner.base import SimulationRunner
+from pymontecarlo.util.future import Token
+from pymontecarlo.formats.hdf5.reader import read
+from pymontecarlo.formats.hdf5.writer import write
+from pymontecarlo.exceptions import WorkerError, WorkerCancelledError
+
+# Globals and constants variables.
+
+STATE_QUEUED = 'queued'
+STATE_LEASED = 'leased'
+STATE_DONE = 'done'
+STATE_FAILED = 'failed'
+STATE_CANCELLED = 'cancelled'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    identifier TEXT NOT NULL,
+    state TEXT NOT NULL,
+    simulation BLOB NOT NULL,
+    result BLOB,
+    error TEXT,
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    progress REAL NOT NULL DEFAULT 0.0,
+    status TEXT NOT NULL DEFAULT '',
+    created REAL NOT NULL,
+    elapsed_s REAL,
+    cpu_time_s REAL,
+    peak_rss_bytes INTEGER
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, id);
+"""
+
+# Columns added to existing databases
+_ADDED_COLUMNS = [('elapsed_s', 'REAL'),
+                  ('cpu_time_s', 'REAL'),
+                  ('peak_rss_bytes', 'INTEGER')]
+
+def _dump_simulation(simulation):
+    tmpdir = tempfile.mkdtemp()
+    try:
+        filepath = os.path.join(tmpdir, 'simulation.h5')
+        write(simulation, filepath)
+        with open(filepath, 'rb') as fp:
+            return fp.read()
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+def _load_simulation(data):
+    tmpdir = tempfile.mkdtemp()
+    try:
+        filepath = os.path.join(tmpdir, 'simulation.h5')
+        with open(filepath, 'wb') as fp:
+            fp.write(data)
+        return read(filepath)
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+def create_worker_id():
+    return '{}:{}:{}'.format(socket.gethostname(), os.getpid(),
+                             threading.get_ident())
+
+class JobInfo:
+
+    def __init__(self, job_id, identifier, state, worker, attempts,
+                 progress, status, error, elapsed_s=None, cpu_time_s=None,
+                 peak_rss_bytes=None):
+        """
+        State of a job in a :class:`JobQueue`.
+        The resources used by a completed job, as measured by its worker,
+        are ``None`` until the job is done.
+        """
+        self.job_id = job_id
+        self.identifier = identifier
+        self.state = state
+        self.worker = worker
+        self.attempts = attempts
+        self.progress = progress
+        self.status = status
+        self.error = error
+        self.elapsed_s = elapsed_s
+        self.cpu_time_s = cpu_time_s
+        self.peak_rss_bytes = peak_rss_bytes
+
+    def __repr__(self):
+        return '<{classname}({job_id}, {identifier}, {state})>' \
+            .format(classname=self.__class__.__name__, **self.__dict__)
+
+    def done(self):
+        return self.state in (STATE_DONE, STATE_FAILED, STATE_CANCELLED)
+
+class JobQueue:
+    """
+    Queue of simulations stored in a SQLite database.
+    The database can be located on a shared filesystem, so that workers
+    on several hosts pull jobs from the same queue.
+
+    A worker leases a job for *lease_duration_s* and must renew its lease
+    with :meth:`heartbeat` while the simulation runs.
+    A job whose lease expires (e.g. its worker crashed) is requeued, up to
+    *max_attempts* times, after which it fails.
+    Lease expiration relies on the clocks of the hosts being synchronized.
+    """
+
+    def __init__(self, filepath, lease_duration_s=60.0, max_attempts=3,
+                 timeout_s=30.0):
+        """
+        :arg filepath: path to the SQLite database, created if needed
+        :arg lease_duration_s: duration of a lease without heartbeat
+        :arg max_attempts: maximum number of times a job is leased
+        :arg timeout_s: maximum time to wait for the database lock
+        """
+        self.filepath = filepath
+        self.lease_duration_s = lease_duration_s
+        self.max_attempts = max_attempts
+        self.timeout_s = timeout_s
+
+        connection = self._connect()
+        try:
+            connection.executescript(_SCHEMA)
+
+            columns = set(row[1] for row in connection.execute('PRAGMA table_info(jobs)'))
+            for name, type_ in _ADDED_COLUMNS:
+                if name not in columns:
+                    connection.execute('ALTER TABLE jobs ADD COLUMN {} {}'.format(name, type_))
+        finally:
+            connection.close()
+
+    def __repr__(self):
+        return '<{classname}({filepath})>' \
+            .format(classname=self.__class__.__name__, filepath=self.filepath)
+
+    def _connect(self):
+        return sqlite3.connect(self.filepath, timeout=self.timeout_s,
+                               isolation_level=None)
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        connection = self._connect()
+        try:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                yield connection
+            except:
+                connection.execute('ROLLBACK')
+                raise
+            else:
+                connection.execute('COMMIT')
+        finally:
+            connection.close()
+
+    def _requeue_expired(self, connection, now):
+        connection.execute("UPDATE jobs SET state=?, error='Lease expired' "
+                           "WHERE state=? AND lease_expires<? AND attempts>=?",
+                           (STATE_FAILED, STATE_LEASED, now, self.max_attempts))
+        connection.execute("UPDATE jobs SET state=?, worker=NULL, lease_expires=NULL "
+                           "WHERE state=? AND lease_expires<?",
+                           (STATE_QUEUED, STATE_LEASED, now))
+
+    def put(self, simulation):
+        """
+        Queues a simulation and returns the identifier of its job.
+        """
+        data = _dump_simulation(simulation)
+
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "INSERT INTO jobs (identifier, state, simulation, created) "
+                "VALUES (?, ?, ?, ?)",
+                (simulation.identifier, STATE_QUEUED, data, time.time()))
+            return cursor.lastrowid
+
+    def lease(self, worker_id):
+        """
+        Leases the oldest queued job.
+        Returns a :class:`tuple` of the job identifier and the simulation,
+        or ``None`` if no job is queued.
+        """
+        now = time.time()
+
+        with self._transaction() as connection:
+            self._requeue_expired(connection, now)
+
+            row = connection.execute(
+                "SELECT id, simulation FROM jobs WHERE state=? ORDER BY id LIMIT 1",
+                (STATE_QUEUED,)).fetchone()
+            if row is None:
+                return None
+
+            job_id, data = row
+            connection.execute(
+                "UPDATE jobs SET state=?, worker=?, lease_expires=?, "
+                "attempts=attempts+1, progress=0.0, status='Leased' WHERE id=?",
+                (STATE_LEASED, worker_id, now + self.lease_duration_s, job_id))
+
+        return job_id, _load_simulation(data)
+
+    def heartbeat(self, job_id, worker_id, progress=0.0, status=''):
+        """
+        Renews the lease of a job and updates its progress.
+        Returns ``False`` if the worker does not hold the lease anymore
+        (e.g. the lease expired or the job was cancelled).
+        """
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET lease_expires=?, progress=?, status=? "
+                "WHERE id=? AND state=? AND worker=?",
+                (time.time() + self.lease_duration_s, progress, status,
+                 job_id, STATE_LEASED, worker_id))
+            return cursor.rowcount > 0
+
+    def complete(self, job_id, worker_id, simulation, elapsed_s=None,
+                 cpu_time_s=None, peak_rss_bytes=None):
+        """
+        Stores the simulation with its results, and the resources used to
+        run it, as measured by the worker.
+        Returns ``False`` if the worker does not hold the lease anymore.
+        """
+        data = _dump_simulation(simulation)
+
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET state=?, result=?, progress=1.0, status='Done', "
+                "lease_expires=NULL, elapsed_s=?, cpu_time_s=?, peak_rss_bytes=? "
+                "WHERE id=? AND state=? AND worker=?",
+                (STATE_DONE, data, elapsed_s, cpu_time_s, peak_rss_bytes,
+                 job_id, STATE_LEASED, worker_id))
+            return cursor.rowcount > 0
+
+    def fail(self, job_id, worker_id, error):
+        """
+        Marks a job as failed.
+        Returns ``False`` if the worker does not hold the lease anymore.
+        """
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET state=?, error=?, progress=1.0, status='Error', "
+                "lease_expires=NULL WHERE id=? AND state=? AND worker=?",
+                (STATE_FAILED, str(error), job_id, STATE_LEASED, worker_id))
+            return cursor.rowcount > 0
+
+    def cancel(self, job_id):
+        """
+        Cancels a queued or leased job.
+        The worker running a leased job stops at its next heartbeat.
+        """
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE jobs SET state=?, status='Cancelled', lease_expires=NULL "
+                "WHERE id=? AND state IN (?, ?)",
+                (STATE_CANCELLED, job_id, STATE_QUEUED, STATE_LEASED))
+
+    def requeue_expired(self):
+        """
+        Requeues the jobs whose lease expired.
+        This is also done each time a job is leased.
+        """
+        with self._transaction() as connection:
+            self._requeue_expired(connection, time.time())
+
+    def get_info(self, job_id):
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT id, identifier, state, worker, attempts, progress, "
+                "status, error, elapsed_s, cpu_time_s, peak_rss_bytes "
+                "FROM jobs WHERE id=?", (job_id,)).fetchone()
+
+        if row is None:
+            raise KeyError(job_id)
+
+        return JobInfo(*row)
+
+    def get_result(self, job_id):
+        """
+        Returns the simulation with its results of a completed job.
+        """
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT state, result FROM jobs WHERE id=?", (job_id,)).fetchone()
+
+        if row is None:
+            raise KeyError(job_id)
+
+        state, data = row
+        if state != STATE_DONE:
+            raise ValueError('Job {} is not done: {}'.format(job_id, state))
+
+        return _load_simulation(data)
+
+    def count(self, state=None):
+        """
+        Returns the number of jobs, or the number of jobs in *state*.
+        """
+        with self._transaction() as connection:
+            if state is None:
+                row = connection.execute("SELECT COUNT(*) FROM jobs").fetchone()
+            else:
+                row = connection.execute("SELECT COUNT(*) FROM jobs WHERE state=?",
+                                         (state,)).fetchone()
+        return row[0]
+
+class QueueWorker:
+
+    def __init__(self, queue, worker_id=None, heartbeat_interval_s=None,
+                 poll_interval_s=1.0):
+        """
+        Pulls jobs from a :class:`JobQueue`, runs them with the worker of
+        their program and pushes the results back to the queue.
+
+        :arg queue: :class:`JobQueue`
+        :arg worker_id: unique identifier of this worker
+            (default: host name, process and thread identifiers)
+        :arg heartbeat_interval_s: interval between the renewals of the
+            lease (default: a third of the lease duration)
+        :arg poll_interval_s: interval between the polls of an empty queue
+        """
+        if worker_id is None:
+            worker_id = create_worker_id()
+        if heartbeat_interval_s is None:
+            heartbeat_interval_s = queue.lease_duration_s / 3
+
+        self.queue = queue
+        self.worker_id = worker_id
+        self.heartbeat_interval_s = heartbeat_interval_s
+        self.poll_interval_s = poll_interval_s
+
+        self._stop_event = threading.Event()
+
+    def _heartbeat(self, job_id, token, done_event):
+        while not done_event.wait(self.heartbeat_interval_s):
+            try:
+                alive = self.queue.heartbeat(job_id, self.worker_id,
+                                             token.progress, token.status)
+            except sqlite3.Error:
+                logger.exception('Heartbeat of job {} failed'.format(job_id))
+                continue
+
+            if not alive:
+                logger.info('Lease of job {} lost'.format(job_id))
+                token.cancel()
+                return
+
+    def _run_simulation(self, token, simulation):
+        worker = simulation.options.program.create_worker()
+
+        outputdir = tempfile.mkdtemp()
+        try:
+            worker.run(token, simulation, outputdir)
+        finally:
+            shutil.rmtree(outputdir, ignore_errors=True)
+
+    def run_one(self):
+        """
+        Leases and runs one job.
+        Returns ``False`` if no job is queued.
+        """
+        job = self.queue.lease(self.worker_id)
+        if job is None:
+            return False
+
+        job_id, simulation = job
+        logger.info('Running job {} ({})'.format(job_id, simulation.identifier))
+
+        token = Token()
+        done_event = threading.Event()
+        thread = threading.Thread(target=self._heartbeat,
+                                  args=(job_id, token, done_event), daemon=True)
+        thread.start()
+
+        start = time.perf_counter()
+        start_cpu = time.thread_time()
+
+        try:
+            self._run_simulation(token, simulation)
+
+        except Exception as exc:
+            logger.exception('Job {} failed'.format(job_id))
+            if not token.cancelled():
+                self.queue.fail(job_id, self.worker_id, exc)
+
+        else:
+            if not token.cancelled():
+                elapsed_s = time.perf_counter() - start
+                cpu_time_s = time.thread_time() - start_cpu + token.cpu_time_s
+                self.queue.complete(job_id, self.worker_id, simulation,
+                                    elapsed_s, cpu_time_s, token.peak_rss_bytes)
+
+        finally:
+            done_event.set()
+            thread.join()
+
+        return True
+
+    def run(self, max_jobs=None, idle_timeout_s=None):
+        """
+        Runs jobs until :meth:`stop` is called.
+
+        :arg max_jobs: maximum number of jobs to run
+        :arg idle_timeout_s: stops if no job was queued during this duration
+
+        :return: number of jobs run
+        """
+        self._stop_event.clear()
+        count = 0
+        idle_start = time.monotonic()
+
+        while not self._stop_event.is_set():
+            if max_jobs is not None and count >= max_jobs:
+                break
+
+            if self.run_one():
+                count += 1
+                idle_start = time.monotonic()
+                continue
+
+            if idle_timeout_s is not None and \
+                    time.monotonic() - idle_start >= idle_timeout_s:
+                break
+
+            self._stop_event.wait(self.poll_interval_s)
+
+        return count
+
+    def stop(self):
+        self._stop_event.set()
+
+class QueueSimulationRunner(SimulationRunner):
+
+    def __init__(self, filepath, project=None, max_workers=16,
+                 poll_interval_s=1.0, lease_duration_s=60.0, max_attempts=3,
+                 **kwargs):
+        """
+        Runner writing the simulations in a :class:`JobQueue`.
+        The simulations are run by workers started separately, for example
+        with the ``pymontecarlo worker`` command, on any host with access
+        to the queue.
+
+        :arg filepath: path to the SQLite database of the queue
+        :arg max_workers: maximum number of simulations in the queue
+            at once. The scheduler of the runner orders the other
+            simulations.
+        :arg poll_interval_s: interval between the checks of the state
+            of the queued simulations
+
+        See :class:`JobQueue` and :class:`SimulationRunner` for the other
+        arguments.
+        """
+        super().__init__(project, max_workers, **kwargs)
+        self.queue = JobQueue(filepath, lease_duration_s, max_attempts)
+        self.poll_interval_s = poll_interval_s
+
+    def _on_target_started(self, token, simulation):
+        # NOTE: Queued simulations are only watched once leased by a worker
+        pass
+
+    def _prepare_target(self):
+        queue = self.queue
+        poll_interval_s = self.poll_interval_s
+
+        def target(token, simulation):
+            job_id = queue.put(simulation)
+            token.update(0.0, 'Queued')
+            watched = False
+
+            while True:
+                if token.cancelled():
+                    queue.cancel(job_id)
+                    raise WorkerCancelledError()
+
+                info = queue.get_info(job_id)
+
+                if info.state == STATE_DONE:
+                    # Resources used by the worker, excluding the queue wait
+                    if info.elapsed_s is not None:
+                        token.update_elapsed(info.elapsed_s)
+                        token.update_usage(info.cpu_time_s or 0.0,
+                                           info.peak_rss_bytes or 0)
+                    return queue.get_result(job_id)
+
+                if info.state == STATE_FAILED:
+                    raise WorkerError(info.error)
+
+                if info.state == STATE_CANCELLED:
+                    raise WorkerCancelledError()
+
+                if info.state == STATE_LEASED:
+                    if not watched:
+                        self._watch(token, simulation)
+                        watched = True
+                    token.update(info.progress, info.status)
+
+                time.sleep(poll_interval_s)
+
+        return target
@@ -6,16 +6,91 @@ Local runner.
 import os
 import tempfile
 import shutil
+import concurrent.futures
 
 # Third party modules.
 
 # Local modules.
 from pymontecarlo.runner.base import SimulationRunner
+from pymontecarlo.runner.pool import StagePool
+from pymontecarlo.program.worker import StagedWorker
+from pymontecarlo.exceptions import WorkerCancelledError
 
 # Globals and constants variables.
 
 class LocalSimulationRunner(SimulationRunner):
 
+    def __init__(self, project=None, max_workers=1, export_workers=0,
+                 import_workers=0, **kwargs):
+        """
+        :arg export_workers: number of simulations exported in parallel.
+            If greater than 0, the simulations run by a :class:`StagedWorker`
+            are pipelined: up to *max_workers* simulations run while others
+            are exported or imported.
+            Each stage has its own queue, bounded by the number of workers
+            of the other stages.
+        :arg import_workers: number of simulations imported in parallel
+            (at least 1), when the simulations are pipelined
+        
+        See :class:`SimulationRunner` for the other arguments.
+        """
+        super().__init__(project, max_workers, **kwargs)
+
+        self.export_workers = export_workers
+        self.import_workers = import_workers
+
+        self.stages = {}
+        if self.pipelined:
+            self.stages['export'] = StagePool('Exporting', export_workers)
+            self.stages['run'] = StagePool('Running', max_workers)
+            self.stages['import'] = StagePool('Importing', max(import_workers, 1))
+
+    @property
+    def pipelined(self):
+        return self.export_workers > 0
+
+    def start(self):
+        if self.executor is not None:
+            return
+
+        # One thread per simulation in any stage
+        max_threads = self.max_workers
+        if self.pipelined:
+            max_threads += self.export_workers + max(self.import_workers, 1)
+
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_threads)
+
+    def _run_stage(self, name, method, token, simulation, outputdir):
+        stage = self.stages.get(name)
+        if stage is None:
+            method(token, simulation, outputdir)
+            return
+
+        token.update(token.progress, 'Waiting for {}'.format(stage.name.lower()))
+        if not stage.acquire(token):
+            raise WorkerCancelledError()
+
+        try:
+            token.update(token.progress, stage.name)
+            method(token, simulation, outputdir)
+        finally:
+            stage.release()
+
+    def _run_worker(self, worker, token, simulation, outputdir):
+        if not self.pipelined or not isinstance(worker, StagedWorker):
+            self._run_stage('run', worker.run, token, simulation, outputdir)
+            return
+
+        self._run_stage('export', worker.export, token, simulation, outputdir)
+        if token.cancelled():
+            return
+
+        self._run_stage('run', worker.execute, token, simulation, outputdir)
+        if token.cancelled():
+            return
+
+        self._run_stage('import', worker.import_, token, simulation, outputdir)
+
     def _prepare_target(self):
         # Create output directory
         if self.project.filepath is not None:
@@ -31,6 +106,10 @@ class LocalSimulationRunner(SimulationRunner):
             program = simulation.options.program
             worker = program.create_worker()
 
+            pool = self._find_pool(simulation.options)
+            if pool is not None and pool.cpu_affinity:
+                worker.cpu_affinity = pool.cpu_affinity
+
             if temporary:
                 outputdir = tempfile.mkdtemp()
             else:
@@ -38,7 +117,7 @@ class LocalSimulationRunner(SimulationRunner):
             os.makedirs(outputdir, exist_ok=True)
 
             try:
-                worker.run(token, simulation, outputdir)
+                self._run_worker(worker, token, simulation, outputdir)
 
             finally:
                 if temporary:
@@ -47,4 +126,3 @@ class LocalSimulationRunner(SimulationRunner):
             return simulation
 
         return target
-
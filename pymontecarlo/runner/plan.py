@@ -0,0 +1,67 @@
+"""
+Plan of the simulations that a runner would submit.
+"""
+
+# Standard library modules.
+
+# Third party modules.
+
+# Local modules.
+
+# Globals and constants variables.
+
+class SimulationPlan:
+
+    def __init__(self, new_list_options, standard_count, cached_count,
+                 invalid, durations_s):
+        """
+        Plan of a submission, as returned by :meth:`SimulationRunner.plan`.
+
+        :arg new_list_options: validated options that would be simulated,
+            including standards
+        :arg standard_count: number of new options only required by the
+            analyses of other options (e.g. standards of a k-ratio analysis)
+        :arg cached_count: number of options already simulated or submitted
+        :arg invalid: :class:`list` of :class:`tuple` of the invalid options
+            and their :exc:`ValidationError`
+        :arg durations_s: estimated duration of each new options in seconds,
+            ``None`` if unknown
+        """
+        self.new_list_options = new_list_options
+        self.standard_count = standard_count
+        self.cached_count = cached_count
+        self.invalid = invalid
+        self.durations_s = durations_s
+
+    def __repr__(self):
+        return '<{classname}({new} new, {standard} standards, {cached} cached, {invalid} invalid)>' \
+            .format(classname=self.__class__.__name__,
+                    new=self.new_count,
+                    standard=self.standard_count,
+                    cached=self.cached_count,
+                    invalid=self.invalid_count)
+
+    @property
+    def new_count(self):
+        return len(self.new_list_options)
+
+    @property
+    def invalid_count(self):
+        return len(self.invalid)
+
+    @property
+    def unestimated_count(self):
+        """
+        Number of new options whose duration cannot be estimated, because
+        no simulation of their program was recorded.
+        """
+        return sum(1 for duration_s in self.durations_s if duration_s is None)
+
+    @property
+    def estimated_cpu_hours(self):
+        """
+        Sum of the estimated durations of the new options, in hours.
+        Options whose duration cannot be estimated are not included.
+        """
+        return sum(duration_s for duration_s in self.durations_s
+                   if duration_s is not None) / 3600.0
@@ -0,0 +1,160 @@
+"""
+Pools limiting the resources used by the simulations.
+"""
+
+# Standard library modules.
+import threading
+import collections
+
+# Third party modules.
+import psutil
+
+# Local modules.
+
+# Globals and constants variables.
+
+class ProgramPool:
+
+    def __init__(self, max_workers=None, memory_budget_bytes=None,
+                 memory_per_worker_bytes=0, cpu_affinity=None):
+        """
+        Creates a pool of workers for the simulations of one program.
+
+        A simulation is only started if the pool has less than *max_workers*
+        running simulations, and if its memory fits in *memory_budget_bytes*
+        and in the memory currently available on the system (as reported
+        by :mod:`psutil`).
+        To avoid starvation, a simulation is always started if no other
+        simulation of the pool is running.
+
+        :arg max_workers: maximum number of simulations running concurrently
+            (``None``: limited only by the runner)
+        :arg memory_budget_bytes: maximum memory used by the running
+            simulations (``None``: no budget)
+        :arg memory_per_worker_bytes: memory reserved for each simulation,
+            when it cannot be predicted from the runtime history
+        :arg cpu_affinity: :class:`list` of CPU indexes where the
+            simulations are run (``None``: any CPU)
+        """
+        self.max_workers = max_workers
+        self.memory_budget_bytes = memory_budget_bytes
+        self.memory_per_worker_bytes = memory_per_worker_bytes
+        self.cpu_affinity = cpu_affinity
+
+        self._reserved = {} # key: simulation key, value: reserved memory
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return '<{classname}({running} running)>' \
+            .format(classname=self.__class__.__name__,
+                    running=self.running_count)
+
+    def _has_capacity(self, memory_bytes):
+        if not self._reserved:
+            return True
+
+        if self.max_workers is not None and \
+                len(self._reserved) >= self.max_workers:
+            return False
+
+        if self.memory_budget_bytes is not None and \
+                self.reserved_memory_bytes + memory_bytes > self.memory_budget_bytes:
+            return False
+
+        if memory_bytes > 0 and \
+                memory_bytes > psutil.virtual_memory().available:
+            return False
+
+        return True
+
+    def try_acquire(self, key, memory_bytes=None):
+        """
+        Reserves a worker for the simulation identified by *key*.
+        Returns ``False`` if the pool has no capacity.
+
+        :arg memory_bytes: predicted peak memory of the simulation
+            (``None``: :attr:`memory_per_worker_bytes`)
+        """
+        if memory_bytes is None:
+            memory_bytes = self.memory_per_worker_bytes
+
+        with self._lock:
+            if not self._has_capacity(memory_bytes):
+                return False
+
+            self._reserved[key] = memory_bytes
+            return True
+
+    def release(self, key):
+        with self._lock:
+            self._reserved.pop(key, None)
+
+    @property
+    def running_count(self):
+        return len(self._reserved)
+
+    @property
+    def reserved_memory_bytes(self):
+        return sum(self._reserved.values())
+
+class StagePool:
+
+    def __init__(self, name, max_workers=1):
+        """
+        Creates a pool of workers for one stage of the simulations
+        (e.g. export, run or import).
+        Simulations waiting for a worker are queued and acquire a worker
+        in arrival order.
+
+        :arg name: name of the stage, used as status of the waiting
+            simulations
+        :arg max_workers: maximum number of simulations in this stage
+        """
+        self.name = name
+        self.max_workers = max_workers
+
+        self._running_count = 0
+        self._queue = collections.deque()
+        self._condition = threading.Condition()
+
+    def __repr__(self):
+        return '<{classname}({name}, {running} running, {queued} queued)>' \
+            .format(classname=self.__class__.__name__, name=self.name,
+                    running=self.running_count, queued=self.queued_count)
+
+    def acquire(self, token, interval_s=0.1):
+        """
+        Waits until a worker is available and reserves it.
+        Returns ``False`` if the *token* was cancelled while waiting.
+        """
+        ticket = object()
+
+        with self._condition:
+            self._queue.append(ticket)
+
+            try:
+                while self._queue[0] is not ticket or \
+                        self._running_count >= self.max_workers:
+                    if token.cancelled():
+                        return False
+                    self._condition.wait(interval_s)
+
+                self._running_count += 1
+                return True
+
+            finally:
+                self._queue.remove(ticket)
+                self._condition.notify_all()
+
+    def release(self):
+        with self._condition:
+            self._running_count -= 1
+            self._condition.notify_all()
+
+    @property
+    def running_count(self):
+        return self._running_count
+
+    @property
+    def queued_count(self):
+        return len(self._queue)
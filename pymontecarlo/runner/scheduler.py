@@ -0,0 +1,193 @@
+"""
+Schedulers to order the execution of simulations.
+"""
+
+# Standard library modules.
+import abc
+import threading
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.options.limit import ShowersLimit, UncertaintyLimit
+
+# Globals and constants variables.
+
+class CostEstimator:
+    """
+    Estimates the cost of running a simulation.
+
+    The cost is proportional to the number of simulated trajectories and
+    to the electron range, which scales with the beam energy as
+    :math:`E^{1.67}` (Kanaya-Okayama).
+    The number of trajectories is taken from the :class:`ShowersLimit`.
+    For an :class:`UncertaintyLimit`, it is estimated from the number of
+    photons required to reach the relative uncertainty, assuming a constant
+    photon yield per trajectory.
+
+    Each time a simulation is completed, its runtime can be recorded with
+    :meth:`record` to calibrate the estimate of its program.
+    Once a program is calibrated, the cost is expressed in seconds.
+
+    If a *predictor* (see :class:`RuntimePredictor`) is specified and
+    enough simulations of a program are in its history, the predicted
+    runtime is used instead.
+    """
+
+    DEFAULT_NUMBER_TRAJECTORIES = 1000
+    REFERENCE_ENERGY_eV = 10e3
+    ENERGY_EXPONENT = 1.67
+    PHOTON_YIELD = 1e-3 # photons per trajectory
+    SMOOTHING = 0.2
+
+    def __init__(self, predictor=None):
+        self.predictor = predictor
+        self._scales = {} # key: program identifier, value: seconds per cost
+        self._lock = threading.Lock()
+
+    @classmethod
+    def estimate_number_trajectories(cls, options):
+        """
+        Returns the estimated number of trajectories simulated before one
+        of the limits of the options is reached.
+        """
+        candidates = []
+
+        for limit in options.find_limits(ShowersLimit):
+            candidates.append(limit.number_trajectories)
+
+        for limit in options.find_limits(UncertaintyLimit):
+            if limit.uncertainty <= 0.0:
+                continue
+            nphotons = 1.0 / limit.uncertainty ** 2
+            candidates.append(nphotons / cls.PHOTON_YIELD)
+
+        if not candidates:
+            return cls.DEFAULT_NUMBER_TRAJECTORIES
+
+        # Simulation stops as soon as one limit is reached
+        return min(candidates)
+
+    def _estimate_relative_cost(self, options):
+        ntrajectories = self.estimate_number_trajectories(options)
+        energy_factor = \
+            (options.beam.energy_eV / self.REFERENCE_ENERGY_eV) ** self.ENERGY_EXPONENT
+        return ntrajectories * energy_factor
+
+    def estimate(self, options):
+        """
+        Returns the estimated cost of simulating the specified options.
+        """
+        duration_s = self._predict_duration_s(options)
+        if duration_s is not None:
+            return duration_s
+
+        identifier = options.program.getidentifier()
+        scale = self._scales.get(identifier, 1.0)
+        return self._estimate_relative_cost(options) * scale
+
+    def _predict_duration_s(self, options):
+        if self.predictor is None:
+            return None
+        return self.predictor.predict_wall_time_s(options)
+
+    def estimate_duration_s(self, options):
+        """
+        Returns the estimated runtime in seconds of the specified options,
+        or ``None`` if the program is not calibrated.
+        """
+        duration_s = self._predict_duration_s(options)
+        if duration_s is not None:
+            return duration_s
+
+        if not self.is_calibrated(options.program):
+            return None
+
+        return self.estimate(options)
+
+    def record(self, options, elapsed_s):
+        """
+        Records the runtime of a completed simulation to calibrate the
+        estimate of its program.
+        """
+        cost = self._estimate_relative_cost(options)
+        if cost <= 0.0 or elapsed_s <= 0.0:
+            return
+
+        identifier = options.program.getidentifier()
+        scale = elapsed_s / cost
+
+        with self._lock:
+            if identifier in self._scales:
+                scale = (1.0 - self.SMOOTHING) * self._scales[identifier] + \
+                    self.SMOOTHING * scale
+            self._scales[identifier] = scale
+
+    def is_calibrated(self, program):
+        """
+        Returns whether the runtime of at least one simulation of the
+        specified program was recorded.
+        """
+        return program.getidentifier() in self._scales
+
+class Scheduler(metaclass=abc.ABCMeta):
+    """
+    Base class of all schedulers.
+    A scheduler assigns a priority to each submitted simulation.
+    When a worker becomes available, the simulation with the lowest
+    priority is started first.
+    """
+
+    def __init__(self, cost_estimator=None):
+        if cost_estimator is None:
+            cost_estimator = CostEstimator()
+        self.cost_estimator = cost_estimator
+
+    @abc.abstractmethod
+    def priority(self, simulation, standard=False):
+        """
+        Returns the priority of a simulation as a :class:`tuple`.
+        Simulations with the same priority are started in submission order.
+
+        :arg simulation: simulation to prioritize
+        :arg standard: whether the simulation is required by the analysis
+            of another simulation (e.g. standard of a k-ratio analysis)
+        """
+        raise NotImplementedError
+
+class FifoScheduler(Scheduler):
+    """
+    Starts simulations in submission order.
+    """
+
+    def priority(self, simulation, standard=False):
+        return ()
+
+class LongestJobFirstScheduler(Scheduler):
+    """
+    Starts the most expensive simulations first to avoid a long tail of
+    a few large simulations at the end of a sweep.
+    """
+
+    def priority(self, simulation, standard=False):
+        return (-self.cost_estimator.estimate(simulation.options),)
+
+class ShortestJobFirstScheduler(Scheduler):
+    """
+    Starts the least expensive simulations first to obtain results as
+    early as possible.
+    """
+
+    def priority(self, simulation, standard=False):
+        return (self.cost_estimator.estimate(simulation.options),)
+
+class StandardsFirstScheduler(Scheduler):
+    """
+    Starts the simulations required by analyses (e.g. standards) first,
+    then the other simulations.
+    Within each group, the most expensive simulations are started first.
+    """
+
+    def priority(self, simulation, standard=False):
+        cost = self.cost_estimator.estimate(simulation.options)
+        return (0 if standard else 1, -cost)
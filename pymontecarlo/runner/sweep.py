@@ -0,0 +1,196 @@
+"""
+Adaptive sweep of simulation parameters.
+"""
+
+# Standard library modules.
+import itertools
+import collections
+import logging
+logger = logging.getLogger(__name__)
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.results.kratio import KRatioResult
+from pymontecarlo.results.photonintensity import EmittedPhotonIntensityResult
+
+# Globals and constants variables.
+
+def extract_response(simulation):
+    """
+    Returns a :class:`dict` of the k-ratios of a simulation or, if it has
+    no k-ratio, of its emitted photon intensities.
+    """
+    response = {}
+
+    for result in simulation.find_result(KRatioResult):
+        for xrayline, q in result.items():
+            response[('kratio', xrayline)] = q.nominal_value
+
+    if response:
+        return response
+
+    for result in simulation.find_result(EmittedPhotonIntensityResult):
+        for xrayline, q in result.items():
+            response[('intensity', xrayline)] = q.nominal_value
+
+    return response
+
+def calculate_relative_change(response0, response1):
+    """
+    Returns the maximum relative change between the values of two responses.
+    """
+    change = 0.0
+
+    for key in response0.keys() & response1.keys():
+        value0 = response0[key]
+        value1 = response1[key]
+        denominator = max(abs(value0), abs(value1))
+        if denominator == 0.0:
+            continue
+        change = max(change, abs(value1 - value0) / denominator)
+
+    return change
+
+class AdaptiveSweep:
+    """
+    Sweep of parameters starting from a coarse grid, refined only where
+    the response of the simulations (e.g. k-ratios) changes rapidly.
+
+    After each batch of simulations, the midpoint between two neighbouring
+    points is simulated if the relative change of their response exceeds
+    *tolerance*. Two points are neighbours if they only differ by the
+    value of one parameter and no other point lies between them.
+    The refinement stops when no more point is required, or when
+    *max_simulations* is reached.
+    """
+
+    def __init__(self, runner, create_options, parameters, tolerance=0.05,
+                 max_simulations=None, max_depth=4, response=extract_response):
+        """
+        :arg runner: :class:`SimulationRunner` running the simulations
+        :arg create_options: function returning the options for the
+            parameter values given as keyword arguments
+        :arg parameters: ordered :class:`dict` where the keys are the names
+            of the parameters and the values, the values of the coarse grid
+        :arg tolerance: maximum relative change of the response between
+            neighbouring points
+        :arg max_simulations: maximum number of simulations of the sweep
+            (``None``: unlimited)
+        :arg max_depth: maximum number of times the spacing of the coarse
+            grid is halved
+        :arg response: function returning a :class:`dict` of values from
+            a simulation (default: :func:`extract_response`)
+        """
+        self.runner = runner
+        self.create_options = create_options
+        self.parameters = collections.OrderedDict(
+            (name, sorted(values)) for name, values in parameters.items())
+        self.tolerance = tolerance
+        self.max_simulations = max_simulations
+        self.max_depth = max_depth
+        self.response = response
+
+        self.simulations = collections.OrderedDict() # key: point, value: simulation
+        self._responses = {}
+
+        self._min_spacings = []
+        for values in self.parameters.values():
+            spacings = [b - a for a, b in zip(values, values[1:])]
+            min_spacing = min(spacings) / 2 ** max_depth if spacings else 0.0
+            self._min_spacings.append(min_spacing)
+
+    def _create_coarse_points(self):
+        return list(itertools.product(*self.parameters.values()))
+
+    def _find_candidates(self):
+        candidates = {} # key: point, value: change
+
+        for dim, min_spacing in enumerate(self._min_spacings):
+            lines = {}
+            for point in self.simulations:
+                key = point[:dim] + point[dim + 1:]
+                lines.setdefault(key, []).append(point)
+
+            for line in lines.values():
+                line.sort(key=lambda point: point[dim])
+
+                for point0, point1 in zip(line, line[1:]):
+                    response0 = self._responses.get(point0)
+                    response1 = self._responses.get(point1)
+                    if response0 is None or response1 is None:
+                        continue
+
+                    spacing = point1[dim] - point0[dim]
+                    if spacing / 2 < min_spacing:
+                        continue
+
+                    change = calculate_relative_change(response0, response1)
+                    if change <= self.tolerance:
+                        continue
+
+                    midpoint = list(point0)
+                    midpoint[dim] = (point0[dim] + point1[dim]) / 2
+                    midpoint = tuple(midpoint)
+
+                    candidates[midpoint] = max(change, candidates.get(midpoint, 0.0))
+
+        # Largest changes first
+        return sorted(candidates, key=candidates.get, reverse=True)
+
+    def _run_batch(self, points):
+        list_options = []
+        for point in points:
+            values = dict(zip(self.parameters.keys(), point))
+            options = self.create_options(**values)
+            options = options.program.create_validator().validate_options(options)
+            list_options.append(options)
+
+        self.runner.start()
+        self.runner.submit(*list_options)
+        self.runner.wait()
+
+        for point, options in zip(points, list_options):
+            simulation = self.runner.project.find_simulation(options)
+            self.simulations[point] = simulation
+
+            if simulation is None:
+                logger.warning('No simulation for {}'.format(point))
+                continue
+
+            self._responses[point] = self.response(simulation)
+
+    def _get_remaining_count(self):
+        if self.max_simulations is None:
+            return None
+        return max(self.max_simulations - len(self.simulations), 0)
+
+    def run(self):
+        """
+        Runs the sweep and returns the simulations, in the order they were
+        run, as a :class:`dict` where the keys are the parameter values.
+        """
+        points = self._create_coarse_points()
+
+        while points:
+            remaining = self._get_remaining_count()
+            if remaining is not None:
+                points = points[:remaining]
+                if not points:
+                    break
+
+            logger.debug('Simulating {} point(s)'.format(len(points)))
+            self._run_batch(points)
+
+            points = [point for point in self._find_candidates()
+                      if point not in self.simulations]
+
+        return self.results
+
+    @property
+    def results(self):
+        results = collections.OrderedDict()
+        for point, simulation in self.simulations.items():
+            values = tuple(zip(self.parameters.keys(), point))
+            results[values] = simulation
+        return results
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+import os
+import json
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+from pymontecarlo.runner.batch import BatchSimulationRunner
+
+# Globals and constants variables.
+
+class TestBatchSimulationRunner(TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.dirpath = self.create_temp_dir()
+        self.r = BatchSimulationRunner(self.dirpath, 'mock-program', max_workers=2)
+
+        self.list_options = []
+        for energy_eV in [5e3, 10e3]:
+            options = self.create_basic_options()
+            options.beam.energy_eV = energy_eV
+            self.list_options.append(options)
+
+    def _export(self, runner):
+        with runner:
+            runner.submit(*self.list_options)
+            runner.wait()
+
+    def _read_jobdirs(self):
+        with open(os.path.join(self.dirpath, BatchSimulationRunner.MANIFEST_FILENAME)) as fp:
+            data = json.load(fp)
+        return [os.path.join(self.dirpath, job['dirname']) for job in data['jobs']]
+
+    def testexport(self):
+        self._export(self.r)
+
+        jobdirs = self._read_jobdirs()
+        self.assertEqual(2, len(jobdirs))
+        for jobdir in jobdirs:
+            self.assertTrue(os.path.exists(os.path.join(jobdir, 'simulation.h5')))
+
+        self.assertEqual(0, len(self.r.project.simulations))
+        self.assertEqual(0, self.r.failed_count)
+        self.assertEqual(len(self.list_options), self.r.done_count)
+
+        with open(self.r.script_filepath) as fp:
+            script = fp.read()
+        self.assertIn('--array=0-1', script)
+        self.assertIn('mock-program', script)
+
+        with open(os.path.join(self.dirpath, BatchSimulationRunner.JOBS_FILENAME)) as fp:
+            self.assertEqual(2, len(fp.read().splitlines()))
+
+    def testexport_again(self):
+        self._export(self.r)
+
+        runner = BatchSimulationRunner(self.dirpath, 'mock-program')
+        self._export(runner)
+
+        self.assertEqual(2, len(self._read_jobdirs()))
+
+    def testexport_manifest_written(self):
+        with self.r:
+            self.r.submit(*self.list_options)
+            self.r.wait()
+
+            # Written after each export, before shutdown
+            self.assertEqual(2, len(self._read_jobdirs()))
+
+    def testexport_failed(self):
+        self.r.SIMULATION_FILENAME = os.path.join('missing', 'simulation.h5')
+        self._export(self.r)
+
+        self.assertEqual(2, self.r.failed_count)
+        self.assertEqual(0, len(self._read_jobdirs()))
+        self.assertEqual([BatchSimulationRunner.JOBS_FILENAME,
+                          BatchSimulationRunner.MANIFEST_FILENAME,
+                          BatchSimulationRunner.SCRIPT_FILENAME],
+                         sorted(os.listdir(self.dirpath)))
+
+        # Exported again
+        runner = BatchSimulationRunner(self.dirpath, 'mock-program')
+        self._export(runner)
+        self.assertEqual(0, runner.failed_count)
+        self.assertEqual(2, len(self._read_jobdirs()))
+
+    def testexport_orphaned_directory(self):
+        # e.g. left by a crash
+        os.makedirs(os.path.join(self.dirpath, '00000-orphan'))
+
+        runner = BatchSimulationRunner(self.dirpath, 'mock-program')
+        self._export(runner)
+
+        dirnames = sorted(os.path.basename(jobdir) for jobdir in self._read_jobdirs())
+        self.assertTrue(dirnames[0].startswith('00001-'))
+        self.assertTrue(dirnames[1].startswith('00002-'))
+
+    def testimport_results(self):
+        self._export(self.r)
+        jobdirs = self._read_jobdirs()
+
+        self.assertEqual(0, len(self.r.import_results()))
+
+        open(os.path.join(jobdirs[0], BatchSimulationRunner.DONE_FILENAME), 'w').close()
+        self.assertEqual(1, len(self.r.import_results()))
+        self.assertEqual(1, len(self.r.project.simulations))
+
+        # Already imported
+        self.assertEqual(0, len(self.r.import_results()))
+
+        open(os.path.join(jobdirs[1], BatchSimulationRunner.DONE_FILENAME), 'w').close()
+        runner = BatchSimulationRunner(self.dirpath, 'mock-program',
+                                       project=self.r.project)
+        self.assertEqual(1, len(runner.import_results()))
+        self.assertEqual(2, len(self.r.project.simulations))
+
+if __name__ == '__main__': # pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+import os
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+from pymontecarlo.runner.cache import ResultCache
+from pymontecarlo.simulation import Simulation
+
+# Globals and constants variables.
+
+class TestResultCache(TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.cache = ResultCache(self.create_temp_dir())
+        self.simulation = self.create_basic_simulation()
+
+    def testput_get(self):
+        options = self.simulation.options
+        self.assertIsNone(self.cache.get(options))
+        self.assertNotIn(options, self.cache)
+
+        self.cache.put(self.simulation)
+        self.assertIn(options, self.cache)
+        self.assertEqual(1, len(self.cache))
+
+        simulation = self.cache.get(self.create_basic_options())
+        self.assertIsNotNone(simulation)
+        self.assertEqual(options, simulation.options)
+        self.assertEqual(1, len(simulation.results))
+
+        other = self.create_basic_options()
+        other.beam.energy_eV = 20e3
+        self.assertIsNone(self.cache.get(other))
+
+    def testput_no_results(self):
+        self.cache.put(Simulation(self.create_basic_options()))
+        self.assertEqual(0, len(self.cache))
+
+    def testevict(self):
+        self.cache.put(self.simulation)
+
+        simulation2 = self.create_basic_simulation()
+        simulation2.options.beam.energy_eV = 20e3
+        self.cache.put(simulation2)
+
+        # Make the first simulation the most recently used
+        filepath = self.cache._get_filepath(self.simulation.options)
+        os.utime(filepath, (0, 1e9))
+        filepath = self.cache._get_filepath(simulation2.options)
+        os.utime(filepath, (0, 0))
+
+        size_bytes = self.cache.size_bytes
+        self.cache.evict(size_bytes - 1)
+
+        self.assertEqual(1, len(self.cache))
+        self.assertIn(self.simulation.options, self.cache)
+        self.assertNotIn(simulation2.options, self.cache)
+
+    def testmax_size_bytes(self):
+        cache = ResultCache(self.cache.dirpath, max_size_bytes=1)
+        cache.put(self.simulation)
+        self.assertEqual(0, len(cache))
+
+    def testmax_size_bytes_not_exceeded(self):
+        cache = ResultCache(self.cache.dirpath, max_size_bytes=1e9)
+        cache.put(self.simulation)
+
+        # The size is only read from the disk once
+        cache._list_filepaths = lambda: self.fail('Cache directory listed')
+
+        simulation2 = self.create_basic_simulation()
+        simulation2.options.beam.energy_eV = 20e3
+        cache.put(simulation2)
+        cache.put(simulation2)
+
+        self.assertEqual(self.cache.size_bytes, cache._size_bytes)
+
+    def testclear(self):
+        self.cache.put(self.simulation)
+        self.cache.clear()
+        self.assertEqual(0, len(self.cache))
+        self.assertEqual(0, self.cache.size_bytes)
+
+if __name__ == '__main__': # pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
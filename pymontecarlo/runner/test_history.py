@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+import os
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+from pymontecarlo.runner.history import \
+    extract_features, RuntimeRecord, RuntimeHistory, RuntimePredictor
+from pymontecarlo.options.limit import ShowersLimit
+from pymontecarlo.options.material import Material
+from pymontecarlo.options.sample import SubstrateSample
+
+# Globals and constants variables.
+
+class TestRuntimeHistory(TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.options = self.create_basic_options()
+
+        self.h = RuntimeHistory()
+        self.h.add(RuntimeRecord.from_options(self.options, 2.0, 1.5, 1000))
+
+    def testextract_features(self):
+        features = extract_features(self.options)
+        self.assertEqual(100, features['number_trajectories'])
+        self.assertAlmostEqual(15e3, features['energy_eV'], 4)
+        self.assertAlmostEqual(29.0, features['mean_z'], 4)
+        self.assertEqual('SubstrateSample', features['sample'])
+        self.assertEqual(0, features['number_layers'])
+
+    def testfind_records(self):
+        self.assertEqual(1, len(self.h.find_records('mock')))
+        self.assertEqual(0, len(self.h.find_records('casino2')))
+
+    def testmax_records_per_program(self):
+        h = RuntimeHistory(max_records_per_program=2)
+        for wall_time_s in [1.0, 2.0, 3.0]:
+            h.add(RuntimeRecord.from_options(self.options, wall_time_s, 1.0, 0))
+        h.add(RuntimeRecord('casino2', 'abc', {}, 4.0, 1.0, 0))
+
+        self.assertEqual(3, len(h))
+        self.assertEqual([2.0, 3.0], [record.wall_time_s for record in h.find_records('mock')])
+        self.assertEqual([2.0, 3.0, 4.0], [record.wall_time_s for record in h])
+
+    def testget_version(self):
+        version = self.h.get_version('mock')
+        self.h.add(RuntimeRecord.from_options(self.options, 2.0, 1.5, 1000))
+        self.assertNotEqual(version, self.h.get_version('mock'))
+        self.assertEqual(0, self.h.get_version('casino2'))
+
+    def testreadwrite(self):
+        filepath = os.path.join(self.create_temp_dir(), 'runtimes.json')
+        self.h.write(filepath)
+
+        h2 = RuntimeHistory.read(filepath)
+        self.assertEqual(1, len(h2))
+
+        record = h2.records[0]
+        self.assertEqual('mock', record.program_identifier)
+        self.assertAlmostEqual(2.0, record.wall_time_s, 4)
+        self.assertAlmostEqual(1.5, record.cpu_time_s, 4)
+        self.assertEqual(1000, record.peak_rss_bytes)
+        self.assertEqual(extract_features(self.options), record.features)
+
+    def testread_missing(self):
+        filepath = os.path.join(self.create_temp_dir(), 'runtimes.json')
+        self.assertEqual(0, len(RuntimeHistory.read(filepath)))
+
+class TestRuntimePredictor(TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.h = RuntimeHistory()
+        self.p = RuntimePredictor(self.h)
+
+    def _create_options(self, number_trajectories, energy_eV, z):
+        options = self.create_basic_options()
+        options.beam.energy_eV = energy_eV
+        options.sample = SubstrateSample(Material.pure(z))
+        options.limits[0] = ShowersLimit(number_trajectories)
+        return options
+
+    def _runtime_s(self, number_trajectories, energy_eV, z):
+        return 1e-3 * number_trajectories * (energy_eV / 1e4) ** 1.5 * (1 + 0.01 * z)
+
+    def testpredict(self):
+        options = self._create_options(1000, 15e3, 29)
+        self.assertFalse(self.p.can_predict(options.program))
+        self.assertIsNone(self.p.predict_wall_time_s(options))
+
+        for number_trajectories in [100, 1000, 10000]:
+            for energy_eV in [5e3, 10e3, 20e3]:
+                for z in [13, 29, 79]:
+                    runtime_s = self._runtime_s(number_trajectories, energy_eV, z)
+                    options = self._create_options(number_trajectories, energy_eV, z)
+                    record = RuntimeRecord.from_options(options, runtime_s, runtime_s, 1e6)
+                    self.h.add(record)
+
+        options = self._create_options(5000, 15e3, 26)
+        self.assertTrue(self.p.can_predict(options.program))
+
+        expected = self._runtime_s(5000, 15e3, 26)
+        actual = self.p.predict_wall_time_s(options)
+        self.assertAlmostEqual(1.0, actual / expected, 1)
+
+        self.assertAlmostEqual(1e6, self.p.predict_peak_rss_bytes(options), -3)
+
+        # The model is not refitted, nor the records read, until a record is added
+        find_records = self.h.find_records
+        self.h.find_records = lambda program_identifier: self.fail('Records read')
+        self.assertAlmostEqual(actual, self.p.predict_wall_time_s(options), 6)
+
+        self.h.find_records = find_records
+        self.h.add(RuntimeRecord.from_options(options, expected, expected, 1e6))
+        self.assertIsNotNone(self.p.predict_wall_time_s(options))
+
+if __name__ == '__main__': # pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
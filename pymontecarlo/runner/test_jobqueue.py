@@ -0,0 +1,271 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+import os
+import time
+import sqlite3
+import threading
+import multiprocessing
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+from pymontecarlo.runner.jobqueue import \
+    (JobQueue, QueueWorker, QueueSimulationRunner,
+     STATE_QUEUED, STATE_LEASED, STATE_DONE, STATE_FAILED, STATE_CANCELLED)
+from pymontecarlo.runner.history import RuntimeHistory
+from pymontecarlo.runner.watchdog import Watchdog
+from pymontecarlo.simulation import Simulation
+
+# Globals and constants variables.
+
+def _run_worker(filepath):
+    queue = JobQueue(filepath)
+    QueueWorker(queue, poll_interval_s=0.01).run(idle_timeout_s=1.0)
+
+class TestJobQueue(TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.filepath = os.path.join(self.create_temp_dir(), 'queue.sqlite')
+        self.queue = JobQueue(self.filepath)
+        self.simulation = Simulation(self.create_basic_options(), identifier='sim1')
+
+    def testput(self):
+        job_id = self.queue.put(self.simulation)
+
+        info = self.queue.get_info(job_id)
+        self.assertEqual('sim1', info.identifier)
+        self.assertEqual(STATE_QUEUED, info.state)
+        self.assertFalse(info.done())
+        self.assertEqual(1, self.queue.count())
+        self.assertEqual(1, self.queue.count(STATE_QUEUED))
+
+    def testlease(self):
+        job_id = self.queue.put(self.simulation)
+
+        job = self.queue.lease('worker1')
+        self.assertEqual(job_id, job[0])
+        self.assertEqual(self.simulation.options, job[1].options)
+        self.assertIsNone(self.queue.lease('worker2'))
+
+        info = self.queue.get_info(job_id)
+        self.assertEqual(STATE_LEASED, info.state)
+        self.assertEqual('worker1', info.worker)
+        self.assertEqual(1, info.attempts)
+
+    def testheartbeat(self):
+        job_id = self.queue.put(self.simulation)
+        self.queue.lease('worker1')
+
+        self.assertTrue(self.queue.heartbeat(job_id, 'worker1', 0.5, 'Running'))
+        self.assertFalse(self.queue.heartbeat(job_id, 'worker2'))
+
+        info = self.queue.get_info(job_id)
+        self.assertAlmostEqual(0.5, info.progress, 4)
+        self.assertEqual('Running', info.status)
+
+        self.queue.cancel(job_id)
+        self.assertFalse(self.queue.heartbeat(job_id, 'worker1'))
+        self.assertEqual(STATE_CANCELLED, self.queue.get_info(job_id).state)
+
+    def testcomplete(self):
+        job_id = self.queue.put(self.simulation)
+        _job_id, simulation = self.queue.lease('worker1')
+
+        self.assertFalse(self.queue.complete(job_id, 'worker2', simulation))
+        self.assertTrue(self.queue.complete(job_id, 'worker1', simulation))
+
+        self.assertEqual(STATE_DONE, self.queue.get_info(job_id).state)
+        self.assertEqual(self.simulation.options,
+                         self.queue.get_result(job_id).options)
+
+    def testcomplete_resources(self):
+        job_id = self.queue.put(self.simulation)
+        _job_id, simulation = self.queue.lease('worker1')
+        self.assertIsNone(self.queue.get_info(job_id).elapsed_s)
+
+        self.queue.complete(job_id, 'worker1', simulation, 2.0, 1.5, 1024)
+
+        info = self.queue.get_info(job_id)
+        self.assertAlmostEqual(2.0, info.elapsed_s, 4)
+        self.assertAlmostEqual(1.5, info.cpu_time_s, 4)
+        self.assertEqual(1024, info.peak_rss_bytes)
+
+    def testupgrade_schema(self):
+        filepath = os.path.join(self.create_temp_dir(), 'old.sqlite')
+        connection = sqlite3.connect(filepath)
+        try:
+            connection.execute("CREATE TABLE jobs (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                               "identifier TEXT NOT NULL, state TEXT NOT NULL, "
+                               "simulation BLOB NOT NULL, result BLOB, error TEXT, "
+                               "worker TEXT, lease_expires REAL, "
+                               "attempts INTEGER NOT NULL DEFAULT 0, "
+                               "progress REAL NOT NULL DEFAULT 0.0, "
+                               "status TEXT NOT NULL DEFAULT '', created REAL NOT NULL)")
+            connection.commit()
+        finally:
+            connection.close()
+
+        queue = JobQueue(filepath)
+        job_id = queue.put(self.simulation)
+        self.assertIsNone(queue.get_info(job_id).elapsed_s)
+
+    def testfail(self):
+        job_id = self.queue.put(self.simulation)
+        self.queue.lease('worker1')
+
+        self.assertTrue(self.queue.fail(job_id, 'worker1', 'Error'))
+
+        info = self.queue.get_info(job_id)
+        self.assertEqual(STATE_FAILED, info.state)
+        self.assertEqual('Error', info.error)
+        self.assertRaises(ValueError, self.queue.get_result, job_id)
+
+    def testlease_expired(self):
+        queue = JobQueue(self.filepath, lease_duration_s=0.0, max_attempts=2)
+        job_id = queue.put(self.simulation)
+
+        self.assertEqual(job_id, queue.lease('worker1')[0])
+        self.assertEqual(job_id, queue.lease('worker2')[0])
+        self.assertEqual(2, queue.get_info(job_id).attempts)
+        self.assertFalse(queue.heartbeat(job_id, 'worker1'))
+
+        self.assertIsNone(queue.lease('worker3'))
+
+        info = queue.get_info(job_id)
+        self.assertEqual(STATE_FAILED, info.state)
+        self.assertEqual('Lease expired', info.error)
+
+class TestQueueWorker(TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        filepath = os.path.join(self.create_temp_dir(), 'queue.sqlite')
+        self.queue = JobQueue(filepath)
+        self.worker = QueueWorker(self.queue, 'worker1', poll_interval_s=0.01)
+
+    def testrun_one(self):
+        self.assertFalse(self.worker.run_one())
+
+        simulation = Simulation(self.create_basic_options(), identifier='sim1')
+        job_id = self.queue.put(simulation)
+
+        self.assertTrue(self.worker.run_one())
+        self.assertEqual(STATE_DONE, self.queue.get_info(job_id).state)
+
+    def testrun(self):
+        for _ in range(3):
+            self.queue.put(Simulation(self.create_basic_options()))
+
+        self.assertEqual(2, self.worker.run(max_jobs=2))
+        self.assertEqual(1, self.worker.run(idle_timeout_s=0.0))
+        self.assertEqual(3, self.queue.count(STATE_DONE))
+
+class TestQueueSimulationRunner(TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.filepath = os.path.join(self.create_temp_dir(), 'queue.sqlite')
+        self.r = QueueSimulationRunner(self.filepath, max_workers=4,
+                                       poll_interval_s=0.01)
+
+    def tearDown(self):
+        super().tearDown()
+        self.r.shutdown()
+
+    def _create_list_options(self):
+        list_options = []
+        for energy_eV in [5e3, 10e3, 15e3]:
+            options = self.create_basic_options()
+            options.beam.energy_eV = energy_eV
+            list_options.append(options)
+        return list_options
+
+    def testrun(self):
+        workers = [QueueWorker(self.r.queue, poll_interval_s=0.01) for _ in range(2)]
+        threads = [threading.Thread(target=worker.run) for worker in workers]
+        for thread in threads:
+            thread.start()
+
+        try:
+            with self.r:
+                futures = self.r.submit(*self._create_list_options())
+                self.r.wait()
+        finally:
+            for worker in workers:
+                worker.stop()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(3, len(futures))
+        self.assertEqual(3, self.r.done_count)
+        self.assertEqual(3, len(self.r.project.simulations))
+        self.assertEqual(3, self.r.queue.count(STATE_DONE))
+
+    @unittest.skipUnless('fork' in multiprocessing.get_all_start_methods(),
+                         'Requires fork')
+    def testrun_processes(self):
+        context = multiprocessing.get_context('fork')
+        processes = [context.Process(target=_run_worker, args=(self.filepath,))
+                     for _ in range(2)]
+        for process in processes:
+            process.start()
+
+        try:
+            with self.r:
+                self.r.submit(*self._create_list_options())
+                self.r.wait()
+        finally:
+            for process in processes:
+                process.join(10)
+
+        self.assertEqual(3, self.r.done_count)
+        self.assertEqual(3, len(self.r.project.simulations))
+
+    def testrun_queue_wait(self):
+        history = RuntimeHistory()
+        watchdog = Watchdog(wall_time_limit_s=0.2, interval_s=0.01)
+        self.r = QueueSimulationRunner(self.filepath, poll_interval_s=0.01,
+                                       history=history, watchdog=watchdog)
+
+        worker = QueueWorker(self.r.queue, poll_interval_s=0.01)
+        thread = threading.Thread(target=worker.run, kwargs={'idle_timeout_s': 2.0})
+
+        with self.r:
+            self.r.submit(self.create_basic_options())
+
+            # Queued for longer than the wall time limit
+            time.sleep(0.4)
+            thread.start()
+            self.r.wait()
+
+        worker.stop()
+        thread.join()
+
+        self.assertEqual(1, self.r.done_count)
+        self.assertEqual(0, self.r.failed_count)
+
+        # Runtime measured by the worker, without the wait in the queue
+        record, = history.records
+        self.assertLess(record.wall_time_s, 0.2)
+
+    def testcancel(self):
+        with self.r:
+            futures = self.r.submit(self.create_basic_options())
+            self.r.cancel()
+            self.r.wait()
+
+        self.assertTrue(futures[0].cancelled())
+        self.assertEqual(STATE_CANCELLED, self.r.queue.get_info(1).state)
+
+if __name__ == '__main__': # pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
@@ -10,9 +10,25 @@ import logging
 # Local modules.
 from pymontecarlo.testcase import TestCase
 from pymontecarlo.runner.local import LocalSimulationRunner
+from pymontecarlo.runner.scheduler import LongestJobFirstScheduler, FifoScheduler
+from pymontecarlo.runner.history import RuntimeHistory
+from pymontecarlo.runner.pool import ProgramPool
+from pymontecarlo.runner.watchdog import Watchdog, RetryPolicy
+from pymontecarlo.runner.cache import ResultCache
+from pymontecarlo.exceptions import WorkerTimeoutError
+from pymontecarlo.options.limit import ShowersLimit
+from pymontecarlo.options.analysis import KRatioAnalysis
+from pymontecarlo.options.material import Material
+from pymontecarlo.options.sample import SubstrateSample
+from pymontecarlo.options.beam.cylindrical import CylindricalBeam
 
 # Globals and constants variables.
 
+class FailingProgramPool(ProgramPool):
+
+    def try_acquire(self, key, memory_bytes=None):
+        raise RuntimeError('acquire failed')
+
 class TestLocalSimulationRunner(TestCase):
 
     def setUp(self):
@@ -79,6 +95,309 @@ class TestLocalSimulationRunner(TestCase):
         project = self.r.project
         self.assertEqual(0, len(project.simulations))
 
+    def _on_simulation_added(self, simulation):
+        self.added_simulations.append(simulation)
+
+    def testrun_longest_job_first(self):
+        self.r.scheduler = LongestJobFirstScheduler()
+
+        list_options = []
+        for number_trajectories in [100, 1000, 10000]:
+            options = self.create_basic_options()
+            options.limits[0] = ShowersLimit(number_trajectories)
+            list_options.append(options)
+
+        self.added_simulations = []
+        self.r.project.simulation_added.connect(self._on_simulation_added)
+
+        with self.r:
+            self.r.submit(*list_options)
+
+        self.assertEqual(3, self.r.done_count)
+
+        actual = [s.options.limits[0].number_trajectories
+                  for s in self.added_simulations]
+        self.assertEqual([10000, 1000, 100], actual)
+
+    def _create_kratio_options(self):
+        options = self.create_basic_options()
+        options.sample = SubstrateSample(Material.from_formula('CuZn'))
+        options.analyses = [KRatioAnalysis(self.create_basic_photondetector())]
+        return options
+
+    def _on_simulation_event(self, event, simulation):
+        self.events.append((event, simulation.options.sample.material.name))
+
+    def _on_simulation_added_event(self, simulation):
+        self._on_simulation_event('added', simulation)
+
+    def _on_simulation_recalculated_event(self, simulation):
+        self._on_simulation_event('recalculated', simulation)
+
+    def _run_events(self):
+        self.events = []
+        self.r.project.simulation_added.connect(self._on_simulation_added_event)
+        self.r.project.simulation_recalculated.connect(self._on_simulation_recalculated_event)
+
+        with self.r:
+            self.r.submit(self._create_kratio_options())
+
+        self.assertEqual(3, self.r.done_count)
+        return self.events
+
+    def testrun_standards_first(self):
+        events = self._run_events()
+        self.assertEqual(('recalculated', 'CuZn'), events[-1])
+        self.assertEqual(('added', 'CuZn'), events[-2])
+
+    def testrun_stream_recalculation(self):
+        # Unknown is simulated first, but its results are calculated after
+        # both standards are finished
+        self.r.scheduler = FifoScheduler()
+        events = self._run_events()
+
+        self.assertEqual(('added', 'CuZn'), events[0])
+        self.assertEqual(('recalculated', 'CuZn'), events[-1])
+        self.assertEqual(1, events.count(('recalculated', 'CuZn')))
+        self.assertEqual(6, len(events))
+
+    def _on_recalculated(self):
+        self.recalculated_count += 1
+
+    def _run_recalculated(self):
+        self.recalculated_count = 0
+        self.r.project.recalculated.connect(self._on_recalculated)
+
+        # Not shutdown before the final recalculation
+        self.r.start()
+        try:
+            self.r.submit(self._create_kratio_options())
+            self.r.wait()
+            self.r.wait()
+        finally:
+            self.r.shutdown()
+
+        self.assertEqual(3, self.r.done_count)
+
+    def testrun_stream_recalculation_no_final_pass(self):
+        self._run_recalculated()
+        self.assertEqual(0, self.recalculated_count)
+        self.assertFalse(self.r.project.recalculate_required)
+
+    def testrun_recalculation_required(self):
+        # Project already requiring a recalculation before the runner starts
+        self.r.project.add_simulation(self.create_basic_simulation())
+
+        self._run_recalculated()
+        self.assertEqual(1, self.recalculated_count)
+        self.assertFalse(self.r.project.recalculate_required)
+
+    def _iter_options(self, count, max_in_flight):
+        for i in range(count):
+            self.assertLessEqual(self.r.in_flight_count, max_in_flight)
+            options = self.create_basic_options()
+            options.limits[0] = ShowersLimit(100 + i)
+            yield options
+
+    def testsubmit_iter(self):
+        self.r = LocalSimulationRunner(max_workers=2)
+
+        with self.r:
+            count = self.r.submit_iter(self._iter_options(10, 4), max_in_flight=4)
+            self.assertEqual(10, count)
+            self.assertLessEqual(len(self.r.futures), 4)
+            self.r.wait()
+
+        self.assertEqual(10, self.r.done_count)
+        self.assertEqual(10, len(self.r.project.simulations))
+        self.assertAlmostEqual(1.0, self.r.progress, 4)
+
+    def testsubmit_iter_bounded(self):
+        max_in_flight = 4
+
+        with self.r:
+            count = self.r.submit_iter(self._iter_options(40, max_in_flight),
+                                       max_in_flight=max_in_flight)
+            self.assertEqual(40, count)
+            self.assertLessEqual(len(self.r.submitted_options), 2 * max_in_flight)
+            self.assertLessEqual(len(self.r._submitted_index), 2 * max_in_flight)
+            self.assertLessEqual(len(self.r._finished_fingerprints), 2 * max_in_flight)
+
+        self.assertEqual(40, self.r.done_count)
+        self.assertEqual(40, len(self.r.project.simulations))
+
+    def testsubmit_iter_duplicates(self):
+        list_options = [self.create_basic_options() for _ in range(5)]
+
+        with self.r:
+            count = self.r.submit_iter(list_options, max_in_flight=2, batch_size=1)
+
+        self.assertEqual(1, count)
+        self.assertEqual(1, len(self.r.project.simulations))
+
+    def testplan(self):
+        options = self._create_kratio_options()
+
+        invalid_options = self.create_basic_options()
+        invalid_options.beam = CylindricalBeam(15e3, 10e-9)
+
+        simulation = self.create_basic_simulation()
+        self.r.project.add_simulation(simulation)
+
+        plan = self.r.plan(options, options, invalid_options, simulation.options)
+
+        self.assertEqual(3, plan.new_count)
+        self.assertEqual(2, plan.standard_count)
+        self.assertEqual(1, plan.cached_count)
+        self.assertEqual(1, plan.invalid_count)
+        self.assertEqual(3, plan.unestimated_count)
+        self.assertAlmostEqual(0.0, plan.estimated_cpu_hours, 4)
+
+        # Nothing submitted
+        self.assertEqual(0, self.r.submitted_count)
+        self.assertEqual(1, len(self.r.project.simulations))
+
+    def _on_submitted(self, future):
+        self.max_running = max(self.max_running, self.pool.running_count)
+
+    def testrun_pool(self):
+        self.pool = ProgramPool(max_workers=1)
+        self.r = LocalSimulationRunner(max_workers=4, pools={'mock': self.pool})
+
+        list_options = []
+        for number_trajectories in range(100, 106):
+            options = self.create_basic_options()
+            options.limits[0] = ShowersLimit(number_trajectories)
+            list_options.append(options)
+
+        self.max_running = 0
+        self.r.project.simulation_added.connect(self._on_submitted)
+
+        with self.r:
+            self.r.submit(*list_options)
+
+        self.assertEqual(6, self.r.done_count)
+        self.assertEqual(1, self.max_running)
+        self.assertEqual(0, self.pool.running_count)
+
+    def testrun_pool_acquire_failed(self):
+        self.r = LocalSimulationRunner(max_workers=2, pools={'mock': FailingProgramPool()})
+
+        options = self.create_basic_options()
+
+        with self.r:
+            futures = self.r.submit(options)
+            self.assertTrue(self.r.wait(5.0))
+
+        self.assertEqual(1, self.r.failed_count)
+        self.assertEqual(0, self.r.done_count)
+        self.assertIsInstance(futures[0].exception(), RuntimeError)
+
+    def testrun_watchdog(self):
+        watchdog = Watchdog(wall_time_limit_s=0.02, interval_s=0.005)
+        retry_policy = RetryPolicy(max_retries=2)
+        self.r = LocalSimulationRunner(watchdog=watchdog, retry_policy=retry_policy)
+
+        options = self.create_basic_options()
+
+        with self.r:
+            futures = self.r.submit(options)
+            self.r.wait()
+
+        self.assertEqual(1, self.r.failed_count)
+        self.assertEqual(0, self.r.cancelled_count)
+        self.assertIsInstance(futures[0].exception(), WorkerTimeoutError)
+
+    def testrun_pipelined(self):
+        self.r = LocalSimulationRunner(max_workers=1, export_workers=1,
+                                       import_workers=1)
+        self.assertTrue(self.r.pipelined)
+
+        list_options = []
+        for energy_eV in [5e3, 10e3, 15e3]:
+            options = self.create_basic_options()
+            options.beam.energy_eV = energy_eV
+            list_options.append(options)
+
+        with self.r:
+            futures = self.r.submit(*list_options)
+            self.r.wait()
+
+        self.assertEqual(3, len(futures))
+        self.assertEqual(3, self.r.done_count)
+        self.assertEqual(0, self.r.failed_count)
+        self.assertEqual(3, len(self.r.project.simulations))
+
+        for stage in self.r.stages.values():
+            self.assertEqual(0, stage.running_count)
+            self.assertEqual(0, stage.queued_count)
+
+    def testrun_cache(self):
+        cache = ResultCache(self.create_temp_dir())
+        cache.put(self.create_basic_simulation())
+
+        history = RuntimeHistory()
+        self.r = LocalSimulationRunner(history=history, cache=cache)
+
+        options1 = self.create_basic_options()
+        options2 = self.create_basic_options()
+        options2.beam.energy_eV = 20e3
+
+        with self.r:
+            futures = self.r.submit(options1, options2)
+            self.r.wait()
+
+        self.assertEqual(2, self.r.done_count)
+        self.assertEqual(1, len(futures[0].result().results))
+        self.assertEqual(0, len(futures[1].result().results))
+
+        # Only the simulation not in the cache was run
+        self.assertEqual(1, len(history))
+
+    def testrun_cache_without_worker(self):
+        cache = ResultCache(self.create_temp_dir())
+        cache.put(self.create_basic_simulation())
+
+        # The cached simulation does not reserve a worker of the pool
+        self.r = LocalSimulationRunner(pools={'mock': FailingProgramPool()}, cache=cache)
+
+        with self.r:
+            futures = self.r.submit(self.create_basic_options())
+            self.assertTrue(futures[0].done())
+            self.r.wait()
+
+        self.assertEqual(1, self.r.done_count)
+        self.assertEqual(0, self.r.failed_count)
+        self.assertEqual(1, len(self.r.project.simulations))
+        self.assertEqual(1, len(futures[0].result().results))
+
+    def testrun_history(self):
+        history = RuntimeHistory()
+        self.r = LocalSimulationRunner(max_workers=1, history=history)
+
+        options1 = self.create_basic_options()
+        options2 = self.create_basic_options()
+        options2.limits[0] = ShowersLimit(200)
+
+        with self.r:
+            futures = self.r.submit(options1)
+            self.r.wait()
+
+            # Runtime is calibrated after the first simulation
+            futures += self.r.submit(options2)
+            self.assertIsNotNone(self.r.estimate_remaining_s())
+            self.r.wait()
+
+            self.assertAlmostEqual(0.0, self.r.estimate_remaining_s(), 4)
+            self.assertAlmostEqual(1.0, self.r.progress, 4)
+
+        self.assertEqual(2, len(history))
+
+        record = history.records[0]
+        self.assertEqual('mock', record.program_identifier)
+        self.assertGreater(record.wall_time_s, 0.0)
+        self.assertGreaterEqual(record.cpu_time_s, 0.0)
+
 if __name__ == '__main__': # pragma: no cover
     logging.getLogger().setLevel(logging.DEBUG)
     unittest.main()
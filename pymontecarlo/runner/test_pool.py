@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+from pymontecarlo.runner.pool import ProgramPool, StagePool
+from pymontecarlo.util.future import Token
+
+# Globals and constants variables.
+
+class TestProgramPool(TestCase):
+
+    def testmax_workers(self):
+        pool = ProgramPool(max_workers=2)
+        self.assertTrue(pool.try_acquire('a'))
+        self.assertTrue(pool.try_acquire('b'))
+        self.assertFalse(pool.try_acquire('c'))
+        self.assertEqual(2, pool.running_count)
+
+        pool.release('a')
+        self.assertTrue(pool.try_acquire('c'))
+
+    def testmemory_budget(self):
+        pool = ProgramPool(memory_budget_bytes=100, memory_per_worker_bytes=40)
+        self.assertTrue(pool.try_acquire('a'))
+        self.assertTrue(pool.try_acquire('b'))
+        self.assertFalse(pool.try_acquire('c'))
+        self.assertTrue(pool.try_acquire('c', 20))
+        self.assertEqual(100, pool.reserved_memory_bytes)
+
+    def testmemory_budget_empty(self):
+        # Always start one simulation to avoid starvation
+        pool = ProgramPool(memory_budget_bytes=100)
+        self.assertTrue(pool.try_acquire('a', 1000))
+        self.assertFalse(pool.try_acquire('b', 1))
+
+class TestStagePool(TestCase):
+
+    def testacquire(self):
+        stage = StagePool('Running', max_workers=2)
+        self.assertTrue(stage.acquire(Token()))
+        self.assertTrue(stage.acquire(Token()))
+        self.assertEqual(2, stage.running_count)
+        self.assertEqual(0, stage.queued_count)
+
+        stage.release()
+        self.assertEqual(1, stage.running_count)
+
+    def testacquire_cancelled(self):
+        stage = StagePool('Running', max_workers=1)
+        self.assertTrue(stage.acquire(Token()))
+
+        token = Token()
+        token.cancel()
+        self.assertFalse(stage.acquire(token, interval_s=0.01))
+        self.assertEqual(1, stage.running_count)
+        self.assertEqual(0, stage.queued_count)
+
+if __name__ == '__main__': # pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
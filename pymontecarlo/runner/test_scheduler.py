@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+from pymontecarlo.runner.scheduler import \
+    (CostEstimator, FifoScheduler, LongestJobFirstScheduler,
+     ShortestJobFirstScheduler, StandardsFirstScheduler)
+from pymontecarlo.simulation import Simulation
+from pymontecarlo.options.limit import ShowersLimit, UncertaintyLimit
+from pymontecarlo.util.xrayline import XrayLine
+
+# Globals and constants variables.
+
+class TestCostEstimator(TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.e = CostEstimator()
+
+    def testestimate_showers(self):
+        options = self.create_basic_options()
+        cost1 = self.e.estimate(options)
+
+        options.limits[0] = ShowersLimit(200)
+        cost2 = self.e.estimate(options)
+
+        self.assertAlmostEqual(2.0, cost2 / cost1, 4)
+
+    def testestimate_energy(self):
+        options = self.create_basic_options()
+        cost1 = self.e.estimate(options)
+
+        options.beam.energy_eV *= 2.0
+        cost2 = self.e.estimate(options)
+
+        self.assertAlmostEqual(2.0 ** 1.67, cost2 / cost1, 4)
+
+    def testestimate_uncertainty(self):
+        options = self.create_basic_options()
+        detector = self.create_basic_photondetector()
+        options.limits = [UncertaintyLimit(XrayLine(29, 'Ka1'), detector, 0.1)]
+        cost1 = self.e.estimate(options)
+
+        options.limits = [UncertaintyLimit(XrayLine(29, 'Ka1'), detector, 0.05)]
+        cost2 = self.e.estimate(options)
+
+        self.assertAlmostEqual(4.0, cost2 / cost1, 4)
+
+    def testestimate_no_limit(self):
+        options = self.create_basic_options()
+        options.limits.clear()
+        self.assertGreater(self.e.estimate(options), 0.0)
+
+    def testrecord(self):
+        options = self.create_basic_options()
+        self.assertFalse(self.e.is_calibrated(options.program))
+
+        self.e.record(options, 2.0)
+        self.assertTrue(self.e.is_calibrated(options.program))
+        self.assertAlmostEqual(2.0, self.e.estimate(options), 4)
+
+        options.limits[0] = ShowersLimit(200)
+        self.assertAlmostEqual(4.0, self.e.estimate(options), 4)
+
+class TestScheduler(TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        options = self.create_basic_options()
+        self.sim_small = Simulation(options, identifier='small')
+
+        options = self.create_basic_options()
+        options.limits[0] = ShowersLimit(10000)
+        self.sim_large = Simulation(options, identifier='large')
+
+    def _sort(self, scheduler, simulations, standards=()):
+        return sorted(simulations,
+                      key=lambda s: scheduler.priority(s, s in standards))
+
+    def testfifo(self):
+        s = FifoScheduler()
+        simulations = [self.sim_small, self.sim_large]
+        self.assertEqual(simulations, self._sort(s, simulations))
+
+    def testlongest_job_first(self):
+        s = LongestJobFirstScheduler()
+        simulations = self._sort(s, [self.sim_small, self.sim_large])
+        self.assertIs(self.sim_large, simulations[0])
+
+    def testshortest_job_first(self):
+        s = ShortestJobFirstScheduler()
+        simulations = self._sort(s, [self.sim_large, self.sim_small])
+        self.assertIs(self.sim_small, simulations[0])
+
+    def teststandards_first(self):
+        s = StandardsFirstScheduler()
+        simulations = self._sort(s, [self.sim_large, self.sim_small],
+                                 standards=[self.sim_small])
+        self.assertIs(self.sim_small, simulations[0])
+
+if __name__ == '__main__': # pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+from pymontecarlo.runner.local import LocalSimulationRunner
+from pymontecarlo.runner.sweep import AdaptiveSweep, calculate_relative_change
+from pymontecarlo.options.beam import GaussianBeam
+
+# Globals and constants variables.
+
+def _response(simulation):
+    # Step between 10 and 15 keV
+    return {'y': 1.0 if simulation.options.beam.energy_eV > 12e3 else 0.1}
+
+class TestAdaptiveSweep(TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.r = LocalSimulationRunner(max_workers=2)
+
+    def tearDown(self):
+        super().tearDown()
+        self.r.shutdown()
+
+    def _create_options(self, energy_eV, diameter_m=10e-9):
+        options = self.create_basic_options()
+        options.beam = GaussianBeam(energy_eV, diameter_m)
+        return options
+
+    def testcalculate_relative_change(self):
+        self.assertAlmostEqual(0.5, calculate_relative_change({'a': 1.0, 'b': 2.0},
+                                                              {'a': 2.0, 'c': 5.0}), 4)
+        self.assertAlmostEqual(0.0, calculate_relative_change({'a': 0.0}, {'a': 0.0}), 4)
+
+    def testrun(self):
+        parameters = {'energy_eV': [5e3, 10e3, 15e3, 20e3, 25e3]}
+        sweep = AdaptiveSweep(self.r, self._create_options, parameters,
+                              tolerance=0.05, max_depth=4, response=_response)
+        results = sweep.run()
+
+        # Only the interval containing the step is refined
+        self.assertEqual(9, len(results))
+        energies = sorted(dict(values)['energy_eV'] for values in results)
+        self.assertEqual([5e3, 10e3, 11.25e3, 11.875e3, 12.1875e3, 12.5e3,
+                          15e3, 20e3, 25e3], energies)
+
+        for simulation in results.values():
+            self.assertIsNotNone(simulation)
+
+    def testrun_two_parameters(self):
+        parameters = {'energy_eV': [5e3, 10e3, 15e3, 20e3, 25e3],
+                      'diameter_m': [10e-9, 20e-9]}
+        sweep = AdaptiveSweep(self.r, self._create_options, parameters,
+                              tolerance=0.05, max_depth=4, response=_response)
+        results = sweep.run()
+
+        self.assertEqual(18, len(results))
+
+    def testrun_max_simulations(self):
+        parameters = {'energy_eV': [5e3, 10e3, 15e3, 20e3, 25e3]}
+        sweep = AdaptiveSweep(self.r, self._create_options, parameters,
+                              max_simulations=6, response=_response)
+        results = sweep.run()
+
+        self.assertEqual(6, len(results))
+        self.assertIn((('energy_eV', 12.5e3),), results)
+
+if __name__ == '__main__': # pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+import time
+import threading
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+from pymontecarlo.runner.watchdog import Watchdog, RetryPolicy
+from pymontecarlo.util.future import Token
+from pymontecarlo.exceptions import WorkerTimeoutError, WorkerError
+
+# Globals and constants variables.
+
+class TestWatchdog(TestCase):
+
+    def tearDown(self):
+        super().tearDown()
+        self.w.stop()
+
+    def testcalculate_wall_time_limit_s(self):
+        self.w = Watchdog()
+        self.assertIsNone(self.w.calculate_wall_time_limit_s(10.0))
+
+        self.w = Watchdog(wall_time_limit_s=60.0, wall_time_factor=3.0)
+        self.assertAlmostEqual(60.0, self.w.calculate_wall_time_limit_s(), 4)
+        self.assertAlmostEqual(60.0, self.w.calculate_wall_time_limit_s(30.0), 4)
+        self.assertAlmostEqual(30.0, self.w.calculate_wall_time_limit_s(10.0), 4)
+
+    def testcheck_wall_time(self):
+        self.w = Watchdog(wall_time_limit_s=0.01, interval_s=60.0)
+
+        token = Token()
+        self.w.watch(token)
+        self.w.check()
+        self.assertFalse(token.timed_out())
+
+        time.sleep(0.02)
+        self.w.check()
+        self.assertTrue(token.timed_out())
+        self.assertTrue(token.cancelled())
+
+    def testcheck_stall(self):
+        self.w = Watchdog(stall_timeout_s=0.05, interval_s=60.0)
+
+        token = Token()
+        self.w.watch(token)
+
+        for i in range(5):
+            time.sleep(0.02)
+            token.update(i / 5, 'Running')
+            self.w.check()
+            self.assertFalse(token.timed_out())
+
+        time.sleep(0.06)
+        self.w.check()
+        self.assertTrue(token.timed_out())
+
+    def testunwatch(self):
+        self.w = Watchdog(wall_time_limit_s=0.01, interval_s=60.0)
+
+        token = Token()
+        self.w.watch(token)
+        self.w.unwatch(token)
+
+        time.sleep(0.02)
+        self.w.check()
+        self.assertFalse(token.timed_out())
+
+    def teststop_restart(self):
+        self.w = Watchdog(wall_time_limit_s=60.0, interval_s=0.001)
+
+        for _ in range(20):
+            self.w.watch(Token())
+            thread = self.w._thread
+
+            thread2 = threading.Thread(target=self.w.watch, args=(Token(),))
+            thread2.start()
+            self.w.stop()
+            thread2.join()
+
+            # The stopped thread is never restarted
+            self.assertFalse(thread.is_alive())
+
+        self.w.stop()
+        self.assertIsNone(self.w._thread)
+
+class TestRetryPolicy(TestCase):
+
+    def testshould_retry(self):
+        policy = RetryPolicy(max_retries=1)
+        self.assertTrue(policy.should_retry(WorkerTimeoutError(), 0))
+        self.assertFalse(policy.should_retry(WorkerTimeoutError(), 1))
+        self.assertFalse(policy.should_retry(WorkerError(), 0))
+
+if __name__ == '__main__': # pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
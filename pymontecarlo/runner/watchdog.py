@@ -0,0 +1,168 @@
+"""
+Watchdog timing out hung simulations and retry policy.
+"""
+
+# Standard library modules.
+import time
+import threading
+import logging
+logger = logging.getLogger(__name__)
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.exceptions import WorkerTimeoutError
+from pymontecarlo.util.human import human_time
+
+# Globals and constants variables.
+
+class _Watch:
+
+    def __init__(self, token, wall_time_limit_s):
+        self.token = token
+        self.wall_time_limit_s = wall_time_limit_s
+        self.start = time.monotonic()
+        self.last_activity = self.start
+        self.last_state = (token.progress, token.status)
+
+class Watchdog:
+    """
+    Times out the tokens of simulations running for too long or whose
+    progress stopped changing.
+    A timed out token is also cancelled, so that the worker stops and
+    kills its processes (see :class:`SubprocessWorkerMixin`).
+    """
+
+    def __init__(self, wall_time_limit_s=None, wall_time_factor=None,
+                 stall_timeout_s=None, interval_s=1.0):
+        """
+        :arg wall_time_limit_s: maximum duration of a simulation
+        :arg wall_time_factor: maximum duration of a simulation, as a multiple
+            of its estimated duration. If both *wall_time_limit_s* and
+            *wall_time_factor* are specified, the lowest limit is used.
+        :arg stall_timeout_s: maximum duration without a change of
+            the progress or status of a simulation
+        :arg interval_s: interval between checks
+        """
+        self.wall_time_limit_s = wall_time_limit_s
+        self.wall_time_factor = wall_time_factor
+        self.stall_timeout_s = stall_timeout_s
+        self.interval_s = interval_s
+
+        self._watches = {} # key: id of token, value: _Watch
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop_event = None # event of the current thread
+
+    def calculate_wall_time_limit_s(self, estimated_duration_s=None):
+        """
+        Returns the wall time limit of a simulation, or ``None`` if unlimited.
+        """
+        limits_s = []
+
+        if self.wall_time_limit_s is not None:
+            limits_s.append(self.wall_time_limit_s)
+
+        if self.wall_time_factor is not None and estimated_duration_s is not None:
+            limits_s.append(self.wall_time_factor * estimated_duration_s)
+
+        return min(limits_s) if limits_s else None
+
+    def _check(self, watch, now):
+        state = (watch.token.progress, watch.token.status)
+        if state != watch.last_state:
+            watch.last_state = state
+            watch.last_activity = now
+
+        if watch.wall_time_limit_s is not None and \
+                now - watch.start > watch.wall_time_limit_s:
+            return 'Wall time limit of {} exceeded' \
+                .format(human_time(watch.wall_time_limit_s) or '0 sec')
+
+        if self.stall_timeout_s is not None and \
+                now - watch.last_activity > self.stall_timeout_s:
+            return 'No progress for {}' \
+                .format(human_time(self.stall_timeout_s) or '0 sec')
+
+        return None
+
+    def check(self):
+        """
+        Times out the tokens exceeding their limits.
+        This method is called periodically by the watchdog thread.
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            watches = list(self._watches.values())
+
+        for watch in watches:
+            if watch.token.cancelled():
+                continue
+
+            reason = self._check(watch, now)
+            if reason is not None:
+                logger.warning(reason)
+                watch.token.timeout(reason)
+
+    def _run(self, stop_event):
+        while not stop_event.wait(self.interval_s):
+            self.check()
+
+    def watch(self, token, estimated_duration_s=None):
+        """
+        Starts watching a token.
+        """
+        wall_time_limit_s = self.calculate_wall_time_limit_s(estimated_duration_s)
+
+        with self._lock:
+            self._watches[id(token)] = _Watch(token, wall_time_limit_s)
+
+            # NOTE: Each thread has its own event, so that a thread being
+            # stopped cannot be restarted by a new watch
+            if self._thread is None:
+                self._stop_event = threading.Event()
+                self._thread = threading.Thread(target=self._run,
+                                                args=(self._stop_event,),
+                                                daemon=True)
+                self._thread.start()
+
+    def unwatch(self, token):
+        with self._lock:
+            self._watches.pop(id(token), None)
+
+    def stop(self):
+        """
+        Stops the watchdog thread.
+        """
+        with self._lock:
+            thread = self._thread
+            if thread is not None:
+                self._stop_event.set()
+
+            self._thread = None
+            self._stop_event = None
+            self._watches.clear()
+
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+class RetryPolicy:
+
+    def __init__(self, max_retries=1, exceptions=(WorkerTimeoutError,)):
+        """
+        Policy to retry failed simulations.
+
+        :arg max_retries: maximum number of retries of a simulation
+        :arg exceptions: :class:`tuple` of exception classes to retry
+        """
+        self.max_retries = max_retries
+        self.exceptions = exceptions
+
+    def should_retry(self, exc, retries):
+        """
+        Returns whether a simulation failing with *exc* should be retried.
+
+        :arg retries: number of times the simulation was already retried
+        """
+        return retries < self.max_retries and isinstance(exc, self.exceptions)
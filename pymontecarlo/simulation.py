@@ -8,8 +8,6 @@ Simulation.
 
 # Local modules.
 from pymontecarlo.util.cbook import find_by_type
-from pymontecarlo.formats.series.base import \
-    find_convert_serieshandler, create_identifier
 
 # Globals and constants variables.
 
@@ -23,6 +21,10 @@ class Simulation(object):
         self.results = results.copy()
 
         if identifier is None:
+            # Deferred, pandas is slow to import
+            from pymontecarlo.formats.series.base import \
+                find_convert_serieshandler, create_identifier
+
             handler = find_convert_serieshandler(options)
             s = handler.convert(options)
             identifier = create_identifier(s)
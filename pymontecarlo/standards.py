@@ -0,0 +1,178 @@
+"""
+Library of precomputed standard intensities.
+"""
+
+# Standard library modules.
+import itertools
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.project import Project
+from pymontecarlo.options.options import Options
+from pymontecarlo.options.beam import GaussianBeam
+from pymontecarlo.options.beam.base import Beam
+from pymontecarlo.options.material import Material
+from pymontecarlo.options.sample import SubstrateSample
+from pymontecarlo.options.analysis.photonintensity import PhotonIntensityAnalysis
+from pymontecarlo.results.photonintensity import \
+    EmittedPhotonIntensityResult, EmittedPhotonIntensityResultBuilder
+
+# Globals and constants variables.
+
+class StandardsLibrary:
+    """
+    Library of the emitted intensities of standards (substrate samples),
+    simulated over a grid of beam energies, photon detectors and models,
+    for one or more programs.
+    It is used by :class:`KRatioAnalysis` instead of simulating the
+    standards in every project.
+
+    The intensities of a standard are found for the same program,
+    material, photon detector, particle and models.
+    The limits of the simulations are not compared.
+    If no standard was simulated at the requested beam energy, the
+    intensities are linearly interpolated between the two closest energies,
+    provided both are within *energy_tolerance_eV* of the requested energy.
+    """
+
+    def __init__(self, simulations=(), energy_tolerance_eV=0.0):
+        """
+        :arg simulations: simulations of the standards
+        :arg energy_tolerance_eV: maximum difference between the requested
+            beam energy and the energies used for the interpolation
+            (0: no interpolation)
+        """
+        self.simulations = []
+        self.energy_tolerance_eV = energy_tolerance_eV
+        self.filepath = None # File the library was read from or written to
+        self._entries = {} # key: see _create_key, value: list of (energy, result)
+
+        for simulation in simulations:
+            self.add_simulation(simulation)
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._entries.values())
+
+    @classmethod
+    def read(cls, filepath, energy_tolerance_eV=0.0):
+        """
+        Reads a library saved as a project.
+        """
+        project = Project.read(filepath)
+        library = cls(project.simulations, energy_tolerance_eV)
+        library.filepath = filepath
+        return library
+
+    def write(self, filepath):
+        project = Project()
+        for simulation in self.simulations:
+            project.add_simulation(simulation)
+        project.write(filepath)
+        self.filepath = filepath
+
+    @staticmethod
+    def create_list_options(program, materials, energies_eV, photon_detectors,
+                            limits=(), list_models=((),)):
+        """
+        Returns the options to simulate the standards of a library.
+
+        :arg materials: standard materials or atomic numbers of pure
+            standards
+        :arg energies_eV: beam energies
+        :arg photon_detectors: photon detectors, all added to each options
+        :arg limits: limits of each options
+        :arg list_models: :class:`list` of the models of each options
+        """
+        analyses = [PhotonIntensityAnalysis(photon_detector)
+                    for photon_detector in photon_detectors]
+
+        list_options = []
+        for material, energy_eV, models in \
+                itertools.product(materials, energies_eV, list_models):
+            if isinstance(material, int):
+                material = Material.pure(material)
+
+            beam = GaussianBeam(energy_eV, 0.0)
+            sample = SubstrateSample(material)
+            list_options.append(Options(program, beam, sample, list(analyses),
+                                        list(limits), list(models)))
+
+        return list_options
+
+    def _create_key(self, options, photon_detector):
+        models = tuple(sorted(model.fingerprint() for model in options.models))
+        return (options.program.getidentifier(),
+                options.sample.material.fingerprint(),
+                photon_detector.fingerprint(),
+                options.beam.particle.name,
+                models)
+
+    def add_simulation(self, simulation):
+        """
+        Adds the emitted intensities of a standard simulation.
+        Simulations of other samples than substrates are ignored.
+        """
+        options = simulation.options
+        if not isinstance(options.sample, SubstrateSample):
+            return
+
+        self.simulations.append(simulation)
+
+        for result in simulation.find_result(EmittedPhotonIntensityResult):
+            key = self._create_key(options, result.analysis.photon_detector)
+            entries = self._entries.setdefault(key, [])
+            entries.append((options.beam.energy_eV, result))
+            entries.sort(key=lambda entry: entry[0])
+
+    def _interpolate(self, energy_eV, lower, upper):
+        energy0_eV, result0 = lower
+        energy1_eV, result1 = upper
+        t = (energy_eV - energy0_eV) / (energy1_eV - energy0_eV)
+
+        builder = EmittedPhotonIntensityResultBuilder(result0.analysis)
+        for xrayline, q0 in result0.items():
+            q1 = result1.get(xrayline, None)
+            if q1 is None:
+                continue
+
+            q = q0 + (q1 - q0) * t
+            builder.add_intensity(xrayline, q.nominal_value, q.std_dev)
+
+        return builder.build()
+
+    def find_result(self, options, photon_detector):
+        """
+        Returns the :class:`EmittedPhotonIntensityResult` of the standard
+        options for the photon detector, or ``None`` if the library does not
+        contain this standard.
+
+        :arg options: options of the standard
+        """
+        if not isinstance(options.sample, SubstrateSample):
+            return None
+
+        entries = self._entries.get(self._create_key(options, photon_detector))
+        if not entries:
+            return None
+
+        energy_eV = options.beam.energy_eV
+        lower = upper = None
+
+        for entry in entries:
+            if abs(entry[0] - energy_eV) <= Beam.ENERGY_TOLERANCE_eV:
+                return entry[1]
+
+            if entry[0] < energy_eV:
+                lower = entry
+            elif upper is None:
+                upper = entry
+
+        if lower is None or upper is None:
+            return None
+
+        if energy_eV - lower[0] > self.energy_tolerance_eV or \
+                upper[0] - energy_eV > self.energy_tolerance_eV:
+            return None
+
+        return self._interpolate(energy_eV, lower, upper)
@@ -0,0 +1,216 @@
+"""
+Surrogate models interpolating k-ratios over swept parameters.
+"""
+
+# Standard library modules.
+import collections
+
+# Third party modules.
+import numpy as np
+import pandas as pd
+
+# Local modules.
+from pymontecarlo.results.kratio import KRatioResult
+
+# Globals and constants variables.
+
+class KRatioSurrogate:
+    """
+    Surrogate of the k-ratios of simulations over N swept parameters
+    (e.g. beam energy, layer thickness, composition), to evaluate
+    k-ratios at other parameter values without running simulations.
+
+    The k-ratios of each X-ray line are interpolated with a radial basis
+    function (cubic polyharmonic spline with a linear polynomial) in the
+    parameter space, where each parameter is scaled by its range.
+    The simulation points can be scattered; they do not need to form a grid.
+    The interpolation error is estimated by leave-one-out
+    cross-validation (see :meth:`create_error_dataframe`).
+    """
+
+    def __init__(self, parameters, xraylines, points, kratios, uncertainties=None,
+                 smoothing=0.0):
+        """
+        :arg parameters: names of the parameters
+        :arg xraylines: X-ray lines of the k-ratios
+        :arg points: :class:`numpy.ndarray` of shape (number of points,
+            number of parameters) with the parameter values of each point
+        :arg kratios: :class:`numpy.ndarray` of shape (number of points,
+            number of X-ray lines)
+        :arg uncertainties: standard deviations of the k-ratios, same shape
+            as *kratios*, used for the error report
+        :arg smoothing: smoothing of the interpolation, to reduce the effect
+            of the statistical noise of the simulations (0: exact
+            interpolation of the points)
+        """
+        points = np.asarray(points, dtype=float)
+        kratios = np.asarray(kratios, dtype=float)
+
+        if points.ndim != 2 or points.shape[1] != len(parameters):
+            raise ValueError('Points must have one column per parameter')
+        if kratios.shape != (len(points), len(xraylines)):
+            raise ValueError('K-ratios must have one row per point and '
+                             'one column per X-ray line')
+        if len(points) <= len(parameters) + 1:
+            raise ValueError('At least {} points are required'
+                             .format(len(parameters) + 2))
+
+        self.parameters = tuple(parameters)
+        self.xraylines = tuple(xraylines)
+        self.smoothing = smoothing
+
+        minimums = points.min(axis=0)
+        ranges = points.max(axis=0) - minimums
+        for parameter, value_range in zip(self.parameters, ranges):
+            if value_range <= 0.0:
+                raise ValueError('Parameter "{}" is not swept'.format(parameter))
+
+        self._offset = minimums
+        self._scale = ranges
+        self._points = (points - minimums) / ranges
+
+        self._coefficients, self._loo_errors = self._fit(self._points, kratios)
+
+        if uncertainties is None:
+            uncertainties = np.zeros_like(kratios)
+        self._uncertainties = np.asarray(uncertainties, dtype=float)
+
+    @classmethod
+    def from_project(cls, project, parameters, photon_detector=None, smoothing=0.0):
+        """
+        Creates a surrogate from the :class:`KRatioResult` of the simulations
+        of a project.
+        Only the X-ray lines with a k-ratio in every simulation are
+        interpolated.
+
+        :arg project: project
+        :arg parameters: ordered :class:`dict` where the keys are the names of
+            the parameters and the values, functions returning the value
+            of the parameter from options, e.g.
+            ``{'energy_eV': lambda options: options.beam.energy_eV}``
+        :arg photon_detector: photon detector of the k-ratios (default: any)
+        """
+        rows = collections.OrderedDict() # key: point, value: list of results
+
+        for simulation in project.simulations:
+            result = next((r for r in simulation.find_result(KRatioResult)
+                           if photon_detector is None or
+                           r.analysis.photon_detector == photon_detector), None)
+            if result is None:
+                continue
+
+            point = tuple(float(getter(simulation.options))
+                          for getter in parameters.values())
+            rows.setdefault(point, []).append(result)
+
+        if not rows:
+            raise ValueError('No simulation with k-ratios')
+
+        xraylines = set.intersection(*[set(result.keys())
+                                       for results in rows.values()
+                                       for result in results])
+        xraylines = sorted(xraylines, key=str)
+
+        # Average the k-ratios of simulations with the same parameter values
+        points = []
+        kratios = []
+        uncertainties = []
+        for point, results in rows.items():
+            points.append(point)
+            kratios.append([np.mean([result.data[xrayline].nominal_value for result in results])
+                            for xrayline in xraylines])
+            uncertainties.append([np.mean([result.data[xrayline].std_dev for result in results])
+                                  for xrayline in xraylines])
+
+        return cls(list(parameters.keys()), xraylines, points, kratios,
+                   uncertainties, smoothing)
+
+    @property
+    def bounds(self):
+        """
+        Returns a :class:`dict` of the minimum and maximum value of each
+        parameter of the simulation points.
+        """
+        return dict((parameter, (offset, offset + scale))
+                    for parameter, offset, scale
+                    in zip(self.parameters, self._offset, self._scale))
+
+    @staticmethod
+    def _basis(distances):
+        return distances ** 3
+
+    def _create_matrix(self, points, nodes):
+        distances = np.sqrt(((points[:, np.newaxis, :] - nodes[np.newaxis, :, :]) ** 2).sum(axis=2))
+        polynomial = np.hstack([np.ones((len(points), 1)), points])
+        return np.hstack([self._basis(distances), polynomial])
+
+    def _fit(self, points, kratios):
+        n, d = points.shape
+
+        matrix = np.zeros((n + d + 1, n + d + 1))
+        matrix[:n, :] = self._create_matrix(points, points)
+        matrix[:n, :n] += self.smoothing * np.eye(n)
+        matrix[n:, :n] = matrix[:n, n:].T
+
+        rhs = np.zeros((n + d + 1, kratios.shape[1]))
+        rhs[:n] = kratios
+
+        # NOTE: The unit vectors of the simulation points are solved with
+        # the same factorization as the k-ratios, to obtain the diagonal of
+        # the inverse needed for the leave-one-out errors (Rippa, 1999)
+        m = kratios.shape[1]
+        rhs = np.hstack([rhs, np.eye(n + d + 1, n)])
+
+        try:
+            solution = np.linalg.solve(matrix, rhs)
+        except np.linalg.LinAlgError:
+            raise ValueError('Points are degenerate (e.g. duplicated or '
+                             'all on a hyperplane)')
+
+        coefficients = solution[:, :m]
+        inverse_diagonal = np.diag(solution[:n, m:])
+
+        loo_errors = coefficients[:n] / inverse_diagonal[:, np.newaxis]
+
+        return coefficients, loo_errors
+
+    def predict_array(self, points):
+        """
+        Returns the interpolated k-ratios as a :class:`numpy.ndarray` of
+        shape (number of points, number of X-ray lines).
+
+        :arg points: array of shape (number of points, number of parameters)
+        """
+        points = (np.atleast_2d(np.asarray(points, dtype=float)) - self._offset) / self._scale
+        return self._create_matrix(points, self._points).dot(self._coefficients)
+
+    def predict(self, **values):
+        """
+        Returns a :class:`dict` of the interpolated k-ratio of each X-ray line
+        at the specified parameter values, given as keyword arguments.
+        """
+        try:
+            point = [values[parameter] for parameter in self.parameters]
+        except KeyError as ex:
+            raise ValueError('Missing parameter: {}'.format(ex.args[0]))
+
+        kratios = self.predict_array([point])[0]
+        return dict(zip(self.xraylines, kratios))
+
+    def create_error_dataframe(self):
+        """
+        Returns a :class:`pandas.DataFrame` with the root mean square and
+        maximum leave-one-out interpolation errors of each X-ray line,
+        as well as the mean uncertainty of the simulated k-ratios.
+        Interpolation errors similar to the uncertainties indicate that the
+        parameters are sampled densely enough.
+        """
+        rms = np.sqrt(np.mean(self._loo_errors ** 2, axis=0))
+        maximum = np.max(np.abs(self._loo_errors), axis=0)
+        uncertainty = np.mean(self._uncertainties, axis=0)
+
+        return pd.DataFrame({'rms error': rms,
+                             'max error': maximum,
+                             'mean uncertainty': uncertainty},
+                            index=[str(xrayline) for xrayline in self.xraylines],
+                            columns=['rms error', 'max error', 'mean uncertainty'])
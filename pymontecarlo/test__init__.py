@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+import os
+import sys
+import subprocess
+
+# Third party modules.
+import pint
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+import pymontecarlo
+from pymontecarlo._settings import Settings
+
+# Globals and constants variables.
+
+# Generous, to avoid failures on slow machines
+IMPORT_TIME_BUDGET_s = 1.0
+
+HEAVY_MODULES = ('pint', 'pandas', 'h5py', 'matplotlib', 'pyparsing')
+
+IMPORT_CODE = """
+import sys, time
+start = time.perf_counter()
+import {0}
+print(time.perf_counter() - start)
+print(' '.join(sys.modules))
+"""
+
+def run_import(modulename):
+    """
+    Imports a module in a new interpreter and returns the import duration
+    (in seconds) and the names of all imported modules.
+    """
+    env = os.environ.copy()
+    dirpath = os.path.dirname(os.path.dirname(os.path.abspath(pymontecarlo.__file__)))
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [dirpath, env.get('PYTHONPATH')]))
+
+    code = IMPORT_CODE.format(modulename)
+    stdout = subprocess.check_output([sys.executable, '-c', code], env=env,
+                                     universal_newlines=True)
+    duration, modulenames = stdout.splitlines()[-2:]
+    return float(duration), set(modulenames.split())
+
+class Test__init__(TestCase):
+
+    def testimport_time(self):
+        duration, _modulenames = run_import('pymontecarlo')
+        self.assertLess(duration, IMPORT_TIME_BUDGET_s)
+
+    def testimport_deferred(self):
+        for modulename in ['pymontecarlo', 'pymontecarlo.options',
+                           'pymontecarlo.simulation', 'pymontecarlo.project']:
+            _duration, modulenames = run_import(modulename)
+            for heavy_modulename in HEAVY_MODULES:
+                self.assertNotIn(heavy_modulename, modulenames,
+                                 '{} imported by {}'.format(heavy_modulename, modulename))
+
+    def testunit_registry(self):
+        self.assertIsInstance(pymontecarlo.unit_registry, pint.UnitRegistry)
+        self.assertIs(pymontecarlo.unit_registry, pymontecarlo.unit_registry)
+
+        q = pymontecarlo.unit_registry.Quantity(1.0, 'electron')
+        self.assertAlmostEqual(1.0, q.to('mol').magnitude, 4)
+
+    def testsettings(self):
+        self.assertIsInstance(pymontecarlo.settings, Settings)
+        self.assertIs(Settings, pymontecarlo.Settings)
+
+    def testunknown_attribute(self):
+        self.assertRaises(AttributeError, getattr, pymontecarlo, 'unknown')
+
+if __name__ == '__main__': #pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
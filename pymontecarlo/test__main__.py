@@ -7,6 +7,8 @@ import logging
 import os
 import sys
 import subprocess
+import io
+import contextlib
 
 # Third party modules.
 
@@ -14,6 +16,11 @@ import subprocess
 from pymontecarlo.testcase import TestCase
 from pymontecarlo.util.path import get_config_dir
 from pymontecarlo._settings import Settings
+from pymontecarlo.formats.hdf5.writer import write
+from pymontecarlo.runner.jobqueue import JobQueue, STATE_DONE
+from pymontecarlo.simulation import Simulation
+from pymontecarlo.__main__ import _create_parser, _create_commands, _parse_commands
+from pymontecarlo.test__init__ import run_import
 
 # Globals and constants variables.
 
@@ -48,6 +55,43 @@ class Test__main__(TestCase):
         out = process.stderr.decode('ascii')
         self.assertEqual('Program', out[:7])
 
+    def testplan(self):
+        filepath = os.path.join(self.create_temp_dir(), 'options.h5')
+        write(self.create_basic_options(), filepath)
+
+        parser = _create_parser()
+        _create_commands(parser)
+        ns = parser.parse_args(['plan', filepath])
+
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            self.assertRaises(SystemExit, _parse_commands, parser, ns)
+
+        out = stderr.getvalue()
+        self.assertIn('New simulations', out)
+
+    def testworker(self):
+        filepath = os.path.join(self.create_temp_dir(), 'queue.sqlite')
+        queue = JobQueue(filepath)
+        queue.put(Simulation(self.create_basic_options()))
+
+        parser = _create_parser()
+        _create_commands(parser)
+        ns = parser.parse_args(['worker', filepath, '--idle-timeout', '0'])
+
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            self.assertRaises(SystemExit, _parse_commands, parser, ns)
+
+        self.assertIn('1 simulation(s) run', stderr.getvalue())
+        self.assertEqual(1, queue.count(STATE_DONE))
+
+    def testimport_deferred(self):
+        _duration, modulenames = run_import('pymontecarlo.__main__')
+        for modulename in ['pymontecarlo.runner.local', 'pymontecarlo.runner.history',
+                           'pymontecarlo.runner.jobqueue']:
+            self.assertNotIn(modulename, modulenames)
+
 if __name__ == '__main__': #pragma: no cover
     logging.getLogger().setLevel(logging.DEBUG)
     unittest.main()
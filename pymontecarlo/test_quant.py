@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+
+# Third party modules.
+import numpy as np
+import uncertainties
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+from pymontecarlo.quant import \
+    Quantifier, ElementByDifferenceRule, FixedElementRule
+from pymontecarlo.runner.local import LocalSimulationRunner
+from pymontecarlo.options.material import Material
+from pymontecarlo.options.sample import SubstrateSample
+from pymontecarlo.options.analysis import KRatioAnalysis
+from pymontecarlo.util.xrayline import XrayLine
+
+# Globals and constants variables.
+
+# Hyperbolic calibration curves (Ziebold and Ogilvie) of each element
+ALPHAS = {29: 1.3, 79: 0.7, 30: 1.0}
+
+def _calculate_kratio(z, composition):
+    wf = composition.get(z, 0.0)
+    alpha = ALPHAS[z]
+    return wf / (wf + alpha * (1.0 - wf))
+
+def _extract_kratios(simulation, photon_detector):
+    composition = simulation.options.sample.material.composition
+    return dict((XrayLine(z, 'Ka1'), uncertainties.ufloat(_calculate_kratio(z, composition), 0.001))
+                for z in composition)
+
+class TestElementByDifferenceRule(TestCase):
+
+    def testupdate(self):
+        rule = ElementByDifferenceRule(79)
+
+        composition = {29: 0.4, 79: 0.1}
+        rule.update(composition)
+        self.assertAlmostEqual(0.6, composition[79], 4)
+
+        composition = {29: 1.0, 79: 0.1}
+        rule.update(composition)
+        self.assertNotIn(79, composition)
+
+class TestFixedElementRule(TestCase):
+
+    def testupdate(self):
+        rule = FixedElementRule(30, 0.1)
+
+        composition = {29: 0.4}
+        rule.update(composition)
+        self.assertAlmostEqual(0.1, composition[30], 4)
+
+    def test__init__(self):
+        self.assertRaises(ValueError, FixedElementRule, 30, 0.0)
+        self.assertRaises(ValueError, FixedElementRule, 30, 1.1)
+
+class TestQuantifier(TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.r = LocalSimulationRunner(max_workers=4)
+
+        self.composition = {29: 0.3, 79: 0.6, 30: 0.1}
+
+    def tearDown(self):
+        super().tearDown()
+        self.r.shutdown()
+
+    def _create_options(self, composition):
+        options = self.create_basic_options()
+        options.sample = SubstrateSample(Material('unknown', composition, 8e3))
+        options.analyses = [KRatioAnalysis(self.create_basic_photondetector())]
+        return options
+
+    def _create_kratios(self, zs):
+        return dict(((z, 'Ka1'), (_calculate_kratio(z, self.composition), 0.001))
+                    for z in zs)
+
+    def _create_quantifier(self, kratios, rules, **kwargs):
+        return Quantifier(self.r, self._create_options, kratios, rules,
+                          extract_kratios=_extract_kratios, **kwargs)
+
+    def testrun_by_difference(self):
+        kratios = self._create_kratios([29, 30])
+        rules = [ElementByDifferenceRule(79)]
+        quantifier = self._create_quantifier(kratios, rules)
+        composition = quantifier.run()
+
+        self.assertTrue(quantifier.converged)
+        self.assertEqual(3, len(composition))
+        for z, wf in self.composition.items():
+            self.assertAlmostEqual(wf, composition[z].nominal_value, 2)
+
+        self.assertGreater(composition[29].std_dev, 0.0)
+        self.assertGreater(composition[79].std_dev, 0.0)
+
+    def testrun_fixed(self):
+        kratios = self._create_kratios([29])
+        rules = [FixedElementRule(30, 0.1), ElementByDifferenceRule(79)]
+        quantifier = self._create_quantifier(kratios, rules)
+        composition = quantifier.run()
+
+        self.assertTrue(quantifier.converged)
+        for z, wf in self.composition.items():
+            self.assertAlmostEqual(wf, composition[z].nominal_value, 2)
+
+        self.assertAlmostEqual(0.0, composition[30].std_dev, 4)
+        self.assertAlmostEqual(composition[29].std_dev, composition[79].std_dev, 4)
+
+    def testrun_all_measured(self):
+        kratios = self._create_kratios([29, 30, 79])
+        quantifier = self._create_quantifier(kratios, [])
+        composition = quantifier.run()
+
+        self.assertTrue(quantifier.converged)
+        for z, wf in self.composition.items():
+            self.assertAlmostEqual(wf, composition[z].nominal_value, 2)
+
+    def testrun_broyden(self):
+        kratios = self._create_kratios([29, 30])
+        rules = [ElementByDifferenceRule(79)]
+
+        quantifier = self._create_quantifier(kratios, rules, method='broyden')
+        composition = quantifier.run()
+
+        self.assertTrue(quantifier.converged)
+        for z, wf in self.composition.items():
+            self.assertAlmostEqual(wf, composition[z].nominal_value, 2)
+
+        # Only one composition per iteration after the first one
+        self.assertEqual(2 + len(quantifier.iterations), len(quantifier._cache))
+
+    def testrun_cache(self):
+        kratios = self._create_kratios([29, 30])
+        rules = [ElementByDifferenceRule(79)]
+        quantifier = self._create_quantifier(kratios, rules)
+        quantifier.run()
+
+        count = len(self.r.submitted_options)
+        quantifier.run()
+        self.assertEqual(count, len(self.r.submitted_options))
+
+    def test_create_variants(self):
+        kratios = self._create_kratios([29, 30])
+        rules = [ElementByDifferenceRule(79)]
+        quantifier = self._create_quantifier(kratios, rules)
+        tolerance = quantifier.composition_tolerance
+
+        # Total at its maximum, with a trace element below the step
+        x = np.array([1.0 - tolerance - 0.0045, 0.0045])
+        variants = quantifier._create_variants(x)
+
+        self.assertEqual(2, len(variants))
+        for j, xj in enumerate(variants):
+            self.assertNotAlmostEqual(x[j], xj[j], 4)
+            self.assertTrue(np.all(xj >= tolerance))
+            np.testing.assert_allclose(quantifier._constrain(xj), xj)
+
+        self.assertAlmostEqual(x[0] - quantifier.step, variants[0][0], 8)
+        self.assertAlmostEqual(tolerance, variants[1][1], 8)
+
+        # Trace element at the tolerance
+        x = np.array([1.0 - 2 * tolerance, tolerance])
+        xj = quantifier._create_variants(x)[1]
+        self.assertGreater(xj[1], x[1])
+        np.testing.assert_allclose(quantifier._constrain(xj), xj)
+
+    def test_create_composition(self):
+        kratios = self._create_kratios([29, 30, 79])
+        rules = [ElementByDifferenceRule(26)]
+        quantifier = self._create_quantifier(kratios, rules)
+
+        # Total at its maximum, but above it once each weight fraction is rounded
+        x = quantifier._constrain(np.array([0.33336, 0.33336, 0.33318]))
+        composition = quantifier._create_composition(x)
+
+        self.assertEqual(4, len(composition))
+        self.assertGreater(composition[26], 0.0)
+        self.assertAlmostEqual(1.0, sum(composition.values()), 8)
+        for z in [29, 30, 79]:
+            self.assertAlmostEqual(composition[z], round(composition[z], 4), 10)
+
+    def test_create_variants_rounded(self):
+        kratios = self._create_kratios([29, 30])
+        rules = [ElementByDifferenceRule(79)]
+        quantifier = self._create_quantifier(kratios, rules, step=0.01234)
+
+        x = quantifier._round(np.array([0.30004, 0.10004]))
+        for j, xj in enumerate(quantifier._create_variants(x)):
+            composition = quantifier._create_composition(xj)
+            self.assertAlmostEqual(composition[quantifier._zs[j]], xj[j], 10)
+            self.assertAlmostEqual(0.0123, xj[j] - x[j], 10)
+
+    def test__init__(self):
+        kratios = self._create_kratios([29])
+        self.assertRaises(ValueError, self._create_quantifier, kratios,
+                          [ElementByDifferenceRule(29)])
+        self.assertRaises(ValueError, self._create_quantifier, kratios,
+                          [ElementByDifferenceRule(30), ElementByDifferenceRule(79)])
+        self.assertRaises(ValueError, self._create_quantifier, kratios, [],
+                          method='unknown')
+
+if __name__ == '__main__': # pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
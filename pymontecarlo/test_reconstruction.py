@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+import math
+import itertools
+
+# Third party modules.
+import numpy as np
+import uncertainties
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+from pymontecarlo.reconstruction import \
+    (Reconstructor, Measurement, Parameter, LayerThicknessParameter,
+     SphereDiameterParameter)
+from pymontecarlo.surrogate import KRatioSurrogate
+from pymontecarlo.runner.local import LocalSimulationRunner
+from pymontecarlo.options.beam import GaussianBeam
+from pymontecarlo.options.material import Material
+from pymontecarlo.options.sample import HorizontalLayerSample, SphereSample
+from pymontecarlo.options.analysis import KRatioAnalysis
+from pymontecarlo.util.xrayline import XrayLine
+
+# Globals and constants variables.
+
+CU_KA = XrayLine(29, 'Ka1')
+AU_LA = XrayLine(79, 'La1')
+
+def _calculate_kratios(thickness_m, energy_eV):
+    # Exponential absorption model with a range proportional to the energy
+    range_m = energy_eV * 1e-11
+    return {CU_KA: 1.0 - math.exp(-thickness_m / range_m),
+            AU_LA: math.exp(-thickness_m / range_m)}
+
+def _extract_kratios(simulation, photon_detector):
+    options = simulation.options
+    if isinstance(options.sample, SphereSample):
+        thickness_m = options.sample.diameter_m
+    else:
+        thickness_m = options.sample.layers[0].thickness_m
+    kratios = _calculate_kratios(thickness_m, options.beam.energy_eV)
+    return dict((xrayline, uncertainties.ufloat(kratio, 0.001))
+                for xrayline, kratio in kratios.items())
+
+class TestParameter(TestCase):
+
+    def testset(self):
+        parameter = LayerThicknessParameter(0, maximum=1e-6)
+        sample = HorizontalLayerSample(Material.pure(79))
+        sample.add_layer(Material.pure(29), 10e-9)
+
+        parameter.set(sample, 20e-9)
+        self.assertAlmostEqual(20e-9, parameter.get(sample), 12)
+
+        self.assertRaises(ValueError, parameter.set, sample, 2e-6)
+        self.assertRaises(ValueError, parameter.set, sample, -1e-9)
+
+    def testround(self):
+        parameter = Parameter('a', None, None, tolerance=0.5)
+        self.assertAlmostEqual(1.5, parameter.round(1.3), 4)
+
+        parameter = Parameter('a', None, None)
+        self.assertAlmostEqual(1.3, parameter.round(1.3), 4)
+
+class TestReconstructor(TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.r = LocalSimulationRunner(max_workers=4)
+
+        self.thickness_m = 50e-9
+        self.energies_eV = [10e3, 20e3]
+
+    def tearDown(self):
+        super().tearDown()
+        self.r.shutdown()
+
+    def _create_measurements(self, sample):
+        measurements = []
+
+        for energy_eV in self.energies_eV:
+            options = self.create_basic_options()
+            options.beam = GaussianBeam(energy_eV, 10e-9)
+            options.sample = sample
+            options.analyses = [KRatioAnalysis(self.create_basic_photondetector())]
+
+            kratios = _calculate_kratios(self.thickness_m, energy_eV)
+            kratios = dict((xrayline, (kratio, 0.001)) for xrayline, kratio in kratios.items())
+
+            measurements.append(Measurement(options, kratios, {'energy_eV': energy_eV}))
+
+        return measurements
+
+    def _create_layer_measurements(self):
+        sample = HorizontalLayerSample(Material.pure(79))
+        sample.add_layer(Material.pure(29), 20e-9)
+        return self._create_measurements(sample)
+
+    def _create_reconstructor(self, measurements, parameters):
+        return Reconstructor(self.r, measurements, parameters,
+                             extract_kratios=_extract_kratios)
+
+    def testrun_layer(self):
+        measurements = self._create_layer_measurements()
+        parameters = [LayerThicknessParameter(0, maximum=1e-6)]
+        reconstructor = self._create_reconstructor(measurements, parameters)
+        values = reconstructor.run()
+
+        self.assertTrue(reconstructor.converged)
+        value = values['layer0_thickness_m']
+        self.assertAlmostEqual(self.thickness_m, value.nominal_value, delta=0.5e-9)
+        self.assertGreater(value.std_dev, 0.0)
+
+        # Measurement options are not modified
+        self.assertAlmostEqual(20e-9, measurements[0].options.sample.layers[0].thickness_m, 12)
+
+    def testrun_sphere(self):
+        sample = SphereSample(Material.pure(29), 80e-9)
+        measurements = self._create_measurements(sample)
+        parameters = [SphereDiameterParameter(maximum=1e-6)]
+        reconstructor = self._create_reconstructor(measurements, parameters)
+        values = reconstructor.run()
+
+        self.assertTrue(reconstructor.converged)
+        self.assertAlmostEqual(self.thickness_m, values['diameter_m'].nominal_value, delta=0.5e-9)
+
+    def testrun_cache(self):
+        measurements = self._create_layer_measurements()
+        parameters = [LayerThicknessParameter(0, maximum=1e-6)]
+        reconstructor = self._create_reconstructor(measurements, parameters)
+        reconstructor.run()
+
+        count = len(self.r.submitted_options)
+        reconstructor.run()
+        self.assertEqual(count, len(self.r.submitted_options))
+
+    def testrun_surrogate(self):
+        points = list(itertools.product([0.0, 25e-9, 75e-9, 100e-9, 150e-9, 200e-9],
+                                        self.energies_eV))
+        kratios = []
+        for thickness_m, energy_eV in points:
+            values = _calculate_kratios(thickness_m, energy_eV)
+            kratios.append([values[CU_KA], values[AU_LA]])
+        surrogate = KRatioSurrogate(['layer0_thickness_m', 'energy_eV'],
+                                    [CU_KA, AU_LA], points, kratios)
+
+        measurements = self._create_layer_measurements()
+        parameters = [LayerThicknessParameter(0, maximum=1e-6)]
+        reconstructor = self._create_reconstructor(measurements, parameters)
+
+        values = reconstructor.estimate_from_surrogate(surrogate, count=41)
+        self.assertAlmostEqual(self.thickness_m, values['layer0_thickness_m'], delta=5e-9)
+
+        values = reconstructor.run(surrogate=surrogate)
+        self.assertTrue(reconstructor.converged)
+        self.assertAlmostEqual(self.thickness_m, values['layer0_thickness_m'].nominal_value,
+                               delta=0.5e-9)
+        self.assertLessEqual(len(reconstructor.iterations), 3)
+
+    def test_create_variants(self):
+        measurements = self._create_layer_measurements()
+        parameters = [LayerThicknessParameter(0, maximum=25e-9)]
+        reconstructor = self._create_reconstructor(measurements, parameters)
+
+        # Variants are rounded to the tolerance of the parameter
+        x = np.array([23.7e-9])
+        xj, = reconstructor._create_variants(x)
+        self.assertEqual(reconstructor._create_key(xj), tuple(xj))
+        self.assertAlmostEqual(23.9e-9, xj[0], 15)
+
+        # Backward step at the maximum
+        x = np.array([25e-9])
+        xj, = reconstructor._create_variants(x)
+        self.assertEqual(reconstructor._create_key(xj), tuple(xj))
+        self.assertAlmostEqual(24.8e-9, xj[0], 15)
+
+    def test__init__(self):
+        measurements = self._create_layer_measurements()
+        self.assertRaises(ValueError, Reconstructor, self.r, [], [LayerThicknessParameter(0)])
+        self.assertRaises(ValueError, Reconstructor, self.r, measurements, [])
+
+if __name__ == '__main__': # pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+import os
+import math
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+from pymontecarlo.standards import StandardsLibrary
+from pymontecarlo.simulation import Simulation
+from pymontecarlo.options.detector import PhotonDetector
+from pymontecarlo.options.material import Material
+from pymontecarlo.options.model import ElasticCrossSectionModel
+from pymontecarlo.results.photonintensity import EmittedPhotonIntensityResultBuilder
+
+# Globals and constants variables.
+
+class TestStandardsLibrary(TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.detector = self.create_basic_photondetector()
+        list_options = StandardsLibrary.create_list_options(
+            self.program, [29], [10e3, 20e3], [self.detector])
+
+        simulations = []
+        for options in list_options:
+            analysis = options.analyses[0]
+            builder = EmittedPhotonIntensityResultBuilder(analysis)
+            intensity = options.beam.energy_eV / 10e3
+            builder.add_intensity((29, 'Ka1'), intensity, 0.1)
+            simulations.append(Simulation(options, [builder.build()]))
+
+        self.library = StandardsLibrary(simulations, energy_tolerance_eV=5e3)
+
+    def _create_standard_options(self, energy_eV):
+        options = StandardsLibrary.create_list_options(
+            self.program, [29], [energy_eV], [self.detector])[0]
+        return options
+
+    def testcreate_list_options(self):
+        list_options = StandardsLibrary.create_list_options(
+            self.program, [29, Material.from_formula('Al2O3')], [5e3, 10e3, 15e3],
+            [self.detector], list_models=[[], [ElasticCrossSectionModel.RUTHERFORD]])
+        self.assertEqual(12, len(list_options))
+        self.assertEqual(Material.pure(29), list_options[0].sample.material)
+        self.assertEqual(1, len(list_options[0].analyses))
+
+    def testfind_result(self):
+        self.assertEqual(2, len(self.library))
+
+        result = self.library.find_result(self._create_standard_options(20e3), self.detector)
+        self.assertAlmostEqual(2.0, result[(29, 'Ka1')].n, 4)
+
+    def testfind_result_interpolation(self):
+        result = self.library.find_result(self._create_standard_options(15e3), self.detector)
+        q = result[(29, 'Ka1')]
+        self.assertAlmostEqual(1.5, q.n, 4)
+        self.assertTrue(q.s > 0.0)
+
+    def testfind_result_tolerance(self):
+        self.library.energy_tolerance_eV = 1e3
+        self.assertIsNone(self.library.find_result(self._create_standard_options(14e3), self.detector))
+
+        # Outside grid
+        self.library.energy_tolerance_eV = 5e3
+        self.assertIsNone(self.library.find_result(self._create_standard_options(22e3), self.detector))
+
+    def testfind_result_mismatch(self):
+        detector = PhotonDetector('xray', math.radians(35.0))
+        self.assertIsNone(self.library.find_result(self._create_standard_options(20e3), detector))
+
+        options = self._create_standard_options(20e3)
+        options.models.append(ElasticCrossSectionModel.RUTHERFORD)
+        self.assertIsNone(self.library.find_result(options, self.detector))
+
+    def testread_write(self):
+        filepath = os.path.join(self.create_temp_dir(), 'standards.h5')
+        self.library.write(filepath)
+
+        library = StandardsLibrary.read(filepath, energy_tolerance_eV=5e3)
+        self.assertEqual(2, len(library))
+
+        result = library.find_result(self._create_standard_options(15e3), self.detector)
+        self.assertAlmostEqual(1.5, result[(29, 'Ka1')].n, 4)
+
+if __name__ == '__main__': # pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+import itertools
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+from pymontecarlo.surrogate import KRatioSurrogate
+from pymontecarlo.project import Project
+from pymontecarlo.simulation import Simulation
+from pymontecarlo.options.analysis import KRatioAnalysis
+from pymontecarlo.results.kratio import KRatioResultBuilder
+from pymontecarlo.util.xrayline import XrayLine
+
+# Globals and constants variables.
+
+def _linear(energy_keV, diameter_nm):
+    return 0.1 + 0.01 * energy_keV + 0.002 * diameter_nm
+
+def _quadratic(energy_keV, diameter_nm):
+    return 0.1 + 0.001 * energy_keV ** 2 + 0.002 * diameter_nm
+
+class TestKRatioSurrogate(TestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        self.points = np.array(list(itertools.product([5.0, 10.0, 15.0, 20.0],
+                                                      [10.0, 50.0, 100.0])))
+        self.xrayline = XrayLine(29, 'Ka1')
+
+    def _create_surrogate(self, func):
+        kratios = [[func(*point)] for point in self.points]
+        return KRatioSurrogate(['energy_keV', 'diameter_nm'], [self.xrayline],
+                               self.points, kratios)
+
+    def testpredict_linear(self):
+        surrogate = self._create_surrogate(_linear)
+
+        kratios = surrogate.predict(energy_keV=12.0, diameter_nm=30.0)
+        self.assertAlmostEqual(_linear(12.0, 30.0), kratios[self.xrayline], 6)
+
+        df = surrogate.create_error_dataframe()
+        self.assertEqual(1, len(df))
+        self.assertAlmostEqual(0.0, df['max error'].iloc[0], 6)
+
+    def testpredict_quadratic(self):
+        surrogate = self._create_surrogate(_quadratic)
+
+        # Exact at simulated points
+        kratios = surrogate.predict_array(self.points)
+        expected = [_quadratic(*point) for point in self.points]
+        np.testing.assert_allclose(expected, kratios[:, 0], atol=1e-8)
+
+        kratios = surrogate.predict(energy_keV=12.0, diameter_nm=30.0)
+        self.assertAlmostEqual(_quadratic(12.0, 30.0), kratios[self.xrayline], 2)
+
+        df = surrogate.create_error_dataframe()
+        self.assertTrue(df['rms error'].iloc[0] > 0.0)
+        self.assertTrue(df['max error'].iloc[0] >= df['rms error'].iloc[0])
+
+    def testpredict_missing_parameter(self):
+        surrogate = self._create_surrogate(_linear)
+        self.assertRaises(ValueError, surrogate.predict, energy_keV=12.0)
+
+    def testnot_swept(self):
+        points = [[5.0, 10.0], [10.0, 10.0], [15.0, 10.0], [20.0, 10.0]]
+        kratios = [[0.1]] * 4
+        self.assertRaises(ValueError, KRatioSurrogate, ['energy_keV', 'diameter_nm'],
+                          [self.xrayline], points, kratios)
+
+    def testfrom_project(self):
+        project = Project()
+        analysis = KRatioAnalysis(self.create_basic_photondetector())
+
+        for energy_keV, diameter_nm in self.points:
+            options = self.create_basic_options()
+            options.beam.energy_eV = energy_keV * 1e3
+            options.beam.diameter_m = diameter_nm * 1e-9
+
+            builder = KRatioResultBuilder(analysis)
+            builder.add_kratio((29, 'Ka1'), _linear(energy_keV, diameter_nm), 1.0)
+            builder.add_kratio((29, 'La'), 0.5, 1.0)
+            project.add_simulation(Simulation(options, [builder.build()]))
+
+        parameters = {'energy_keV': lambda options: options.beam.energy_eV / 1e3,
+                      'diameter_nm': lambda options: options.beam.diameter_m * 1e9}
+        surrogate = KRatioSurrogate.from_project(project, parameters)
+
+        self.assertEqual(('energy_keV', 'diameter_nm'), surrogate.parameters)
+        self.assertEqual(2, len(surrogate.xraylines))
+
+        kratios = surrogate.predict(energy_keV=7.0, diameter_nm=20.0)
+        self.assertAlmostEqual(_linear(7.0, 20.0), kratios[self.xrayline], 6)
+        self.assertAlmostEqual(0.5, kratios[XrayLine(29, 'La')], 6)
+
+if __name__ == '__main__': # pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
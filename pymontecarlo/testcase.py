@@ -10,12 +10,11 @@ import tempfile
 import shutil
 
 # Third party modules.
-import pkg_resources
-
 import h5py
 
 # Local modules.
 import pymontecarlo
+import pymontecarlo.util.entrypoint as entrypoint
 from pymontecarlo.project import Project
 from pymontecarlo.simulation import Simulation
 from pymontecarlo.options.options import Options
@@ -42,18 +41,12 @@ class TestCase(unittest.TestCase):
         super().setUpClass()
 
         # Add program HDF5 handler
-        requirement = pkg_resources.Requirement('pymontecarlo')
-        distribution = pkg_resources.working_set.find(requirement)
-        entry_map = distribution.get_entry_map('pymontecarlo.formats.hdf5')
-        entry_map['mock'] = pkg_resources.EntryPoint('mock', 'pymontecarlo.mock',
-                                                     attrs=('ProgramHDF5HandlerMock',),
-                                                     dist=distribution)
+        entrypoint.add_entrypoint('pymontecarlo.formats.hdf5', 'mock',
+                                  'pymontecarlo.mock:ProgramHDF5HandlerMock')
 
         # Add program to available programs
-        entry_map = distribution.get_entry_map('pymontecarlo.program')
-        entry_map['mock'] = pkg_resources.EntryPoint('mock', 'pymontecarlo.mock',
-                                                     attrs=('ProgramMock',),
-                                                     dist=distribution)
+        entrypoint.add_entrypoint('pymontecarlo.program', 'mock',
+                                  'pymontecarlo.mock:ProgramMock')
 
         pymontecarlo.settings.reload()
 
@@ -0,0 +1,64 @@
+"""
+Mass absorption coefficient calculations
+"""
+
+# Standard library modules.
+import functools
+
+# Third party modules.
+import pyxray
+
+# Local modules.
+from pymontecarlo.util.element_data import atomic_weight
+
+# Globals and constants variables.
+
+# Constants of the Bragg-Pierce law for photon energies above the K edge,
+# above the L3 edge, above the M5 edge and below it
+BRAGG_PIERCE_CONSTANTS = [('K', 0.0101), ('L3', 0.00097), ('M5', 0.00097 / 3),
+                          (None, 0.00097 / 9)]
+
+@functools.lru_cache(maxsize=None)
+def _get_binding_energy_eV(z, subshell):
+    try:
+        return pyxray.atomic_subshell_binding_energy_eV(z, subshell)
+    except pyxray.NotFound:
+        return None
+
+@functools.lru_cache(maxsize=None)
+def bragg_pierce(z, energy_eV):
+    """
+    Returns the mass absorption coefficient (in cm2/g) of photons in an
+    element, using the Bragg-Pierce law.
+    This approximation is within a few tens of percent of tabulated values
+    away from the absorption edges.
+
+    Reference:
+    Heinrich, K.F.J. (1966). X-ray absorption uncertainty. In The Electron
+    Microprobe, pp. 296-377. Wiley, New York.
+
+    :arg z: atomic number of the absorber
+    :arg energy_eV: photon energy (in eV)
+    """
+    wavelength_angstrom = 12398.4 / energy_eV
+
+    for subshell, constant in BRAGG_PIERCE_CONSTANTS:
+        if subshell is None:
+            break
+
+        edge_eV = _get_binding_energy_eV(z, subshell)
+        if edge_eV is not None and energy_eV > edge_eV:
+            break
+
+    return constant * z ** 4 * wavelength_angstrom ** 3 / \
+        atomic_weight(z)
+
+def mass_absorption_coefficient(composition, energy_eV):
+    """
+    Returns the mass absorption coefficient (in cm2/g) of photons in a
+    composition, using the Bragg-Pierce law.
+
+    :arg composition: composition in weight fraction
+    :arg energy_eV: photon energy (in eV)
+    """
+    return sum(wf * bragg_pierce(z, energy_eV) for z, wf in composition.items())
@@ -7,6 +7,7 @@ import math
 import abc
 import unicodedata
 import re
+import threading
 
 # Third party modules.
 import more_itertools
@@ -135,6 +136,23 @@ class DegreesAttribute(MultiplierAttribute):
     def __init__(self, attrname_rad):
         super().__init__(attrname_rad, 180.0 / math.pi)
 
+class LazyClassAttribute(object):
+    """
+    Class attribute whose value is returned by *func* when first accessed,
+    for constants which are slow to create.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.lock = threading.Lock()
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner=None):
+        with self.lock:
+            if not hasattr(self, 'value'):
+                self.value = self.func()
+        return self.value
+
 class Monitorable(metaclass=abc.ABCMeta):
 
     @abc.abstractmethod
@@ -3,12 +3,14 @@ Some useful color sets
 """
 
 # Standard library modules.
+import re
 
 # Third party modules.
 
 # Local modules.
 
 # Globals and constant variables.
+_HEX_COLOR_PATTERN = re.compile(r'^#(?:[0-9a-fA-F]{6}|[0-9a-fA-F]{8})$')
 COLOR_SET_GREY = ('#282828',
                   '#323232',
                   '#3C3C3C',
@@ -46,4 +48,23 @@ COLOR_SET_COLORFUL = ('#FFB300',  # Vivid Yellow
                       '#F4C800',  # Vivid Greenish Yellow
                       '#93AA00',  # Vivid Yellowish Green
                       '#F13A13',  # Vivid Reddish Orange
-                      '#232C16')
\ No newline at end of file
+                      '#232C16')
+
+def is_color_like(color):
+    """
+    Returns whether *color* is a valid matplotlib color.
+    Hexadecimal strings and RGB(A) tuples are checked without importing
+    matplotlib.
+    """
+    if isinstance(color, str):
+        if _HEX_COLOR_PATTERN.match(color):
+            return True
+
+    elif isinstance(color, (tuple, list)) and len(color) in (3, 4):
+        try:
+            return all(0.0 <= float(value) <= 1.0 for value in color)
+        except (TypeError, ValueError):
+            return False
+
+    import matplotlib.colors # Deferred, slow to import
+    return matplotlib.colors.is_color_like(color)
@@ -5,9 +5,11 @@ Electron range calculations
 # Standard library modules.
 
 # Third party modules.
-import pyxray
+import numpy as np
 
 # Local modules.
+from pymontecarlo.util.element_data import \
+    atomic_weight, mass_density_g_per_cm3, to_weight_fraction_matrix
 
 # Globals and constants variables.
 
@@ -26,9 +28,28 @@ def kanaya_okayama(composition, energy):
     r = 0.0;
 
     for z, fraction in composition.items():
-        dr = (0.0276 * pyxray.element_atomic_weight(z) * (energy / 1000.0) ** 1.67) / \
-            (z ** 0.89 * pyxray.element_mass_density_g_per_cm3(z))
+        dr = (0.0276 * atomic_weight(z) * (energy / 1000.0) ** 1.67) / \
+            (z ** 0.89 * mass_density_g_per_cm3(z))
         r += fraction / (dr * 1e-6)
 
     return 1.0 / r;
 
+def kanaya_okayama_array(compositions, energies):
+    """
+    Returns the electron ranges (in meters) of many compositions at many
+    energies, as a :class:`numpy.ndarray` of shape
+    (number of compositions, ) + shape of *energies*.
+    Same as :func:`kanaya_okayama`.
+
+    :arg compositions: iterable of compositions in weight fraction
+        (see :func:`kanaya_okayama`)
+    :arg energies: beam energies in eV
+    """
+    zs, wfs = to_weight_fraction_matrix(compositions)
+    energies = np.asarray(energies, dtype=float)
+
+    # Range of each element at each energy, shape: energies + (elements,)
+    drs = (0.0276 * atomic_weight(zs) * (energies[..., np.newaxis] / 1000.0) ** 1.67) / \
+        (zs ** 0.89 * mass_density_g_per_cm3(zs))
+
+    return 1.0 / np.einsum('cz,...z->c...', wfs, 1.0 / (drs * 1e-6))
@@ -0,0 +1,188 @@
+"""
+Properties of the elements as arrays indexed by atomic number.
+
+The arrays are loaded from pyxray on first use and are then shared by all
+callers, to avoid a database lookup per element in calculations over
+many materials.
+Missing values (e.g. density of synthetic elements) are ``nan``.
+
+The tables are read-only. Processes forked after :func:`preload` share them
+with their parent instead of querying pyxray again.
+"""
+
+# Standard library modules.
+import os
+import threading
+
+# Third party modules.
+import numpy as np
+import pyxray
+
+# Local modules.
+
+# Globals and constants variables.
+
+MAX_Z = 118
+
+_lock = threading.RLock()
+_tables = {}
+
+def _reset_lock():
+    # The lock may have been held by another thread at the time of the fork
+    global _lock
+    _lock = threading.RLock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_lock)
+
+def _load_table(name, create):
+    try:
+        return _tables[name]
+    except KeyError:
+        pass
+
+    with _lock:
+        if name not in _tables:
+            _tables[name] = create()
+
+    return _tables[name]
+
+def _load(name, func):
+    def create():
+        values = np.full(MAX_Z + 1, np.nan)
+        for z in range(1, MAX_Z + 1):
+            try:
+                values[z] = func(z)
+            except pyxray.NotFound:
+                pass
+        values.setflags(write=False)
+        return values
+
+    return _load_table(name, create)
+
+def _load_strings(name, func):
+    def create():
+        return ('',) + tuple(func(z) for z in range(1, MAX_Z + 1))
+
+    return _load_table(name, create)
+
+def preload():
+    """
+    Loads all tables.
+    To be called before forking worker processes, so that they share the
+    tables of the parent process.
+    """
+    atomic_weights()
+    mass_densities_g_per_cm3()
+    mass_densities_kg_per_m3()
+    symbols()
+    names()
+    atomic_numbers()
+
+def atomic_weights():
+    """
+    Returns the atomic weight (g/mol) of each element, indexed by
+    atomic number.
+    """
+    return _load('atomic_weights', pyxray.element_atomic_weight)
+
+def mass_densities_g_per_cm3():
+    """
+    Returns the mass density (g/cm3) of each element, indexed by
+    atomic number.
+    """
+    return _load('mass_densities_g_per_cm3', pyxray.element_mass_density_g_per_cm3)
+
+def mass_densities_kg_per_m3():
+    """
+    Returns the mass density (kg/m3) of each element, indexed by
+    atomic number.
+    """
+    return _load('mass_densities_kg_per_m3', pyxray.element_mass_density_kg_per_m3)
+
+def symbols():
+    """
+    Returns a :class:`tuple` with the symbol of each element, indexed by
+    atomic number.
+    """
+    return _load_strings('symbols', pyxray.element_symbol)
+
+def names():
+    """
+    Returns a :class:`tuple` with the name of each element, indexed by
+    atomic number.
+    """
+    return _load_strings('names', pyxray.element_name)
+
+def atomic_numbers():
+    """
+    Returns a :class:`dict` where the keys are element symbols and the values,
+    atomic numbers.
+    """
+    def create():
+        return dict((symbol, z) for z, symbol in enumerate(symbols()) if z > 0)
+
+    return _load_table('atomic_numbers', create)
+
+def _get(values, z, name):
+    value = values[z]
+    if np.isnan(value).any():
+        raise pyxray.NotFound('No {} found for Z={}'.format(name, z))
+    return value if np.ndim(value) else float(value)
+
+def atomic_weight(z):
+    """
+    Returns the atomic weight (g/mol) of an element or elements.
+    Raises :exc:`pyxray.NotFound` if it is unknown.
+
+    :arg z: atomic number, or array of atomic numbers
+    """
+    return _get(atomic_weights(), z, 'atomic weight')
+
+def mass_density_g_per_cm3(z):
+    """
+    Returns the mass density (g/cm3) of an element or elements.
+    Raises :exc:`pyxray.NotFound` if it is unknown.
+
+    :arg z: atomic number, or array of atomic numbers
+    """
+    return _get(mass_densities_g_per_cm3(), z, 'mass density')
+
+def mass_density_kg_per_m3(z):
+    """
+    Returns the mass density (kg/m3) of an element or elements.
+    Raises :exc:`pyxray.NotFound` if it is unknown.
+
+    :arg z: atomic number, or array of atomic numbers
+    """
+    return _get(mass_densities_kg_per_m3(), z, 'mass density')
+
+def atomic_number(symbol):
+    """
+    Returns the atomic number of an element from its symbol.
+    Raises :exc:`pyxray.NotFound` if the symbol is unknown.
+    """
+    try:
+        return atomic_numbers()[symbol]
+    except KeyError:
+        raise pyxray.NotFound('No element found for symbol {}'.format(symbol))
+
+def to_weight_fraction_matrix(compositions):
+    """
+    Returns the atomic numbers of all elements in *compositions*, and
+    an array of shape (number of compositions, number of elements) with
+    their weight fractions.
+
+    :arg compositions: iterable of :class:`dict` where the keys are atomic
+        numbers and the values, weight fractions
+    """
+    compositions = list(compositions)
+    zs = sorted(set(z for composition in compositions for z in composition))
+    indexes = dict((z, i) for i, z in enumerate(zs))
+
+    wfs = np.zeros((len(compositions), len(zs)))
+    for row, composition in enumerate(compositions):
+        for z, wf in composition.items():
+            wfs[row, indexes[z]] = wf
+
+    return np.array(zs, dtype=int), wfs
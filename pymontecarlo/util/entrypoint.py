@@ -1,29 +1,276 @@
-""""""
+"""
+Registry of the entry points of the installed distributions.
+
+The entry points (group, name and target) are read from the metadata of the
+installed distributions, using :mod:`importlib.metadata` (or its backport,
+or :mod:`pkg_resources` as last resort).
+Since scanning all distributions is slow, the entries are saved in a cache
+file in the configuration directory. The cache is invalidated when the
+metadata of a distribution on the :data:`sys.path` changes.
+The target of each entry point is only imported when it is first needed.
+All functions can be called from any thread.
+"""
 
 # Standard library modules.
+import os
+import sys
+import json
+import hashlib
+import importlib
 import threading
+import collections
+import logging
+logger = logging.getLogger(__name__)
 
 # Third party modules.
-from pkg_resources import iter_entry_points
 
 # Local modules.
+from pymontecarlo.util.path import get_config_dir
 
 # Globals and constants variables.
-_ENTRYPOINTS = {}
 
-def resolve_entrypoints(group):
+CACHE_FILENAME = 'entrypoints.json'
+CACHE_VERSION = 1
+
+METADATA_EXTENSIONS = ('.dist-info', '.egg-info')
+
+_lock = threading.RLock()
+_generation = 0
+_installed_entries = None # key: group, value: list of (name, target)
+_added_entries = collections.OrderedDict() # key: group, value: OrderedDict of name: target
+_resolved_targets = {} # key: target, value: object
+_resolved_groups = {} # key: group, value: tuple of objects
+
+def _iter_entry_points_filepaths():
+    for dirpath in sys.path:
+        try:
+            entries = list(os.scandir(dirpath or os.curdir))
+        except OSError:
+            continue
+
+        for entry in entries:
+            if entry.name.endswith(METADATA_EXTENSIONS):
+                yield os.path.join(entry.path, 'entry_points.txt')
+            elif entry.name.endswith('.egg'):
+                yield os.path.join(entry.path, 'EGG-INFO', 'entry_points.txt')
+
+def calculate_environment_key():
     """
-    Returns a dictionary where the keys are the entry point's name and
-    the values are the entry point's class.
+    Returns a key identifying the entry points of the installed distributions.
+    The key changes when the interpreter, the :data:`sys.path`, or the
+    entry points of a distribution change.
     """
-    if group in _ENTRYPOINTS:
-        return _ENTRYPOINTS[group]
+    sha = hashlib.sha1()
+    sha.update(sys.executable.encode('utf8'))
+    sha.update(sys.version.encode('utf8'))
+
+    for filepath in _iter_entry_points_filepaths():
+        try:
+            mtime_ns = os.stat(filepath).st_mtime_ns
+        except OSError:
+            mtime_ns = 0
+        sha.update('{}:{}'.format(filepath, mtime_ns).encode('utf8'))
+
+    return sha.hexdigest()
+
+def _scan_importlib_metadata(metadata):
+    entries = collections.OrderedDict()
+    distribution_names = set()
+
+    for distribution in metadata.distributions():
+        # The same distribution may be found in several directories
+        name = (distribution.metadata['Name'] or '').lower()
+        if name in distribution_names:
+            continue
+        distribution_names.add(name)
+
+        for entry_point in distribution.entry_points:
+            entries.setdefault(entry_point.group, []) \
+                .append((entry_point.name, entry_point.value))
+
+    return entries
+
+def _scan_pkg_resources():
+    import pkg_resources
+
+    entries = collections.OrderedDict()
+
+    for distribution in pkg_resources.working_set:
+        for group, entry_map in distribution.get_entry_map().items():
+            for entry_point in entry_map.values():
+                target = entry_point.module_name
+                if entry_point.attrs:
+                    target += ':' + '.'.join(entry_point.attrs)
+                entries.setdefault(group, []).append((entry_point.name, target))
+
+    return entries
+
+def scan_entrypoints():
+    """
+    Returns the entry points of the installed distributions, as a
+    :class:`dict` where the keys are groups and the values, :class:`list`
+    of name and target (e.g. ``package.module:Class``).
+    """
+    try:
+        import importlib.metadata as metadata
+    except ImportError: # Python < 3.8
+        try:
+            import importlib_metadata as metadata
+        except ImportError:
+            metadata = None
+
+    if metadata is not None:
+        return _scan_importlib_metadata(metadata)
+    else:
+        return _scan_pkg_resources()
+
+def _get_cache_filepath():
+    return os.path.join(get_config_dir(), CACHE_FILENAME)
+
+def _read_cache(filepath, key):
+    try:
+        with open(filepath, 'r') as fp:
+            data = json.load(fp)
+    except (OSError, ValueError):
+        return None
+
+    if data.get('version') != CACHE_VERSION or data.get('key') != key:
+        return None
+
+    return collections.OrderedDict((group, [tuple(entry) for entry in entries])
+                                   for group, entries in data['entrypoints'])
+
+def _write_cache(filepath, key, entries):
+    data = {'version': CACHE_VERSION,
+            'key': key,
+            'entrypoints': list(entries.items())}
+
+    tmpfilepath = '{}.{}.tmp'.format(filepath, os.getpid())
+    try:
+        with open(tmpfilepath, 'w') as fp:
+            json.dump(data, fp)
+        os.replace(tmpfilepath, filepath)
+    except OSError:
+        logger.debug('Could not write entry points cache: {}'.format(filepath))
+
+def _load_installed_entries():
+    global _installed_entries
+
+    with _lock:
+        if _installed_entries is not None:
+            return _installed_entries
+
+        key = calculate_environment_key()
+        try:
+            filepath = _get_cache_filepath()
+        except OSError:
+            filepath = None
+
+        entries = None
+        if filepath is not None:
+            entries = _read_cache(filepath, key)
 
-    # NOTE: This is an important check. If the entry points are resolved in
-    # another thread than the main one, the import hangs
-    if threading.current_thread() != threading.main_thread():
-        raise RuntimeError('Handler must be initialized in main thread')
+        if entries is None:
+            entries = scan_entrypoints()
+            if filepath is not None:
+                _write_cache(filepath, key, entries)
 
-    entrypoints = tuple(ep.resolve() for ep in iter_entry_points(group))
-    _ENTRYPOINTS[group] = entrypoints
-    return entrypoints
+        _installed_entries = entries
+        return entries
+
+def get_entrypoints(group):
+    """
+    Returns a :class:`tuple` of the name and target of the entry points
+    of a group, without importing them.
+    """
+    entries = _load_installed_entries().get(group, [])
+
+    with _lock:
+        added = _added_entries.get(group, {})
+        entries = [(name, target) for name, target in entries if name not in added]
+        entries.extend(added.items())
+
+    return tuple(entries)
+
+def add_entrypoint(group, name, target):
+    """
+    Adds (or replaces) an entry point which is not defined by an installed
+    distribution, e.g. for testing.
+
+    :arg group: group of the entry point
+    :arg name: name of the entry point
+    :arg target: object, as ``package.module:attribute``
+    """
+    global _generation
+
+    with _lock:
+        _added_entries.setdefault(group, collections.OrderedDict())[name] = target
+        _resolved_groups.pop(group, None)
+        _generation += 1
+
+def reset():
+    """
+    Forgets the entry points of the installed distributions and the
+    resolved objects. The entry points are scanned again when next needed.
+    Entry points added with :func:`add_entrypoint` are kept.
+    """
+    global _installed_entries, _generation
+
+    with _lock:
+        _installed_entries = None
+        _resolved_targets.clear()
+        _resolved_groups.clear()
+        _generation += 1
+
+def resolve_target(target):
+    """
+    Imports and returns the object of an entry point's target
+    (e.g. ``package.module:Class``).
+    """
+    try:
+        return _resolved_targets[target]
+    except KeyError:
+        pass
+
+    # NOTE: The import is done without holding the lock, since the imported
+    # module may itself look up entry points in another thread
+    modulename, _, attrs = target.partition(':')
+    obj = importlib.import_module(modulename.strip())
+
+    attrs = attrs.split('[', 1)[0].strip() # Remove extras
+    if attrs:
+        for attr in attrs.split('.'):
+            obj = getattr(obj, attr)
+
+    with _lock:
+        return _resolved_targets.setdefault(target, obj)
+
+def iter_entrypoints(group):
+    """
+    Yields the objects of the entry points of a group.
+    Each object is only imported when it is reached.
+    """
+    with _lock:
+        generation = _generation
+        objs = _resolved_groups.get(group)
+
+    if objs is not None:
+        yield from objs
+        return
+
+    objs = []
+    for _name, target in get_entrypoints(group):
+        obj = resolve_target(target)
+        objs.append(obj)
+        yield obj
+
+    with _lock:
+        if generation == _generation:
+            _resolved_groups[group] = tuple(objs)
+
+def resolve_entrypoints(group):
+    """
+    Returns a :class:`tuple` with the objects (usually classes) of
+    the entry points of a group.
+    """
+    return tuple(iter_entrypoints(group))
@@ -2,12 +2,16 @@
 
 # Standard library modules.
 import concurrent.futures
+import heapq
+import itertools
+import threading
 
 # Third party modules.
 
 # Local modules.
 from pymontecarlo.util.cbook import Monitorable
 from pymontecarlo.util.signal import Signal
+from pymontecarlo.util.human import human_time
 
 # Globals and constants variables.
 
@@ -17,18 +21,69 @@ class Token:
         self._progress = 0.0
         self._status = 'Not started'
         self._cancelled = False
+        self._timeout_reason = None
+        self._cpu_time_s = 0.0
+        self._peak_rss_bytes = 0
+        self._elapsed_s = None
 
     def cancel(self):
         self._cancelled = True
         self.update(1.0, 'Cancelled')
 
     def cancelled(self):
-        return self._cancelled
+        """
+        Returns whether the task was cancelled or timed out.
+        In both cases, the task should stop as soon as possible.
+        """
+        return self._cancelled or self.timed_out()
+
+    def timeout(self, reason):
+        """
+        Requests the task to stop because it exceeded a time limit.
+        """
+        self._timeout_reason = reason
+        self._status = reason
+
+    def timed_out(self):
+        return self._timeout_reason is not None
+
+    def reset_timeout(self):
+        """
+        Clears the timeout, before the task is retried.
+        """
+        self._timeout_reason = None
+        self._cpu_time_s = 0.0
+        self._peak_rss_bytes = 0
+        self._elapsed_s = None
+        self.update(0.0, 'Retrying')
+
+    @property
+    def timeout_reason(self):
+        return self._timeout_reason
 
     def update(self, progress, status):
         self._progress = progress
         self._status = status
 
+    def update_usage(self, cpu_time_s, rss_bytes):
+        """
+        Updates the resources used by the task outside of its thread
+        (e.g. in subprocesses).
+
+        :arg cpu_time_s: total CPU time used so far
+        :arg rss_bytes: current resident memory
+        """
+        self._cpu_time_s = cpu_time_s
+        self._peak_rss_bytes = max(self._peak_rss_bytes, rss_bytes)
+
+    def update_elapsed(self, elapsed_s):
+        """
+        Sets the wall time of the task, when it was measured where the task
+        actually ran (e.g. by a remote worker), instead of the time spent
+        waiting for it.
+        """
+        self._elapsed_s = elapsed_s
+
     @property
     def progress(self):
         return self._progress
@@ -37,6 +92,21 @@ class Token:
     def status(self):
         return self._status
 
+    @property
+    def cpu_time_s(self):
+        return self._cpu_time_s
+
+    @property
+    def peak_rss_bytes(self):
+        return self._peak_rss_bytes
+
+    @property
+    def elapsed_s(self):
+        """
+        Wall time set by :meth:`update_elapsed`, or ``None``.
+        """
+        return self._elapsed_s
+
 class FutureAdapter(Monitorable):
 
     def __init__(self, future, token, args, kwargs):
@@ -50,7 +120,8 @@ class FutureAdapter(Monitorable):
 
     def cancelled(self):
         # NOTE: future cancel always returns False
-        return self.token.cancelled()
+        # NOTE: A timed out future failed, it is not cancelled
+        return self.token.cancelled() and not self.token.timed_out()
 
     def cancel(self):
         # NOTE: future cancel always returns False
@@ -93,6 +164,16 @@ class FutureExecutor(Monitorable):
         self.cancelled_count = 0
         self.submitted_count = 0
         self.done_count = 0
+        self._processed_count = 0
+
+        # Queue of submissions waiting for a free worker
+        self._queue = []
+        self._queue_lock = threading.RLock()
+        self._queue_condition = threading.Condition(self._queue_lock)
+        self._queue_counter = itertools.count()
+
+        # Notified each time a submission is completed
+        self._done_condition = threading.Condition()
 
     def __enter__(self):
         self.start()
@@ -118,6 +199,34 @@ class FutureExecutor(Monitorable):
         self.done_count += 1
         return future.result()
 
+    def _handle_done(self, future):
+        # NOTE: Submissions are only completed once processed by _on_done
+        try:
+            self._on_done(future)
+        finally:
+            with self._done_condition:
+                self._processed_count += 1
+                self._done_condition.notify_all()
+
+    def _wait_in_flight(self, max_count, timeout=None):
+        """
+        Waits until at most *max_count* submissions are not completed.
+        Returns ``True`` if the condition was met before *timeout*.
+        """
+        with self._done_condition:
+            return self._done_condition.wait_for(
+                lambda: self.in_flight_count <= max_count, timeout)
+
+    def _prune_futures(self):
+        """
+        Removes the completed futures from :attr:`futures`, so that 
+        the memory does not grow with the number of submissions.
+        Failed futures are kept in :attr:`failed_futures`.
+        """
+        for future in list(self.futures):
+            if future.done():
+                self.futures.discard(future)
+
     def start(self):
         if self.executor is not None:
             return
@@ -127,7 +236,7 @@ class FutureExecutor(Monitorable):
         """
         Cancels all not completed futures.
         """
-        for future in self.futures:
+        for future in list(self.futures):
             if not future.done():
                 future.cancel()
 
@@ -143,10 +252,119 @@ class FutureExecutor(Monitorable):
         Otherwise waits for *timeout* and returns ``True`` if all submissions
         were executed, ``False`` otherwise.
         """
-        fs = [future.future for future in self.futures]
+        fs = [future.future for future in list(self.futures)]
         _done, notdone = \
             concurrent.futures.wait(fs, timeout, concurrent.futures.ALL_COMPLETED)
-        return not notdone
+        if notdone:
+            return False
+
+        # Wait until the completed submissions are processed
+        return self._wait_in_flight(0, timeout)
+
+    def _acquire(self, args, kwargs):
+        """
+        Returns whether the queued submission with the specified arguments
+        can start now, in which case the resources it needs are reserved
+        until :meth:`_release` is called.
+        Derived classes can override this method to limit the submissions
+        running concurrently (e.g. per type of submission).
+        """
+        return True
+
+    def _release(self, args, kwargs):
+        """
+        Releases the resources reserved by :meth:`_acquire`.
+        """
+        pass
+
+    def _iter_queue_indexes(self):
+        """
+        Yields the indexes of the queued submissions, from the lowest
+        priority, without sorting the whole queue.
+        The queue must not be modified while iterating.
+        """
+        queue = self._queue
+        if not queue:
+            return
+
+        # Heap of the candidates, ordered by priority and submission order
+        candidates = [(queue[0][:2], 0)]
+        while candidates:
+            _key, index = heapq.heappop(candidates)
+            yield index
+
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(queue):
+                    heapq.heappush(candidates, (queue[child][:2], child))
+
+    def _remove_queued(self, index):
+        if index == 0:
+            return heapq.heappop(self._queue)
+
+        item = self._queue[index]
+        last = self._queue.pop()
+        if index < len(self._queue):
+            self._queue[index] = last
+            heapq.heapify(self._queue)
+        return item
+
+    def _pop_next(self):
+        """
+        Removes from the queue and returns the submission with the lowest 
+        priority that can start, and the exception raised by 
+        :meth:`_acquire` for this submission, if any.
+        Returns ``(None, None)`` if no submission can start.
+        """
+        for index in self._iter_queue_indexes():
+            args, kwargs = self._queue[index][5:]
+
+            try:
+                acquired = self._acquire(args, kwargs)
+            except Exception as exc:
+                return self._remove_queued(index), exc
+
+            if acquired:
+                return self._remove_queued(index), None
+
+        return None, None
+
+    def _run_next(self):
+        """
+        Runs the queued submission with the lowest priority that can start.
+        One call to this method is scheduled on the executor per submission.
+        If no submission can start, waits until one is completed or a new
+        submission is queued.
+        """
+        with self._queue_condition:
+            while True:
+                item, exc = self._pop_next()
+                if item is not None:
+                    break
+                self._queue_condition.wait()
+
+        _priority, _count, future, token, target, args, kwargs = item
+
+        # No resources were reserved, the submission fails without running
+        if exc is not None:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(exc)
+            return
+
+        try:
+            if not future.set_running_or_notify_cancel():
+                return
+
+            try:
+                result = target(token, *args, **kwargs)
+            except BaseException as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+        finally:
+            with self._queue_condition:
+                self._release(args, kwargs)
+                self._queue_condition.notify_all()
 
     def _submit(self, target, *args, **kwargs):
         """
@@ -167,17 +385,61 @@ class FutureExecutor(Monitorable):
         
         :return: a :class:`Future` object
         """
+        return self._submit_with_priority((), target, *args, **kwargs)
+
+    def _submit_with_priority(self, priority, target, *args, **kwargs):
+        """
+        Same as :meth:`_submit`, but the submission is queued with the 
+        specified *priority*.
+        When a worker becomes available, the queued submission with the 
+        lowest priority is executed first.
+        Submissions with the same priority are executed in submission order.
+        
+        :arg priority: :class:`tuple` used to order the submissions
+        
+        :return: a :class:`Future` object
+        """
+        if self.executor is None:
+            raise RuntimeError('Executor is not started')
+
+        token = Token()
+        future = concurrent.futures.Future()
+
+        with self._queue_condition:
+            item = (priority, next(self._queue_counter),
+                    future, token, target, args, kwargs)
+            heapq.heappush(self._queue, item)
+            self._queue_condition.notify_all()
+
+        self.executor.submit(self._run_next)
+
+        return self._add_future(future, token, args, kwargs)
+
+    def _submit_result(self, result, *args, **kwargs):
+        """
+        Same as :meth:`_submit`, but for a submission whose *result* is 
+        already known (e.g. from a cache). 
+        The submission is not queued and is completed immediately.
+        
+        :return: a completed :class:`Future` object
+        """
         if self.executor is None:
             raise RuntimeError('Executor is not started')
 
         token = Token()
-        future = self.executor.submit(target, token, *args, **kwargs)
+        future = concurrent.futures.Future()
+        future.set_running_or_notify_cancel()
+        future.set_result(result)
 
+        return self._add_future(future, token, args, kwargs)
+
+    def _add_future(self, future, token, args, kwargs):
         future2 = FutureAdapter(future, token, args, kwargs)
-        future2.add_done_callback(self._on_done)
         self.futures.add(future2)
-
         self.submitted_count += 1
+
+        # NOTE: Callback is called immediately if the future is completed
+        future2.add_done_callback(self._handle_done)
         self.submitted.send(future2)
 
         return future2
@@ -186,20 +448,86 @@ class FutureExecutor(Monitorable):
         """
         Returns whether the executor is running and can accept submission.
         """
-        return any(future.running() for future in self.futures)
+        return any(future.running() for future in list(self.futures))
 
     def done(self):
-        return all(future.done() for future in self.futures)
+        return all(future.done() for future in list(self.futures))
 
     def cancelled(self):
         return False
 
+    def _estimate_duration_s(self, future):
+        """
+        Returns the estimated duration of a submission in seconds,
+        or ``None`` if it cannot be estimated.
+        Derived classes can override this method to weight the progress
+        by the duration of each submission and to report an estimated time
+        of completion.
+        """
+        return None
+
+    def _estimate_durations_s(self):
+        futures = list(self.futures)
+        if not futures:
+            return None
+
+        # Completed futures were pruned
+        if len(futures) < self.submitted_count:
+            return None
+
+        durations_s = []
+        for future in futures:
+            duration_s = self._estimate_duration_s(future)
+            if duration_s is None:
+                return None
+            durations_s.append((future, duration_s))
+
+        return durations_s
+
+    def estimate_remaining_s(self):
+        """
+        Returns the estimated time in seconds before all submissions are
+        completed, or ``None`` if the duration of a submission is unknown.
+        """
+        durations_s = self._estimate_durations_s()
+        if durations_s is None:
+            return None
+
+        remainings_s = [duration_s * (1.0 - future.progress)
+                        for future, duration_s in durations_s
+                        if not future.done()]
+        if not remainings_s:
+            return 0.0
+
+        return max(sum(remainings_s) / self.max_workers, max(remainings_s))
+
+    @property
+    def in_flight_count(self):
+        """
+        Number of submissions queued or running.
+        """
+        return self.submitted_count - self._processed_count
+
     @property
     def progress(self):
         if self.submitted_count == 0:
             return 0
+
+        durations_s = self._estimate_durations_s()
+        if durations_s is not None:
+            total_s = sum(duration_s for _future, duration_s in durations_s)
+            if total_s > 0.0:
+                completed_s = sum(duration_s * (1.0 if future.done() else future.progress)
+                                  for future, duration_s in durations_s)
+                return completed_s / total_s
+
         return (self.done_count + self.failed_count + self.cancelled_count) / self.submitted_count
 
     @property
     def status(self):
-        return ''
+        remaining_s = self.estimate_remaining_s()
+        if remaining_s is None or self.done():
+            return ''
+        if remaining_s < 1.0:
+            return 'Less than 1 sec remaining'
+        return 'About {} remaining'.format(human_time(remaining_s))
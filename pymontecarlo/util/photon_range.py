@@ -3,14 +3,28 @@ Estimate of electron range
 """
 
 # Standard library modules.
+import functools
 
 # Third party modules.
+import numpy as np
 import pyxray
 
 # Local modules.
 
 # Globals and constants variables.
 
+@functools.lru_cache(maxsize=None)
+def _get_energy_eV(xrayline, reference):
+    if xrayline.is_xray_transitionset():
+        return pyxray.xray_transitionset_energy_eV(*xrayline, reference=reference)
+    else:
+        return pyxray.xray_transition_energy_eV(*xrayline, reference=reference)
+
+def _get_coefficients(z):
+    ck = 43.04 + 1.5 * z + 5.4e-3 * z ** 2
+    cn = 1.755 - 7.4e-3 * z + 3.0e-5 * z ** 2
+    return ck, cn
+
 def photon_range(e0, material, xrayline, reference=None):
     """
     This function returns the generated photon range in *material* at
@@ -32,18 +46,42 @@ def photon_range(e0, material, xrayline, reference=None):
     if z not in material.composition:
         raise ValueError('{} is not in material'.format(xrayline))
 
-    if xrayline.is_xray_transitionset():
-        energy_eV = pyxray.xray_transitionset_energy_eV(*xrayline, reference=reference)
-    else:
-        energy_eV = pyxray.xray_transition_energy_eV(*xrayline, reference=reference)
+    energy_eV = _get_energy_eV(xrayline, reference)
     if energy_eV > e0:
         return 0.0
 
-    ck = 43.04 + 1.5 * z + 5.4e-3 * z ** 2
-    cn = 1.755 - 7.4e-3 * z + 3.0e-5 * z ** 2
+    ck, cn = _get_coefficients(z)
     density = material.density_g_per_cm3
 
     e0 = e0 / 1e3
     ec = energy_eV / 1e3
 
     return ck / density * (e0 ** cn - ec ** cn) * 1e-9
+
+def photon_range_array(energies, materials, xrayline, reference=None):
+    """
+    Returns the generated photon ranges (in meters) in many materials at
+    many incident electron energies, as a :class:`numpy.ndarray` of shape
+    (number of materials, ) + shape of *energies*.
+    Same as :func:`photon_range`.
+
+    :arg energies: incident electron energies (in eV)
+    :arg materials: iterable of materials, all containing the element of
+        the x-ray line
+    :arg xrayline: x-ray line
+    """
+    materials = list(materials)
+    z = xrayline.atomic_number
+    for material in materials:
+        if z not in material.composition:
+            raise ValueError('{} is not in material {}'.format(xrayline, material))
+
+    energy_eV = _get_energy_eV(xrayline, reference)
+    ck, cn = _get_coefficients(z)
+    densities = np.array([material.density_g_per_cm3 for material in materials])
+
+    e0s = np.asarray(energies, dtype=float)
+    ranges = ck / densities.reshape((-1,) + (1,) * e0s.ndim) * \
+        ((e0s / 1e3) ** cn - (energy_eV / 1e3) ** cn) * 1e-9
+
+    return np.where(e0s < energy_eV, 0.0, ranges)
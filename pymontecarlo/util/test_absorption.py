@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+
+from pymontecarlo.util.absorption import bragg_pierce, mass_absorption_coefficient
+
+# Globals and constants variables.
+
+class TestModule(TestCase):
+
+    def testbragg_pierce(self):
+        # Tabulated: 52.9 cm2/g (Cu Ka in Cu), 208 cm2/g (Cu Ka in Au)
+        self.assertAlmostEqual(52.9, bragg_pierce(29, 8048.0), delta=52.9 * 0.3)
+        self.assertAlmostEqual(208.0, bragg_pierce(79, 8048.0), delta=208.0 * 0.3)
+
+        # Absorption edge
+        self.assertGreater(bragg_pierce(29, 9000.0), bragg_pierce(29, 8900.0))
+
+    def testmass_absorption_coefficient(self):
+        composition = {29: 0.5, 79: 0.5}
+        expected = 0.5 * bragg_pierce(29, 8048.0) + 0.5 * bragg_pierce(79, 8048.0)
+        self.assertAlmostEqual(expected, mass_absorption_coefficient(composition, 8048.0), 8)
+
+if __name__ == '__main__': #pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
@@ -6,11 +6,13 @@ import unittest
 import logging
 
 # Third party modules.
+import numpy as np
+import pyxray
 
 # Local modules.
 from pymontecarlo.testcase import TestCase
 
-from pymontecarlo.util.electron_range import kanaya_okayama
+from pymontecarlo.util.electron_range import kanaya_okayama, kanaya_okayama_array
 
 # Globals and constants variables.
 
@@ -26,6 +28,22 @@ class TestModule(TestCase):
         self.assertAlmostEqual(1.45504, kanaya_okayama(self.comp1, 20e3) * 1e6, 4)
         self.assertAlmostEqual(1.61829, kanaya_okayama(self.comp2, 20e3) * 1e6, 4)
 
+    def testkanaya_okayama_array(self):
+        energies = np.array([5e3, 10e3, 20e3])
+        actual = kanaya_okayama_array([self.comp1, self.comp2], energies)
+        self.assertEqual((2, 3), actual.shape)
+
+        for i, composition in enumerate([self.comp1, self.comp2]):
+            for j, energy in enumerate(energies):
+                self.assertAlmostEqual(kanaya_okayama(composition, energy) * 1e6,
+                                       actual[i, j] * 1e6, 10)
+
+    def testkanaya_okayama_no_density(self):
+        # No density for astatine
+        self.assertRaises(pyxray.NotFound, kanaya_okayama, {85: 1.0}, 20e3)
+        self.assertRaises(pyxray.NotFound, kanaya_okayama_array,
+                          [self.comp1, {85: 1.0}], [20e3])
+
 if __name__ == '__main__': #pragma: no cover
     logging.getLogger().setLevel(logging.DEBUG)
     unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+
+# Third party modules.
+import numpy as np
+import pyxray
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+from pymontecarlo.util.element_data import \
+    (MAX_Z, preload, atomic_weights, mass_densities_g_per_cm3, symbols, names,
+     atomic_numbers, atomic_weight, mass_density_g_per_cm3,
+     mass_density_kg_per_m3, atomic_number, to_weight_fraction_matrix)
+
+# Globals and constants variables.
+
+class TestModule(TestCase):
+
+    def testatomic_weights(self):
+        values = atomic_weights()
+        self.assertEqual(MAX_Z + 1, len(values))
+        self.assertTrue(np.isnan(values[0]))
+        self.assertAlmostEqual(pyxray.element_atomic_weight(29), values[29], 8)
+        self.assertIs(values, atomic_weights())
+        self.assertFalse(values.flags.writeable)
+
+    def testmass_densities_g_per_cm3(self):
+        values = mass_densities_g_per_cm3()
+        self.assertEqual(MAX_Z + 1, len(values))
+        self.assertAlmostEqual(pyxray.element_mass_density_g_per_cm3(29), values[29], 8)
+
+    def testatomic_weight(self):
+        self.assertAlmostEqual(pyxray.element_atomic_weight(79), atomic_weight(79), 8)
+        self.assertRaises(pyxray.NotFound, atomic_weight, 118)
+
+    def testmass_density_g_per_cm3(self):
+        self.assertAlmostEqual(pyxray.element_mass_density_g_per_cm3(79),
+                               mass_density_g_per_cm3(79), 8)
+        self.assertRaises(pyxray.NotFound, mass_density_g_per_cm3, 85)
+
+    def testatomic_weight_array(self):
+        values = atomic_weight(np.array([6, 29]))
+        self.assertEqual((2,), values.shape)
+        self.assertAlmostEqual(pyxray.element_atomic_weight(29), values[1], 8)
+        self.assertRaises(pyxray.NotFound, atomic_weight, np.array([29, 118]))
+
+    def testmass_density_kg_per_m3(self):
+        self.assertAlmostEqual(pyxray.element_mass_density_kg_per_m3(29),
+                               mass_density_kg_per_m3(29), 8)
+
+    def testsymbols(self):
+        values = symbols()
+        self.assertEqual(MAX_Z + 1, len(values))
+        self.assertEqual('Cu', values[29])
+        self.assertEqual('', values[0])
+
+    def testnames(self):
+        self.assertEqual('Copper', names()[29])
+
+    def testatomic_number(self):
+        self.assertEqual(29, atomic_number('Cu'))
+        self.assertEqual(MAX_Z, len(atomic_numbers()))
+        self.assertRaises(pyxray.NotFound, atomic_number, 'Aq')
+
+    def testpreload(self):
+        preload()
+        self.assertIs(symbols(), symbols())
+
+    def testto_weight_fraction_matrix(self):
+        zs, wfs = to_weight_fraction_matrix([{29: 1.0}, {30: 0.4, 29: 0.6}])
+        self.assertEqual([29, 30], zs.tolist())
+        np.testing.assert_allclose([[1.0, 0.0], [0.6, 0.4]], wfs)
+
+if __name__ == '__main__': #pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+import os
+import threading
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+from pymontecarlo.mock import ProgramMock, ProgramHDF5HandlerMock
+from pymontecarlo.formats.hdf5.base import ENTRYPOINT_HDF5HANDLER
+import pymontecarlo.util.entrypoint as entrypoint
+
+# Globals and constants variables.
+
+GROUP = 'pymontecarlo.test'
+
+class TestModule(TestCase):
+
+    def tearDown(self):
+        super().tearDown()
+        entrypoint._added_entries.pop(GROUP, None)
+        entrypoint._resolved_groups.pop(GROUP, None)
+
+    def testresolve_entrypoints(self):
+        self.assertIn(ProgramMock, entrypoint.resolve_entrypoints('pymontecarlo.program'))
+        self.assertIn(ProgramHDF5HandlerMock, entrypoint.resolve_entrypoints(ENTRYPOINT_HDF5HANDLER))
+        self.assertEqual((), entrypoint.resolve_entrypoints('pymontecarlo.unknown'))
+
+    def testresolve_entrypoints_thread(self):
+        entrypoint.reset()
+        entrypoint.add_entrypoint(GROUP, 'mock', 'pymontecarlo.mock:ProgramMock')
+
+        results = []
+        thread = threading.Thread(target=lambda: results.append(entrypoint.resolve_entrypoints(GROUP)))
+        thread.start()
+        thread.join()
+
+        self.assertEqual([(ProgramMock,)], results)
+
+    def testadd_entrypoint(self):
+        entrypoint.add_entrypoint(GROUP, 'mock', 'pymontecarlo.mock:ProgramMock')
+        self.assertEqual((ProgramMock,), entrypoint.resolve_entrypoints(GROUP))
+
+        entrypoint.add_entrypoint(GROUP, 'mock', 'pymontecarlo.mock:ProgramHDF5HandlerMock')
+        self.assertEqual((('mock', 'pymontecarlo.mock:ProgramHDF5HandlerMock'),),
+                         entrypoint.get_entrypoints(GROUP))
+        self.assertEqual((ProgramHDF5HandlerMock,), entrypoint.resolve_entrypoints(GROUP))
+
+    def testiter_entrypoints_lazy(self):
+        entrypoint.add_entrypoint(GROUP, 'mock', 'pymontecarlo.mock:ProgramMock')
+        entrypoint.add_entrypoint(GROUP, 'missing', 'pymontecarlo.missing:Missing')
+
+        iterator = entrypoint.iter_entrypoints(GROUP)
+        self.assertIs(ProgramMock, next(iterator))
+        self.assertRaises(ImportError, next, iterator)
+
+    def testresolve_target(self):
+        self.assertIs(os.path.join, entrypoint.resolve_target('os:path.join'))
+        self.assertIs(os, entrypoint.resolve_target('os'))
+        self.assertIs(ProgramMock, entrypoint.resolve_target('pymontecarlo.mock:ProgramMock [extra]'))
+
+    def testscan_entrypoints(self):
+        entries = entrypoint.scan_entrypoints()
+        self.assertIn(ENTRYPOINT_HDF5HANDLER, entries)
+
+    def testcalculate_environment_key(self):
+        self.assertEqual(entrypoint.calculate_environment_key(),
+                         entrypoint.calculate_environment_key())
+
+    def testcache(self):
+        filepath = os.path.join(self.create_temp_dir(), entrypoint.CACHE_FILENAME)
+        entries = {GROUP: [('mock', 'pymontecarlo.mock:ProgramMock')]}
+
+        entrypoint._write_cache(filepath, 'abc', entries)
+        self.assertEqual(entries, entrypoint._read_cache(filepath, 'abc'))
+        self.assertIsNone(entrypoint._read_cache(filepath, 'def'))
+        self.assertIsNone(entrypoint._read_cache(filepath + '.missing', 'abc'))
+
+if __name__ == '__main__': #pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
@@ -6,10 +6,11 @@ import unittest
 import logging
 
 # Third party modules.
+import numpy as np
 
 # Local modules.
 from pymontecarlo.testcase import TestCase
-from pymontecarlo.util.photon_range import photon_range
+from pymontecarlo.util.photon_range import photon_range, photon_range_array
 from pymontecarlo.util.xrayline import XrayLine
 from pymontecarlo.options.material import Material
 
@@ -24,6 +25,26 @@ class TestModule(TestCase):
         actual = photon_range(20e3, material, xrayline, reference='perkins1991')
         self.assertAlmostEqual(8.42816e-7, actual, 10)
 
+    def testphoton_range_array(self):
+        materials = [Material.pure(29), Material.from_formula('CuZn')]
+        xrayline = XrayLine(29, 'Ka1')
+        energies = np.array([5e3, 10e3, 20e3])
+
+        actual = photon_range_array(energies, materials, xrayline)
+        self.assertEqual((2, 3), actual.shape)
+
+        for i, material in enumerate(materials):
+            for j, energy in enumerate(energies):
+                expected = photon_range(energy, material, xrayline)
+                self.assertAlmostEqual(expected * 1e6, actual[i, j] * 1e6, 10)
+
+        self.assertAlmostEqual(0.0, actual[0, 0], 10)
+
+    def testphoton_range_array_missing_element(self):
+        materials = [Material.pure(29), Material.pure(30)]
+        xrayline = XrayLine(29, 'Ka1')
+        self.assertRaises(ValueError, photon_range_array, [20e3], materials, xrayline)
+
 if __name__ == '__main__': #pragma: no cover
     logging.getLogger().setLevel(logging.DEBUG)
     unittest.main()
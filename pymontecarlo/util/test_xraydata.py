@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+""" """
+
+# Standard library modules.
+import unittest
+import logging
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.testcase import TestCase
+
+from pymontecarlo.util.xraydata import get_xrayline_data, iter_xrayline_data
+
+# Globals and constants variables.
+
+class TestModule(TestCase):
+
+    def testget_xrayline_data(self):
+        data = get_xrayline_data(29, 'Ka1')
+        self.assertEqual(29, data['z'])
+        self.assertEqual('K', data['shell'])
+        self.assertAlmostEqual(8.98, data['edge_keV'], delta=0.05)
+        self.assertAlmostEqual(8.048, data['energy_keV'], 2)
+        self.assertGreater(data['probability'], 0.0)
+        self.assertAlmostEqual(63.546, data['atomic_weight'], 2)
+
+    def testget_xrayline_data_notfound(self):
+        self.assertIsNone(get_xrayline_data(1, 'Ka1'))
+
+    def testiter_xrayline_data(self):
+        transitions = [data['transition'] for data in iter_xrayline_data([29], 5.0)]
+        self.assertNotIn('Ka1', transitions)
+        self.assertIn('La1', transitions)
+
+        transitions = [data['transition'] for data in iter_xrayline_data([29], 15.0)]
+        self.assertIn('Ka1', transitions)
+
+if __name__ == '__main__': #pragma: no cover
+    logging.getLogger().setLevel(logging.DEBUG)
+    unittest.main()
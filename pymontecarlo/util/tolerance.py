@@ -11,3 +11,12 @@ import math
 
 def tolerance_to_decimals(tolerance):
     return math.ceil(abs(math.log10(tolerance)))
+
+def round_to_tolerance(value, tolerance):
+    """
+    Returns the multiple of *tolerance* closest to *value* as an :class:`int`.
+    Non-finite values (e.g. infinity) are returned unchanged.
+    """
+    if not math.isfinite(value):
+        return value
+    return int(round(value / tolerance))
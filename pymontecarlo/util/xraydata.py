@@ -0,0 +1,64 @@
+"""
+Data of the x-ray lines calculated by the programs.
+"""
+
+# Standard library modules.
+import functools
+
+# Third party modules.
+import pyxray
+
+# Local modules.
+from pymontecarlo.util.element_data import atomic_weight
+
+# Globals and constants variables.
+
+# Transitions calculated for each element, if their shell can be ionized
+TRANSITIONS = ['Ka1', 'Ka2', 'Kb1', 'La1', 'La2', 'Lb1', 'Lb2', 'Ma1', 'Ma2']
+
+@functools.lru_cache(maxsize=None)
+def get_xrayline_data(z, transition):
+    """
+    Returns the data of a transition of an element as a :class:`dict`,
+    or ``None`` if the transition does not exist.
+    The returned :class:`dict` is cached and should not be modified.
+
+    :arg z: atomic number
+    :arg transition: name of the transition (e.g. ``Ka1``)
+    """
+    try:
+        xraytransition = pyxray.xray_transition(transition)
+        subshell = xraytransition.destination_subshell
+        edge_keV = pyxray.atomic_subshell_binding_energy_eV(z, subshell) / 1e3
+        occupancy = pyxray.atomic_subshell_occupancy(z, subshell)
+        energy_keV = pyxray.xray_transition_energy_eV(z, transition) / 1e3
+        probability = pyxray.xray_transition_probability(z, transition)
+    except pyxray.NotFound:
+        return None
+
+    if probability <= 0.0:
+        return None
+
+    return {'z': z,
+            'transition': transition,
+            'shell': 'KLMN'[min(subshell.n, 4) - 1],
+            'edge_keV': edge_keV,
+            'energy_keV': energy_keV,
+            'occupancy': occupancy,
+            'probability': probability,
+            'atomic_weight': atomic_weight(z)}
+
+def iter_xrayline_data(zs, energy_keV):
+    """
+    Yields the data of the transitions of the elements which can be ionized
+    by electrons of the specified energy.
+
+    :arg zs: atomic numbers
+    :arg energy_keV: energy of the incident electrons (in keV)
+    """
+    for z in zs:
+        for transition in TRANSITIONS:
+            data = get_xrayline_data(z, transition)
+            if data is None or data['edge_keV'] >= energy_keV:
+                continue
+            yield data
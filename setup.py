@@ -26,13 +26,18 @@ EXTRAS_REQUIRE = {'develop': ['nose', 'coverage', 'docutils', 'jinja2', 'sphinx'
 
 CMDCLASS = versioneer.get_cmdclass()
 
-ENTRY_POINTS = {'pymontecarlo.program': [],
+ENTRY_POINTS = {'pymontecarlo.program':
+                ['numpymc = pymontecarlo.program.numpymc.program:NumpyMonteCarloProgram',
+                 'xpp = pymontecarlo.program.xpp.program:XppProgram'],
 
                 'pymontecarlo.formats.hdf5':
                 ['SettingsHDF5Handler = pymontecarlo.formats.hdf5.settings:SettingsHDF5Handler',
                  'SimulationHDF5Handler = pymontecarlo.formats.hdf5.simulation:SimulationHDF5Handler',
                  'ProjectHDF5Handler = pymontecarlo.formats.hdf5.project:ProjectHDF5Handler',
 
+                 'NumpyMonteCarloProgramHDF5Handler = pymontecarlo.formats.hdf5.program.numpymc:NumpyMonteCarloProgramHDF5Handler',
+                 'XppProgramHDF5Handler = pymontecarlo.formats.hdf5.program.xpp:XppProgramHDF5Handler',
+
                  'XrayLineHDF5Handler = pymontecarlo.formats.hdf5.util.xrayline:XrayLineHDF5Handler',
 
                  'OptionsHDF5Handler = pymontecarlo.formats.hdf5.options.options:OptionsHDF5Handler',